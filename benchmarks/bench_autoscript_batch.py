@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Cost of applying a repeat AutoScript to the users of a timer task:
+    one engine (Lua runtime) per user as the timer task runner used to do,
+    against one engine running all users in a single batch call. Native
+    compilation is off, the script is in the orchestration subset.
+"""
+import os
+import sys
+import copy
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from autoscript import createEngine
+
+
+_SCRIPT = """
+RESERVE_DATE = dateadd(datenow(), 1)
+if RESERVE_BEGIN_TIME < time(9, 0) then
+    RESERVE_BEGIN_TIME = timeadd(RESERVE_BEGIN_TIME, 30)
+end
+RESERVE_END_TIME = timeadd(RESERVE_BEGIN_TIME, 240)
+"""
+
+
+def _users(
+    count: int
+) -> list:
+
+    return [
+        {
+            "username": f"user{i:04d}",
+            "enabled": True,
+            "reserve_info": {
+                "date": "2026-01-01",
+                "begin_time": {"time": f"{7 + i%4:02d}:00"},
+                "end_time": {"time": "12:00"}
+            }
+        }
+        for i in range(count)
+    ]
+
+def _perUser(
+    users: list
+) -> float:
+
+    begin = time.perf_counter()
+    for user in users:
+        createEngine(nativeCompile=False).execute(_SCRIPT, user)
+    return time.perf_counter() - begin
+
+def _batch(
+    users: list
+) -> float:
+
+    begin = time.perf_counter()
+    errors = createEngine(nativeCompile=False).executeBatch(_SCRIPT, users)
+    elapsed = time.perf_counter() - begin
+    assert not any(errors), errors
+    return elapsed
+
+def main(
+    user_count: int = 1000,
+    rounds: int = 3
+):
+
+    users = _users(user_count)
+    per_user_users = copy.deepcopy(users)
+    batch_users = copy.deepcopy(users)
+    per_user = min(_perUser(per_user_users) for _ in range(rounds))
+    batch = min(_batch(batch_users) for _ in range(rounds))
+    assert per_user_users == batch_users
+
+    print(f"AutoScript on {user_count} users (best of {rounds})")
+    print(f"  engine per user : {per_user*1000:10.1f} ms  {user_count/per_user:10.0f} users/s")
+    print(f"  one batch call  : {batch*1000:10.1f} ms  {user_count/batch:10.0f} users/s")
+    print(f"  speedup         : {per_user/batch:10.1f} x")
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Orchestration-style AutoScripts compiled to Python closures against the
+    same scripts run through Lua.
+
+    First checks that both paths agree (updated data and error messages) on
+    random block programs over random users and on hand-written edge cases
+    (comments, huge literals), then times a typical block
+    script on a cold engine, where the Lua path also pays for starting the
+    runtime.
+"""
+import os
+import sys
+import copy
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from autoscript import createEngine
+from autoscript.ASIR import (
+    Assign, BinOp, Call, Compare, If, Literal, Logic, Program, Var, parseScript,
+)
+
+
+_VARS = {
+    "String": ["USERNAME"],
+    "Boolean": ["USER_ENABLE"],
+    "Date": ["RESERVE_DATE"],
+    "Time": ["RESERVE_BEGIN_TIME", "RESERVE_END_TIME"],
+}
+_OPS = ["==", "~=", "<", ">", "<=", ">="]
+_SCRIPT = """
+if RESERVE_DATE < datenow() then
+    RESERVE_DATE = dateadd(datenow(), 1)
+end
+if (RESERVE_BEGIN_TIME < time(9, 0)) and (USER_ENABLE == true) then
+    RESERVE_BEGIN_TIME = time(9, 0)
+    RESERVE_END_TIME = timeadd(RESERVE_END_TIME, 1)
+elseif RESERVE_BEGIN_TIME >= time(20, 0) then
+    USER_ENABLE = false
+else
+    RESERVE_END_TIME = time(22, 0)
+end
+"""
+# hand-written scripts the random programs never produce: comments (long
+# ones hide code from Lua) and integer literals beyond int64 (floats in Lua)
+_EDGE_SCRIPTS = [
+    "RESERVE_END_TIME = time(21, 0) -- a line comment\n-- RESERVE_END_TIME = time(22, 0)",
+    "RESERVE_END_TIME = time(21, 0)\n--[[\nRESERVE_END_TIME = time(22, 0)\n]]",
+    "RESERVE_END_TIME = time(21, 0)\n--[==[\nRESERVE_END_TIME = time(22, 0)\n--]==]",
+    "--[=[ ]] RESERVE_END_TIME = time(22, 0) ]=] RESERVE_BEGIN_TIME = time(7, 0)",
+    "--[==\nRESERVE_END_TIME = time(22, 0)",
+    "--[[ unfinished\nRESERVE_END_TIME = time(22, 0)",
+    "if 99999999999999999999 == 99999999999999999998 then USER_ENABLE = false end",
+    "if 9223372036854775807 == 9223372036854775806 then USER_ENABLE = false end",
+    "if -9223372036854775808 == -9223372036854775807 - 1 then USER_ENABLE = false end",
+    "RESERVE_END_TIME = timeadd(RESERVE_END_TIME, 9223372036854775808 - 9223372036854775807)",
+]
+
+
+def _expr(
+    rng: random.Random,
+    var_type: str
+):
+
+    if rng.random() < 0.1:
+        # another type, exercises the type checks and the Lua fallback
+        var_type = rng.choice(list(_VARS))
+    choice = rng.random()
+    if choice < 0.3:
+        return Var(rng.choice(_VARS[var_type]))
+    if var_type == "String":
+        return Literal(rng.choice(["", "user01", 'a"b', "a\\b", "用户", "zz"]))
+    if var_type == "Boolean":
+        return Literal(rng.random() < 0.5)
+    if var_type == "Date":
+        if choice < 0.5:
+            return Call("datenow")
+        if choice < 0.75:
+            base = rng.choice([Var("RESERVE_DATE"), Call("datenow")])
+            return Call("dateadd", (base, Literal(rng.randint(-400, 400))))
+        if choice < 0.8:
+            return BinOp("+", Var("RESERVE_DATE"), Literal(rng.choice([3600, 86400, 1.5])))
+        return Call("date", (Literal(rng.randint(2020, 2030)), Literal(rng.randint(1, 12)), Literal(rng.randint(1, 31))))
+    if choice < 0.45:
+        return Call("timenow")
+    if choice < 0.7:
+        return Call("timeadd", (Var(rng.choice(_VARS["Time"])), Literal(rng.randint(-30, 30))))
+    if choice < 0.8:
+        return BinOp(rng.choice("+-"), Var(rng.choice(_VARS["Time"])), Literal(rng.choice([15, 90, 2.5, 2000])))
+    return Call("time", (Literal(rng.randint(0, 25)), Literal(rng.randint(0, 59))))
+
+def _cond(
+    rng: random.Random
+):
+
+    terms = []
+    for _ in range(rng.randint(1, 3)):
+        if rng.random() < 0.1:
+            terms.append(Literal(rng.random() < 0.5))
+            continue
+        var_type = rng.choice(list(_VARS))
+        terms.append(Compare(rng.choice(_OPS), Var(rng.choice(_VARS[var_type])), _expr(rng, var_type)))
+    ops = tuple(rng.choice(["and", "or"]) for _ in terms[1:])
+    return Logic(tuple(terms), ops)
+
+def _body(
+    rng: random.Random
+) -> tuple:
+
+    body = []
+    for _ in range(rng.randint(0, 3)):
+        var_type = rng.choice(list(_VARS))
+        body.append(Assign(rng.choice(_VARS[var_type]), _expr(rng, var_type)))
+    return tuple(body)
+
+def _program(
+    rng: random.Random
+) -> Program:
+
+    chains = []
+    for _ in range(rng.randint(1, 3)):
+        branches = tuple((_cond(rng), _body(rng)) for _ in range(rng.randint(1, 3)))
+        chains.append(If(branches, _body(rng) if rng.random() < 0.5 else None))
+    return Program(tuple(chains))
+
+def _users(
+    rng: random.Random,
+    count: int
+) -> list:
+
+    users = []
+    for i in range(count):
+        user = {
+            "username": rng.choice(["", "user01", "zz", "用户", f"user{i}"]),
+            "enabled": rng.choice([True, False, None]),
+            "reserve_info": {
+                "date": rng.choice(["2026-01-01", "2026-03-29", "2026-10-25", "2024-02-29", "2099-12-31"]),
+                "begin_time": {"time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"},
+                "end_time": {"time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"}
+            }
+        }
+        if rng.random() < 0.05:
+            user["reserve_info"]["date"] = ""
+        users.append(user)
+    return users
+
+def _checkEquivalence(
+    programs: int,
+    users_per_program: int,
+    seed: int = 2026
+) -> tuple[int, int]:
+
+    rng = random.Random(seed)
+    native_engine = createEngine()
+    lua_engine = createEngine(nativeCompile=False)
+    checked = failed = 0
+    for _ in range(programs):
+        script = _program(rng).toLua()
+        assert parseScript(script).toLua() == script, script
+        users = _users(rng, users_per_program)
+        native_users, lua_users = copy.deepcopy(users), copy.deepcopy(users)
+        native_errors = native_engine.executeBatch(script, native_users)
+        lua_errors = lua_engine.executeBatch(script, lua_users)
+        assert native_errors == lua_errors, (script, native_errors, lua_errors)
+        assert native_users == lua_users, script
+        checked += len(users)
+        failed += sum(1 for error in lua_errors if error)
+    return checked, failed
+
+def _checkEdgeScripts(
+    users: list
+) -> int:
+
+    native_engine = createEngine()
+    lua_engine = createEngine(nativeCompile=False)
+    parsed = 0
+    for script in _EDGE_SCRIPTS:
+        parsed += parseScript(script) is not None
+        results = []
+        for engine in (native_engine, lua_engine):
+            engine_users = copy.deepcopy(users)
+            try:
+                results.append((engine.executeBatch(script, engine_users), engine_users))
+            except ValueError as e:
+                results.append((str(e), engine_users))
+        assert results[0] == results[1], (script, results)
+    return parsed
+
+def _cold(
+    users: list,
+    native: bool
+) -> float:
+
+    begin = time.perf_counter()
+    errors = createEngine(nativeCompile=native).executeBatch(_SCRIPT, users)
+    elapsed = time.perf_counter() - begin
+    assert not any(errors), errors
+    return elapsed
+
+def main(
+    programs: int = 300,
+    user_count: int = 1000,
+    rounds: int = 5
+):
+
+    checked, failed = _checkEquivalence(programs, 20)
+    print(f"equivalence: {programs} programs, {checked} users, {failed} errors, all identical")
+    parsed = _checkEdgeScripts(_users(random.Random(1), 20))
+    print(f"edge scripts: {len(_EDGE_SCRIPTS)} scripts ({parsed} native), all identical")
+
+    users = _users(random.Random(0), user_count)
+    for user in users:
+        user["reserve_info"]["date"] = "2026-01-01"
+    native_users, lua_users = copy.deepcopy(users), copy.deepcopy(users)
+    lua = min(_cold(lua_users, False) for _ in range(rounds))
+    native = min(_cold(native_users, True) for _ in range(rounds))
+    assert native_users == lua_users
+
+    print(f"block script on {user_count} users, new engine each run (best of {rounds})")
+    print(f"  lua        : {lua*1000:10.1f} ms  {user_count/lua:10.0f} users/s")
+    print(f"  native     : {native*1000:10.1f} ms  {user_count/native:10.0f} users/s")
+    print(f"  speedup    : {lua/native:10.1f} x")
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Throughput and allocations of the AutoScript engine, stage by stage:
+
+      setup        Lua runtime creation, _sandbox, _registerHelpers, script
+                   compilation (Lua and native)
+      marshalling  _collect / _apply per user and the Lua batch table
+      conversion   strtodate / datetostr / strtotime / timetostr in Lua and
+                   their native counterparts
+      scripts      representative scripts (orchestration output, date
+                   arithmetic, conditionals, a Lua-only script) through the
+                   Lua and the native path across user counts
+
+    Python allocations are the tracemalloc peak of a separate run (it slows
+    everything down), Lua allocations are measured with the collector
+    stopped. All figures are per op / per user.
+
+        python benchmarks/bench_autoscript_suite.py [--users 10,100,1000]
+                                                    [--rounds 5] [--only scripts]
+"""
+import os
+import sys
+import copy
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from lupa import LuaRuntime
+
+from autoscript import ASEngine, createEngine
+from autoscript import ASCompiler
+from autoscript.ASIR import (
+    Assign, Call, Compare, If, Literal, Logic, Program, Var, parseScript,
+)
+
+
+def _orchestrationScript(
+) -> str:
+
+    # what the orchestration dialog emits for a typical weekly task
+    next_day = Assign("RESERVE_DATE", Call("dateadd", (Call("datenow"), Literal(1))))
+    return Program((
+        If((
+            (Compare("<", Var("RESERVE_DATE"), Call("datenow")), (next_day,)),
+        )),
+        If((
+            (
+                Logic((
+                    Compare("<", Var("RESERVE_BEGIN_TIME"), Call("time", (Literal(9), Literal(0)))),
+                    Compare("==", Var("USER_ENABLE"), Literal(True)),
+                ), ("and",)),
+                (
+                    Assign("RESERVE_BEGIN_TIME", Call("time", (Literal(9), Literal(0)))),
+                    Assign("RESERVE_END_TIME", Call("timeadd", (Var("RESERVE_END_TIME"), Literal(1)))),
+                ),
+            ),
+            (
+                Compare(">=", Var("RESERVE_BEGIN_TIME"), Call("time", (Literal(20), Literal(0)))),
+                (Assign("USER_ENABLE", Literal(False)),),
+            ),
+        ), (Assign("RESERVE_END_TIME", Call("time", (Literal(22), Literal(0)))),)),
+    )).toLua()
+
+
+_SCRIPTS = {
+    "orchestration": _orchestrationScript(),
+    "date arithmetic": """
+RESERVE_DATE = dateadd(RESERVE_DATE, 7)
+RESERVE_BEGIN_TIME = timeadd(RESERVE_BEGIN_TIME, 1)
+RESERVE_END_TIME = timeadd(RESERVE_BEGIN_TIME, 4)
+RESERVE_DATE = dateadd(RESERVE_DATE, -1)
+""",
+    "conditionals": """
+if USERNAME == "user0001" then
+    USER_ENABLE = false
+elseif (RESERVE_BEGIN_TIME >= time(8, 0)) and (RESERVE_BEGIN_TIME < time(12, 0)) then
+    RESERVE_END_TIME = time(12, 0)
+elseif (RESERVE_BEGIN_TIME >= time(12, 0)) or (RESERVE_DATE > date(2026, 6, 1)) then
+    RESERVE_END_TIME = time(18, 0)
+else
+    RESERVE_END_TIME = time(22, 0)
+end
+""",
+    # outside the orchestration subset, always runs through Lua
+    "lua only": """
+local shift = 0
+for i = 1, 4 do
+    shift = shift + i
+end
+RESERVE_END_TIME = timeadd(RESERVE_BEGIN_TIME, shift % 5)
+USERNAME = string.upper(USERNAME)
+""",
+}
+
+
+def _users(
+    count: int
+) -> list:
+
+    return [
+        {
+            "username": f"user{i:04d}",
+            "enabled": i%5 != 0,
+            "reserve_info": {
+                "date": f"2026-0{1 + i%9}-1{i%10}",
+                "begin_time": {"time": f"{7 + i%14:02d}:{(i*7)%60:02d}"},
+                "end_time": {"time": "22:00"}
+            }
+        }
+        for i in range(count)
+    ]
+
+def _best(
+    fn,
+    rounds: int
+) -> float:
+
+    best = float("inf")
+    for _ in range(rounds):
+        begin = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+def _pyAlloc(
+    fn
+) -> int:
+    """
+        Peak bytes allocated by Python while running fn.
+    """
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - base)
+
+def _luaAlloc(
+    lua,
+    fn
+) -> int:
+    """
+        Bytes allocated in the Lua state while running fn, collector stopped.
+    """
+
+    lua.execute("collectgarbage('collect'); collectgarbage('stop')")
+    try:
+        before = lua.get_memory_used()
+        fn()
+        return max(0, lua.get_memory_used() - before)
+    finally:
+        lua.execute("collectgarbage('restart')")
+
+def _row(
+    name: str,
+    ops: int,
+    seconds: float,
+    py_bytes: int,
+    lua_bytes: int = None
+):
+
+    lua_col = f"{lua_bytes/ops:12.0f}" if lua_bytes is not None else f"{'-':>12}"
+    print(
+        f"  {name:<34} {ops/seconds:12.0f} {seconds/ops*1e6:10.2f} "
+        f"{py_bytes/ops:12.0f} {lua_col}"
+    )
+
+def _header(
+    title: str,
+    unit: str = "op"
+):
+
+    print(title)
+    print(f"  {'':<34} {unit + '/s':>12} {'us/' + unit:>10} {'py peak B':>12} {'lua B':>12}")
+
+def _newRuntime(
+):
+
+    return LuaRuntime(unpack_returned_tuples=True, max_memory=0)
+
+def _benchSetup(
+    rounds: int,
+    count: int = 30
+):
+
+    _header(f"setup (x {count}, best of {rounds})")
+
+    def runtimes():
+        for _ in range(count):
+            _newRuntime().execute(ASEngine._RUNNER)
+    _row("runtime + runner", count, _best(runtimes, rounds), _pyAlloc(runtimes))
+
+    def staged(stage):
+        lua_list = []
+
+        def prepare():
+            lua_list[:] = []
+            for _ in range(count):
+                lua = _newRuntime()
+                lua.execute(ASEngine._RUNNER)
+                if stage is ASEngine._registerHelpers:
+                    ASEngine._sandbox(lua)
+                lua_list.append(lua)
+
+        def run():
+            for lua in lua_list:
+                stage(lua)
+
+        best = float("inf")
+        for _ in range(rounds):
+            prepare()
+            begin = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - begin)
+        prepare()
+        lua_bytes = sum(_luaAlloc(lua, lambda lua=lua: stage(lua)) for lua in lua_list)
+        prepare()
+        return best, _pyAlloc(run), lua_bytes
+
+    seconds, py_bytes, lua_bytes = staged(ASEngine._sandbox)
+    _row("_sandbox", count, seconds, py_bytes, lua_bytes)
+    seconds, py_bytes, lua_bytes = staged(ASEngine._registerHelpers)
+    _row("_registerHelpers", count, seconds, py_bytes, lua_bytes)
+
+    scripts = list(_SCRIPTS.values())
+    engine = createEngine(nativeCompile=False)
+    lua = engine._getLua()
+
+    def compileLua():
+        for _ in range(count):
+            engine._compiled.clear()
+            for script in scripts:
+                engine._compileScript(script)
+    ops = count*len(scripts)
+    _row(
+        "compile (lua)", ops, _best(compileLua, rounds),
+        _pyAlloc(compileLua), _luaAlloc(lua, compileLua)
+    )
+
+    def compileNative():
+        for _ in range(count):
+            for script in scripts:
+                program = parseScript(script)
+                if program is not None:
+                    ASCompiler.compileProgram(program)
+    _row("parse + compile (native)", ops, _best(compileNative, rounds), _pyAlloc(compileNative))
+    print()
+
+def _benchMarshalling(
+    rounds: int,
+    count: int = 1000
+):
+
+    _header(f"marshalling ({count} users, best of {rounds})", "user")
+    engine = createEngine(nativeCompile=False)
+    lua = engine._getLua()
+    users = _users(count)
+    collected = [engine._collect(user) for user in users]
+
+    def collect():
+        for user in users:
+            engine._collect(user)
+    _row("_collect", count, _best(collect, rounds), _pyAlloc(collect))
+
+    def table():
+        lua.table_from(collected, recursive=True)
+    _row("table_from (batch)", count, _best(table, rounds), _pyAlloc(table), _luaAlloc(lua, table))
+
+    targets = copy.deepcopy(users)
+    results = [dict(values) for values in collected]
+
+    def apply():
+        for target, result in zip(targets, results):
+            engine._apply(target, result)
+    _row("_apply", count, _best(apply, rounds), _pyAlloc(apply))
+    print()
+
+def _benchConversions(
+    rounds: int,
+    count: int = 10000
+):
+
+    _header(f"conversion (x {count}, best of {rounds})")
+    engine = createEngine(nativeCompile=False)
+    lua = engine._getLua()
+    lua_cases = {
+        "strtodate (lua)": ("strtodate", '"2026-03-29"'),
+        "datetostr (lua)": ("datetostr", "1774778400"),
+        "strtotime (lua)": ("strtotime", '"08:30"'),
+        "timetostr (lua)": ("timetostr", "510"),
+    }
+    for name, (func, arg) in lua_cases.items():
+        loop = lua.eval(
+            f"function(n) local f = {func} for i = 1, n do f({arg}) end end"
+        )
+        _row(
+            name, count, _best(lambda: loop(count), rounds),
+            _pyAlloc(lambda: loop(count)), _luaAlloc(lua, lambda: loop(count))
+        )
+    # uncached, the engine caches these per distinct value
+    py_cases = {
+        "strtodate (native)": (ASCompiler._strToDate.__wrapped__, "2026-03-29"),
+        "datetostr (native)": (ASCompiler._strfDate.__wrapped__, 1774778400),
+        "strtotime (native)": (ASCompiler._strToTime.__wrapped__, "08:30"),
+        "timetostr (native)": (ASCompiler._strfTime.__wrapped__, 510),
+    }
+    for name, (func, arg) in py_cases.items():
+        def convert(func=func, arg=arg):
+            for _ in range(count):
+                func(arg)
+        _row(name, count, _best(convert, rounds), _pyAlloc(convert))
+    print()
+
+def _benchScripts(
+    rounds: int,
+    user_counts: list[int]
+):
+
+    _header(f"scripts (warm engine, best of {rounds})", "user")
+    for script_name, script in _SCRIPTS.items():
+        for native in (False, True):
+            path = "native" if native else "lua"
+            if native and parseScript(script) is None:
+                continue
+            engine = createEngine(nativeCompile=native)
+            for count in user_counts:
+                users = _users(count)
+                errors = engine.executeBatch(script, copy.deepcopy(users))
+                assert not any(errors), errors
+                batches = [copy.deepcopy(users) for _ in range(rounds + 2)]
+
+                def run():
+                    engine.executeBatch(script, batches.pop())
+                seconds = _best(run, rounds)
+                py_bytes = _pyAlloc(run)
+                lua_bytes = None
+                if engine._lua is not None:
+                    lua_bytes = _luaAlloc(engine._lua, run)
+                _row(f"{script_name} / {path} / {count}", count, seconds, py_bytes, lua_bytes)
+    print()
+
+_SECTIONS = {
+    "setup": lambda args: _benchSetup(args.rounds),
+    "marshalling": lambda args: _benchMarshalling(args.rounds),
+    "conversion": lambda args: _benchConversions(args.rounds),
+    "scripts": lambda args: _benchScripts(args.rounds, args.users),
+}
+
+def main(
+    argv: list[str] = None
+):
+
+    parser = argparse.ArgumentParser(description="AutoScript engine benchmark suite")
+    parser.add_argument(
+        "--users", default="10,100,1000",
+        type=lambda s: [int(x) for x in s.split(",") if x],
+        help="comma separated user counts for the script runs"
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--only", choices=list(_SECTIONS), action="append")
+    args = parser.parse_args(argv)
+    for name in args.only or _SECTIONS:
+        _SECTIONS[name](args)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+    Several users in one browser session through WindowRouter.
+
+    Simulated (default): a stand-in WebDriver session runs one command at a
+    time (like ChromeDriver does) and remembers its current window. Every
+    simulated user sends commands for its own window: clicks that load a
+    page and polls for an element the page fetches later. The run checks
+    that no command ever lands in another user's window and compares
+    running the users one by one with running them in several windows at
+    once, with commands that block in the driver (full page loads,
+    implicit wait) and with the ones AutoLib sends (eager page loads, no
+    implicit wait).
+
+    With a browser driver given, the memory of N browsers is compared with
+    one browser holding N browser contexts (Linux, resident memory of the
+    driver and browser processes):
+
+        python benchmarks/bench_browser_contexts.py [users]
+        python benchmarks/bench_browser_contexts.py [users] chrome|edge DRIVER_PATH
+"""
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from selenium.webdriver.remote.command import Command
+
+from utils.BrowserContexts import WindowRouter, openIsolatedWindow
+
+
+class _Session:
+    """
+        Stand-in WebDriver session: one command at a time, ``command``
+        seconds each, commands act on the current window. A command may
+        block like the driver does: a click for its page load
+        (``params["load"]``), a find for the implicit wait while the element
+        is missing (until ``params["ready_at"]``, at most
+        ``params["implicit"]``).
+    """
+
+    def __init__(
+        self,
+        command: float
+    ):
+
+        self.__lock = threading.Lock()
+        self.__command = command
+        self.current_window_handle = "window-0"
+        self.misrouted = 0
+        self.commands = 0
+
+    def execute(
+        self,
+        driver_command: str,
+        params: dict | None = None
+    ) -> dict:
+
+        with self.__lock:
+            time.sleep(self.__command)
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                self.current_window_handle = params["handle"]
+                return {"value": None}
+            self.commands += 1
+            if params["window"] != self.current_window_handle:
+                self.misrouted += 1
+            time.sleep(params.get("load", 0.0))
+            missing = params.get("ready_at", 0.0) - time.monotonic()
+            if missing > 0 and params.get("implicit", 0.0) > 0:
+                time.sleep(min(missing, params["implicit"]))
+            return {"value": time.monotonic() >= params.get("ready_at", 0.0)}
+
+def _simulate(
+    users: int,
+    windows: int,
+    blocking: bool,
+    steps: int = 20,
+    command: float = 0.002,
+    document: float = 0.01,
+    load: float = 0.04,
+    host: float = 0.03,
+    poll: float = 0.01
+) -> tuple[float, _Session, WindowRouter]:
+    """
+        Every step clicks a link whose page takes ``load`` seconds, parsed
+        after ``document``, then waits for an element the page fetches
+        from the host ``host`` seconds later.
+
+        Blocking: the "normal" load strategy holds the session for the whole
+        load and the implicit wait for the missing element. Otherwise the
+        "eager" strategy holds it until the page is parsed and the element
+        is polled for without implicit wait.
+    """
+
+    session = _Session(command)
+    router = WindowRouter(session)
+    pending = iter(range(users))
+    lock = threading.Lock()
+
+    def worker(
+        handle: str
+    ):
+
+        router.bind(handle)
+        while True:
+            with lock:
+                if next(pending, None) is None:
+                    return
+            for _ in range(steps):
+                session.execute(Command.CLICK_ELEMENT, {
+                    "window": handle,
+                    "load": load if blocking else document,
+                })
+                ready_at = time.monotonic() + host + (0.0 if blocking else load - document)
+                while not session.execute(Command.FIND_ELEMENTS, {
+                    "window": handle,
+                    "ready_at": ready_at,
+                    "implicit": 1.0 if blocking else 0.0,
+                })["value"]:
+                    time.sleep(poll)
+
+    begin = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(f"window-{n}",)) for n in range(windows)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - begin, session, router
+
+def _rss(
+    root: int
+) -> int:
+    """
+        Get the resident memory in bytes of a process and its descendants.
+    """
+
+    children: dict[int, list[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as file:
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    total, stack = 0, [root]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", "r") as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])*1024
+        except OSError:
+            continue
+    return total
+
+def _memory(
+    users: int,
+    driver_type: str,
+    driver_path: str
+):
+
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.edge.service import Service as EdgeService
+
+    def start():
+        options = webdriver.ChromeOptions() if driver_type == "chrome" else webdriver.EdgeOptions()
+        for argument in ("--headless", "--no-sandbox", "--disable-dev-shm-usage", "--window-size=1920,1080"):
+            options.add_argument(argument)
+        if driver_type == "chrome":
+            return webdriver.Chrome(service=ChromeService(executable_path=driver_path), options=options)
+        return webdriver.Edge(service=EdgeService(executable_path=driver_path), options=options)
+
+    page = "data:text/html,<title>AutoLibrary</title><p>" + "x"*1000 + "</p>"
+    drivers = [start() for _ in range(users)]
+    try:
+        for driver in drivers:
+            driver.get(page)
+        separate = sum(_rss(driver.service.process.pid) for driver in drivers)
+    finally:
+        for driver in drivers:
+            driver.quit()
+
+    driver = start()
+    try:
+        driver.get(page)
+        router = WindowRouter(driver)
+        for _ in range(users - 1):
+            router.bind(openIsolatedWindow(driver))
+            driver.get(page)
+        router.bind(None)
+        shared = _rss(driver.service.process.pid)
+    finally:
+        driver.quit()
+    print(f"{users} users, {driver_type}")
+    print(f"  {users} browsers          {separate/2**20:8.0f} MB  ({separate/users/2**20:6.0f} MB per user)")
+    print(f"  1 browser, {users} contexts {shared/2**20:8.0f} MB  ({shared/users/2**20:6.0f} MB per user)")
+
+def main(
+    users: int = 12
+):
+
+    print(f"{users} simulated users, 20 page loads of 40 ms each, element from the host 30 ms later")
+    for blocking, name in ((True, "blocking commands"), (False, "non-blocking commands")):
+        print(name)
+        for windows in (1, 2, 4):
+            seconds, session, router = _simulate(users, windows, blocking)
+            assert session.misrouted == 0, session.misrouted
+            print(
+                f"  {windows} window(s)  {seconds:6.2f} s  "
+                f"{session.commands} commands, {router.switches()} window switches, 0 misrouted"
+            )
+
+
+if __name__ == "__main__":
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    if len(sys.argv) > 3:
+        _memory(count, sys.argv[2].lower(), sys.argv[3])
+    else:
+        main(count)
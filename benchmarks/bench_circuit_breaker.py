@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+    Host circuit breaker against a library host that is down.
+
+    The host is a local socket that accepts connections but never answers,
+    like a hung web server. Every simulated user loads the login page once,
+    which times out after ``timeout`` seconds (the page load timeout of
+    AutoLib, scaled down). Without the breaker every user waits for its
+    timeout; with it, the first ``failure_threshold`` users do and the rest
+    fail at once. Then the host comes back (a real HTTP server on the same
+    port) and the breaker lets users run again after its backoff.
+
+        python benchmarks/bench_circuit_breaker.py [users]
+"""
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import sys
+import time
+import socket
+import threading
+import http.server
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.HostCircuitBreaker import HostCircuitBreaker, probeHost
+from utils.HostRateLimiter import HostRateLimiter
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(
+        self
+    ):
+
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(
+        self,
+        *args
+    ):
+
+        return
+
+
+def _loadPage(
+    host_url: str,
+    timeout: float
+) -> bool:
+    """
+        A page load as the browser sees it: the host answers in time or not.
+    """
+
+    return probeHost(host_url, timeout) is None
+
+def _runUsers(
+    users: int,
+    host_url: str,
+    timeout: float,
+    breaker: HostCircuitBreaker | None
+) -> tuple[float, int, int]:
+
+    limiter = HostRateLimiter({}, breaker)
+    ok = fast_failed = 0
+    begin = time.perf_counter()
+    for _ in range(users):
+        if breaker is not None and not breaker.allow():
+            fast_failed += 1
+            continue
+        with limiter.limit(HostRateLimiter.NAVIGATE) as permit:
+            if _loadPage(host_url, timeout):
+                ok += 1
+            else:
+                permit.fail()
+    return time.perf_counter() - begin, ok, fast_failed
+
+def main(
+    users: int = 30
+):
+
+    timeout = 0.2
+    hung = socket.socket()
+    hung.bind(("127.0.0.1", 0))
+    hung.listen(users*2)
+    port = hung.getsockname()[1]
+    host_url = f"http://127.0.0.1:{port}/"
+    print(f"{users} users, host down, page load timeout {timeout:g} s")
+
+    seconds, ok, fast_failed = _runUsers(users, host_url, timeout, None)
+    assert ok == 0
+    print(f"  {"no breaker":<12} {seconds:7.2f} s  {users - ok} failed ({fast_failed} at once)")
+    breaker = HostCircuitBreaker(host_url, base_backoff=0.5, probe_timeout=timeout)
+    seconds, ok, fast_failed = _runUsers(users, host_url, timeout, breaker)
+    assert ok == 0 and fast_failed == users - 3, fast_failed
+    print(f"  {"breaker":<12} {seconds:7.2f} s  {users - ok} failed ({fast_failed} at once)")
+    print(f"  breaker {breaker.state()}, {breaker.lastError()}, probe in {breaker.retryIn():.2f} s")
+
+    # the host comes back on the same port
+    hung.close()
+    server = http.server.HTTPServer(("127.0.0.1", port), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    time.sleep(breaker.retryIn())
+    seconds, ok, fast_failed = _runUsers(users, host_url, timeout, breaker)
+    server.shutdown()
+    assert ok == users and breaker.state() == HostCircuitBreaker.CLOSED
+    print(f"host back: {ok}/{users} users ran in {seconds:.2f} s, breaker {breaker.state()}")
+
+
+if __name__ == "__main__":
+
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
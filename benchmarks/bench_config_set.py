@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Throughput of ConfigManager.set with a synchronous save after every
+    change and with the write-behind flush, using a timer task list of
+    realistic size.
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from interfaces.ConfigProvider import CfgKey
+from managers.config.ConfigManager import ConfigManager
+
+
+def _timerTasks(
+    count: int
+) -> list:
+
+    return [
+        {
+            "name": f"task{i}",
+            "task_uuid": f"{i:032x}",
+            "execute_time": "2026-01-01 08:00:00",
+            "repeat": True,
+            "repeat_history": [f"2025-12-{d:02d} 08:00:00" for d in range(1, 31)]
+        }
+        for i in range(count)
+    ]
+
+def _measure(
+    manager: ConfigManager,
+    sets: int,
+    tasks: list,
+    sync: bool
+) -> float:
+
+    begin = time.perf_counter()
+    for i in range(sets):
+        tasks[0]["name"] = f"task{i}"
+        manager.set(CfgKey.TIMERTASK.ROOT, {"timer_tasks": tasks})
+        if sync:
+            manager.save(CfgKey.TIMERTASK.ROOT.config_type)
+    manager.flush()
+    return sets/(time.perf_counter() - begin)
+
+def main(
+    sets: int = 500,
+    task_count: int = 200
+):
+
+    manager = ConfigManager(tempfile.mkdtemp(prefix="al-bench-config-"))
+    tasks = _timerTasks(task_count)
+    sync_rate = _measure(manager, sets, tasks, True)
+    async_rate = _measure(manager, sets, tasks, False)
+
+    print(f"ConfigManager.set x {sets} ({task_count} timer tasks)")
+    print(f"  save on every set : {sync_rate:10.1f} sets/s")
+    print(f"  write-behind      : {async_rate:10.1f} sets/s")
+
+
+if __name__ == "__main__":
+
+    main()
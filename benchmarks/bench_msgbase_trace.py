@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Per-call cost of MsgBase._showTrace with the former formatter (which
+    walked the stack with traceback.extract_stack() on every record, the
+    handlers attached directly to the logger), with synchronous handlers
+    and the current formatter, and with the queued LogManager pipeline.
+"""
+import os
+import sys
+import time
+import queue
+import logging
+import tempfile
+import traceback
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import managers.log.LogManager as LogManager
+
+from base.MsgBase import MsgBase
+
+
+class _BaselineFormatter(LogManager.CallerInfoFormatter):
+    """
+        CallerInfoFormatter before records carried their caller location.
+    """
+
+    def format(
+        self,
+        record
+    ):
+
+        depth = 0
+        while depth < 10:
+            record.filename = os.path.basename(record.pathname)
+            if 'MsgBase.py' not in record.filename and record.funcName != '_showTrace':
+                break
+            if not hasattr(record, 'stack'):
+                record.stack = True
+                record.stack_list = traceback.extract_stack()
+            depth += 1
+            if depth < len(record.stack_list):
+                frame = record.stack_list[-depth-1]
+                record.filename = os.path.basename(frame.filename)
+                record.lineno = int(frame.lineno)
+                record.funcName = frame.name
+        return super().format(record)
+
+
+class _BaselineLogger(logging.Logger):
+    """
+        Logger whose records point at MsgBase._showTrace, as they did before
+        it passed ``stacklevel``.
+    """
+
+    def log(
+        self,
+        level,
+        msg,
+        *args,
+        **kwargs
+    ):
+
+        kwargs["stacklevel"] = 2
+        super().log(level, msg, *args, **kwargs)
+
+
+class _Tracer(MsgBase):
+
+    def __init__(
+        self
+    ):
+
+        super().__init__(queue.Queue(), queue.Queue())
+
+    def trace(
+        self,
+        msg: str
+    ):
+
+        self._showTrace(msg)
+
+
+def _measure(
+    tracer: _Tracer,
+    calls: int
+) -> float:
+
+    begin = time.perf_counter()
+    for i in range(calls):
+        tracer.trace(f"用户 user{i} 第 1 次尝试登录......")
+    elapsed = time.perf_counter() - begin
+    # keep the output queue from growing across runs
+    tracer._output_queue = queue.Queue()
+    return elapsed/calls*1e6
+
+def main(
+    calls: int = 20000
+):
+
+    log_dir = tempfile.mkdtemp(prefix="al-bench-log-")
+    # the console handlers would flood the benchmark output
+    stderr, sys.stderr = sys.stderr, open(os.devnull, "w")
+    try:
+        manager = LogManager.instance(log_dir)
+        sync_logger = logging.getLogger("AutoLibraryBenchSync")
+        sync_logger.setLevel(logging.DEBUG)
+        sync_logger.propagate = False
+        for handler in manager.createHandlers():
+            sync_logger.addHandler(handler)
+
+        baseline_logger = _BaselineLogger("AutoLibraryBenchBaseline")
+        for handler in manager.createHandlers():
+            handler.setFormatter(_BaselineFormatter(handler.formatter.basefmt, handler.formatter.datefmt))
+            baseline_logger.addHandler(handler)
+
+        tracer = _Tracer()
+        async_us = _measure(tracer, calls)
+        tracer._logger = sync_logger.getChild("_Tracer")
+        sync_us = _measure(tracer, calls)
+        tracer._logger = baseline_logger
+        baseline_us = _measure(tracer, calls)
+        dropped = manager.droppedCount()
+        manager.shutdown()
+    finally:
+        sys.stderr.close()
+        sys.stderr = stderr
+
+    print(f"MsgBase._showTrace x {calls}")
+    print(f"  before (stack walk)  : {baseline_us:8.2f} us/call")
+    print(f"  synchronous handlers : {sync_us:8.2f} us/call")
+    print(f"  queued pipeline      : {async_us:8.2f} us/call")
+    print(f"  dropped records      : {dropped}")
+
+
+if __name__ == "__main__":
+
+    main()
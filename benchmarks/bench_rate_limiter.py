@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+    Adaptive host rate limiter against unlimited traffic.
+
+    A simulated library host serves one request at a time (``service``
+    seconds each), a request waiting longer than ``timeout`` fails on the
+    client side but the host still works it off, like a real page load
+    timeout. Browsers are threads sending requests back to back, either
+    directly or through one shared HostRateLimiter whose budget is well
+    above what the host can serve.
+
+    Unlimited, the queue grows past the timeout and most requests fail;
+    limited, the scale settles near the host capacity and nearly all
+    requests succeed.
+
+        python benchmarks/bench_rate_limiter.py [browsers] [seconds]
+"""
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.HostRateLimiter import HostRateLimiter
+
+
+class _Host:
+
+    def __init__(
+        self,
+        service: float,
+        timeout: float
+    ):
+
+        self.__lock = threading.Lock()
+        self.__busy_until = 0.0
+        self.__service = service
+        self.__timeout = timeout
+
+    def request(
+        self
+    ) -> bool:
+
+        with self.__lock:
+            now = time.monotonic()
+            self.__busy_until = max(now, self.__busy_until) + self.__service
+            latency = self.__busy_until - now
+        if latency > self.__timeout:
+            time.sleep(self.__timeout)
+            return False
+        time.sleep(latency)
+        return True
+
+def _run(
+    browsers: int,
+    seconds: float,
+    limiter: HostRateLimiter | None
+) -> tuple[int, int]:
+
+    host = _Host(service=0.01, timeout=0.1)
+    counts = {"ok": 0, "failed": 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def browser():
+        while time.monotonic() < stop:
+            if limiter is None:
+                ok = host.request()
+            else:
+                with limiter.limit(HostRateLimiter.NAVIGATE) as permit:
+                    ok = host.request()
+                    if not ok:
+                        permit.fail()
+            with lock:
+                counts["ok" if ok else "failed"] += 1
+
+    threads = [threading.Thread(target=browser) for _ in range(browsers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts["ok"], counts["failed"]
+
+def main(
+    browsers: int = 16,
+    seconds: float = 3.0
+):
+
+    # the host serves 100 requests per second, the budget allows 400
+    limiter = HostRateLimiter({HostRateLimiter.NAVIGATE: (400.0, 10)})
+    print(f"{browsers} browsers for {seconds:.0f} s, host capacity 100 req/s, timeout 0.1 s")
+    for name, current in (("unlimited", None), ("adaptive limiter", limiter)):
+        ok, failed = _run(browsers, seconds, current)
+        total = ok + failed
+        print(
+            f"  {name:<18} {ok/seconds:7.1f} ok/s  {failed/seconds:7.1f} failed/s  "
+            f"({100*failed/max(total, 1):5.1f}% failed)"
+        )
+    print(
+        f"  limiter settled at {limiter.rate(HostRateLimiter.NAVIGATE):.0f} req/s "
+        f"(scale {limiter.scale():.2f}), {limiter.failures()} failures seen"
+    )
+
+
+if __name__ == "__main__":
+
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    )
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+    Learnt page wait timeouts against the fixed 2 s ones.
+
+    Simulated users each run a few required waits (elements that do come)
+    and one optional wait whose element is missing for a third of them
+    (no check in button without a reservation), first against a fast LAN
+    host, then against a host at peak load whose slowest answers take
+    longer than 2 s. The latencies are drawn, not slept: a wait costs its
+    latency, or its timeout when the latency is longer, and fails then.
+
+    Fixed timeouts waste 2 s on every missing element on the LAN and fail
+    the slow answers at peak; learnt ones fail missing elements at the
+    floor and stretch past the slow answers after a few timeouts (AutoLib
+    sets no implicit wait, which would hold every poll of a missing
+    element for its own duration). The histograms are saved and loaded
+    back at the end, like between two runs.
+
+        python benchmarks/bench_timeout_policy.py [users]
+"""
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.TimeoutPolicy import TimeoutPolicy
+
+_REQUIRED = ("LoginPage:title", "MainShell:reserve_view", "ReserveView:room", "SeatMapDialog:open")
+_OPTIONAL = "MainShell:checkin_button:probe"
+
+
+def _simulate(
+    users: int,
+    median: float,
+    policy: TimeoutPolicy | None,
+    rng: random.Random
+) -> tuple[float, int, int]:
+    """
+        Returns:
+            tuple[float, int, int]: Seconds waited, failed required waits,
+                missing elements.
+    """
+
+    waited = 0.0
+    failed = missing = 0
+    for _ in range(users):
+        for name in _REQUIRED + (_OPTIONAL,):
+            optional = name == _OPTIONAL
+            timeout = TimeoutPolicy.DEFAULT_TIMEOUT if policy is None else policy.timeout(name)
+            if optional and rng.random() < 1/3:
+                waited += timeout
+                missing += 1
+                continue
+            latency = rng.lognormvariate(0, 0.35)*median
+            if latency > timeout:
+                waited += timeout
+                failed += 1
+                if policy is not None and not optional:
+                    policy.record(name, timeout, timed_out=True)
+            else:
+                waited += latency
+                if policy is not None:
+                    policy.record(name, latency, optional=optional)
+    return waited, failed, missing
+
+def _realWait(
+    policy: TimeoutPolicy
+) -> float:
+    """
+        One wait through WebDriverWait, the condition is met after 0.15 s.
+    """
+
+    ready_at = time.monotonic() + 0.15
+    begin = time.perf_counter()
+    policy.wait(object(), "bench:real", lambda driver: time.monotonic() >= ready_at)
+    return time.perf_counter() - begin
+
+def main(
+    users: int = 200
+):
+
+    rng = random.Random(49)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "timeouts.json")
+        policy = TimeoutPolicy(path)
+        print(f"{users} users per phase, {len(_REQUIRED)} required and 1 optional wait each")
+        for phase, median in (("fast LAN", 0.08), ("peak load", 1.2)):
+            print(f"{phase} (median latency {median:g} s)")
+            for name, current in (("fixed 2 s", None), ("learnt", policy)):
+                waited, failed, missing = _simulate(users, median, current, rng)
+                print(
+                    f"  {name:<10} {waited:8.1f} s waited  {failed:4d} failed waits  "
+                    f"({missing} missing elements)"
+                )
+            print(f"  slowdown {policy.slowdown():.2f}, learnt timeouts: " + ", ".join(
+                f"{name.split(':')[1]} {stats['timeout']:.2f} s" for name, stats in policy.stats().items()
+            ))
+        print(f"real wait of 0.15 s took {_realWait(policy):.3f} s (poll every {TimeoutPolicy.POLL_INTERVAL:g} s)")
+
+        begin = time.perf_counter()
+        assert policy.save()
+        saved = time.perf_counter() - begin
+        loaded = TimeoutPolicy()
+        begin = time.perf_counter()
+        assert loaded.load(path)
+        elapsed = time.perf_counter() - begin
+        # the slowdown of the optional waits is not kept between runs
+        assert all(loaded.timeout(name) == policy.timeout(name) for name in _REQUIRED)
+        print(f"saved in {saved*1000:.2f} ms, loaded in {elapsed*1000:.2f} ms ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
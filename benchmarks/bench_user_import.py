@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Bulk user import and export, CSV and JSON lines.
+
+    For a generated config with thousands of users: exporting it, reading
+    and validating the rows alone, importing them into an empty JSON user
+    config and an empty user store, and importing them again over the
+    imported users (every row an update). A few broken rows are mixed in
+    and must be reported with their line numbers.
+
+        python benchmarks/bench_user_import.py [users]
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from managers.config.UserConfig import UserConfig
+from managers.config.UserStore import loadUserConfig
+from managers.config.UserTransfer import exportUsers, importUsers, readUserRows, writeUsers
+
+from bench_user_model import _best, _config
+
+_BROKEN_CSV = [
+    "g,,pw,true,,,2,1,7,,,,,,,,,,,,",
+    "g,2026broken1,pw,true,,,9,1,7,,,,,,,,,,,,",
+    "g,2026broken2,pw,maybe,,,2,1,7,,,,,,,,,,,,",
+    "g,2026broken3,pw,true,2026-13-01,,2,1,7,,,,,,,,,,,,",
+]
+_BROKEN_JSONL = [
+    '{"username": "2026broken0", "reserve_info": {"floor": "2", "room": "1"}}',
+    '{"username": "2026broken1", "reserve_info": {"floor": "2", "room": "1", "seat_id": "7",',
+    '["not", "a", "user"]',
+    '{"group": 1, "username": "2026broken3"}',
+]
+
+
+def _withBroken(
+    path: str,
+    broken: list[str]
+) -> list[int]:
+    """
+        Insert the broken rows evenly into a written file, return their line
+        numbers.
+    """
+
+    with open(path, "r", encoding="utf-8-sig") as file:
+        lines = file.read().splitlines()
+    step = len(lines)//(len(broken) + 1)
+    numbers = []
+    for index, row in enumerate(broken):
+        at = step*(index + 1) + index
+        lines.insert(at, row)
+        numbers.append(at + 1)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    return numbers
+
+def main(
+    count: int = 10000
+):
+
+    config = UserConfig.fromDict(_config(count))
+    rows = [(group.name, user) for group in config.groups for user in group.users]
+    print(f"{count} users in {len(config.groups)} groups (best of 3)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix, broken in ((".csv", _BROKEN_CSV), (".jsonl", _BROKEN_JSONL)):
+            source = os.path.join(tmp, f"users{suffix}")
+            export_seconds = _best(lambda: writeUsers(source, rows), 3)
+            broken_lines = _withBroken(source, broken)
+
+            json_path = os.path.join(tmp, f"user{suffix}.json")
+            store_path = os.path.join(tmp, f"user{suffix}.db")
+            report = importUsers(source, json_path)
+            assert (report.inserted, report.updated) == (count, 0), report.summary()
+            assert [line for line, _ in report.errors] == broken_lines, report.summary()
+            assert loadUserConfig(json_path).toDict() == config.toDict()
+            report = importUsers(source, store_path)
+            assert (report.inserted, report.updated, len(report.errors)) == (count, 0, len(broken))
+            assert loadUserConfig(store_path).toDict() == config.toDict()
+            round_trip = os.path.join(tmp, f"round_trip{suffix}")
+            assert exportUsers(store_path, round_trip) == count
+            assert [row.user for row in readUserRows(round_trip)] == [user for _, user in rows]
+
+            timings = [
+                ("export", export_seconds),
+                ("read and validate", _best(lambda: sum(1 for _ in readUserRows(source)), 3)),
+                ("import: new json", _best(lambda: importUsers(source, json_path + ".new"), 1)),
+                ("import: upsert json", _best(lambda: importUsers(source, json_path), 3)),
+                ("import: new store", _best(lambda: importUsers(source, store_path + ".new.db"), 1)),
+                ("import: upsert store", _best(lambda: importUsers(source, store_path), 3)),
+            ]
+            report = importUsers(source, store_path)
+            assert (report.inserted, report.updated) == (0, count)
+            print(f"{suffix[1:]} ({os.path.getsize(source)/1024:.0f} KB)")
+            for name, seconds in timings:
+                print(f"  {name:<32} {seconds*1000:9.2f} ms")
+    print(f"first reported rows:\n{report.summary(max_errors=len(broken))}")
+
+
+if __name__ == "__main__":
+
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
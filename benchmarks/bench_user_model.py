@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Typed user config model against the nested dicts it replaces.
+
+    For a generated config with thousands of users: parsing (json + model),
+    iterating every user's reserve times, the per task copy a timer task
+    makes of the users (deepcopy of the dicts before, ``User.copy`` now, and
+    no copy at all for tasks without a repeat AutoScript), the key used to
+    merge identical users, and the memory the loaded config holds.
+
+        python benchmarks/bench_user_model.py [users]
+"""
+import os
+import sys
+import copy
+import gc
+import json
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from managers.config.UserConfig import UserConfig
+
+
+def _config(
+    count: int,
+    group_size: int = 200
+) -> dict:
+
+    groups = []
+    for start in range(0, count, group_size):
+        users = []
+        for i in range(start, min(count, start + group_size)):
+            users.append({
+                "username": f"2026{i:06d}",
+                "password": f"pw{i}",
+                "enabled": i%7 != 0,
+                "reserve_info": {
+                    "date": f"2026-11-{1 + i%28:02d}",
+                    "place": "图书馆",
+                    "floor": str(2 + i%4),
+                    "room": str(1 + i%3),
+                    "seat_id": str(i%120),
+                    "begin_time": {"time": f"{8 + i%6:02d}:00", "max_diff": 30, "prefer_early": False},
+                    "end_time": {"time": f"{14 + i%6:02d}:30", "max_diff": 30, "prefer_early": True},
+                    "expect_duration": 4.0,
+                    "satisfy_duration": False,
+                    "renew_time": {"expect_duration": 1.0, "max_diff": 30, "prefer_early": True}
+                }
+            })
+        groups.append({"name": f"group{start//group_size}", "enabled": True, "users": users})
+    return {"groups": groups}
+
+def _best(
+    fn,
+    rounds: int = 5
+) -> float:
+
+    best = float("inf")
+    for _ in range(rounds):
+        begin = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+def _retained(
+    build
+) -> int:
+    """
+        Bytes still held by the object build() returns.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        obj = build()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del obj
+    return size - base
+
+def _dictUsers(
+    data: dict
+) -> list:
+
+    return [
+        user
+        for group in data.get("groups", [])
+        if group.get("enabled", False)
+        for user in group.get("users", [])
+    ]
+
+def main(
+    count: int = 5000
+):
+
+    text = json.dumps(_config(count), ensure_ascii=False)
+    data = json.loads(text)
+    model = UserConfig.fromDict(json.loads(text))
+    assert model.toDict() == data
+    assert not any(user.error for group in model.groups for user in group.users)
+    users = model.enabledUsers()
+    dict_users = _dictUsers(data)
+
+    def iterDicts():
+        for user in dict_users:
+            info = user.get("reserve_info", {})
+            info.get("begin_time", {}).get("time")
+            info.get("end_time", {}).get("time")
+
+    def iterModel():
+        for user in users:
+            user.reserve_info.begin_time.time
+            user.reserve_info.end_time.time
+
+    rows = [
+        ("load: json.loads (dicts)", _best(lambda: json.loads(text))),
+        ("load: json.loads + UserConfig", _best(lambda: UserConfig.fromDict(json.loads(text)))),
+        ("iterate: dicts", _best(iterDicts)),
+        ("iterate: model", _best(iterModel)),
+        ("task copy: deepcopy (dicts)", _best(lambda: [copy.deepcopy(user) for user in _dictUsers(data)])),
+        ("task copy: User.copy", _best(lambda: [user.copy() for user in model.enabledUsers()])),
+        ("task copy: none (no script)", _best(model.enabledUsers)),
+        (
+            "merge key: json.dumps",
+            _best(lambda: [json.dumps(user, sort_keys=True, ensure_ascii=False) for user in dict_users])
+        ),
+        ("merge key: User.key", _best(lambda: [user.key() for user in users])),
+    ]
+    print(f"{count} users, {len(users)} in enabled groups (best of 5)")
+    for name, seconds in rows:
+        print(f"  {name:<32} {seconds*1000:9.2f} ms  {count/seconds:12.0f} users/s")
+    dict_bytes = _retained(lambda: json.loads(text))
+    model_bytes = _retained(lambda: UserConfig.fromDict(json.loads(text)))
+    print("retained memory")
+    print(f"  {'dicts':<32} {dict_bytes/1024:9.0f} KB  {dict_bytes/count:8.0f} B/user")
+    print(f"  {'model':<32} {model_bytes/1024:9.0f} KB  {model_bytes/count:8.0f} B/user")
+
+
+if __name__ == "__main__":
+
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
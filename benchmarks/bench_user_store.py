@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    SQLite user store against the JSON user config.
+
+    For a generated config with thousands of users: a full load, the load a
+    run does (users of the enabled groups only), streaming the users, saving
+    after one user was edited (the whole file rewritten for JSON, one row for
+    the store), a single user upsert and a lookup by username.
+
+        python benchmarks/bench_user_store.py [users]
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from managers.config.UserConfig import User, UserConfig
+from managers.config.UserStore import UserStore, loadUserConfig, saveUserConfig
+
+from bench_user_model import _best, _config
+
+
+def main(
+    count: int = 10000
+):
+
+    data = _config(count)
+    # every fourth group disabled, a run skips them
+    for index, group in enumerate(data["groups"]):
+        group["enabled"] = index%4 != 3
+    # malformed values are kept and flagged, not turned into disabled users
+    data["groups"][0]["users"][1]["enabled"] = "yes"
+    data["groups"][0]["users"][2]["enabled"] = 1
+    config = UserConfig.fromDict(data)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "user.json")
+        store_path = os.path.join(tmp, "user.db")
+        saveUserConfig(json_path, config)
+        saveUserConfig(store_path, config)
+        assert loadUserConfig(store_path).toDict() == loadUserConfig(json_path).toDict() == data
+        assert [
+            user.error for group in loadUserConfig(store_path).groups for user in group.users
+        ] == [user.error for group in config.groups for user in group.users]
+        store = UserStore(store_path)
+        assert store.save(config) == 0
+        streamed = [user for _, user in store.iterUsers()]
+        assert [user.key() for user in streamed] == [user.key() for user in config.enabledUsers()]
+
+        edited = UserConfig.fromDict(config.toDict())
+        edits = [0]
+
+        def editOne():
+            edits[0] += 1
+            edited.groups[0].users[0].password = f"edit{edits[0]}"
+
+        def saveJson():
+            editOne()
+            saveUserConfig(json_path, edited)
+
+        def saveStore():
+            editOne()
+            assert store.save(edited) == 1
+
+        def putUser():
+            editOne()
+            assert not store.putUser(edited.groups[0].name, edited.groups[0].users[0])
+
+        middle = config.groups[len(config.groups)//2].users[0]
+        rows = [
+            ("load: json", _best(lambda: loadUserConfig(json_path))),
+            ("load: store", _best(lambda: loadUserConfig(store_path))),
+            ("run load: json", _best(lambda: loadUserConfig(json_path, enabled_only=True))),
+            ("run load: store (enabled)", _best(lambda: loadUserConfig(store_path, enabled_only=True))),
+            ("stream: store.iterUsers", _best(lambda: sum(1 for _ in store.iterUsers()))),
+            ("save one edit: json", _best(saveJson)),
+            ("save one edit: store.save", _best(saveStore)),
+            ("save one edit: store.putUser", _best(putUser)),
+            (
+                "find by username: model scan",
+                _best(lambda: [u for g in config.groups for u in g.users if u.username == middle.username])
+            ),
+            ("find by username: store", _best(lambda: store.findUsers(middle.username))),
+        ]
+        print(f"{count} users in {len(config.groups)} groups (best of 5)")
+        for name, seconds in rows:
+            print(f"  {name:<32} {seconds*1000:9.2f} ms")
+        print("file size")
+        print(f"  {'json':<32} {os.path.getsize(json_path)/1024:9.0f} KB")
+        print(f"  {'store':<32} {os.path.getsize(store_path)/1024:9.0f} KB")
+        store.close()
+    assert User.fromDict(middle.toDict()) == middle
+
+
+if __name__ == "__main__":
+
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
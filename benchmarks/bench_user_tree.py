@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Model backed user tree against one QTreeWidgetItem per user.
+
+    For a generated config with thousands of users: showing it (the items
+    built and sorted by a QTreeWidget, a model reset for the tree view),
+    collecting it back for a save, and moving one user to another group
+    (take/insert of an item, a row move in the model).
+
+        QT_QPA_PLATFORM=offscreen python benchmarks/bench_user_tree.py [users]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QTreeWidget, QTreeWidgetItem
+
+from gui.ALUserTreeWidget import ALUserTreeWidget
+from managers.config.UserConfig import Group, UserConfig
+
+from bench_user_model import _best, _config
+
+
+def _fillItems(
+    tree: QTreeWidget,
+    user_config: UserConfig
+):
+
+    tree.clear()
+    for group in user_config.groups:
+        GroupItem = QTreeWidgetItem(tree)
+        GroupItem.setText(0, group.name)
+        GroupItem.setCheckState(1, Qt.CheckState.Checked if group.enabled else Qt.CheckState.Unchecked)
+        for user in group.users:
+            UserItem = QTreeWidgetItem(GroupItem)
+            UserItem.setText(0, user.username)
+            UserItem.setText(1, "" if user.enabled else "跳过")
+            UserItem.setData(0, Qt.ItemDataRole.UserRole, user)
+            UserItem.setCheckState(1, Qt.CheckState.Checked if user.enabled else Qt.CheckState.Unchecked)
+        GroupItem.setExpanded(True)
+
+def _collectItems(
+    tree: QTreeWidget
+) -> UserConfig:
+
+    user_config = UserConfig()
+    for i in range(tree.topLevelItemCount()):
+        GroupItem = tree.topLevelItem(i)
+        group = Group(GroupItem.text(0), GroupItem.checkState(1) == Qt.CheckState.Checked)
+        for j in range(GroupItem.childCount()):
+            UserItem = GroupItem.child(j)
+            user = UserItem.data(0, Qt.ItemDataRole.UserRole)
+            user.enabled = UserItem.checkState(1) == Qt.CheckState.Checked
+            group.users.append(user)
+        user_config.groups.append(group)
+    return user_config
+
+def main(
+    count: int = 10000
+):
+
+    app = QApplication.instance() or QApplication([])
+    user_config = UserConfig.fromDict(_config(count))
+    items = QTreeWidget()
+    items.setColumnCount(2)
+    items.setSortingEnabled(True)
+    items.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+    view = ALUserTreeWidget()
+    for tree in (items, view):
+        tree.resize(250, 600)
+        tree.show()
+    app.processEvents()
+
+    def showItems():
+        _fillItems(items, user_config)
+        app.processEvents()
+
+    def showModel():
+        view.setUserConfig(user_config)
+        app.processEvents()
+
+    def moveItem():
+        GroupItem = items.topLevelItem(0)
+        items.topLevelItem(1).addChild(GroupItem.takeChild(0))
+        app.processEvents()
+
+    model = view.model()
+
+    def moveModel():
+        SourceIndex = model.index(0, 0, model.index(0, 0))
+        view.setCurrentIndex(SourceIndex)
+        view.moveUser(SourceIndex, model.index(1, 0))
+        app.processEvents()
+
+    rows = [
+        ("show: QTreeWidgetItem", _best(showItems, 3)),
+        ("show: model", _best(showModel, 3)),
+        ("collect: QTreeWidgetItem", _best(lambda: _collectItems(items), 3)),
+        ("collect: model", _best(view.userConfig, 3)),
+        ("move one user: QTreeWidgetItem", _best(moveItem)),
+        ("move one user: model", _best(moveModel)),
+    ]
+    showItems()
+    showModel()
+    assert view.userConfig().toDict() == _collectItems(items).toDict()
+    print(f"{count} users in {len(user_config.groups)} groups (best of 3/5)")
+    for name, seconds in rows:
+        print(f"  {name:<32} {seconds*1000:9.2f} ms")
+    view.setUserConfig(UserConfig.fromDict(_config(count, group_size=count)))
+    print(
+        f"one group of {count} users: "
+        f"{'expanded' if view.isExpanded(model.index(0, 0)) else 'collapsed, fetched on expand'}"
+    )
+
+
+if __name__ == "__main__":
+
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
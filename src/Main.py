@@ -15,7 +15,7 @@ from PySide6.QtWidgets import QApplication
 from gui.ALMainWindow import ALMainWindow
 from gui.resources import ALResource
 
-from boot.AppInitializer import initializeApp
+from boot.AppInitializer import initializeApp, finalizeApp
 
 
 def main():
@@ -29,7 +29,9 @@ def main():
         sys.exit(-1)
     window = ALMainWindow()
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    finalizeApp()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
 
@@ -0,0 +1,582 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import copy
+import json
+import queue
+import hmac
+import socket
+import threading
+import socketserver
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+import managers.log.LogManager as LogManager
+
+from autolibrary.EventHub import EventHub
+from autolibrary.HeadlessDaemon import HeadlessDaemon
+from utils.TimerTaskUtils import TimerTaskUtils
+
+
+class RPCError(Exception):
+    """
+        JSON-RPC error returned to the client.
+    """
+
+    PARSE_ERROR = -32700
+    INVALID_REQUEST = -32600
+    METHOD_NOT_FOUND = -32601
+    INVALID_PARAMS = -32602
+    SERVER_ERROR = -32000
+
+    def __init__(
+        self,
+        code: int,
+        message: str
+    ):
+
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class _ControlRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    server_version = "AutoLibrary"
+
+    def address_string(
+        self
+    ) -> str:
+
+        # a unix socket peer has no address
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "local"
+
+    def log_message(
+        self,
+        format: str,
+        *args: Any
+    ):
+
+        self.server.control.logger.debug("%s - %s", self.address_string(), format%args)
+
+    def do_GET(
+        self
+    ):
+
+        control: ControlServer = self.server.control
+        if not self.checkRequest():
+            return
+        match urlsplit(self.path).path:
+            case "/events":
+                control.streamEvents(self)
+            case "/metrics":
+                self.sendJSON(200, control.metrics())
+            case "/status":
+                try:
+                    self.sendJSON(200, control.dispatch("status", {}))
+                except RPCError as e:
+                    self.sendJSON(503, { "error": e.message })
+            case _:
+                self.sendJSON(404, { "error": "not found" })
+
+    def do_POST(
+        self
+    ):
+
+        control: ControlServer = self.server.control
+        if not self.checkRequest():
+            return
+        if urlsplit(self.path).path != "/rpc":
+            self.sendJSON(404, { "error": "not found" })
+            return
+        if self.headers.get_content_type() != "application/json":
+            # keeps plain html forms of other sites out
+            self.sendJSON(415, { "error": "content type must be application/json" })
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.sendJSON(400, { "error": "invalid content length" })
+            return
+        if length > control.MAX_REQUEST_SIZE:
+            self.sendJSON(413, { "error": "request too large" })
+            return
+        response = control.handleRPC(self.rfile.read(length))
+        if response is None:
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.sendJSON(200, response)
+
+    def checkRequest(
+        self
+    ) -> bool:
+
+        control: ControlServer = self.server.control
+        if not control.isAllowedHost(self.headers.get("Host", "")):
+            self.sendJSON(403, { "error": "host not allowed" })
+            return False
+        if not control.isAuthorized(self.headers.get("Authorization", "")):
+            self.sendJSON(401, { "error": "unauthorized" })
+            return False
+        return True
+
+    def sendJSON(
+        self,
+        status: int,
+        data: Any
+    ):
+
+        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _ControlHTTPServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        control: "ControlServer"
+    ):
+
+        self.control = control
+        super().__init__(address, _ControlRequestHandler)
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class _ControlUnixServer(socketserver.ThreadingUnixStreamServer):
+
+        daemon_threads = True
+
+        def __init__(
+            self,
+            socket_path: str,
+            control: "ControlServer"
+        ):
+
+            self.control = control
+            super().__init__(socket_path, _ControlRequestHandler)
+
+
+class ControlServer:
+    """
+        Local HTTP control API of the headless daemon.
+
+        Endpoints:
+            POST /rpc      JSON-RPC 2.0 calls (single or batch), see ``METHODS``.
+            GET /events    Live MsgEvent stream (server-sent events).
+            GET /metrics   Daemon and server counters.
+            GET /status    Same as the ``status`` call.
+
+        The server listens on localhost or on a unix socket only. Requests
+        are served on their own threads, everything touching the timer
+        tasks is marshalled onto the daemon loop with ``HeadlessDaemon.call``
+        and events are read from a per-client EventHub queue, so a slow or
+        stuck client never holds up the daemon or the automation threads.
+
+        Args:
+            daemon (HeadlessDaemon): The daemon to control.
+            event_hub (EventHub): Source of the streamed events.
+            host (str): Listen address, must be a loopback address.
+            port (int): Listen port, 0 picks a free port.
+            socket_path (str): Listen on this unix socket instead of TCP.
+            token (str): When set, requests need ``Authorization: Bearer <token>``.
+    """
+
+    MAX_REQUEST_SIZE = 1 << 20
+    # an idle event stream sends a comment line this often, so dead
+    # clients are noticed
+    KEEPALIVE_INTERVAL = 15.0
+
+    METHODS = (
+        "status", "metrics", "run.start", "run.stop", "daemon.stop",
+        "tasks.list", "tasks.get", "tasks.add", "tasks.update", "tasks.delete",
+    )
+
+    def __init__(
+        self,
+        daemon: HeadlessDaemon,
+        event_hub: EventHub,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        socket_path: str = "",
+        token: str = ""
+    ):
+
+        self.logger = LogManager.getLogger(self.__class__.__name__)
+        self.__daemon = daemon
+        self.__event_hub = event_hub
+        self.__token = token
+        self.__socket_path = socket_path
+        self.__stopping = threading.Event()
+        self.__counter_lock = threading.Lock()
+        self.__counters = { "rpc_requests": 0, "rpc_errors": 0, "event_clients": 0 }
+        if socket_path:
+            if not hasattr(socket, "AF_UNIX"):
+                raise ValueError("当前系统不支持 unix socket")
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.__server = _ControlUnixServer(socket_path, self)
+            os.chmod(socket_path, 0o600)
+        else:
+            if host not in ("127.0.0.1", "localhost"):
+                raise ValueError(f"控制接口只能监听本机地址, 不能使用 {host}")
+            self.__server = _ControlHTTPServer((host, port), self)
+        self.__methods: dict[str, Callable[[dict], Any]] = {
+            "status": lambda params: self.__daemon.call(self.__daemon.status),
+            "metrics": lambda params: self.metrics(),
+            "run.start": self.__startRun,
+            "run.stop": lambda params: self.__daemon.call(self.__daemon.stopRun),
+            "daemon.stop": self.__stopDaemon,
+            "tasks.list": lambda params: self.__daemon.call(self.__listTasks),
+            "tasks.get": lambda params: self.__daemon.call(self.__getTask, self.__uuid(params)),
+            "tasks.add": self.__addTask,
+            "tasks.update": self.__updateTask,
+            "tasks.delete": self.__deleteTask,
+        }
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever,
+            name="ControlServer",
+            daemon=True
+        )
+
+    def address(
+        self
+    ) -> str:
+
+        if self.__socket_path:
+            return f"unix:{self.__socket_path}"
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(
+        self
+    ):
+
+        self.__thread.start()
+        self.logger.info("控制接口已启动: %s", self.address())
+
+    def stop(
+        self
+    ):
+
+        self.__stopping.set()
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        if self.__socket_path and os.path.exists(self.__socket_path):
+            os.remove(self.__socket_path)
+        self.logger.info("控制接口已停止")
+
+    def isAllowedHost(
+        self,
+        host: str
+    ) -> bool:
+        """
+            Reject requests addressed to other host names, a web page can
+            not reach the server by rebinding its own name to 127.0.0.1.
+        """
+
+        if self.__socket_path:
+            return True
+        name = host.rsplit(":", 1)[0] if not host.endswith("]") else host
+        return name in ("127.0.0.1", "localhost", "[::1]")
+
+    def isAuthorized(
+        self,
+        authorization: str
+    ) -> bool:
+
+        if not self.__token:
+            return True
+        return hmac.compare_digest(authorization, f"Bearer {self.__token}")
+
+    def metrics(
+        self
+    ) -> dict:
+
+        with self.__counter_lock:
+            counters = dict(self.__counters)
+        counters["events_published"] = self.__event_hub.publishedCount()
+        counters["event_subscribers"] = self.__event_hub.subscriberCount()
+        try:
+            counters.update(self.__daemon.call(self.__daemon.metrics))
+        except (RuntimeError, TimeoutError):
+            counters["daemon_available"] = False
+        return counters
+
+    def handleRPC(
+        self,
+        body: bytes
+    ) -> Optional[Any]:
+        """
+            Handle a JSON-RPC 2.0 request body.
+
+            Returns:
+                Optional[Any]: The response, None when only notifications
+                    were sent.
+        """
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return self.__errorResponse(None, RPCError(RPCError.PARSE_ERROR, "parse error"))
+        if isinstance(request, list):
+            if not request:
+                return self.__errorResponse(None, RPCError(RPCError.INVALID_REQUEST, "empty batch"))
+            responses = [x for x in map(self.__handleCall, request) if x is not None]
+            return responses or None
+        return self.__handleCall(request)
+
+    def dispatch(
+        self,
+        method: str,
+        params: dict
+    ) -> Any:
+
+        with self.__counter_lock:
+            self.__counters["rpc_requests"] += 1
+        handler = self.__methods.get(method)
+        if handler is None:
+            raise RPCError(RPCError.METHOD_NOT_FOUND, f"method not found: {method}")
+        try:
+            return handler(params)
+        except RPCError:
+            raise
+        except (KeyError, ValueError, TypeError) as e:
+            # str() of a KeyError quotes its message
+            message = str(e.args[0]) if isinstance(e, KeyError) and e.args else str(e)
+            raise RPCError(RPCError.INVALID_PARAMS, message)
+        except TimeoutError:
+            raise RPCError(RPCError.SERVER_ERROR, "定时任务守护进程繁忙, 请稍后重试")
+        except Exception as e:
+            raise RPCError(RPCError.SERVER_ERROR, str(e))
+
+    def streamEvents(
+        self,
+        handler: BaseHTTPRequestHandler
+    ):
+
+        subscriber = self.__event_hub.subscribe()
+        with self.__counter_lock:
+            self.__counters["event_clients"] += 1
+        try:
+            handler.send_response(200)
+            handler.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            handler.send_header("Cache-Control", "no-cache")
+            handler.send_header("Connection", "close")
+            handler.end_headers()
+            handler.close_connection = True
+            while not self.__stopping.is_set():
+                try:
+                    events = [subscriber.get(timeout=self.KEEPALIVE_INTERVAL)]
+                except queue.Empty:
+                    handler.wfile.write(b": keepalive\n\n")
+                    handler.wfile.flush()
+                    continue
+                events.extend(subscriber.getBatch(200))
+                chunks = []
+                dropped = subscriber.takeDroppedCount()
+                if dropped:
+                    chunks.append(f"event: dropped\ndata: {dropped}\n\n")
+                for event in events:
+                    data = json.dumps(event.toDict(), ensure_ascii=False, default=str)
+                    chunks.append(f"data: {data}\n\n")
+                handler.wfile.write("".join(chunks).encode("utf-8"))
+                handler.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass
+        finally:
+            self.__event_hub.unsubscribe(subscriber)
+
+    def __handleCall(
+        self,
+        request: Any
+    ) -> Optional[dict]:
+
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0"\
+        or not isinstance(request.get("method"), str):
+            return self.__errorResponse(None, RPCError(RPCError.INVALID_REQUEST, "invalid request"))
+        request_id = request.get("id")
+        params = request.get("params", {})
+        try:
+            if not isinstance(params, dict):
+                raise RPCError(RPCError.INVALID_PARAMS, "params must be an object")
+            result = self.dispatch(request["method"], params)
+        except RPCError as e:
+            if "id" not in request:
+                return None
+            return self.__errorResponse(request_id, e)
+        if "id" not in request:
+            return None
+        return { "jsonrpc": "2.0", "id": request_id, "result": result }
+
+    def __errorResponse(
+        self,
+        request_id: Any,
+        error: RPCError
+    ) -> dict:
+
+        with self.__counter_lock:
+            self.__counters["rpc_errors"] += 1
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": { "code": error.code, "message": error.message }
+        }
+
+    @staticmethod
+    def __uuid(
+        params: dict
+    ) -> str:
+
+        task_uuid = params.get("uuid")
+        if not isinstance(task_uuid, str) or not task_uuid:
+            raise ValueError("缺少参数 uuid")
+        return task_uuid
+
+    @staticmethod
+    def __parseTime(
+        value: Any
+    ) -> datetime:
+
+        if not isinstance(value, str):
+            raise ValueError("execute_time 格式应为 YYYY-MM-DD HH:MM:SS")
+        return datetime.strptime(value, TimerTaskUtils.TIME_FORMAT)
+
+    @staticmethod
+    def __encodeTask(
+        timer_task: dict
+    ) -> dict:
+
+        return TimerTaskUtils.encodeTimerTasks([copy.deepcopy(timer_task)])[0]
+
+    def __listTasks(
+        self
+    ) -> list[dict]:
+
+        return TimerTaskUtils.encodeTimerTasks(copy.deepcopy(self.__daemon.timerTasks()))
+
+    def __getTask(
+        self,
+        task_uuid: str
+    ) -> dict:
+
+        return self.__encodeTask(self.__daemon.findTimerTask(task_uuid))
+
+    def __startRun(
+        self,
+        params: dict
+    ) -> dict:
+
+        config_paths = {}
+        if params.get("run_config"):
+            config_paths["run"] = str(params["run_config"])
+        if params.get("user_config"):
+            config_paths["user"] = str(params["user_config"])
+        self.__daemon.call(self.__daemon.startRun, config_paths)
+        return { "started": True }
+
+    def __stopDaemon(
+        self,
+        params: dict
+    ) -> dict:
+
+        self.__daemon.stop()
+        return { "stopping": True }
+
+    def __addTask(
+        self,
+        params: dict
+    ) -> dict:
+
+        name = params.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("缺少参数 name")
+        timer_task = TimerTaskUtils.createTimerTask(
+            name.strip(),
+            self.__parseTime(params.get("execute_time")),
+            bool(params.get("silent", True)),
+            bool(params.get("repeat", False)),
+            list(params.get("repeat_days") or []),
+            str(params.get("repeat_auto_script", "")),
+            int(params.get("priority", 0))
+        )
+        return self.__daemon.call(
+            lambda: self.__encodeTask(self.__daemon.addTimerTask(timer_task))
+        )
+
+    def __updateTask(
+        self,
+        params: dict
+    ) -> dict:
+
+        task_uuid = self.__uuid(params)
+        changes = {}
+        if "name" in params:
+            if not isinstance(params["name"], str) or not params["name"].strip():
+                raise ValueError("name 不能为空")
+            changes["name"] = params["name"].strip()
+        if "execute_time" in params:
+            changes["execute_time"] = self.__parseTime(params["execute_time"])
+        if "silent" in params:
+            changes["silent"] = bool(params["silent"])
+        if "priority" in params:
+            changes["priority"] = int(params["priority"])
+        if "repeat_auto_script" in params:
+            changes["repeat_auto_script"] = str(params["repeat_auto_script"])
+        repeat = params.get("repeat")
+        repeat_days = params.get("repeat_days")
+
+        def update(
+            timer_task: dict
+        ):
+
+            timer_task.update(changes)
+            if repeat is False:
+                timer_task["repeat"] = False
+            elif repeat or (timer_task.get("repeat", False) and (
+                repeat_days is not None or "execute_time" in changes
+            )):
+                TimerTaskUtils.setRepeat(
+                    timer_task,
+                    list(repeat_days) if repeat_days is not None else timer_task.get("repeat_days"),
+                    timer_task["execute_time"]
+                )
+
+        return self.__daemon.call(
+            lambda: self.__encodeTask(self.__daemon.updateTimerTask(task_uuid, update))
+        )
+
+    def __deleteTask(
+        self,
+        params: dict
+    ) -> dict:
+
+        task_uuid = self.__uuid(params)
+        return self.__daemon.call(
+            lambda: self.__encodeTask(self.__daemon.deleteTimerTask(task_uuid))
+        )
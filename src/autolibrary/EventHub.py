@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import threading
+
+from base.MsgEvent import MsgEvent
+from base.MsgQueue import MsgQueue
+
+
+class EventHub:
+    """
+        Fans MsgEvent objects out to any number of subscribers.
+
+        Every subscriber gets its own bounded MsgQueue, publishing never
+        blocks: a subscriber that does not keep up loses its oldest events,
+        the producer and the other subscribers are not slowed down.
+
+        Args:
+            queue_size (int): Events retained per subscriber.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1000
+    ):
+
+        self.__queue_size = queue_size
+        self.__lock = threading.Lock()
+        self.__subscribers: list[MsgQueue] = []
+        self.__published = 0
+
+    def subscribe(
+        self
+    ) -> MsgQueue:
+
+        subscriber = MsgQueue(self.__queue_size)
+        with self.__lock:
+            self.__subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(
+        self,
+        subscriber: MsgQueue
+    ):
+
+        with self.__lock:
+            if subscriber in self.__subscribers:
+                self.__subscribers.remove(subscriber)
+
+    def publish(
+        self,
+        events: list[MsgEvent]
+    ):
+
+        with self.__lock:
+            subscribers = list(self.__subscribers)
+            self.__published += len(events)
+        for subscriber in subscribers:
+            for event in events:
+                subscriber.put(event)
+
+    def subscriberCount(
+        self
+    ) -> int:
+
+        with self.__lock:
+            return len(self.__subscribers)
+
+    def publishedCount(
+        self
+    ) -> int:
+
+        with self.__lock:
+            return self.__published
@@ -0,0 +1,608 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import copy
+import time
+import queue
+import threading
+
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+import managers.config.ConfigManager as ConfigManager
+import managers.history.TimerTaskHistoryManager as TimerTaskHistoryManager
+
+from base.MsgBase import MsgBase
+from interfaces.ConfigProvider import CfgKey, ConfigProvider
+from runners.AutoLibRunner import AutoLibRunner
+from runners.TimerTaskRunner import TimerTaskRunner
+from utils.TaskAdmissionQueue import TaskAdmissionQueue
+from utils.TimerScheduler import TimerScheduler
+from utils.TimerTaskUtils import ALTimerTaskStatus, TimerTaskUtils
+
+
+class HeadlessTimerTaskRunner(TimerTaskRunner):
+    """
+        Timer task runner reporting each task result through a callback.
+    """
+
+    def __init__(
+        self,
+        timer_tasks: list[dict],
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+        config_paths: dict,
+        on_finished: Callable[[bool, dict], None]
+    ):
+
+        super().__init__(timer_tasks, input_queue, output_queue, config_paths)
+        self.__on_finished = on_finished
+
+    def _onTimerTaskFinished(
+        self,
+        is_error: bool,
+        timer_task: dict
+    ):
+
+        self.__on_finished(is_error, timer_task)
+
+
+class HeadlessDaemon(MsgBase):
+    """
+        Timer task daemon without Qt.
+
+        Executes the timer tasks of ``timer_task.json`` the same way the
+        timer task widget does: pending tasks wait in a TimerScheduler,
+        fired tasks go through a TaskAdmissionQueue and run on plain threads,
+        results and repeat rescheduling use TimerTaskUtils. All task state is
+        owned by the thread calling ``run``, runner threads only report back
+        through a queue and other threads (the control server) go through
+        ``call``.
+
+        Args:
+            input_queue (queue.Queue): The input queue for receiving messages.
+            output_queue (queue.Queue): The output queue for sending messages.
+            config_paths (dict): The ``run`` and ``user`` config paths.
+            max_browsers (Optional[int]): Overrides ``execution.max_browsers``.
+            max_cpu_load (Optional[float]): Overrides ``execution.max_cpu_load``.
+    """
+
+    # longest single wait, bounds how late a sleep/resume is noticed
+    MAX_WAIT = 10.0
+    # retry interval while tasks are held back by the CPU limit
+    ADMISSION_RETRY = 0.5
+    # queued timer tasks due within this window run in one browser session
+    TIMER_TASK_COALESCE_WINDOW = timedelta(seconds=60)
+    # longest wait of ``call`` for the loop thread
+    CALL_TIMEOUT = 5.0
+
+    def __init__(
+        self,
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+        config_paths: dict,
+        max_browsers: Optional[int] = None,
+        max_cpu_load: Optional[float] = None
+    ):
+
+        super().__init__(input_queue, output_queue)
+        self.__cfg_mgr: ConfigProvider = ConfigManager.instance()
+        self.__history_mgr = TimerTaskHistoryManager.instance()
+        self.__config_paths = config_paths
+        self.__timer_tasks: list[dict] = []
+        self.__scheduler = TimerScheduler()
+        self.__admission = TaskAdmissionQueue(
+            max_browsers or int(self.__cfg_mgr.get(CfgKey.GLOBAL.EXECUTION.MAX_BROWSERS, 2)),
+            max_cpu_load if max_cpu_load is not None
+            else float(self.__cfg_mgr.get(CfgKey.GLOBAL.EXECUTION.MAX_CPU_LOAD, 0.8))
+        )
+        self.__threads: dict[str, threading.Thread] = {}
+        self.__results: queue.Queue = queue.Queue()
+        self.__commands: queue.Queue = queue.Queue()
+        self.__tasks_changed = False
+        self.__run_runner: Optional[AutoLibRunner] = None
+        self.__run_thread: Optional[threading.Thread] = None
+        self.__wakeup = threading.Event()
+        self.__stop = threading.Event()
+        self.__started_time = time.time()
+        self.__counters = {
+            "sessions_started": 0,
+            "tasks_executed": 0,
+            "tasks_failed": 0,
+            "tasks_outdated": 0,
+            "runs_started": 0,
+            "runs_failed": 0,
+            "commands": 0,
+        }
+
+    def loadTimerTasks(
+        self
+    ) -> bool:
+
+        try:
+            timer_tasks = self.__cfg_mgr.get(CfgKey.TIMERTASK.ROOT)
+            if not timer_tasks or "timer_tasks" not in timer_tasks:
+                raise Exception("定时任务配置文件格式错误")
+            self.__timer_tasks = TimerTaskUtils.decodeTimerTasks(
+                copy.deepcopy(timer_tasks["timer_tasks"]),
+                self.__history_mgr
+            )
+        except Exception as e:
+            self._showTrace(f"加载定时任务配置发生错误 ! : {e}", self.TraceLevel.ERROR)
+            return False
+        self.__history_mgr.retain(x["uuid"] for x in self.__timer_tasks)
+        self.__scheduler.clear()
+        for timer_task in self.__timer_tasks:
+            self.scheduleTask(timer_task)
+        return True
+
+    def saveTimerTasks(
+        self
+    ):
+
+        timer_tasks = TimerTaskUtils.encodeTimerTasks(copy.deepcopy(self.__timer_tasks))
+        self.__cfg_mgr.set(CfgKey.TIMERTASK.ROOT, { "timer_tasks": timer_tasks })
+
+    def timerTasks(
+        self
+    ) -> list[dict]:
+
+        return self.__timer_tasks
+
+    def scheduleTask(
+        self,
+        timer_task: dict
+    ):
+
+        if timer_task["status"] is ALTimerTaskStatus.PENDING:
+            self.__scheduler.schedule(timer_task["uuid"], timer_task["execute_time"])
+        else:
+            self.__scheduler.cancel(timer_task["uuid"])
+
+    def wakeup(
+        self
+    ):
+
+        self.__wakeup.set()
+
+    def stop(
+        self
+    ):
+        """
+            Ask ``run`` to return, may be called from any thread or a signal
+            handler.
+        """
+
+        self.__stop.set()
+        self.__wakeup.set()
+
+    def isStopped(
+        self
+    ) -> bool:
+
+        return self.__stop.is_set()
+
+    def runningCount(
+        self
+    ) -> int:
+
+        running = len(set(self.__threads.values()))
+        if self.__run_thread:
+            running += 1
+        return running
+
+    def pendingCount(
+        self
+    ) -> int:
+
+        return len(self.__admission)
+
+    def run(
+        self,
+        join_timeout: float = 2.0
+    ) -> bool:
+        """
+            Run timer tasks until ``stop`` is called.
+
+            Args:
+                join_timeout (float): Seconds to wait for each running session
+                    when stopping.
+
+            Returns:
+                bool: False if the timer tasks could not be loaded or another
+                    instance runs them.
+        """
+
+        task_lock = TimerTaskUtils.taskLock(ConfigManager.instance().configDir())
+        if not task_lock.acquire():
+            self._showTrace(
+                f"定时任务已由另一个 AutoLibrary 实例执行 (图形界面或守护进程), "
+                f"无法启动守护进程: {task_lock.path()}",
+                self.TraceLevel.ERROR
+            )
+            return False
+        try:
+            return self.__run(join_timeout)
+        finally:
+            task_lock.release()
+
+    def __run(
+        self,
+        join_timeout: float
+    ) -> bool:
+
+        if not self.loadTimerTasks():
+            return False
+        self._showTrace(
+            f"定时任务守护进程已启动, 共 {len(self.__timer_tasks)} 个定时任务, "
+            f"等待中 {len(self.__scheduler)} 个"
+        )
+        while not self.__stop.is_set():
+            self.__wakeup.wait(self.nextWait())
+            self.__wakeup.clear()
+            changed = self.processCommands()
+            changed = self.processResults() or changed
+            changed = self.checkTasks() or changed
+            changed = self.admitTasks() or changed
+            if changed:
+                self.saveTimerTasks()
+        self.cancelCommands()
+        running = set(self.__threads.values())
+        if self.__run_thread:
+            self.__run_runner.requestStop()
+            running.add(self.__run_thread)
+        if running:
+            self._showTrace(f"正在等待 {len(running)} 个执行中的会话结束......")
+        for thread in running:
+            thread.join(join_timeout)
+        self.processResults()
+        self.saveTimerTasks()
+        self._showTrace("定时任务守护进程已停止")
+        return True
+
+    def nextWait(
+        self
+    ) -> float:
+
+        delay = self.__scheduler.secondsUntilNext()
+        wait = self.MAX_WAIT if delay is None else min(delay, self.MAX_WAIT)
+        if len(self.__admission):
+            wait = min(wait, self.ADMISSION_RETRY)
+        return wait
+
+    def checkTasks(
+        self
+    ) -> bool:
+
+        changed = False
+        if self.__scheduler.detectClockJump() < 0:
+            # the clock was set back, repeat tasks may now be a cycle late
+            for timer_task in self.__timer_tasks:
+                if TimerTaskUtils.rewindRepeatTask(timer_task):
+                    self.scheduleTask(timer_task)
+                    changed = True
+        now = datetime.now()
+        due_uuids = set(self.__scheduler.popDue(now))
+        if not due_uuids:
+            return changed
+        for timer_task in self.__timer_tasks:
+            if timer_task["uuid"] not in due_uuids\
+            or timer_task["status"] is not ALTimerTaskStatus.PENDING:
+                continue
+            if TimerTaskUtils.isOutdated(timer_task, now):
+                self._showTrace(f"定时任务 {timer_task['name']} 已过期", self.TraceLevel.WARNING)
+                self.__counters["tasks_outdated"] += 1
+                TimerTaskUtils.applyResult(ALTimerTaskStatus.OUTDATED, timer_task, self.__history_mgr)
+                self.scheduleTask(timer_task)
+            else:
+                timer_task["status"] = ALTimerTaskStatus.READY
+                self.__admission.push(timer_task)
+            changed = True
+        return changed
+
+    def admitTasks(
+        self
+    ) -> bool:
+
+        admitted = self.__admission.admit(
+            self.runningCount(),
+            self.TIMER_TASK_COALESCE_WINDOW
+        )
+        for timer_tasks in admitted:
+            self.startTimerTasks(timer_tasks)
+        return bool(admitted)
+
+    def startTimerTasks(
+        self,
+        timer_tasks: list[dict]
+    ):
+
+        for timer_task in timer_tasks:
+            timer_task["status"] = ALTimerTaskStatus.RUNNING
+        runner = HeadlessTimerTaskRunner(
+            timer_tasks,
+            self._input_queue,
+            self._output_queue,
+            self.__config_paths,
+            self.onTimerTaskFinished
+        )
+        thread = threading.Thread(
+            target=runner.run,
+            name=f"TimerTask-{timer_tasks[0]['uuid']}",
+            daemon=True
+        )
+        for timer_task in timer_tasks:
+            self.__threads[timer_task["uuid"]] = thread
+        thread.start()
+        self.__counters["sessions_started"] += 1
+        self._showLog(
+            f"定时任务 {', '.join(x['name'] for x in timer_tasks)} 开始执行, "
+            f"正在执行 {self.runningCount()} 个会话, 等待 {len(self.__admission)} 个任务"
+        )
+
+    def onTimerTaskFinished(
+        self,
+        is_error: bool,
+        timer_task: dict
+    ):
+
+        # called on a runner thread
+        self.__results.put((is_error, timer_task["uuid"]))
+        self.__wakeup.set()
+
+    def processResults(
+        self
+    ) -> bool:
+
+        changed = False
+        while True:
+            try:
+                is_error, task_uuid = self.__results.get_nowait()
+            except queue.Empty:
+                return changed
+            if task_uuid is None:
+                # the run started by ``startRun`` is over
+                self.__run_thread.join()
+                self.__run_thread = None
+                self.__run_runner = None
+                if is_error:
+                    self.__counters["runs_failed"] += 1
+                continue
+            self.__threads.pop(task_uuid, None)
+            self.__counters["tasks_failed" if is_error else "tasks_executed"] += 1
+            for timer_task in self.__timer_tasks:
+                if timer_task["uuid"] != task_uuid:
+                    continue
+                timer_task["executed"] = True
+                self._showTrace(
+                    f"定时任务 {timer_task['name']} 执行{'失败' if is_error else '完成'}, uuid: {task_uuid}"
+                )
+                TimerTaskUtils.applyResult(
+                    ALTimerTaskStatus.ERROR if is_error else ALTimerTaskStatus.EXECUTED,
+                    timer_task,
+                    self.__history_mgr
+                )
+                self.scheduleTask(timer_task)
+                changed = True
+                break
+
+    def call(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+            Run function on the thread of ``run`` and wait for its result.
+
+            This is how other threads read or change the timer tasks, the
+            loop runs queued calls each time it wakes up, between scheduling
+            steps, so it never waits for the caller.
+
+            Args:
+                function (Callable[..., Any]): Called with args on the loop thread.
+                timeout (Optional[float]): Seconds to wait, CALL_TIMEOUT by default.
+
+            Returns:
+                Any: The result of function, its exception is raised here.
+
+            Raises:
+                RuntimeError: The daemon is stopped.
+                TimeoutError: The loop did not run the call in time.
+        """
+
+        if self.__stop.is_set():
+            raise RuntimeError("定时任务守护进程已停止")
+        future = Future()
+        self.__commands.put((function, args, future))
+        self.__wakeup.set()
+        return future.result(self.CALL_TIMEOUT if timeout is None else timeout)
+
+    def processCommands(
+        self
+    ) -> bool:
+        """
+            Run the queued calls.
+
+            Returns:
+                bool: Whether a call changed the timer tasks, read-only and
+                    failed calls do not.
+        """
+
+        self.__tasks_changed = False
+        while True:
+            try:
+                function, args, future = self.__commands.get_nowait()
+            except queue.Empty:
+                return self.__tasks_changed
+            if not future.set_running_or_notify_cancel():
+                continue
+            self.__counters["commands"] += 1
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def cancelCommands(
+        self
+    ):
+
+        while True:
+            try:
+                _, _, future = self.__commands.get_nowait()
+            except queue.Empty:
+                return
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("定时任务守护进程已停止"))
+
+    def findTimerTask(
+        self,
+        task_uuid: str
+    ) -> dict:
+
+        for timer_task in self.__timer_tasks:
+            if timer_task["uuid"] == task_uuid:
+                return timer_task
+        raise KeyError(f"定时任务 {task_uuid} 不存在")
+
+    def addTimerTask(
+        self,
+        timer_task: dict
+    ) -> dict:
+
+        self.__timer_tasks.append(timer_task)
+        self.scheduleTask(timer_task)
+        self.__tasks_changed = True
+        self._showTrace(f"已添加定时任务 {timer_task['name']}, uuid: {timer_task['uuid']}")
+        return timer_task
+
+    def updateTimerTask(
+        self,
+        task_uuid: str,
+        update: Callable[[dict], None]
+    ) -> dict:
+        """
+            Change a timer task and make it pending again.
+
+            Args:
+                task_uuid (str): The task to change.
+                update (Callable[[dict], None]): Changes the task in place.
+        """
+
+        timer_task = self.findTimerTask(task_uuid)
+        if timer_task["status"] is ALTimerTaskStatus.RUNNING:
+            raise ValueError(f"定时任务 {timer_task['name']} 正在执行, 无法修改")
+        self.__admission.remove(task_uuid)
+        update(timer_task)
+        timer_task["status"] = ALTimerTaskStatus.PENDING
+        timer_task["executed"] = False
+        self.scheduleTask(timer_task)
+        self.__tasks_changed = True
+        self._showTrace(f"已修改定时任务 {timer_task['name']}, uuid: {task_uuid}")
+        return timer_task
+
+    def deleteTimerTask(
+        self,
+        task_uuid: str
+    ) -> dict:
+
+        timer_task = self.findTimerTask(task_uuid)
+        if timer_task["status"] is ALTimerTaskStatus.RUNNING:
+            raise ValueError(f"定时任务 {timer_task['name']} 正在执行, 无法删除")
+        self.__admission.remove(task_uuid)
+        self.__scheduler.cancel(task_uuid)
+        self.__timer_tasks.remove(timer_task)
+        self.__history_mgr.clear(task_uuid)
+        self.__tasks_changed = True
+        self._showTrace(f"已删除定时任务 {timer_task['name']}, uuid: {task_uuid}")
+        return timer_task
+
+    def startRun(
+        self,
+        config_paths: Optional[dict] = None
+    ):
+        """
+            Run the enabled task groups now, like the start button of the
+            main window. The run takes one browser slot until it is over.
+
+            Args:
+                config_paths (Optional[dict]): Overrides the ``run`` and
+                    ``user`` config paths of the daemon.
+        """
+
+        if self.__run_thread:
+            raise ValueError("已有任务正在运行")
+        runner = AutoLibRunner(
+            self._input_queue,
+            self._output_queue,
+            { **self.__config_paths, **(config_paths or {}) }
+        )
+        self.__run_runner = runner
+        self.__run_thread = threading.Thread(
+            target=self.__runAutoLib,
+            args=(runner,),
+            name="AutoLibRun",
+            daemon=True
+        )
+        self.__run_thread.start()
+        self.__counters["runs_started"] += 1
+
+    def stopRun(
+        self
+    ) -> bool:
+        """
+            Ask the run started by ``startRun`` to stop after its current
+            task group.
+
+            Returns:
+                bool: Whether a run was active.
+        """
+
+        if not self.__run_runner:
+            return False
+        self.__run_runner.requestStop()
+        self._showTrace("正在停止操作......", no_log=True)
+        return True
+
+    def __runAutoLib(
+        self,
+        runner: AutoLibRunner
+    ):
+
+        try:
+            runner.run()
+        finally:
+            self.__results.put((runner.hasError(), None))
+            self.__wakeup.set()
+
+    def status(
+        self
+    ) -> dict:
+
+        next_deadline = self.__scheduler.nextDeadline()
+        return {
+            "timer_tasks": len(self.__timer_tasks),
+            "scheduled": len(self.__scheduler),
+            "queued": len(self.__admission),
+            "running_sessions": self.runningCount(),
+            "run_active": self.__run_thread is not None,
+            "next_execute_time": next_deadline.strftime(TimerTaskUtils.TIME_FORMAT)
+                if next_deadline else None,
+        }
+
+    def metrics(
+        self
+    ) -> dict:
+
+        return {
+            "uptime": time.time() - self.__started_time,
+            **self.__counters,
+            **self.status(),
+        }
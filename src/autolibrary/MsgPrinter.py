@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import sys
+import queue
+import threading
+
+from typing import Optional, TextIO
+
+from base.MsgQueue import MsgQueue
+from autolibrary.EventHub import EventHub
+
+
+class MsgPrinter:
+    """
+        Streams the MsgEvent objects of a message queue to a text stream.
+
+        Args:
+            msg_queue (MsgQueue): The output queue shared by the MsgBase
+                components.
+            stream (TextIO): Where to write, stdout by default.
+            event_hub (Optional[EventHub]): Also receives every event, used by
+                the control server to stream events.
+    """
+
+    POLL_INTERVAL = 0.2 # seconds
+    BATCH_SIZE = 200
+
+    def __init__(
+        self,
+        msg_queue: MsgQueue,
+        stream: TextIO = sys.stdout,
+        event_hub: Optional[EventHub] = None
+    ):
+
+        self.__msg_queue = msg_queue
+        self.__stream = stream
+        self.__event_hub = event_hub
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, name="MsgPrinter", daemon=True)
+
+    def start(
+        self
+    ):
+
+        self.__thread.start()
+
+    def stop(
+        self
+    ):
+        """
+            Print the remaining messages and stop the printer thread.
+        """
+
+        self.__stop.set()
+        self.__thread.join()
+
+    def __print(
+        self,
+        events: list
+    ):
+
+        if self.__event_hub and events:
+            self.__event_hub.publish(events)
+        lines = [event.format() for event in events]
+        dropped = self.__msg_queue.takeDroppedCount()
+        if dropped:
+            lines.insert(0, f"...... 消息过多, 已省略 {dropped} 条消息 ......")
+        if lines:
+            self.__stream.write("\n".join(lines) + "\n")
+            self.__stream.flush()
+
+    def __run(
+        self
+    ):
+
+        while not self.__stop.is_set():
+            try:
+                events = [self.__msg_queue.get(timeout=self.POLL_INTERVAL)]
+            except queue.Empty:
+                continue
+            events.extend(self.__msg_queue.getBatch(self.BATCH_SIZE))
+            self.__print(events)
+        self.__print(self.__msg_queue.getBatch(self.__msg_queue.maxsize))
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Headless command line entry, does not import PySide6.
+
+    Run from the ``src`` directory:
+
+        python -m autolibrary run [--run-config PATH] [--user-config PATH]
+        python -m autolibrary daemon [--max-browsers N] [--max-cpu-load LOAD]
+                                     [--api-port PORT | --api-socket PATH]
+        python -m autolibrary tasks
+        python -m autolibrary users convert SOURCE TARGET
+        python -m autolibrary users import FILE USER_CONFIG [--group NAME]
+        python -m autolibrary users export USER_CONFIG FILE
+
+    ``--data-dir`` selects the data dir (configs, logs, history), the GUI
+    data dir is used by default. ``--api-port``/``--api-socket`` start the
+    local control API of the daemon, see ``ControlServer``. ``users convert``
+    copies a user config between a JSON file and a SQLite user store (``.db``,
+    ``.sqlite``, ``.sqlite3``), see ``UserStore``; ``users import``/``export``
+    move users in bulk from/to a CSV or JSON lines file, see ``UserTransfer``.
+"""
+import sys
+import copy
+import queue
+import signal
+import argparse
+
+from datetime import datetime
+from typing import Optional
+
+from base.MsgQueue import MsgQueue
+from boot.HeadlessInitializer import initializeHeadless, finalizeHeadless
+from interfaces.ConfigProvider import CfgKey
+from managers.config.ConfigManager import instance as configInstance
+from managers.config.ConfigUtils import ConfigUtils
+from managers.config.UserStore import loadUserConfig, saveUserConfig
+from managers.config.UserTransfer import DEFAULT_GROUP, exportUsers, importUsers
+from managers.history.TimerTaskHistoryManager import instance as historyInstance
+from runners.AutoLibRunner import AutoLibRunner
+from utils.TimerTaskUtils import TimerTaskUtils
+
+from autolibrary.ControlServer import ControlServer
+from autolibrary.EventHub import EventHub
+from autolibrary.HeadlessDaemon import HeadlessDaemon
+from autolibrary.MsgPrinter import MsgPrinter
+
+
+def _parseArgs(
+    argv: Optional[list[str]]
+) -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="autolibrary",
+        description="AutoLibrary 命令行 (无界面) 运行器"
+    )
+    parser.add_argument("--data-dir", default="", help="数据目录, 默认与图形界面相同")
+    parser.add_argument("--log-console", action="store_true", help="同时将日志输出到控制台")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="立即运行所有启用的任务组")
+    run_parser.add_argument("--run-config", default="", help="运行配置文件路径")
+    run_parser.add_argument("--user-config", default="", help="用户配置文件路径")
+
+    daemon_parser = commands.add_parser("daemon", help="按计划执行定时任务, 直到收到中断信号")
+    daemon_parser.add_argument("--run-config", default="", help="运行配置文件路径")
+    daemon_parser.add_argument("--user-config", default="", help="用户配置文件路径")
+    daemon_parser.add_argument("--max-browsers", type=int, default=None, help="同时运行的浏览器数量上限")
+    daemon_parser.add_argument("--max-cpu-load", type=float, default=None, help="允许启动新任务的单核平均负载上限")
+    daemon_parser.add_argument("--api-host", default="127.0.0.1", help="控制接口监听地址, 仅限本机地址")
+    daemon_parser.add_argument("--api-port", type=int, default=None, help="在该端口启动控制接口 (0 为自动选择)")
+    daemon_parser.add_argument("--api-socket", default="", help="在该 unix socket 上启动控制接口")
+    daemon_parser.add_argument("--api-token", default="", help="控制接口的访问令牌 (Bearer)")
+
+    commands.add_parser("tasks", help="列出定时任务")
+
+    users_parser = commands.add_parser("users", help="转换用户配置, 批量导入或导出用户")
+    users_commands = users_parser.add_subparsers(dest="users_command", required=True)
+    convert_parser = users_commands.add_parser("convert", help="在 JSON 用户配置与 SQLite 用户库之间转换")
+    convert_parser.add_argument("source", help="源用户配置 (.json 或 .db/.sqlite/.sqlite3)")
+    convert_parser.add_argument("target", help="目标用户配置, 已存在时将被覆盖")
+    import_parser = users_commands.add_parser("import", help="从 CSV/JSONL 文件批量导入用户, 按用户名合并")
+    import_parser.add_argument("file", help="导入文件 (.csv 或 .jsonl/.ndjson)")
+    import_parser.add_argument("user_config", help="目标用户配置 (.json 或 .db/.sqlite/.sqlite3), 不存在时创建")
+    import_parser.add_argument("--group", default=DEFAULT_GROUP, help="未指定分组的新用户加入的分组")
+    export_parser = users_commands.add_parser("export", help="将所有用户导出为 CSV/JSONL 文件")
+    export_parser.add_argument("user_config", help="源用户配置 (.json 或 .db/.sqlite/.sqlite3)")
+    export_parser.add_argument("file", help="导出文件 (.csv 或 .jsonl/.ndjson), 已存在时将被覆盖")
+    return parser.parse_args(argv)
+
+def _configPaths(
+    args: argparse.Namespace
+) -> dict:
+
+    config_paths = ConfigUtils.getAutomationConfigPaths()
+    if args.run_config:
+        config_paths["run"] = args.run_config
+    if args.user_config:
+        config_paths["user"] = args.user_config
+    return config_paths
+
+def _runCommand(
+    args: argparse.Namespace,
+    output_queue: MsgQueue
+) -> int:
+
+    runner = AutoLibRunner(queue.Queue(), output_queue, _configPaths(args))
+    runner.run()
+    return 1 if runner.hasError() else 0
+
+def _daemonCommand(
+    args: argparse.Namespace,
+    output_queue: MsgQueue,
+    event_hub: EventHub
+) -> int:
+
+    daemon = HeadlessDaemon(
+        queue.Queue(),
+        output_queue,
+        _configPaths(args),
+        args.max_browsers,
+        args.max_cpu_load
+    )
+    signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    server = None
+    if args.api_port is not None or args.api_socket:
+        try:
+            server = ControlServer(
+                daemon,
+                event_hub,
+                args.api_host,
+                args.api_port or 0,
+                args.api_socket,
+                args.api_token
+            )
+        except (OSError, ValueError) as e:
+            print(f"控制接口启动失败: {e}", file=sys.stderr)
+            return 1
+        server.start()
+        print(f"控制接口: {server.address()}", flush=True)
+    try:
+        return 0 if daemon.run() else 1
+    finally:
+        if server:
+            server.stop()
+
+def _tasksCommand(
+    args: argparse.Namespace
+) -> int:
+
+    timer_tasks = copy.deepcopy(configInstance().get(CfgKey.TIMERTASK.TIMER_TASKS, []))
+    timer_tasks = TimerTaskUtils.decodeTimerTasks(timer_tasks, historyInstance())
+    if not timer_tasks:
+        print("没有定时任务")
+        return 0
+    for timer_task in sorted(timer_tasks, key=lambda x: x["execute_time"]):
+        print(
+            f"{timer_task['uuid']}  {timer_task['status'].value:<4}  "
+            f"{datetime.strftime(timer_task['execute_time'], TimerTaskUtils.TIME_FORMAT)}  "
+            f"{'重复' if timer_task.get('repeat', False) else '单次'}  {timer_task['name']}"
+        )
+    return 0
+
+def _usersCommand(
+    args: argparse.Namespace
+) -> int:
+
+    match args.users_command:
+        case "convert":
+            try:
+                user_config = loadUserConfig(args.source)
+                saveUserConfig(args.target, user_config)
+            except Exception as e:
+                print(f"用户配置转换失败: {e}", file=sys.stderr)
+                return 1
+            print(
+                f"已转换 {len(user_config.groups)} 个任务组, "
+                f"{sum(len(group.users) for group in user_config.groups)} 个用户: {args.target}"
+            )
+            return 0
+        case "import":
+            try:
+                report = importUsers(args.file, args.user_config, args.group)
+            except Exception as e:
+                print(f"用户导入失败: {e}", file=sys.stderr)
+                return 1
+            print(report.summary())
+            return 1 if report.errors else 0
+        case "export":
+            try:
+                count = exportUsers(args.user_config, args.file)
+            except Exception as e:
+                print(f"用户导出失败: {e}", file=sys.stderr)
+                return 1
+            print(f"已导出 {count} 个用户: {args.file}")
+            return 0
+    return 1
+
+def main(
+    argv: Optional[list[str]] = None
+) -> int:
+
+    args = _parseArgs(argv)
+    if not initializeHeadless(args.data_dir, args.log_console):
+        print("初始化失败, 请检查数据目录", file=sys.stderr)
+        return 1
+    output_queue = MsgQueue()
+    event_hub = EventHub()
+    printer = MsgPrinter(output_queue, event_hub=event_hub)
+    printer.start()
+    try:
+        match args.command:
+            case "run":
+                return _runCommand(args, output_queue)
+            case "daemon":
+                return _daemonCommand(args, output_queue, event_hub)
+            case "tasks":
+                return _tasksCommand(args)
+            case "users":
+                return _usersCommand(args)
+        return 1
+    finally:
+        printer.stop()
+        finalizeHeadless()
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
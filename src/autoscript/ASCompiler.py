@@ -0,0 +1,517 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Compiles ASIR programs to Python closures.
+
+    The closures follow the Lua semantics of the same script: Lua truthiness,
+    ``==`` never equal across types, integer/float arithmetic, and the date
+    helpers built on ``mktime`` / ``localtime`` like ``os.time`` / ``os.date``.
+    Whenever a value would make Lua coerce or raise (ordering mixed types,
+    arithmetic on strings, reading a global that is not a target variable,
+    ...) the closure raises NativeFallback and the caller runs that target
+    data through Lua instead, so results and error messages stay identical.
+"""
+import re
+import time
+
+from functools import lru_cache
+from typing import Callable, Optional
+
+from autoscript.ASIR import (
+    Literal, Var, Call, BinOp, Compare, Logic,
+    Assign, Pass, If, Program, HELPER_ARITY,
+)
+
+
+__all__ = ["NativeFallback", "NativeScript", "compileProgram"]
+
+_INT_MIN, _INT_MAX = -2**63, 2**63 - 1
+# exact types, bool is not a number in Lua
+_NUMBER_TYPES = (int, float)
+_DATE_RE = re.compile(r"(\d+)-(\d+)-(\d+)")
+_TIME_RE = re.compile(r"(\d+):(\d+)")
+
+
+class NativeFallback(Exception):
+    """
+        The native closure can not reproduce Lua for these values.
+    """
+
+
+class _NotCompilable(Exception):
+    pass
+
+
+def _toInteger(
+    value,
+) -> int:
+
+    # Lua accepts floats with an exact integer representation
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise NativeFallback
+        return int(value)
+    if type(value) not in _NUMBER_TYPES:
+        raise NativeFallback
+    return value
+
+def _checkInt(
+    value,
+):
+
+    if type(value) is int and not _INT_MIN <= value <= _INT_MAX:
+        raise NativeFallback
+    return value
+
+def _add(
+    a,
+    b,
+):
+
+    if type(a) not in _NUMBER_TYPES or type(b) not in _NUMBER_TYPES:
+        raise NativeFallback
+    return _checkInt(a + b)
+
+def _sub(
+    a,
+    b,
+):
+
+    if type(a) not in _NUMBER_TYPES or type(b) not in _NUMBER_TYPES:
+        raise NativeFallback
+    return _checkInt(a - b)
+
+def _mul(
+    a,
+    b,
+):
+
+    if type(a) not in _NUMBER_TYPES or type(b) not in _NUMBER_TYPES:
+        raise NativeFallback
+    return _checkInt(a * b)
+
+def _eq(
+    a,
+    b,
+) -> bool:
+
+    if type(a) in _NUMBER_TYPES and type(b) in _NUMBER_TYPES:
+        return a == b
+    return type(a) is type(b) and a == b
+
+def _eqNumber(
+    a,
+    n,
+) -> bool:
+
+    return type(a) in _NUMBER_TYPES and a == n
+
+def _ordered(
+    a,
+    b,
+) -> None:
+
+    if not ((type(a) in _NUMBER_TYPES and type(b) in _NUMBER_TYPES) or (type(a) is str and type(b) is str)):
+        raise NativeFallback
+
+def _lt(
+    a,
+    b,
+) -> bool:
+
+    _ordered(a, b)
+    return a < b
+
+def _le(
+    a,
+    b,
+) -> bool:
+
+    _ordered(a, b)
+    return a <= b
+
+def _truthy(
+    value,
+) -> bool:
+
+    return value is not None and value is not False
+
+def _osTime(
+    year,
+    month,
+    day,
+) -> int:
+
+    # os.time with a table without hour uses 12:00:00, isdst unknown
+    return _mkTime(_toInteger(year), _toInteger(month), _toInteger(day))
+
+@lru_cache(maxsize=4096)
+def _mkTime(
+    year: int,
+    month: int,
+    day: int,
+) -> int:
+
+    try:
+        return int(time.mktime((year, month, day, 12, 0, 0, 0, 0, -1)))
+    except (OverflowError, ValueError):
+        raise NativeFallback
+
+def _date(
+    y,
+    m,
+    d,
+) -> int:
+
+    return _osTime(y, m, d)
+
+def _time(
+    h,
+    m,
+):
+
+    return _add(_mul(h, 60), m)
+
+def _datenow(
+) -> int:
+
+    now = time.localtime()
+    return _osTime(now.tm_year, now.tm_mon, now.tm_mday)
+
+def _timenow(
+) -> int:
+
+    now = time.localtime()
+    return now.tm_hour*60 + now.tm_min
+
+def _dateadd(
+    dateVal,
+    n,
+):
+
+    return _add(dateVal, _mul(n, 86400))
+
+def _timeadd(
+    timeVal,
+    n,
+):
+
+    value = _add(timeVal, _mul(n, 60))
+    return value % 1440
+
+@lru_cache(maxsize=4096)
+def _strToDate(
+    isoStr: str,
+) -> int:
+
+    m = _DATE_RE.search(isoStr)
+    if not m:
+        raise NativeFallback
+    return _mkTime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+@lru_cache(maxsize=4096)
+def _strToTime(
+    hmStr: str,
+) -> int:
+
+    m = _TIME_RE.search(hmStr)
+    if not m:
+        raise NativeFallback
+    return int(m.group(1))*60 + int(m.group(2))
+
+def _dateToStr(
+    ts,
+) -> str:
+
+    return _strfDate(_toInteger(ts))
+
+@lru_cache(maxsize=4096)
+def _strfDate(
+    ts: int,
+) -> str:
+
+    try:
+        return time.strftime("%Y-%m-%d", time.localtime(ts))
+    except (OverflowError, OSError, ValueError):
+        raise NativeFallback
+
+def _timeToStr(
+    m,
+) -> str:
+
+    return _strfTime(_toInteger(m))
+
+@lru_cache(maxsize=4096)
+def _strfTime(
+    m: int,
+) -> str:
+
+    return f"{m//60:02d}:{m%60:02d}"
+
+
+_HELPERS = {
+    "date": _date,
+    "time": _time,
+    "datenow": _datenow,
+    "timenow": _timenow,
+    "dateadd": _dateadd,
+    "timeadd": _timeadd,
+}
+# helpers without side effects, folded when all arguments are constants
+_PURE_HELPERS = ("date", "time", "dateadd", "timeadd")
+_ORDER_OPS = {
+    "<": ("_lt", False),
+    ">": ("_lt", True),
+    "<=": ("_le", False),
+    ">=": ("_le", True),
+}
+_ARITH = {
+    "+": _add,
+    "-": _sub,
+}
+_NATIVE_TYPES = (str, int, float, bool)
+_UNKNOWN = object()
+
+
+class _CodeGen:
+    """
+        Generates the source of one Python function from a program.
+
+        Expressions are emitted as (code, constant) pairs, constant being
+        _UNKNOWN unless the value is known at compile time.
+    """
+
+    def __init__(
+        self,
+    ):
+
+        self.namespace = {
+            "NativeFallback": NativeFallback,
+            "_eqNumber": _eqNumber,
+            "_add": _add,
+            "_sub": _sub,
+            "_eq": _eq,
+            "_lt": _lt,
+            "_le": _le,
+            "_truthy": _truthy,
+        }
+        for name, helper in _HELPERS.items():
+            self.namespace[f"_{name}"] = helper
+        self.lines: list[str] = []
+
+    def _const(
+        self,
+        value,
+    ) -> tuple[str, object]:
+
+        if type(value) in (int, str, bool):
+            return repr(value), value
+        name = f"_k{len(self.namespace)}"
+        self.namespace[name] = value
+        return name, value
+
+    def expr(
+        self,
+        node,
+    ) -> tuple[str, object]:
+
+        if isinstance(node, Literal):
+            return self._const(node.value)
+        if isinstance(node, Var):
+            return f"env[{node.name!r}]", _UNKNOWN
+        if isinstance(node, Call):
+            if node.func not in _HELPERS or len(node.args) != HELPER_ARITY[node.func]:
+                raise _NotCompilable(node.func)
+            args = [self.expr(arg) for arg in node.args]
+            if node.func in _PURE_HELPERS and all(v is not _UNKNOWN for _, v in args):
+                try:
+                    return self._const(_HELPERS[node.func](*(v for _, v in args)))
+                except NativeFallback:
+                    pass
+            if node.func in ("dateadd", "timeadd") and args[1][1] is not _UNKNOWN:
+                # fold the offset, keep the argument checks of the helper
+                scale = 86400 if node.func == "dateadd" else 60
+                try:
+                    offset, _ = self._const(_mul(args[1][1], scale))
+                except NativeFallback:
+                    return f"_{node.func}({args[0][0]}, {args[1][0]})", _UNKNOWN
+                if node.func == "dateadd":
+                    return f"_add({args[0][0]}, {offset})", _UNKNOWN
+                return f"(_add({args[0][0]}, {offset}) % 1440)", _UNKNOWN
+            return f"_{node.func}({', '.join(code for code, _ in args)})", _UNKNOWN
+        if isinstance(node, BinOp):
+            if node.op not in _ARITH:
+                raise _NotCompilable(node.op)
+            left, right = self.expr(node.left), self.expr(node.right)
+            if left[1] is not _UNKNOWN and right[1] is not _UNKNOWN:
+                try:
+                    return self._const(_ARITH[node.op](left[1], right[1]))
+                except NativeFallback:
+                    pass
+            func = "_add" if node.op == "+" else "_sub"
+            return f"{func}({left[0]}, {right[0]})", _UNKNOWN
+        raise _NotCompilable(type(node).__name__)
+
+    def cond(
+        self,
+        node,
+    ) -> str:
+        """
+            Python code of a condition, evaluating to a bool.
+        """
+
+        if isinstance(node, Logic):
+            if len(node.terms) != len(node.ops) + 1:
+                raise _NotCompilable("logic")
+            # Python and Lua share the precedence of and / or
+            parts = [f"({self.cond(node.terms[0])})"]
+            for op, term in zip(node.ops, node.terms[1:]):
+                if op not in ("and", "or"):
+                    raise _NotCompilable(op)
+                parts.append(f" {op} ({self.cond(term)})")
+            return "".join(parts)
+        if isinstance(node, Compare):
+            return self._compare(node)
+        code, value = self.expr(node)
+        if value is not _UNKNOWN:
+            return repr(value is not False)
+        return f"_truthy({code})"
+
+    def _compare(
+        self,
+        node: Compare,
+    ) -> str:
+
+        (left, leftValue), (right, rightValue) = self.expr(node.left), self.expr(node.right)
+        if node.op in ("==", "~="):
+            negate = "not " if node.op == "~=" else ""
+            for code, value, other in ((left, leftValue, right), (right, rightValue, left)):
+                if value is _UNKNOWN:
+                    continue
+                if type(value) is bool:
+                    return f"{other} is {'not ' if negate else ''}{value!r}"
+                if type(value) is str:
+                    return f"{other} {'!=' if negate else '=='} {code}"
+                if type(value) in _NUMBER_TYPES:
+                    return f"{negate}_eqNumber({other}, {code})"
+            return f"{negate}_eq({left}, {right})"
+        if node.op not in _ORDER_OPS:
+            raise _NotCompilable(node.op)
+        func, swap = _ORDER_OPS[node.op]
+        if swap:
+            left, right = right, left
+        return f"{func}({left}, {right})"
+
+    def block(
+        self,
+        statements: tuple,
+        indent: str,
+    ) -> None:
+
+        if not statements:
+            self.lines.append(f"{indent}pass")
+        for stmt in statements:
+            self.statement(stmt, indent)
+
+    def statement(
+        self,
+        stmt,
+        indent: str,
+    ) -> None:
+
+        if isinstance(stmt, Assign):
+            if stmt.target in HELPER_ARITY:
+                # would shadow the helper for the rest of the script
+                raise _NotCompilable(stmt.target)
+            code, _ = self.expr(stmt.value)
+            self.lines.append(f"{indent}env[{stmt.target!r}] = {code}")
+        elif isinstance(stmt, If):
+            for index, (cond, body) in enumerate(stmt.branches):
+                keyword = "if" if index == 0 else "elif"
+                self.lines.append(f"{indent}{keyword} {self.cond(cond)}:")
+                self.block(body, indent + "    ")
+            if stmt.orelse is not None:
+                self.lines.append(f"{indent}else:")
+                self.block(stmt.orelse, indent + "    ")
+        elif isinstance(stmt, Pass):
+            self.lines.append(f"{indent}pass")
+        else:
+            raise _NotCompilable(type(stmt).__name__)
+
+    def function(
+        self,
+        program: Program,
+    ) -> Callable[[dict], None]:
+
+        self.lines = ["def _script(env):", "    try:"]
+        self.block(program.statements, "        ")
+        # a variable that is not in env is a sandbox global (or nil) in Lua
+        self.lines += ["    except KeyError:", "        raise NativeFallback from None"]
+        exec(compile("\n".join(self.lines), "<autoscript>", "exec"), self.namespace)
+        return self.namespace["_script"]
+
+
+class NativeScript:
+    """
+        A compiled program, runs one target data's variables at a time.
+
+        Args:
+            body (Callable[[dict], None]): The compiled program.
+    """
+
+    def __init__(
+        self,
+        body: Callable[[dict], None],
+    ):
+
+        self._body = body
+
+    def run(
+        self,
+        values: dict,
+        dateVars: list[str],
+        timeVars: list[str],
+    ) -> dict:
+        """
+            Run on collected values (dates and times as strings) and return
+            the resulting variables, converted back like the Lua runner does.
+
+            Raises:
+                NativeFallback: These values have to run through Lua.
+        """
+
+        for value in values.values():
+            if not isinstance(value, _NATIVE_TYPES):
+                raise NativeFallback
+        env = dict(values)
+        for name in dateVars:
+            env[name] = _strToDate(env[name])
+        for name in timeVars:
+            env[name] = _strToTime(env[name])
+        self._body(env)
+        for name in dateVars:
+            env[name] = _dateToStr(env[name])
+        for name in timeVars:
+            env[name] = _timeToStr(env[name])
+        return env
+
+
+def compileProgram(
+    program: Program,
+) -> Optional[NativeScript]:
+    """
+        Compile a program, None if it uses a node the compiler does not
+        handle (e.g. Raw text).
+    """
+
+    try:
+        return NativeScript(_CodeGen().function(program))
+    except (_NotCompilable, RecursionError, SyntaxError):
+        return None
@@ -14,6 +14,8 @@ from datetime import (
 
 from lupa import LuaRuntime as _LuaRuntime
 
+from autoscript.ASCompiler import NativeFallback, NativeScript, compileProgram
+from autoscript.ASIR import parseScript
 from autoscript._helpers import (
     _TYPE_DEFAULT_VAR,
     _assignPath,
@@ -25,19 +27,151 @@ from autoscript._helpers import (
 )
 
 try:
-    from lupa.lua55 import LuaError as _LuaError, LuaSyntaxError as _LuaSyntaxError
+    from lupa.lua55 import LuaError as _LuaError, LuaMemoryError as _LuaMemoryError
 except ImportError:
     try:
-        from lupa.lua54 import LuaError as _LuaError, LuaSyntaxError as _LuaSyntaxError
+        from lupa.lua54 import LuaError as _LuaError, LuaMemoryError as _LuaMemoryError
     except ImportError:
         _LuaError = Exception
-        _LuaSyntaxError = Exception
+        _LuaMemoryError = MemoryError
 
 
 __all__ = ["ASEngine"]
 
 
 class ASEngine:
+    """
+        AutoScript engine, runs a Lua script on the target variables of
+        one or many target data dicts (or objects with the key paths as
+        attributes, like the user config model).
+
+        One sandboxed Lua runtime is kept per engine and every script text
+        is compiled once. Each target data dict runs in its own environment
+        table (target variables plus the globals it assigns), falling back
+        to the shared sandbox globals for reads, so users of a batch do not
+        see each other's variables.
+
+        Each user may execute at most ``instructionLimit`` Lua instructions
+        (counted by a debug hook every ``HOOK_STEP`` instructions, coroutines
+        included) and a batch may allocate at most ``memoryLimit`` bytes on
+        top of what the runtime already holds. A user over a limit fails
+        with its own error, 0 disables a limit.
+
+        Scripts in the orchestration subset (see ASIR) are compiled to Python
+        closures instead and only the target data those can not reproduce
+        exactly go through Lua, so block-built scripts usually never start
+        the Lua runtime.
+
+        Args:
+            targetVars (list[tuple]): (name, type, keyPath, ...) of the target
+                variables.
+            instructionLimit (int): Instructions per user.
+            memoryLimit (int): Bytes per batch.
+            nativeCompile (bool): Compile scripts of the orchestration subset
+                to Python closures.
+    """
+
+    DEFAULT_INSTRUCTION_LIMIT = 10_000_000
+    DEFAULT_MEMORY_LIMIT = 64*1024*1024
+    HOOK_STEP = 1000
+
+    # compiled scripts kept per engine
+    MAX_COMPILED_SCRIPTS = 32
+
+    _INSTRUCTION_LIMIT_ERROR = "__autoscript_instruction_limit__"
+    _MEMORY_ERROR = "not enough memory"
+
+    # Defined before the sandbox removes ``load`` and ``debug``, only the
+    # returned functions keep a reference to them.
+    _RUNNER = """
+        local load, pcall, ipairs, setmetatable = load, pcall, ipairs, setmetatable
+        local error, select, tunpack = error, select, table.unpack
+        local sethook, gethook, getinfo = debug.sethook, debug.gethook, debug.getinfo
+        local cocreate, coresume = coroutine.create, coroutine.resume
+        local base = _G
+        local LIMIT_ERROR = "__autoscript_instruction_limit__"
+        local used, limit, step = 0, 0, 0
+        local runBatch
+
+        local function hook()
+            if used > limit then
+                -- over the limit: fail on every instruction, so a pcall in
+                -- the script can not swallow it, until back in runBatch
+                if getinfo(2, "f").func == runBatch then
+                    sethook(hook, "", step)
+                    return
+                end
+                error(LIMIT_ERROR, 0)
+            end
+            used = used + step
+            if used > limit then
+                sethook(hook, "", 1)
+                error(LIMIT_ERROR, 0)
+            end
+        end
+
+        -- coroutines have their own hooks, new ones share the counter
+        coroutine.create = function(fn)
+            local co = cocreate(fn)
+            if gethook() then
+                sethook(co, hook, "", step)
+            end
+            return co
+        end
+        coroutine.wrap = function(fn)
+            local co = coroutine.create(fn)
+            return function(...)
+                local result = table.pack(coresume(co, ...))
+                if not result[1] then
+                    error(result[2], 0)
+                end
+                return tunpack(result, 2, result.n)
+            end
+        end
+
+        local function compile(src)
+            -- the script runs with the table passed in as its globals,
+            -- kept on the first line so error line numbers do not move
+            local fn, err = load("local _ENV = ...; " .. src, "<python>", "t")
+            return fn or false, err or ""
+        end
+
+        local function runOne(fn, vars, dateVars, timeVars)
+            used = 0
+            if limit > 0 then
+                sethook(hook, "", step)
+            end
+            for _, name in ipairs(dateVars) do
+                vars[name] = base.strtodate(vars[name])
+            end
+            for _, name in ipairs(timeVars) do
+                vars[name] = base.strtotime(vars[name])
+            end
+            fn(setmetatable(vars, {__index = base}))
+            for _, name in ipairs(dateVars) do
+                vars[name] = base.datetostr(vars[name])
+            end
+            for _, name in ipairs(timeVars) do
+                vars[name] = base.timetostr(vars[name])
+            end
+        end
+
+        runBatch = function(fn, batch, dateVars, timeVars, instructionLimit, hookStep)
+            limit = instructionLimit
+            step = hookStep < instructionLimit and hookStep or instructionLimit
+            local errors = {}
+            for i = 1, #batch do
+                local ok, err = pcall(runOne, fn, batch[i], dateVars, timeVars)
+                sethook()
+                if not ok then
+                    errors[i] = tostring(err)
+                end
+            end
+            return errors
+        end
+
+        return compile, runBatch
+    """
 
     @staticmethod
     def getCurrentDate(
@@ -134,10 +268,20 @@ class ASEngine:
     def __init__(
         self,
         targetVars: list[tuple] = None,
+        instructionLimit: int = DEFAULT_INSTRUCTION_LIMIT,
+        memoryLimit: int = DEFAULT_MEMORY_LIMIT,
+        nativeCompile: bool = True,
     ):
 
         self._targetVars: dict[str, dict] = {}
+        self._instructionLimit = max(0, int(instructionLimit))
+        self._memoryLimit = max(0, int(memoryLimit))
+        self._nativeCompile = nativeCompile
         self._lua = None
+        self._compile = None
+        self._runBatch = None
+        self._compiled: dict[str, object] = {}
+        self._native: dict[str, NativeScript | None] = {}
 
         if targetVars:
             for item in targetVars:
@@ -149,21 +293,52 @@ class ASEngine:
     ):
 
         if self._lua is None:
-            self._lua = _LuaRuntime(unpack_returned_tuples=True)
+            # max_memory=0 only enables tracking, limits are set per batch
+            self._lua = _LuaRuntime(unpack_returned_tuples=True, max_memory=0)
+            self._compile, self._runBatch = self._lua.execute(self._RUNNER)
             self._sandbox(self._lua)
             self._registerHelpers(self._lua)
         return self._lua
 
-    def _push(
+    def _compileScript(
         self,
-        targetData: dict,
-    ) -> None:
+        scriptText: str,
+    ):
 
-        lua = self._getLua()
-        g = lua.globals()
-        strToDate = g["strtodate"]
-        strToTime = g["strtotime"]
+        fn = self._compiled.get(scriptText)
+        if fn is not None:
+            return fn
+        self._getLua()
+        fn, err = self._compile(scriptText)
+        if not fn:
+            raise ValueError(f"AutoScript 语法错误: {_cleanLuaError(err)}")
+        if len(self._compiled) >= self.MAX_COMPILED_SCRIPTS:
+            self._compiled.clear()
+        self._compiled[scriptText] = fn
+        return fn
+
+    def _nativeScript(
+        self,
+        scriptText: str,
+    ) -> NativeScript | None:
+
+        if not self._nativeCompile:
+            return None
+        if scriptText in self._native:
+            return self._native[scriptText]
+        program = parseScript(scriptText)
+        native = compileProgram(program) if program is not None else None
+        if len(self._native) >= self.MAX_COMPILED_SCRIPTS:
+            self._native.clear()
+        self._native[scriptText] = native
+        return native
+
+    def _collect(
+        self,
+        targetData: dict,
+    ) -> dict:
 
+        values = {}
         for varName, info in self._targetVars.items():
             keyPath = info["keyPath"]
             vt = info["type"]
@@ -176,7 +351,6 @@ class ASEngine:
                     )
                 raw = raw.strip()
                 _checkDateFormat(raw, varName)
-                g[varName] = strToDate(raw)
             elif vt == "Time":
                 if not isinstance(raw, str) or not raw.strip():
                     raise ValueError(
@@ -185,36 +359,28 @@ class ASEngine:
                     )
                 raw = raw.strip()
                 _checkTimeFormat(raw, varName)
-                g[varName] = strToTime(raw)
-            else:
-                if raw is None:
-                    raw = _TYPE_DEFAULT_VAR.get(vt, False)
-                g[varName] = raw
+            elif raw is None:
+                raw = _TYPE_DEFAULT_VAR.get(vt, False)
+            values[varName] = raw
+        return values
 
-    def _pull(
+    def _apply(
         self,
         targetData: dict,
+        luaVars,
     ) -> None:
 
-        lua = self._getLua()
-        g = lua.globals()
-        dateToStr = g["datetostr"]
-        timeToStr = g["timetostr"]
-
+        values = {}
         for varName, info in self._targetVars.items():
-            try:
-                luaVal = g[varName]
-            except KeyError:
-                continue
+            luaVal = luaVars[varName]
             vt = info["type"]
-            if vt == "Date":
-                luaVal = dateToStr(luaVal)
-            elif vt == "Time":
-                luaVal = timeToStr(luaVal)
-            elif vt == "Float" and isinstance(luaVal, int) and not isinstance(luaVal, bool):
+            if vt == "Float" and isinstance(luaVal, int) and not isinstance(luaVal, bool):
                 luaVal = float(luaVal)
             _checkType(varName, vt, luaVal)
-            _assignPath(targetData, info["keyPath"], luaVal)
+            values[varName] = luaVal
+        # only a user passing all checks is changed
+        for varName, luaVal in values.items():
+            _assignPath(targetData, self._targetVars[varName]["keyPath"], luaVal)
 
     def addTargetVar(
         self,
@@ -229,6 +395,29 @@ class ASEngine:
             "keyPath": keyPath,
         }
 
+    def _memoryLimitMessage(
+        self,
+    ) -> str:
+
+        return (
+            f"AutoScript 内存超出限制: 脚本分配的内存超过 "
+            f"{self._memoryLimit/(1024*1024):g} MB, 已中止执行"
+        )
+
+    def _runtimeErrorMessage(
+        self,
+        luaError: str,
+    ) -> str:
+
+        if luaError == self._INSTRUCTION_LIMIT_ERROR:
+            return (
+                f"AutoScript 执行超出指令数限制: 脚本执行超过 {self._instructionLimit} 条指令, "
+                f"已中止执行, 请检查是否存在死循环"
+            )
+        if luaError == self._MEMORY_ERROR:
+            return self._memoryLimitMessage()
+        return f"AutoScript 运行时错误: {_cleanLuaError(luaError)}"
+
     def execute(
         self,
         scriptText: str,
@@ -237,22 +426,104 @@ class ASEngine:
 
         if not scriptText or not scriptText.strip():
             return
+        error = self.executeBatch(scriptText, [targetData])[0]
+        if error:
+            raise ValueError(error)
+
+    def executeBatch(
+        self,
+        scriptText: str,
+        targetDataList: list,
+    ) -> list[str | None]:
+        """
+            Run the script once for every target data dict, natively when the
+            script compiles to a closure, the rest in one Lua call.
+
+            Errors are isolated per target data: a failing dict is left
+            unchanged and the others are still updated.
+
+            Args:
+                scriptText (str): AutoScript source.
+                targetDataList (list): Target data dicts or objects, updated in place.
+
+            Returns:
+                list[str | None]: Error message per dict, None on success.
+
+            Raises:
+                ValueError: The script has a syntax error.
+        """
+
+        errors: list[str | None] = [None]*len(targetDataList)
+        if not scriptText or not scriptText.strip() or not targetDataList:
+            return errors
+        native = self._nativeScript(scriptText)
+        # syntax errors are raised before any data is touched
+        fn = self._compileScript(scriptText) if native is None else None
+        dateVars = [n for n, info in self._targetVars.items() if info["type"] == "Date"]
+        timeVars = [n for n, info in self._targetVars.items() if info["type"] == "Time"]
+        indexes, batch = [], []
+        for index, targetData in enumerate(targetDataList):
+            try:
+                values = self._collect(targetData)
+            except ValueError as e:
+                errors[index] = f"AutoScript 数据错误: {e}"
+                continue
+            if native is not None:
+                try:
+                    self._finish(errors, index, targetData, native.run(values, dateVars, timeVars))
+                    continue
+                except NativeFallback:
+                    pass
+            batch.append(values)
+            indexes.append(index)
+        if not batch:
+            return errors
+        if fn is None:
+            fn = self._compileScript(scriptText)
+        lua = self._getLua()
+        luaBatch = lua.table_from(batch, recursive=True)
+        luaDateVars = lua.table_from(dateVars)
+        luaTimeVars = lua.table_from(timeVars)
+        if self._memoryLimit:
+            lua.set_max_memory(self._memoryLimit, total=False)
         try:
-            self._push(targetData)
-            self._getLua().execute(scriptText)
-            self._pull(targetData)
-        except _LuaSyntaxError as e:
-            raise ValueError(
-                f"AutoScript 语法错误: {_cleanLuaError(str(e))}"
+            luaErrors = self._runBatch(
+                fn,
+                luaBatch,
+                luaDateVars,
+                luaTimeVars,
+                self._instructionLimit,
+                self.HOOK_STEP,
             )
+        except _LuaMemoryError:
+            raise ValueError(self._memoryLimitMessage())
         except _LuaError as e:
-            raise ValueError(
-                f"AutoScript 运行时错误: {_cleanLuaError(str(e))}"
-            )
+            raise ValueError(f"AutoScript 运行时错误: {_cleanLuaError(str(e))}")
+        finally:
+            if self._memoryLimit:
+                lua.set_max_memory(0)
+        for position, index in enumerate(indexes):
+            luaError = luaErrors[position + 1]
+            if luaError is not None:
+                errors[index] = self._runtimeErrorMessage(luaError)
+                continue
+            self._finish(errors, index, targetDataList[index], luaBatch[position + 1])
+        return errors
+
+    def _finish(
+        self,
+        errors: list[str | None],
+        index: int,
+        targetData: dict,
+        resultVars,
+    ) -> None:
+
+        try:
+            self._apply(targetData, resultVars)
         except ValueError as e:
-            raise ValueError(f"AutoScript 数据错误: {e}")
+            errors[index] = f"AutoScript 数据错误: {e}"
         except Exception as e:
-            raise ValueError(f"AutoScript 未知错误: {e}")
+            errors[index] = f"AutoScript 未知错误: {e}"
 
     def reset(
         self,
@@ -260,3 +531,7 @@ class ASEngine:
 
         self._targetVars = {}
         self._lua = None
+        self._compile = None
+        self._runBatch = None
+        self._compiled = {}
+        self._native = {}
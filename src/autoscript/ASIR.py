@@ -0,0 +1,478 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Intermediate representation of orchestration scripts.
+
+    The orchestration dialog builds its scripts from a small fixed set of
+    constructs: if / elseif / else chains over typed comparisons joined by
+    ``and`` / ``or``, and assignments of literals, variables, ``+`` / ``-``
+    and the date/time helpers. The dialog emits these nodes and renders
+    them to Lua with ``toLua``; ``parseScript`` reads that Lua subset back,
+    so a stored script can be compiled natively (see ASCompiler) without
+    keeping the nodes around. Anything outside the subset is not parsed
+    and keeps running through the Lua engine.
+"""
+import re
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+
+__all__ = [
+    "Literal", "Var", "Call", "BinOp", "Raw", "Compare", "Logic",
+    "Assign", "Pass", "If", "Program", "parseScript",
+]
+
+# helpers registered by ASEngine._registerHelpers that scripts may call
+HELPER_ARITY = {
+    "date": 3,
+    "time": 2,
+    "datenow": 0,
+    "timenow": 0,
+    "dateadd": 2,
+    "timeadd": 2,
+}
+COMPARE_OPS = ("==", "~=", "<", ">", "<=", ">=")
+LOGIC_OPS = ("and", "or")
+
+
+def _luaString(
+    value: str,
+) -> str:
+
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+@dataclass(frozen=True, slots=True)
+class Literal:
+
+    value: Union[str, int, float, bool]
+
+    def toLua(
+        self,
+    ) -> str:
+
+        if isinstance(self.value, bool):
+            return "true" if self.value else "false"
+        if isinstance(self.value, str):
+            return _luaString(self.value)
+        return repr(self.value)
+
+
+@dataclass(frozen=True, slots=True)
+class Var:
+
+    name: str
+
+    def toLua(
+        self,
+    ) -> str:
+
+        return self.name
+
+
+@dataclass(frozen=True, slots=True)
+class Call:
+
+    func: str
+    args: tuple = ()
+
+    def toLua(
+        self,
+    ) -> str:
+
+        return f"{self.func}({', '.join(arg.toLua() for arg in self.args)})"
+
+
+@dataclass(frozen=True, slots=True)
+class BinOp:
+
+    op: str
+    left: object
+    right: object
+
+    def toLua(
+        self,
+    ) -> str:
+
+        return f"{self.left.toLua()} {self.op} {self.right.toLua()}"
+
+
+@dataclass(frozen=True, slots=True)
+class Raw:
+    """
+        Lua text the dialog passes through as typed, never compiled natively.
+    """
+
+    text: str
+
+    def toLua(
+        self,
+    ) -> str:
+
+        return self.text
+
+
+@dataclass(frozen=True, slots=True)
+class Compare:
+
+    op: str
+    left: object
+    right: object
+
+    def toLua(
+        self,
+    ) -> str:
+
+        return f"{self.left.toLua()} {self.op} {self.right.toLua()}"
+
+
+@dataclass(frozen=True, slots=True)
+class Logic:
+    """
+        terms[0] ops[0] terms[1] ops[1] ... with Lua precedence (``and``
+        binds tighter than ``or``).
+    """
+
+    terms: tuple
+    ops: tuple
+
+    def toLua(
+        self,
+    ) -> str:
+
+        if len(self.terms) == 1:
+            return self.terms[0].toLua()
+        parts = [f"({self.terms[0].toLua()})"]
+        for op, term in zip(self.ops, self.terms[1:]):
+            parts.append(f" {op} ({term.toLua()})")
+        return "".join(parts)
+
+
+@dataclass(frozen=True, slots=True)
+class Assign:
+
+    target: str
+    value: object
+
+    def toLuaLines(
+        self,
+        indent: str = "",
+    ) -> list[str]:
+
+        return [f"{indent}{self.target} = {self.value.toLua()}"]
+
+
+@dataclass(frozen=True, slots=True)
+class Pass:
+
+    def toLuaLines(
+        self,
+        indent: str = "",
+    ) -> list[str]:
+
+        return [f"{indent}-- pass"]
+
+
+@dataclass(frozen=True, slots=True)
+class If:
+    """
+        if / elseif chain, branches are (condition, body) pairs and orelse
+        the body of the final ``else`` (None without one).
+    """
+
+    branches: tuple
+    orelse: Optional[tuple] = None
+
+    def toLuaLines(
+        self,
+        indent: str = "",
+    ) -> list[str]:
+
+        lines = []
+        for index, (cond, body) in enumerate(self.branches):
+            keyword = "if" if index == 0 else "elseif"
+            lines.append(f"{indent}{keyword} {cond.toLua()} then")
+            for stmt in body:
+                lines.extend(stmt.toLuaLines(indent + "    "))
+        if self.orelse is not None:
+            lines.append(f"{indent}else")
+            for stmt in self.orelse:
+                lines.extend(stmt.toLuaLines(indent + "    "))
+        lines.append(f"{indent}end")
+        return lines
+
+
+@dataclass(frozen=True, slots=True)
+class Program:
+
+    statements: tuple
+
+    def toLua(
+        self,
+    ) -> str:
+
+        lines = []
+        for stmt in self.statements:
+            lines.extend(stmt.toLuaLines())
+        return "\n".join(lines)
+
+
+_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--\[(?P<level>=*)\[[\s\S]*?\](?P=level)\]|--(?!\[=*\[)[^\n]*)
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<op>==|~=|<=|>=|[<>=+\-(),;])
+""", re.VERBOSE)
+_INT_MAX = 2**63 - 1
+_ESCAPES = {"\\": "\\", '"': '"', "'": "'", "n": "\n", "t": "\t"}
+_KEYWORDS = {
+    "and", "break", "do", "else", "elseif", "end", "false", "for", "function",
+    "goto", "if", "in", "local", "nil", "not", "or", "repeat", "return", "then",
+    "true", "until", "while", "global",
+}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class _Parser:
+
+    def __init__(
+        self,
+        text: str,
+    ):
+
+        self._tokens = self._tokenize(text)
+        self._pos = 0
+
+    @staticmethod
+    def _tokenize(
+        text: str,
+    ) -> list[tuple[str, object]]:
+
+        tokens = []
+        pos = 0
+        while pos < len(text):
+            m = _TOKEN_RE.match(text, pos)
+            if not m:
+                raise _Unsupported(text[pos])
+            pos = m.end()
+            kind = m.lastgroup
+            value = m.group()
+            if kind in ("space", "comment"):
+                continue
+            if kind == "number":
+                # like Lua, a decimal integer beyond int64 reads as a float
+                number = float(value) if "." in value else int(value)
+                if type(number) is int and number > _INT_MAX:
+                    number = float(value)
+                tokens.append(("number", number))
+            elif kind == "string":
+                tokens.append(("string", _Parser._unescape(value[1:-1])))
+            elif kind == "name" and value in _KEYWORDS:
+                tokens.append(("keyword", value))
+            else:
+                tokens.append((kind, value))
+        tokens.append(("eof", None))
+        return tokens
+
+    @staticmethod
+    def _unescape(
+        body: str,
+    ) -> str:
+
+        out = []
+        i = 0
+        while i < len(body):
+            ch = body[i]
+            if ch == "\\":
+                esc = body[i + 1]
+                if esc not in _ESCAPES:
+                    raise _Unsupported(esc)
+                out.append(_ESCAPES[esc])
+                i += 2
+                continue
+            out.append(ch)
+            i += 1
+        return "".join(out)
+
+    def _peek(
+        self,
+    ) -> tuple[str, object]:
+
+        return self._tokens[self._pos]
+
+    def _next(
+        self,
+    ) -> tuple[str, object]:
+
+        token = self._tokens[self._pos]
+        self._pos += 1
+        return token
+
+    def _accept(
+        self,
+        kind: str,
+        value: object = None,
+    ) -> bool:
+
+        token = self._peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self._pos += 1
+            return True
+        return False
+
+    def _expect(
+        self,
+        kind: str,
+        value: object = None,
+    ) -> object:
+
+        token = self._next()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise _Unsupported(token)
+        return token[1]
+
+    def parseProgram(
+        self,
+    ) -> Program:
+
+        statements = self._parseBlock(("eof",))
+        self._expect("eof")
+        return Program(tuple(statements))
+
+    def _parseBlock(
+        self,
+        terminators: tuple,
+    ) -> list:
+
+        statements = []
+        while True:
+            kind, value = self._peek()
+            if kind == "eof" or (kind == "keyword" and value in terminators):
+                return statements
+            if self._accept("op", ";"):
+                continue
+            statements.append(self._parseStatement())
+
+    def _parseStatement(
+        self,
+    ):
+
+        if self._accept("keyword", "if"):
+            branches = []
+            orelse = None
+            cond = self._parseCondition()
+            self._expect("keyword", "then")
+            branches.append((cond, tuple(self._parseBlock(("elseif", "else", "end")))))
+            while self._accept("keyword", "elseif"):
+                cond = self._parseCondition()
+                self._expect("keyword", "then")
+                branches.append((cond, tuple(self._parseBlock(("elseif", "else", "end")))))
+            if self._accept("keyword", "else"):
+                orelse = tuple(self._parseBlock(("end",)))
+            self._expect("keyword", "end")
+            return If(tuple(branches), orelse)
+        target = self._expect("name")
+        self._expect("op", "=")
+        return Assign(target, self._parseExpr())
+
+    def _parseCondition(
+        self,
+    ):
+
+        terms = [self._parseTerm()]
+        ops = []
+        while self._peek() in (("keyword", "and"), ("keyword", "or")):
+            ops.append(self._next()[1])
+            terms.append(self._parseTerm())
+        return Logic(tuple(terms), tuple(ops))
+
+    def _parseTerm(
+        self,
+    ):
+
+        if self._accept("op", "("):
+            term = self._parseComparison()
+            self._expect("op", ")")
+            return term
+        return self._parseComparison()
+
+    def _parseComparison(
+        self,
+    ):
+
+        left = self._parseExpr()
+        kind, value = self._peek()
+        if kind == "op" and value in COMPARE_OPS:
+            self._next()
+            return Compare(value, left, self._parseExpr())
+        return left
+
+    def _parseExpr(
+        self,
+    ):
+
+        expr = self._parsePrimary()
+        while self._peek() in (("op", "+"), ("op", "-")):
+            op = self._next()[1]
+            expr = BinOp(op, expr, self._parsePrimary())
+        return expr
+
+    def _parsePrimary(
+        self,
+    ):
+
+        kind, value = self._next()
+        if kind == "number":
+            return Literal(value)
+        if kind == "op" and value == "-":
+            return Literal(-self._expect("number"))
+        if kind == "string":
+            return Literal(value)
+        if kind == "keyword" and value in ("true", "false"):
+            return Literal(value == "true")
+        if kind == "name":
+            if not self._accept("op", "("):
+                return Var(value)
+            if value not in HELPER_ARITY:
+                raise _Unsupported(value)
+            args = []
+            if not self._accept("op", ")"):
+                args.append(self._parseExpr())
+                while self._accept("op", ","):
+                    args.append(self._parseExpr())
+                self._expect("op", ")")
+            if len(args) != HELPER_ARITY[value]:
+                raise _Unsupported(value)
+            return Call(value, tuple(args))
+        raise _Unsupported(value)
+
+
+def parseScript(
+    scriptText: str,
+) -> Optional[Program]:
+    """
+        Parse a script written in the orchestration subset.
+
+        Returns:
+            Optional[Program]: The program, None if the script uses anything
+                outside the subset (or is not valid Lua at all).
+    """
+
+    try:
+        return _Parser(scriptText).parseProgram()
+    except (_Unsupported, IndexError, ValueError):
+        return None
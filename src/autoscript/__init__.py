@@ -53,6 +53,9 @@ def createMockTargetData(
     return data
 
 def createEngine(
+    instructionLimit: int = ASEngine.DEFAULT_INSTRUCTION_LIMIT,
+    memoryLimit: int = ASEngine.DEFAULT_MEMORY_LIMIT,
+    nativeCompile: bool = True,
 ) -> ASEngine:
 
-    return ASEngine(_TARGET_VAR_DEFS)
+    return ASEngine(_TARGET_VAR_DEFS, instructionLimit, memoryLimit, nativeCompile)
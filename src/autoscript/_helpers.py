@@ -22,28 +22,40 @@ _TYPE_DEFAULT_VAR: dict[str, str | int | float | bool] = {
 
 
 def _navigatePath(
-    data: dict,
+    data,
     keyPath: list,
     default=None,
 ):
 
+    # dicts or objects with matching attributes (the user config model)
     d = data
     for key in keyPath[:-1]:
-        d = d.get(key, {})
-        if not isinstance(d, dict):
-            return default
-    return d.get(keyPath[-1], default)
+        if isinstance(d, dict):
+            d = d.get(key, {})
+            if not isinstance(d, dict):
+                return default
+        else:
+            d = getattr(d, key, None)
+            if d is None:
+                return default
+    if isinstance(d, dict):
+        return d.get(keyPath[-1], default)
+    value = getattr(d, keyPath[-1], None)
+    return default if value is None else value
 
 def _assignPath(
-    data: dict,
+    data,
     keyPath: list,
     value,
 ) -> None:
 
     d = data
     for key in keyPath[:-1]:
-        d = d.setdefault(key, {})
-    d[keyPath[-1]] = value
+        d = d.setdefault(key, {}) if isinstance(d, dict) else getattr(d, key)
+    if isinstance(d, dict):
+        d[keyPath[-1]] = value
+    else:
+        setattr(d, keyPath[-1], value)
 
 def _checkDateFormat(
     dateStr: str,
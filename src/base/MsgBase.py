@@ -7,12 +7,23 @@ This software is provided "as is", without any warranty of any kind.
 You may use, modify, and distribute this file under the terms of the MIT License.
 See the LICENSE file for details.
 """
-import logging
+import time
 import queue
-import datetime
+import logging
+import threading
+
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
 
 import managers.log.LogManager as LogManager
 
+from base.MsgEvent import MsgEvent, MsgEventKind
+
+
+# Per-thread trace context (user and stage) shared by all components
+# running on the same automation thread.
+_trace_context = threading.local()
+
 
 class MsgBase:
     """
@@ -21,6 +32,8 @@ class MsgBase:
         This class provides the foundation for message handling and tracing
         abilities based on the provided input and output queues. It enables
         thread-safe communication between components using queue-based messaging.
+        Messages are put on the output queue as structured MsgEvent objects,
+        rendering them is left to the consumer.
 
         Args:
             input_queue (queue.Queue): The input queue for receiving messages.
@@ -58,24 +71,62 @@ class MsgBase:
         except RuntimeError:
             self._logger = None
 
+    @staticmethod
+    @contextmanager
+    def _traceContext(
+        user: Optional[str] = None,
+        stage: Optional[str] = None
+    ) -> Iterator[None]:
+        """
+            Tag every event emitted on this thread with the user and stage.
+
+            Contexts nest, an inner context only overrides the values it sets.
+        """
+
+        prev_user = getattr(_trace_context, "user", None)
+        prev_stage = getattr(_trace_context, "stage", None)
+        _trace_context.user = user if user is not None else prev_user
+        _trace_context.stage = stage if stage is not None else prev_stage
+        try:
+            yield
+        finally:
+            _trace_context.user = prev_user
+            _trace_context.stage = prev_stage
+
     def _showMsg(
         self,
         msg: str
     ):
 
-        self._output_queue.put(f"[{self._class_name:<15}] >>> : {msg}")
+        self._output_queue.put(MsgEvent(
+            timestamp=time.time(),
+            component=self._class_name,
+            level=logging.INFO,
+            message=msg,
+            kind=MsgEventKind.MSG
+        ))
 
     def _showTrace(
         self,
         msg: str,
         level: int = logging.INFO,
-        no_log: bool = False
+        no_log: bool = False,
+        fields: Optional[dict[str, Any]] = None
     ):
 
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        self._output_queue.put(f"{timestamp}-[{self._class_name:<15}] : {msg}")
+        user = getattr(_trace_context, "user", None)
+        stage = getattr(_trace_context, "stage", None)
+        self._output_queue.put(MsgEvent(
+            timestamp=time.time(),
+            component=self._class_name,
+            level=level,
+            message=msg,
+            user=user,
+            stage=stage,
+            fields=fields or {}
+        ))
         if self._logger and not no_log:
-            self._logger.log(level, msg)
+            self._logger.log(level, msg, stacklevel=2, extra={"user": user, "stage": stage})
 
     def _showLog(
         self,
@@ -84,7 +135,7 @@ class MsgBase:
     ):
 
         if self._logger:
-            self._logger.log(level, msg)
+            self._logger.log(level, msg, stacklevel=2)
 
     def _waitMsg(
         self,
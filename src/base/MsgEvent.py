@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import logging
+import datetime
+
+from enum import Enum
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+class MsgEventKind(Enum):
+    """
+        Message event kind.
+    """
+
+    TRACE = "trace"
+    MSG = "msg"
+
+
+@dataclass(frozen=True, slots=True)
+class MsgEvent:
+    """
+        Structured message event put on the output queue by MsgBase.
+
+        Consumers decide how to render the event, ``format()`` gives the
+        classic single-line text used by the message view.
+
+        Attributes:
+            timestamp (float): Creation time in seconds since the epoch.
+            component (str): Class name of the emitting component.
+            level (int): Logging level of the event.
+            message (str): Human readable message.
+            user (Optional[str]): Username being processed, if any.
+            stage (Optional[str]): Automation stage, e.g. ``login`` or ``reserve``.
+            fields (dict[str, Any]): Extra structured values.
+            kind (MsgEventKind): Trace event or echoed user message.
+    """
+
+    timestamp: float
+    component: str
+    level: int
+    message: str
+    user: Optional[str] = None
+    stage: Optional[str] = None
+    fields: dict[str, Any] = field(default_factory=dict)
+    kind: MsgEventKind = MsgEventKind.TRACE
+
+    def levelName(
+        self
+    ) -> str:
+
+        return logging.getLevelName(self.level)
+
+    def format(
+        self
+    ) -> str:
+
+        if self.kind is MsgEventKind.MSG:
+            return f"[{self.component:<15}] >>> : {self.message}"
+        timestamp = datetime.datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        return f"{timestamp}-[{self.component:<15}] : {self.message}"
+
+    def toDict(
+        self
+    ) -> dict[str, Any]:
+        """
+            Get the event as a JSON serializable dict.
+        """
+
+        return {
+            "timestamp": self.timestamp,
+            "component": self.component,
+            "level": self.levelName(),
+            "message": self.message,
+            "user": self.user,
+            "stage": self.stage,
+            "fields": self.fields,
+            "kind": self.kind.value
+        }
+
+    def __str__(
+        self
+    ) -> str:
+
+        return self.format()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import queue
+
+from typing import Any, Callable, Optional
+
+
+class MsgQueue(queue.Queue):
+    """
+        Bounded, non-blocking message queue with push notification.
+
+        Producers never block: when the queue is full the oldest message is
+        dropped. Instead of being polled, the consumer is notified through
+        ``notifier`` when the queue turns non-empty, and then drains it in
+        batches with ``getBatch``. Notifications are coalesced, at most one
+        is outstanding until the consumer has drained the queue.
+
+        Args:
+            maxsize (int): Maximum number of retained messages.
+            notifier (Optional[Callable[[], None]]): Called (from the producer
+                thread) when messages become available.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        notifier: Optional[Callable[[], None]] = None
+    ):
+
+        super().__init__(maxsize)
+        self.__notifier = notifier
+        self.__notify_pending = False
+        self.__dropped = 0
+
+    def setNotifier(
+        self,
+        notifier: Optional[Callable[[], None]]
+    ):
+
+        with self.mutex:
+            self.__notifier = notifier
+            self.__notify_pending = False
+
+    def put(
+        self,
+        item: Any,
+        block: bool = True,
+        timeout: Optional[float] = None
+    ):
+
+        with self.mutex:
+            if 0 < self.maxsize <= self._qsize():
+                self._get()
+                self.__dropped += 1
+            else:
+                self.unfinished_tasks += 1
+            self._put(item)
+            self.not_empty.notify()
+            notifier = None
+            if self.__notifier and not self.__notify_pending:
+                self.__notify_pending = True
+                notifier = self.__notifier
+        if notifier:
+            notifier()
+
+    def getBatch(
+        self,
+        max_items: int
+    ) -> list:
+        """
+            Take up to max_items messages without blocking.
+
+            Once the queue is fully drained the next ``put`` notifies again,
+            otherwise the consumer is expected to call ``getBatch`` again.
+
+            Returns:
+                list: The taken messages, oldest first.
+        """
+
+        with self.mutex:
+            count = min(max_items, self._qsize())
+            items = [self._get() for _ in range(count)]
+            if count:
+                self.not_full.notify(count)
+            if not self._qsize():
+                self.__notify_pending = False
+            return items
+
+    def takeDroppedCount(
+        self
+    ) -> int:
+        """
+            Get and reset the number of messages dropped since the last call.
+        """
+
+        with self.mutex:
+            dropped, self.__dropped = self.__dropped, 0
+            return dropped
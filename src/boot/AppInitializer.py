@@ -15,6 +15,7 @@ from PySide6.QtWidgets import QApplication
 from interfaces.ConfigProvider import CfgKey
 from managers.config.ConfigManager import instance as configInstance
 from managers.driver.WebDriverManager import instance as webdriverInstance
+from managers.history.TimerTaskHistoryManager import instance as historyInstance
 from managers.log.LogManager import instance as logInstance
 from managers.theme.ThemeManager import(
     setActiveStyle,
@@ -55,6 +56,19 @@ def _initializeConfigManager(
     configInstance(new_config_dir)
     return True
 
+def _initializeHistoryManager(
+) -> bool:
+
+    logger = logInstance().getLogger("AppInitializer")
+
+    history_path = os.path.join(configInstance().configDir(), "timer_task_history.db")
+    try:
+        historyInstance(history_path)
+    except Exception as e:
+        logger.error("初始化定时任务历史记录 %s 失败: %s", history_path, e)
+        return False
+    return True
+
 def _initializeWebDriverManager(
 ) -> bool:
 
@@ -98,14 +112,34 @@ def initializeApp(
         Initialize the application components
 
         Order:
-            LogManager -> ConfigManager -> WebDriverManager -> Appearance
+            LogManager -> ConfigManager -> TimerTaskHistoryManager
+            -> WebDriverManager -> Appearance
     """
 
     if not _initializeLogManager():
         return False
     if not _initializeConfigManager():
         return False
+    if not _initializeHistoryManager():
+        return False
     if not _initializeWebDriverManager():
         return False
     _initializeAppearance()
     return True
+
+def finalizeApp(
+):
+    """
+        Finalize the application components before exit
+
+        Order:
+            ConfigManager (flush pending changes) -> TimerTaskHistoryManager
+            -> LogManager
+    """
+
+    try:
+        configInstance().flush()
+    except Exception as e:
+        logInstance().getLogger("AppInitializer").error("保存配置失败: %s", e)
+    historyInstance().close()
+    logInstance().shutdown()
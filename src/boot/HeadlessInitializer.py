@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import sys
+
+from managers.config.ConfigManager import instance as configInstance
+from managers.history.TimerTaskHistoryManager import instance as historyInstance
+from managers.log.LogManager import instance as logInstance
+
+
+# Same as the application name set by Main.py, it is part of the data dir.
+APP_NAME = "AutoLibrary"
+
+
+def defaultAppDataDir(
+) -> str:
+    """
+        Get the data dir the GUI uses, without asking Qt.
+
+        Mirrors ``QStandardPaths.AppDataLocation`` of an application without
+        organization name, so the CLI and the GUI share configs and logs.
+    """
+
+    if sys.platform == "win32":
+        base_dir = os.environ.get("APPDATA") or os.path.expanduser("~/AppData/Roaming")
+    elif sys.platform == "darwin":
+        base_dir = os.path.expanduser("~/Library/Application Support")
+    else:
+        base_dir = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base_dir, APP_NAME)
+
+def initializeHeadless(
+    app_dir: str = "",
+    console_log: bool = False
+) -> bool:
+    """
+        Initialize the Qt-free application components
+
+        Order:
+            LogManager -> ConfigManager -> TimerTaskHistoryManager
+
+        Args:
+            app_dir (str): Data dir, empty for the GUI data dir.
+            console_log (bool): Whether log records also go to the console.
+    """
+
+    app_dir = os.path.abspath(app_dir or defaultAppDataDir())
+    try:
+        log_dir = os.path.join(app_dir, "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        logInstance(log_dir, console_log)
+    except Exception:
+        return False
+
+    logger = logInstance().getLogger("HeadlessInitializer")
+    config_dir = os.path.join(app_dir, "configs")
+    try:
+        os.makedirs(config_dir, exist_ok=True)
+        configInstance(config_dir)
+    except Exception as e:
+        logger.error("初始化配置目录 %s 失败: %s", config_dir, e)
+        return False
+    history_path = os.path.join(config_dir, "timer_task_history.db")
+    try:
+        historyInstance(history_path)
+    except Exception as e:
+        logger.error("初始化定时任务历史记录 %s 失败: %s", history_path, e)
+        return False
+    return True
+
+def finalizeHeadless(
+):
+    """
+        Finalize the Qt-free application components before exit
+
+        Order:
+            ConfigManager (flush pending changes) -> TimerTaskHistoryManager
+            -> LogManager
+    """
+
+    try:
+        configInstance().flush()
+    except Exception as e:
+        logInstance().getLogger("HeadlessInitializer").error("保存配置失败: %s", e)
+    historyInstance().close()
+    logInstance().shutdown()
@@ -22,6 +22,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from autoscript.ASIR import Literal, Logic
 from gui.ALAutoScriptOrchDialog._widgets import (
     ActionStepFrame,
     ConditionRowFrame,
@@ -188,42 +189,36 @@ class ConditionalBlock(QGroupBox):
 
         return len(self._actionWidgets)
 
-    def toScript(
+    def toIR(
         self
-    ) -> list:
+    ) -> tuple:
         """
-            Generate Lua script lines for this conditional block.
+            Build the ASIR pieces of this conditional block.
+
+            Returns:
+                tuple: (blockType, condition, body), the condition is None for
+                    an ELSE block.
         """
 
         blockType = self.getBlockType()
-        lines = []
+        cond = None
         if blockType in ("IF", "ELSE IF"):
-            condTexts = [
-                r.toScript() for r in self._conditionRows if r.toScript()
-            ]
-            if not condTexts:
-                condTexts = ["true"]
-            if len(condTexts) == 1:
-                combined = condTexts[0]
-            else:
-                parts = []
-                for i, ct in enumerate(condTexts):
-                    if i > 0:
-                        logic = self._conditionRows[i].getLogic() or "and"
-                        parts.append(f" {logic} ")
-                    parts.append(f"({ct})")
-                combined = "".join(parts)
-            if blockType == "IF":
-                lines.append(f"if {combined} then")
-            else:
-                lines.append(f"elseif {combined} then")
-        else:
-            lines.append("else")
-        for step in self._actionWidgets:
-            scriptLine = step.toScript()
-            if scriptLine:
-                lines.append(scriptLine)
-        return lines
+            terms, ops = [], []
+            for row in self._conditionRows:
+                term = row.toIR()
+                if term is None:
+                    continue
+                if terms:
+                    ops.append(row.getLogic() or "and")
+                terms.append(term)
+            if not terms:
+                terms = [Literal(True)]
+            cond = Logic(tuple(terms), tuple(ops))
+        body = tuple(
+            stmt for stmt in (step.toIR() for step in self._actionWidgets)
+            if stmt is not None
+        )
+        return blockType, cond, body
 
     def refreshVarCombos(
         self
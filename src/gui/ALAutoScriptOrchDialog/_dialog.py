@@ -22,6 +22,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from autoscript.ASIR import If, Program
 from gui.ALAutoScriptOrchDialog._helpers import VariableManager
 from gui.ALAutoScriptOrchDialog._blocks import ConditionalBlock
 
@@ -132,6 +133,27 @@ class ALAutoScriptOrchDialog(QDialog):
             blk.refreshVarCombos()
         self.updateBlockTypeRestrictions()
 
+    def getProgram(
+        self
+    ) -> Program:
+        """
+            Build the ASIR program from all blocks, each IF starts a new chain.
+        """
+
+        chains = []
+        for block in self._blocks:
+            blockType, cond, body = block.toIR()
+            if blockType == "IF" or not chains:
+                chains.append(([], None))
+            branches, _ = chains[-1]
+            if blockType == "ELSE":
+                chains[-1] = (branches, body)
+            else:
+                branches.append((cond, body))
+        return Program(tuple(
+            If(tuple(branches), orelse) for branches, orelse in chains if branches
+        ))
+
     def getScript(
         self
     ) -> str:
@@ -139,18 +161,7 @@ class ALAutoScriptOrchDialog(QDialog):
             Generate the complete Lua script from all blocks.
         """
 
-        parts = []
-        prevType = None
-        for block in self._blocks:
-            blockType = block.getBlockType()
-            if blockType == "IF" and prevType is not None:
-                parts.append("end")
-            lines = block.toScript()
-            parts.extend(lines)
-            prevType = blockType
-        if self._blocks and self._blocks[0].getBlockType() == "IF":
-            parts.append("end")
-        return "\n".join(parts)
+        return self.getProgram().toLua()
 
     @Slot()
     def onAccept(
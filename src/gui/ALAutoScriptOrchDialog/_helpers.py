@@ -28,6 +28,7 @@ from PySide6.QtWidgets import (
 )
 
 from autoscript import createAllVariablesTable
+from autoscript.ASIR import BinOp, Call, Literal, Raw, Var
 
 VARTYPE_INFOS = [
     # varType, isArithType
@@ -415,12 +416,12 @@ def getValueFromWidget(
         return w.text()
     return ""
 
-def encodeValueStr(
+def encodeValue(
     raw_value: str,
     var_type: str
-) -> str:
+):
     """
-        Encode a raw widget value as a Lua expression.
+        Encode a raw widget value as an ASIR expression.
 
         Arithmetic expressions (A + B) are passed through for numeric types;
         Date/Time arithmetic is translated to ``dateadd()`` / ``timeadd()`` calls.
@@ -429,81 +430,98 @@ def encodeValueStr(
     if var_type in ("Date", "Time"):
         return encodeDateOrTime(str(raw_value), var_type)
     if isinstance(raw_value, bool):
-        return "true" if raw_value else "false"
+        return Literal(raw_value)
     s = str(raw_value)
     if isArithExpr(s):
-        return s
+        return Raw(s)
     if var_type == "Boolean":
         up = s.upper().strip()
         if up in ("TRUE", "FALSE"):
-            return up.lower()
-        return "true" if raw_value else "false"
+            return Literal(up == "TRUE")
+        return Literal(bool(raw_value))
     if var_type == "String":
-        escaped = s.replace("\\", "\\\\").replace('"', '\\"')
-        return f'"{escaped}"'
-    return s
+        return Literal(s)
+    return encodeOperand(s)
+
+def encodeOperand(
+    text: str
+):
+    """
+        Encode a number or a variable name, anything else is kept as raw Lua.
+    """
+
+    s = text.strip()
+    if _RE_INT.match(s):
+        return Literal(int(s))
+    if _RE_FLOAT.match(s):
+        return Literal(float(s))
+    if _RE_NAME.match(s):
+        return Var(s)
+    return Raw(text)
 
 def encodeDateOrTime(
     raw_value: str,
     var_type: str
-) -> str:
+):
     """
-        Translate a date/time widget value into a Lua expression.
+        Translate a date/time widget value into an ASIR expression.
     """
 
     s = raw_value.strip()
     up = s.upper()
     # Input comes from widget values — single binary expressions only (e.g. "A + 3",
     # "CURRENT_DATE + 5"). Multi-operator expressions are not produced by the UI.
-    m_arith_spaced = re.match(r'^(.+?)\s+([+-])\s+(.+)$', s)
-    m_arith_nospace = re.match(r'^([A-Za-z_]\w*)([+-])(\d+|[A-Za-z_]\w*)$', s)
-    m_arith = m_arith_spaced or m_arith_nospace
+    m_arith = _RE_ARITH_SPACED.match(s) or _RE_ARITH_NOSPACE.match(s)
     if m_arith:
         left = m_arith.group(1).strip().upper()
         sign = m_arith.group(2)
         right = m_arith.group(3).strip()
-        operand = right if sign == "+" else f"-{right}"
+        operand = encodeOperand(right if sign == "+" else f"-{right}")
         if left == "CURRENT_DATE":
-            return f"dateadd(datenow(), {operand})"
+            return Call("dateadd", (Call("datenow"), operand))
         if left == "CURRENT_TIME":
-            return f"timeadd(timenow(), {operand})"
+            return Call("timeadd", (Call("timenow"), operand))
         if var_type == "Date":
-            return f"dateadd({left}, {operand})"
+            return Call("dateadd", (encodeOperand(left), operand))
         if var_type == "Time":
-            return f"timeadd({left}, {operand})"
-        return f"{left} {sign} {right}"
+            return Call("timeadd", (encodeOperand(left), operand))
+        return BinOp(sign, encodeOperand(left), encodeOperand(right))
     if up == "CURRENT_DATE":
-        return "datenow()"
+        return Call("datenow")
     if up == "CURRENT_TIME":
-        return "timenow()"
+        return Call("timenow")
     _REL_MAP = {
-        "前天": "dateadd(datenow(), -2)",
-        "昨天": "dateadd(datenow(), -1)",
-        "今天": "datenow()",
-        "明天": "dateadd(datenow(), 1)",
-        "后天": "dateadd(datenow(), 2)",
+        "前天": -2,
+        "昨天": -1,
+        "今天": 0,
+        "明天": 1,
+        "后天": 2,
     }
     if s in _REL_MAP:
-        return _REL_MAP[s]
+        offset = _REL_MAP[s]
+        if offset == 0:
+            return Call("datenow")
+        return Call("dateadd", (Call("datenow"), Literal(offset)))
     if var_type == "Date":
         m_date = re.match(r"^(\d{4})-(\d{2})-(\d{2})$", s)
         if m_date:
-            y, m, d = int(m_date.group(1)), int(m_date.group(2)), int(m_date.group(3))
-            return f"date({y}, {m}, {d})"
+            return Call("date", tuple(Literal(int(g)) for g in m_date.groups()))
     if var_type == "Time":
         m_time = re.match(r"^(\d{1,2}):(\d{2})$", s)
         if m_time:
-            h, m = int(m_time.group(1)), int(m_time.group(2))
-            return f"time({h}, {m})"
-    if re.match(r"^[+-]?\d+$", s):
-        return s
-    if re.match(r"^[A-Za-z_]\w*$", s):
-        return s
-    return f'"{s}"'
+            return Call("time", tuple(Literal(int(g)) for g in m_time.groups()))
+    if _RE_INT.match(s):
+        return Literal(int(s))
+    if _RE_NAME.match(s):
+        return Var(s)
+    return Literal(s)
 
 # Pre-compiled patterns for detecting arithmetic expressions (A + B / A - B)
 _RE_ARITH_SPACED = re.compile(r'^(.+?)\s+([+-])\s+(.+)$')
 _RE_ARITH_NOSPACE = re.compile(r'^([A-Za-z_]\w*)([+-])(\d+|[A-Za-z_]\w*)$')
+_RE_INT = re.compile(r'^[+-]?\d+$')
+_RE_FLOAT = re.compile(r'^[+-]?\d+\.\d+$')
+_RE_NAME = re.compile(r'^[A-Za-z_]\w*$')
 
 def isArithExpr(
     expr: str
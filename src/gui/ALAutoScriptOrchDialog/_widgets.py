@@ -21,11 +21,13 @@ from PySide6.QtWidgets import (
     QStackedWidget
 )
 
+from autoscript.ASIR import Assign, BinOp, Call, Compare, Literal, Pass, Raw, Var
 from gui.ALAutoScriptOrchDialog._helpers import (
     ACTION_OPTIONS,
     COMPARE_OPTIONS,
     LOGIC_OPTIONS,
-    encodeValueStr,
+    encodeOperand,
+    encodeValue,
     getPresetVars,
     getTypeOrder,
     getValueFromWidget,
@@ -168,44 +170,51 @@ class ConditionRowFrame(QFrame):
             vartype = "String"
         self.LiteralStack.setCurrentWidget(self._literalWidgets[vartype])
 
-    def toScript(
+    @staticmethod
+    def _varNode(
+        name: str
+    ):
+
+        # CURRENT_DATE / CURRENT_TIME map to datenow() / timenow()
+        if name == "CURRENT_DATE":
+            return Call("datenow")
+        if name == "CURRENT_TIME":
+            return Call("timenow")
+        return Var(name)
+
+    def toIR(
         self
-    ) -> str:
+    ):
+        """
+            Build the ASIR condition of this row, None when it is incomplete.
+        """
 
         data = self.LeftVarCombo.currentData()
         if self._isBoolMode and data:
-            return data[0]
+            if data[0] in ("true", "false"):
+                return Literal(data[0] == "true")
+            return Var(data[0])
         if not data:
-            return ""
+            return None
         name, vartype = data
-        # CURRENT_DATE / CURRENT_TIME map to datenow() / timenow()
-        if name == "CURRENT_DATE":
-            name = "datenow()"
-        elif name == "CURRENT_TIME":
-            name = "timenow()"
+        left = self._varNode(name)
         opSym = self.OpCombo.currentData()
         if self._rawRhsExpr:
-            return f"{name} {opSym} {self._rawRhsExpr}"
+            return Compare(opSym, left, Raw(self._rawRhsExpr))
         isVarRef = (self._CompTypeCombo.currentData() == "variable")
         if isVarRef:
             rd = self.RhsVarCombo.currentData()
             if rd:
-                rhsName = rd[0]
-                if rhsName == "CURRENT_DATE":
-                    rhsName = "datenow()"
-                elif rhsName == "CURRENT_TIME":
-                    rhsName = "timenow()"
-                return f"{name} {opSym} {rhsName}"
+                return Compare(opSym, left, self._varNode(rd[0]))
             rhsText = self.RhsVarCombo.currentText().strip()
             if rhsText:
-                return f"{name} {opSym} {rhsText}"
-            return ""
+                return Compare(opSym, left, encodeOperand(rhsText))
+            return None
         w = self._literalWidgets.get(vartype)
         if w:
             rawVal = getValueFromWidget(w)
-            encoded = encodeValueStr(rawVal, vartype)
-            return f"{name} {opSym} {encoded}"
-        return ""
+            return Compare(opSym, left, encodeValue(rawVal, vartype))
+        return None
 
     def refreshVarCombos(
         self
@@ -367,41 +376,37 @@ class ActionStepFrame(QFrame):
         else:
             self.ValueStack.setCurrentWidget(self._literalWidgets.get("String"))
 
-    def toScript(
+    def toIR(
         self
-    ) -> str:
+    ):
         """
-            Generate a single line of Lua script from the current widget state.
+            Build the ASIR statement of this step, None when it is incomplete.
         """
 
         target = self.getTargetName()
         op = self.OpTypeCombo.currentData()
         if op == "pass":
-            return "    -- pass"
+            return Pass()
         if not target:
-            return ""
+            return None
         rawVal = self.getValueRaw()
         vartype = self._currentTargetType
         if op == "set":
-            encoded = encodeValueStr(rawVal, vartype)
-            return f"    {target} = {encoded}"
-        elif op == "add":
-            if vartype == "Date" and hasattr(self.ValueStack.currentWidget(), "getOffsetDays"):
-                days = self.ValueStack.currentWidget().getOffsetDays()
-                return f"    {target} = dateadd({target}, {days})"
-            if vartype == "Time" and hasattr(self.ValueStack.currentWidget(), "getOffsetHours"):
-                hours = self.ValueStack.currentWidget().getOffsetHours()
-                return f"    {target} = timeadd({target}, {hours})"
-            return f"    {target} = {target} + {rawVal}"
-        elif op == "sub":
-            if vartype == "Date" and hasattr(self.ValueStack.currentWidget(), "getOffsetDays"):
-                days = self.ValueStack.currentWidget().getOffsetDays()
-                return f"    {target} = dateadd({target}, -{days})"
-            if vartype == "Time" and hasattr(self.ValueStack.currentWidget(), "getOffsetHours"):
-                hours = self.ValueStack.currentWidget().getOffsetHours()
-                return f"    {target} = timeadd({target}, -{hours})"
-            return f"    {target} = {target} - {rawVal}"
-        return ""
+            return Assign(target, encodeValue(rawVal, vartype))
+        if op in ("add", "sub"):
+            sign = 1 if op == "add" else -1
+            offsetWidget = self.ValueStack.currentWidget()
+            if vartype == "Date" and hasattr(offsetWidget, "getOffsetDays"):
+                days = offsetWidget.getOffsetDays()
+                return Assign(target, Call("dateadd", (Var(target), Literal(sign*days))))
+            if vartype == "Time" and hasattr(offsetWidget, "getOffsetHours"):
+                hours = offsetWidget.getOffsetHours()
+                return Assign(target, Call("timeadd", (Var(target), Literal(sign*hours))))
+            return Assign(
+                target,
+                BinOp("+" if op == "add" else "-", Var(target), encodeOperand(str(rawVal)))
+            )
+        return None
 
     def getValueRaw(
         self
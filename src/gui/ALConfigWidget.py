@@ -13,6 +13,8 @@ from PySide6.QtCore import (
     QDate,
     QDir,
     QFileInfo,
+    QModelIndex,
+    QPersistentModelIndex,
     Qt,
     QTime,
     Signal,
@@ -29,7 +31,6 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QMenu,
     QMessageBox,
-    QTreeWidgetItem,
     QWidget
 )
 
@@ -49,6 +50,19 @@ from interfaces.ConfigProvider import (
     ConfigProvider
 )
 from managers.config.ConfigUtils import ConfigUtils
+from managers.config.UserConfig import (
+    RenewSpec,
+    ReserveInfo,
+    TimeSpec,
+    User,
+    UserConfig
+)
+from managers.config.UserStore import UserStore
+from managers.config.UserTransfer import (
+    mergeUsers,
+    readUserRows,
+    writeUsers
+)
 from utils.JSONReader import JSONReader
 from utils.JSONWriter import JSONWriter
 
@@ -65,7 +79,7 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
         super().__init__(parent)
         self.__cfg_mgr: ConfigProvider = ConfigManager.instance()
         self.__config_paths = ConfigUtils.getAutomationConfigPaths()
-        self.__config_data = {"run": {}, "user": {}}
+        self.__config_data = {"run": {}, "user": UserConfig()}
 
         self.setupUi(self)
         self.modifyUi()
@@ -95,8 +109,8 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
         self.ShowPasswordCheckBox.clicked.connect(self.onShowPasswordCheckBoxChecked)
         self.FloorComboBox.currentIndexChanged.connect(self.onFloorComboBoxCurrentIndexChanged)
         self.SelectSeatsButton.clicked.connect(self.onSelectSeatsButtonClicked)
-        self.UserTreeWidget.currentItemChanged.connect(self.onUserTreeWidgetCurrentItemChanged)
-        self.UserTreeWidget.itemChanged.connect(self.onUserTreeWidgetItemChanged)
+        self.UserTreeWidget.selectionModel().currentChanged.connect(self.onUserTreeWidgetCurrentIndexChanged)
+        self.UserTreeWidget.model().dataChanged.connect(self.onUserTreeWidgetDataChanged)
         self.AddUserButton.clicked.connect(self.onAddUserButtonClicked)
         self.DelUserButton.clicked.connect(self.onDelUserButtonClicked)
         self.BrowseBrowserDriverButton.clicked.connect(self.onBrowseBrowserDriverButtonClicked)
@@ -236,24 +250,29 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
 
     def defaultUserConfig(
         self
-    ) -> dict:
+    ) -> UserConfig:
 
-        return {
-            "groups": [
-            ]
-        }
+        return UserConfig()
 
     def collectRunConfigFromWidget(
         self
     ) -> dict:
 
         run_config = self.defaultRunConfig()
-        # library config is never changed
+        # library config is never changed, an access rate limit set by hand is kept
+        rate_limit = (self.__config_data["run"].get("library") or {}).get("rate_limit")
+        if rate_limit is not None:
+            run_config["library"]["rate_limit"] = rate_limit
         run_config["login"]["auto_captcha"] = self.AutoCaptchaCheckBox.isChecked()
         run_config["login"]["max_attempt"] = self.LoginAttemptSpinBox.value()
         run_config["web_driver"]["driver_type"] = self.BrowserTypeComboBox.currentText()
         run_config["web_driver"]["driver_path"] = self.BrowseBrowserDriverEdit.text()
         run_config["web_driver"]["headless"] = self.HeadlessCheckBox.isChecked()
+        # the browser contexts are not on the form either, keep values set by hand
+        web_driver = self.__config_data["run"].get("web_driver") or {}
+        for key in ("contexts", "experimental_contexts"):
+            if web_driver.get(key) is not None:
+                run_config["web_driver"][key] = web_driver[key]
         run_mode = 0
         if self.AutoReserveCheckBox.isChecked():
             run_mode |= 0x01
@@ -328,82 +347,78 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
 
     def collectUserFromWidget(
         self
-    ) -> dict:
-
-        user = {
-            "username": self.UsernameEdit.text(),
-            "password": self.PasswordEdit.text(),
-            "enabled": True,
-            "reserve_info": {
-                "begin_time":{},
-                "end_time": {},
-                "renew_time": {}
-            }
-        }
-        user["reserve_info"]["date"] = self.DateEdit.dateTime().toString("yyyy-MM-dd")
-        user["reserve_info"]["place"] = self.PlaceComboBox.currentText()
-        user["reserve_info"]["floor"] = self.__floor_rmap[self.FloorComboBox.currentText()]
-        user["reserve_info"]["room"] = self.__room_rmap[self.RoomComboBox.currentText()]
-        user["reserve_info"]["seat_id"] = self.SeatIDEdit.text()
-        user["reserve_info"]["begin_time"]["time"] = self.BeginTimeEdit.time().toString("HH:mm")
-        user["reserve_info"]["begin_time"]["max_diff"] = self.MaxBeginTimeDiffSpinBox.value()
-        user["reserve_info"]["begin_time"]["prefer_early"] = self.PreferEarlyBeginTimeCheckBox.isChecked()
-        user["reserve_info"]["end_time"]["time"] = self.EndTimeEdit.time().toString("HH:mm")
-        user["reserve_info"]["end_time"]["max_diff"] = self.MaxEndTimeDiffSpinBox.value()
-        user["reserve_info"]["end_time"]["prefer_early"] = not self.PreferLateEndTimeCheckBox.isChecked()
-        user["reserve_info"]["expect_duration"] = self.ExpectDurationSpinBox.value()
-        user["reserve_info"]["satisfy_duration"] = self.SatisfyDurationCheckBox.isChecked()
-        user["reserve_info"]["renew_time"]["expect_duration"] = self.ExpectRenewDurationSpinBox.value()
-        user["reserve_info"]["renew_time"]["max_diff"] = self.MaxRenewTimeDiffSpinBox.value()
-        user["reserve_info"]["renew_time"]["prefer_early"] = not self.PreferLateRenewTimeCheckBox.isChecked()
-        return user
+    ) -> User:
+
+        return User(
+            username=self.UsernameEdit.text(),
+            password=self.PasswordEdit.text(),
+            enabled=True,
+            reserve_info=ReserveInfo(
+                date=self.DateEdit.dateTime().toString("yyyy-MM-dd"),
+                place=self.PlaceComboBox.currentText(),
+                floor=self.__floor_rmap[self.FloorComboBox.currentText()],
+                room=self.__room_rmap[self.RoomComboBox.currentText()],
+                seat_id=self.SeatIDEdit.text(),
+                begin_time=TimeSpec(
+                    self.BeginTimeEdit.time().toString("HH:mm"),
+                    self.MaxBeginTimeDiffSpinBox.value(),
+                    self.PreferEarlyBeginTimeCheckBox.isChecked()
+                ),
+                end_time=TimeSpec(
+                    self.EndTimeEdit.time().toString("HH:mm"),
+                    self.MaxEndTimeDiffSpinBox.value(),
+                    not self.PreferLateEndTimeCheckBox.isChecked()
+                ),
+                expect_duration=self.ExpectDurationSpinBox.value(),
+                satisfy_duration=self.SatisfyDurationCheckBox.isChecked(),
+                renew_time=RenewSpec(
+                    self.ExpectRenewDurationSpinBox.value(),
+                    self.MaxRenewTimeDiffSpinBox.value(),
+                    not self.PreferLateRenewTimeCheckBox.isChecked()
+                )
+            )
+        )
 
     def collectUsersFromTreeWidget(
         self
-    ) -> dict:
+    ) -> UserConfig:
 
-        user_config = self.defaultUserConfig()
-        for i in range(self.UserTreeWidget.topLevelItemCount()):
-            GroupItem = self.UserTreeWidget.topLevelItem(i)
-            group_config = {
-                "name": GroupItem.text(0),
-                "enabled": GroupItem.checkState(1) == Qt.CheckState.Checked,
-                "users": []
-            }
-            for j in range(GroupItem.childCount()):
-                UserItem = GroupItem.child(j)
-                user = UserItem.data(0, Qt.UserRole)
-                if not user:
-                    continue
-                user["enabled"] = UserItem.checkState(1) == Qt.CheckState.Checked
-                group_config["users"].append(user)
-            user_config["groups"].append(group_config)
-        return user_config
+        # the model holds the users themselves, checking a user sets its 'enabled'
+        return self.UserTreeWidget.userConfig()
 
     def setUserToWidget(
         self,
-        user: dict
+        user: User
     ) -> None:
 
+        reserve_info = user.reserve_info
         try:
-            self.UsernameEdit.setText(user["username"])
-            self.PasswordEdit.setText(user["password"])
-            self.DateEdit.setDate(QDate.fromString(user["reserve_info"]["date"], "yyyy-MM-dd"))
-            self.PlaceComboBox.setCurrentText(user["reserve_info"]["place"])
-            self.FloorComboBox.setCurrentText(self.__floor_map[user["reserve_info"]["floor"]])
-            self.RoomComboBox.setCurrentText(self.__room_map[user["reserve_info"]["room"]])
-            self.SeatIDEdit.setText(user["reserve_info"]["seat_id"])
-            self.BeginTimeEdit.setTime(QTime.fromString(user["reserve_info"]["begin_time"]["time"], "H:mm"))
-            self.MaxBeginTimeDiffSpinBox.setValue(user["reserve_info"]["begin_time"]["max_diff"])
-            self.PreferEarlyBeginTimeCheckBox.setChecked(user["reserve_info"]["begin_time"]["prefer_early"])
-            self.EndTimeEdit.setTime(QTime.fromString(user["reserve_info"]["end_time"]["time"], "H:mm"))
-            self.MaxEndTimeDiffSpinBox.setValue(user["reserve_info"]["end_time"]["max_diff"])
-            self.PreferLateEndTimeCheckBox.setChecked(not user["reserve_info"]["end_time"]["prefer_early"])
-            self.ExpectDurationSpinBox.setValue(user["reserve_info"]["expect_duration"])
-            self.SatisfyDurationCheckBox.setChecked(user["reserve_info"]["satisfy_duration"])
-            self.ExpectRenewDurationSpinBox.setValue(user["reserve_info"]["renew_time"]["expect_duration"])
-            self.MaxRenewTimeDiffSpinBox.setValue(user["reserve_info"]["renew_time"]["max_diff"])
-            self.PreferLateRenewTimeCheckBox.setChecked(not user["reserve_info"]["renew_time"]["prefer_early"])
+            self.UsernameEdit.setText(user.username)
+            self.PasswordEdit.setText(user.password)
+            self.DateEdit.setDate(QDate.fromString(reserve_info.date, "yyyy-MM-dd"))
+            self.PlaceComboBox.setCurrentText(reserve_info.place)
+            self.FloorComboBox.setCurrentText(self.__floor_map[reserve_info.floor])
+            self.RoomComboBox.setCurrentText(self.__room_map[reserve_info.room])
+            self.SeatIDEdit.setText(reserve_info.seat_id)
+            self.BeginTimeEdit.setTime(QTime.fromString(reserve_info.begin_time.time, "H:mm"))
+            self.MaxBeginTimeDiffSpinBox.setValue(reserve_info.begin_time.max_diff)
+            self.PreferEarlyBeginTimeCheckBox.setChecked(reserve_info.begin_time.prefer_early)
+            self.EndTimeEdit.setTime(QTime.fromString(reserve_info.end_time.time, "H:mm"))
+            self.MaxEndTimeDiffSpinBox.setValue(reserve_info.end_time.max_diff)
+            self.PreferLateEndTimeCheckBox.setChecked(not reserve_info.end_time.prefer_early)
+            self.ExpectDurationSpinBox.setValue(reserve_info.expect_duration)
+            self.SatisfyDurationCheckBox.setChecked(reserve_info.satisfy_duration)
+            self.ExpectRenewDurationSpinBox.setValue(reserve_info.renew_time.expect_duration)
+            self.MaxRenewTimeDiffSpinBox.setValue(reserve_info.renew_time.max_diff)
+            self.PreferLateRenewTimeCheckBox.setChecked(not reserve_info.renew_time.prefer_early)
+            if user.error is not None:
+                QMessageBox.warning(
+                    self,
+                    "警告 - AutoLibrary",
+                    f"用户 '{user.username}' 的配置格式不正确, 修改后保存才会运行 ! :\n"
+                    f"{user.error}\n"
+                    f"文件路径: {self.__config_paths['user']}\n"
+                )
         except KeyError as e:
             QMessageBox.warning(
                 self,
@@ -423,44 +438,11 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
 
     def setUsersToTreeWidget(
         self,
-        users: dict
+        users: UserConfig
     ):
 
-        self.UserTreeWidget.clear()
-        self.UserTreeWidget.itemChanged.disconnect(self.onUserTreeWidgetItemChanged)
-        try:
-            if "groups" in users:
-                for group_config in users["groups"]:
-                    GroupItem = QTreeWidgetItem(self.UserTreeWidget, ALUserTreeItemType.GROUP.value)
-                    GroupItem.setText(0, group_config["name"])
-                    GroupItem.setFlags(GroupItem.flags() | Qt.ItemIsEditable)
-                    GroupItem.setCheckState(1, Qt.Checked if group_config.get("enabled", True) else Qt.Unchecked)
-                    for user_config in group_config["users"]:
-                        UserItem = QTreeWidgetItem(GroupItem, ALUserTreeItemType.USER.value)
-                        UserItem.setText(0, user_config["username"])
-                        UserItem.setText(1, "" if user_config.get("enabled", True) else "跳过")
-                        UserItem.setData(0, Qt.UserRole, user_config)
-                        UserItem.setCheckState(1, Qt.Checked if user_config.get("enabled", True) else Qt.Unchecked)
-                        UserItem.setDisabled(not group_config.get("enabled", True))
-                    GroupItem.setExpanded(True)
-        except KeyError as e:
-            QMessageBox.warning(
-                self,
-                "警告 - AutoLibrary",
-                f"用户配置文件读取键 '{e}' 时发生错误 ! :\n"
-                f"文件路径: {self.__config_paths['user']}\n"
-                "文件可能被意外修改或已经损坏\n"
-            )
-        except Exception as e:
-            QMessageBox.warning(
-                self,
-                "警告 - AutoLibrary",
-                f"用户配置文件读取键 '{e}' 时发生未知错误 ! :\n"
-                f"文件路径: {self.__config_paths['user']}\n"
-                "文件可能被意外修改或已经损坏\n"
-            )
-        finally:
-            self.UserTreeWidget.itemChanged.connect(self.onUserTreeWidgetItemChanged)
+        # the model holds the users themselves, no per item copy
+        self.UserTreeWidget.setUserConfig(users)
 
     def loadRunConfig(
         self,
@@ -509,14 +491,17 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
     def loadUserConfig(
         self,
         user_config_path: str
-    ) -> dict:
+    ) -> UserConfig:
 
         try:
             if not user_config_path or not os.path.exists(user_config_path):
                 raise Exception("文件路径不存在")
+            if UserStore.isStorePath(user_config_path):
+                with UserStore(user_config_path) as store:
+                    return store.load()
             user_config = JSONReader(user_config_path).data()
             if user_config and "groups" in user_config:
-                return user_config
+                return UserConfig.fromDict(user_config)
             # compatibility with old version config format
             elif user_config and "users" in user_config:
                 user_config = {
@@ -528,7 +513,7 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
                         }
                     ]
                 }
-                return user_config
+                return UserConfig.fromDict(user_config)
             else:
                 return None
         except Exception as e:
@@ -542,15 +527,20 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
     def saveUserConfig(
         self,
         user_config_path: str,
-        user_config_data: dict
+        user_config_data: UserConfig
     ) -> bool:
 
         try:
             if not user_config_path:
                 raise Exception("文件路径为空")
-            if not user_config_data or not isinstance(user_config_data, dict):
+            if not isinstance(user_config_data, UserConfig):
                 raise Exception("用户配置数据为空或类型错误")
-            JSONWriter(user_config_path, user_config_data)
+            if UserStore.isStorePath(user_config_path):
+                # only the rows that changed are written
+                with UserStore(user_config_path) as store:
+                    store.save(user_config_data)
+                return True
+            JSONWriter(user_config_path, user_config_data.toDict())
             return True
         except Exception as e:
             QMessageBox.warning(
@@ -592,19 +582,21 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
                 self,
                 "从现有配置文件中加载 - AutoLibrary",
                 f"{QDir.toNativeSeparators(QDir.currentPath())}",
-                "JSON 文件 (*.json);;所有文件 (*)"
+                "JSON 文件 (*.json);;SQLite 用户库 (*.db *.sqlite *.sqlite3);;所有文件 (*)"
             )[0]
             if not config_path:
                 return False
         try:
-            run_config = self.loadRunConfig(config_path)
+            run_config = None
+            if not UserStore.isStorePath(config_path):
+                run_config = self.loadRunConfig(config_path)
             user_config = self.loadUserConfig(config_path)
             if run_config is not None:
                 self.__config_data["run"].update(run_config)
                 self.setRunConfigToWidget(self.__config_data["run"])
                 return True
             if user_config is not None:
-                self.__config_data["user"].update(user_config)
+                self.__config_data["user"] = user_config
                 self.setUsersToTreeWidget(self.__config_data["user"])
                 return True
         except:
@@ -613,46 +605,40 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
     def addGroup(
         self,
         group_name: str = ""
-    ) -> QTreeWidgetItem:
+    ) -> QModelIndex:
 
-        self.UserTreeWidget.itemChanged.disconnect(self.onUserTreeWidgetItemChanged)
-        GroupItem = QTreeWidgetItem(self.UserTreeWidget, ALUserTreeItemType.GROUP.value)
         if not group_name:
-            group_name = f"新分组-{self.UserTreeWidget.topLevelItemCount()}"
-        GroupItem.setText(0, group_name)
-        GroupItem.setFlags(GroupItem.flags() | Qt.ItemIsEditable)
-        GroupItem.setCheckState(1, Qt.Checked)
-        self.UserTreeWidget.setCurrentItem(GroupItem)
-        self.UserTreeWidget.itemChanged.connect(self.onUserTreeWidgetItemChanged)
-        return GroupItem
+            group_name = f"新分组-{self.UserTreeWidget.groupCount() + 1}"
+        GroupIndex = self.UserTreeWidget.addGroup(group_name)
+        self.UserTreeWidget.setCurrentIndex(GroupIndex)
+        return GroupIndex
 
     def delGroup(
         self,
-        GroupItem: QTreeWidgetItem = None
+        GroupIndex: QModelIndex = None
     ):
 
-        if GroupItem is None:
+        if GroupIndex is None:
             return
-        if GroupItem.type() != ALUserTreeItemType.GROUP.value:
+        if self.UserTreeWidget.itemType(GroupIndex) != ALUserTreeItemType.GROUP:
             return
-        index = self.UserTreeWidget.indexOfTopLevelItem(GroupItem)
-        self.UserTreeWidget.takeTopLevelItem(index)
+        GroupIndex = QPersistentModelIndex(GroupIndex)
+        self.UserTreeWidget.setCurrentIndex(QModelIndex())
+        self.UserTreeWidget.removeItem(QModelIndex(GroupIndex))
 
     def addUser(
         self,
-        GroupItem: QTreeWidgetItem = None
-    ) -> QTreeWidgetItem:
-
-        if GroupItem is None:
-            CurrentItem = self.UserTreeWidget.currentItem()
-            if CurrentItem is None:
-                GroupItem = self.addGroup()
-        if GroupItem.type() == ALUserTreeItemType.USER.value:
-            GroupItem = GroupItem.parent()
-        if GroupItem.checkState(1) == Qt.CheckState.Unchecked:
+        GroupIndex: QModelIndex = None
+    ) -> QModelIndex:
+
+        if GroupIndex is None or not GroupIndex.isValid():
+            GroupIndex = self.addGroup()
+        if self.UserTreeWidget.itemType(GroupIndex) == ALUserTreeItemType.USER:
+            GroupIndex = GroupIndex.parent()
+        if not self.UserTreeWidget.isChecked(GroupIndex):
             return None
-        new_user = {
-            "username": f"新用户-{GroupItem.childCount()}",
+        new_user = User.fromDict({
+            "username": f"新用户-{self.UserTreeWidget.userCount(GroupIndex)}",
             "password": "000000",
             "enabled": True,
             "reserve_info": {
@@ -679,43 +665,42 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
                     "prefer_early": True
                 }
             }
-        }
-        self.UserTreeWidget.itemChanged.disconnect(self.onUserTreeWidgetItemChanged)
-        UserItem = QTreeWidgetItem(GroupItem, ALUserTreeItemType.USER.value)
-        UserItem.setText(0, new_user["username"])
-        UserItem.setText(1, "")
-        UserItem.setData(0, Qt.UserRole, new_user)
-        UserItem.setCheckState(1, Qt.CheckState.Checked)
-        GroupItem.setExpanded(True)
-        self.UserTreeWidget.setCurrentItem(UserItem)
-        self.setUserToWidget(new_user)
-        self.UserTreeWidget.itemChanged.connect(self.onUserTreeWidgetItemChanged)
-        return UserItem
+        })
+        UserIndex = self.UserTreeWidget.addUser(GroupIndex, new_user)
+        # the user is shown through the current index change
+        self.UserTreeWidget.setCurrentIndex(UserIndex)
+        return UserIndex
 
     def delUser(
         self,
-        UserItem: QTreeWidgetItem = None
+        UserIndex: QModelIndex = None
     ):
 
-        if UserItem is None:
+        if UserIndex is None:
             return
-        if UserItem.type() != ALUserTreeItemType.USER.value:
+        if self.UserTreeWidget.itemType(UserIndex) != ALUserTreeItemType.USER:
             return
-        ParentItem = UserItem.parent()
-        index = ParentItem.indexOfChild(UserItem)
-        ParentItem.takeChild(index)
-        if ParentItem.childCount() == 0:
-            self.UserTreeWidget.setCurrentItem(None)
+        UserIndex = QPersistentModelIndex(UserIndex)
+        # leave the user before its row goes away
+        self.UserTreeWidget.setCurrentIndex(QModelIndex())
+        ParentIndex = QModelIndex(UserIndex).parent()
+        row = UserIndex.row()
+        self.UserTreeWidget.removeItem(QModelIndex(UserIndex))
+        count = self.UserTreeWidget.model().rowCount(ParentIndex)
+        if count > 0:
+            self.UserTreeWidget.setCurrentIndex(
+                self.UserTreeWidget.model().index(min(row, count - 1), 0, ParentIndex)
+            )
 
     def renameItem(
         self,
-        item: QTreeWidgetItem,
+        index: QModelIndex,
     ):
 
-        if item is None:
+        if index is None or not index.isValid():
             return
-        old_name = item.text(0)
-        if item.parent() is None:
+        old_name = index.siblingAtColumn(0).data()
+        if self.UserTreeWidget.itemType(index) == ALUserTreeItemType.GROUP:
             item_type = "分组"
         else:
             item_type = "用户"
@@ -725,15 +710,15 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
         new_name = new_name.strip()
         if not ok or not new_name:
             return
-        item.setText(0, new_name)
-        if item.type() == ALUserTreeItemType.GROUP.value:
-            item.setText(0, new_name)
+        if self.UserTreeWidget.itemType(index) == ALUserTreeItemType.GROUP:
+            self.UserTreeWidget.model().setData(index.siblingAtColumn(0), new_name)
         else:
-            user = item.data(0, Qt.UserRole)
-            user["username"] = new_name
-            item.setText(0, new_name)
-            item.setData(0, Qt.UserRole, user)
-            self.setUserToWidget(user)
+            is_current = index.siblingAtColumn(0) == self.UserTreeWidget.currentIndex().siblingAtColumn(0)
+            user = self.UserTreeWidget.user(index)
+            user.username = new_name
+            self.UserTreeWidget.setUser(index, user)
+            if is_current:
+                self.setUserToWidget(user)
 
     @Slot()
     def onShowPasswordCheckBoxChecked(
@@ -780,55 +765,125 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
             self.SeatIDEdit.setText(",".join(Dialog.getSelectedSeats()))
 
     @Slot()
-    def onUserTreeWidgetCurrentItemChanged(
+    def onUserTreeWidgetCurrentIndexChanged(
         self,
-        current: QTreeWidgetItem,
-        previous: QTreeWidgetItem
+        current: QModelIndex,
+        previous: QModelIndex
     ):
         # dont care about the 'self.__config_data["user"]', we already
         # cant effectively update the data of each user, due to the
-        # possiblity of frequency edit. we just let the QListWidget
+        # possiblity of frequency edit. we just let the tree model
         # help us.
-        if previous and previous.type() == ALUserTreeItemType.USER.value:
+        current = QPersistentModelIndex(current)
+        if self.UserTreeWidget.itemType(previous) == ALUserTreeItemType.USER:
             user = self.collectUserFromWidget()
             if user:
                 self.UsernameEdit.textEdited.disconnect()
-                user["enabled"] = previous.checkState(1) == Qt.Checked
-                previous.setText(0, user["username"])
-                previous.setText(1, "" if user.get("enabled", True) else "跳过")
-                previous.setData(0, Qt.UserRole, user)
-        if current is None:
+                user.enabled = self.UserTreeWidget.user(previous).enabled
+                # may resort the tree, 'current' is kept persistent for it
+                self.UserTreeWidget.setUser(previous, user)
+        if not current.isValid():
             self.initializeUserInfoWidget()
             return
-        if current.type() == ALUserTreeItemType.USER.value:
-            user = current.data(0, Qt.UserRole)
+        if self.UserTreeWidget.itemType(QModelIndex(current)) == ALUserTreeItemType.USER:
+            user = self.UserTreeWidget.user(QModelIndex(current))
             if user:
                 self.setUserToWidget(user)
-                self.UsernameEdit.textEdited.connect(lambda text: current.setText(0, text))
+                self.UsernameEdit.textEdited.connect(
+                    lambda text: self.UserTreeWidget.model().setData(QModelIndex(current), text)
+                )
         else:
             self.initializeUserInfoWidget()
 
     @Slot()
-    def onUserTreeWidgetItemChanged(
+    def onUserTreeWidgetDataChanged(
         self,
-        item: QTreeWidgetItem,
-        column: int
+        top_left: QModelIndex,
+        bottom_right: QModelIndex
     ):
 
-        if item is None:
+        if self.UserTreeWidget.itemType(top_left) != ALUserTreeItemType.GROUP:
             return
-        if column != 1:
+        if bottom_right.column() != 1 or self.UserTreeWidget.isChecked(top_left):
             return
-        if item.type() == ALUserTreeItemType.GROUP.value:
-            is_checked = item.checkState(1) == Qt.CheckState.Checked
-            for i in range(item.childCount()):
-                Child = item.child(i)
-                if self.UserTreeWidget.currentItem() == Child:
-                    self.UserTreeWidget.setCurrentItem(item)
-                Child.setDisabled(not is_checked)
+        # users of a disabled group can not stay current
+        if self.UserTreeWidget.currentIndex().parent().siblingAtColumn(0) == top_left.siblingAtColumn(0):
+            self.UserTreeWidget.setCurrentIndex(top_left.siblingAtColumn(0))
+
+    def importUsers(
+        self,
+        import_path: str = ""
+    ) -> bool:
+
+        if not import_path:
+            import_path = QFileDialog.getOpenFileName(
+                self,
+                "批量导入用户 - AutoLibrary",
+                f"{QDir.toNativeSeparators(QDir.currentPath())}",
+                "CSV 文件 (*.csv);;JSON Lines 文件 (*.jsonl *.ndjson);;所有文件 (*)"
+            )[0]
+            if not import_path:
+                return False
+        # merged outside the tree, the tree is reset once with the result
+        user_config = self.collectUsersFromTreeWidget()
+        try:
+            report = mergeUsers(user_config, readUserRows(import_path))
+        except Exception as e:
+            QMessageBox.warning(
+                self,
+                "警告 - AutoLibrary",
+                f"用户导入发生错误 ! :\n{e}"
+            )
+            return False
+        if report.inserted or report.updated:
+            self.setUsersToTreeWidget(user_config)
+        if report.errors:
+            QMessageBox.warning(
+                self,
+                "警告 - AutoLibrary",
+                f"部分用户未能导入 ! :\n{report.summary()}"
+            )
         else:
-            is_checked = item.checkState(1) == Qt.CheckState.Checked
-            item.setText(1, "" if is_checked else "跳过")
+            QMessageBox.information(
+                self,
+                "提示 - AutoLibrary",
+                f"用户导入完成:\n{report.summary()}"
+            )
+        return bool(report.inserted or report.updated)
+
+    def exportUsers(
+        self,
+        export_path: str = ""
+    ) -> bool:
+
+        if not export_path:
+            export_path = QFileDialog.getSaveFileName(
+                self,
+                "批量导出用户 - AutoLibrary",
+                f"{QDir.toNativeSeparators(QDir.currentPath())}",
+                "CSV 文件 (*.csv);;JSON Lines 文件 (*.jsonl *.ndjson);;所有文件 (*)"
+            )[0]
+            if not export_path:
+                return False
+        user_config = self.collectUsersFromTreeWidget()
+        try:
+            count = writeUsers(
+                export_path,
+                ((group.name, user) for group in user_config.groups for user in group.users)
+            )
+        except Exception as e:
+            QMessageBox.warning(
+                self,
+                "警告 - AutoLibrary",
+                f"用户导出发生错误 ! :\n{e}"
+            )
+            return False
+        QMessageBox.information(
+            self,
+            "提示 - AutoLibrary",
+            f"已导出 {count} 个用户:\n{QDir.toNativeSeparators(export_path)}"
+        )
+        return True
 
     def showTreeMenu(
         self,
@@ -836,38 +891,47 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
     ):
 
         AddGroupAction = QAction("添加分组", menu)
+        ImportUsersAction = QAction("批量导入用户...", menu)
+        ExportUsersAction = QAction("批量导出用户...", menu)
         AddGroupAction.triggered.connect(self.addGroup)
+        ImportUsersAction.triggered.connect(lambda: self.importUsers())
+        ExportUsersAction.triggered.connect(lambda: self.exportUsers())
         menu.addAction(AddGroupAction)
+        menu.addSeparator()
+        menu.addAction(ImportUsersAction)
+        menu.addAction(ExportUsersAction)
+        if not self.UserTreeWidget.groupCount():
+            ExportUsersAction.setEnabled(False)
 
     def showGroupMenu(
         self,
         menu: QMenu,
-        GroupItem: QTreeWidgetItem = None
+        GroupIndex: QModelIndex = None
     ):
 
         AddUserAction = QAction("添加用户", menu)
         RenameGroupAction = QAction("重命名分组", menu)
         DelGroupAction = QAction("删除分组", menu)
-        AddUserAction.triggered.connect(lambda: self.addUser(GroupItem))
-        RenameGroupAction.triggered.connect(lambda: self.renameItem(GroupItem))
-        DelGroupAction.triggered.connect(lambda: self.delGroup(GroupItem))
+        AddUserAction.triggered.connect(lambda: self.addUser(GroupIndex))
+        RenameGroupAction.triggered.connect(lambda: self.renameItem(GroupIndex))
+        DelGroupAction.triggered.connect(lambda: self.delGroup(GroupIndex))
         menu.addAction(AddUserAction)
         menu.addSeparator()
         menu.addAction(RenameGroupAction)
         menu.addAction(DelGroupAction)
-        if GroupItem.checkState(1) == Qt.CheckState.Unchecked:
+        if not self.UserTreeWidget.isChecked(GroupIndex):
             AddUserAction.setEnabled(False)
 
     def showUserMenu(
         self,
         menu: QMenu,
-        UserItem: QTreeWidgetItem = None
+        UserIndex: QModelIndex = None
     ):
 
         RenameUserAction = QAction("重命名用户", menu)
         DelUserAction = QAction("删除用户", menu)
-        RenameUserAction.triggered.connect(lambda: self.renameItem(UserItem))
-        DelUserAction.triggered.connect(lambda: self.delUser(UserItem))
+        RenameUserAction.triggered.connect(lambda: self.renameItem(UserIndex))
+        DelUserAction.triggered.connect(lambda: self.delUser(UserIndex))
         menu.addAction(RenameUserAction)
         menu.addAction(DelUserAction)
 
@@ -877,14 +941,14 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
         pos
     ):
 
-        CurrentItem = self.UserTreeWidget.itemAt(pos)
+        CurrentIndex = self.UserTreeWidget.indexAt(pos)
         Menu = QMenu(self.UserTreeWidget)
-        if CurrentItem is None:
+        if not CurrentIndex.isValid():
             self.showTreeMenu(Menu)
-        elif CurrentItem.type() == ALUserTreeItemType.GROUP.value:
-            self.showGroupMenu(Menu, CurrentItem)
+        elif self.UserTreeWidget.itemType(CurrentIndex) == ALUserTreeItemType.GROUP:
+            self.showGroupMenu(Menu, CurrentIndex)
         else:
-            self.showUserMenu(Menu, CurrentItem)
+            self.showUserMenu(Menu, CurrentIndex)
         Menu.exec_(self.UserTreeWidget.mapToGlobal(pos))
 
     @Slot()
@@ -892,16 +956,16 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
         self
     ):
 
-        CurrentItem = self.UserTreeWidget.currentItem()
-        self.addUser(CurrentItem)
+        CurrentIndex = self.UserTreeWidget.currentIndex()
+        self.addUser(CurrentIndex)
 
     @Slot()
     def onDelUserButtonClicked(
         self
     ):
 
-        CurrentItem = self.UserTreeWidget.currentItem()
-        self.delUser(CurrentItem)
+        CurrentIndex = self.UserTreeWidget.currentIndex()
+        self.delUser(CurrentIndex)
 
     @Slot()
     def onBrowseBrowserDriverButtonClicked(
@@ -974,13 +1038,13 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
             self,
             "选择其它的用户配置 - AutoLibrary",
             self.CurrentUserConfigEdit.text(),
-            "JSON 文件 (*.json);;所有文件 (*)"
+            "JSON 文件 (*.json);;SQLite 用户库 (*.db *.sqlite *.sqlite3);;所有文件 (*)"
         )[0]
         if user_config_path:
             user_config_path = QDir.toNativeSeparators(user_config_path)
             data = self.loadUserConfig(user_config_path)
             if data is not None:
-                self.__config_data["user"].update(data)
+                self.__config_data["user"] = data
                 self.setUsersToTreeWidget(data)
                 self.__config_paths["user"] = user_config_path
                 self.CurrentUserConfigEdit.setText(user_config_path)
@@ -1023,7 +1087,7 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
             self,
             "导出用户配置 - AutoLibrary",
             self.CurrentUserConfigEdit.text(),
-            "JSON 文件 (*.json);;所有文件 (*)"
+            "JSON 文件 (*.json);;SQLite 用户库 (*.db *.sqlite *.sqlite3);;所有文件 (*)"
         )[0]
         if user_config_path:
             self.ExportUserConfigEdit.setText(QDir.toNativeSeparators(user_config_path))
@@ -1111,9 +1175,9 @@ class ALConfigWidget(CenterOnParentMixin, QWidget, Ui_ALConfigWidget):
         self
     ):
 
-        CurrentItem = self.UserTreeWidget.currentItem()
-        if CurrentItem and CurrentItem.type() == ALUserTreeItemType.USER.value:
-            self.UserTreeWidget.setCurrentItem(None)
+        CurrentIndex = self.UserTreeWidget.currentIndex()
+        if self.UserTreeWidget.itemType(CurrentIndex) == ALUserTreeItemType.USER:
+            self.UserTreeWidget.setCurrentIndex(QModelIndex())
         if self.saveConfigs(
             self.__config_paths["run"],
             self.__config_paths["user"]
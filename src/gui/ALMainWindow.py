@@ -9,6 +9,8 @@ See the LICENSE file for details.
 """
 import queue
 
+from datetime import timedelta
+
 from PySide6.QtCore import (
     QTimer,
     QUrl,
@@ -20,8 +22,7 @@ from PySide6.QtGui import (
     QCloseEvent,
     QDesktopServices,
     QFont,
-    QIcon,
-    QTextCursor
+    QIcon
 )
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -31,6 +32,7 @@ from PySide6.QtWidgets import (
 )
 
 from base.MsgBase import MsgBase
+from base.MsgQueue import MsgQueue
 from gui.ALAboutDialog import ALAboutDialog
 from gui.ALConfigWidget import ALConfigWidget
 from gui.ALSettingsWidget import ALSettingsWidget
@@ -41,11 +43,25 @@ from gui.ALMainWorkers import (
 from gui.ALTimerTaskManageWidget import ALTimerTaskManageWidget
 from gui.resources import ALResource
 from gui.resources.ui.Ui_ALMainWindow import Ui_ALMainWindow
+from interfaces.ConfigProvider import CfgKey
+from managers.config.ConfigManager import instance as configInstance
 from managers.config.ConfigUtils import ConfigUtils
+from utils.JSONReader import JSONReader
+from utils.TaskAdmissionQueue import TaskAdmissionQueue
 
 
 class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
 
+    # message view limits
+    MSG_BATCH_SIZE = 200
+    MSG_MAX_BLOCKS = 5000
+
+    # queued timer tasks due within this window run in one browser session
+    TIMER_TASK_COALESCE_WINDOW = timedelta(seconds=60)
+
+    # signal : message queue (emitted from worker threads)
+    msgQueueIsReady = Signal()
+
     # signal : timer task
     timerTaskIsRunning = Signal(dict)
     timerTaskIsExecuted = Signal(dict)
@@ -55,22 +71,21 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
         self
     ):
 
-        MsgBase.__init__(self, queue.Queue(), queue.Queue())
+        MsgBase.__init__(self, queue.Queue(), MsgQueue())
         QMainWindow.__init__(self)
-        self.__timer_task_queue = queue.Queue()
+        self.__timer_task_queue = TaskAdmissionQueue()
+        self.__timer_task_threads: dict[str, TimerTaskWorker] = {}
         self.__config_paths = ConfigUtils.getAutomationConfigPaths()
         self.__alTimerTaskManageWidget = None
         self.__alConfigWidget = None
         self.__alSettingsWidget = None
         self.__auto_lib_thread = None
-        self.__current_timer_task_thread = None
-        self.__is_running_timer_task = False
 
         self.setupUi(self)
         self.modifyUi()
         self.setupTray()
         self.connectSignals()
-        self.startMsgPolling()
+        self.startMsgDelivery()
         self.startTimerTaskPolling()
         self._showLog("主窗口初始化完成")
 
@@ -81,6 +96,7 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
         self.Icon = QIcon(":/res/icons/AutoLibrary_Logo_64.svg")
         self.setWindowIcon(self.Icon)
         self.MessageIOTextEdit.setFont(QFont("Courier New", 10))
+        self.MessageIOTextEdit.setMaximumBlockCount(self.MSG_MAX_BLOCKS)
         self.ManualAction.triggered.connect(self.onManualActionTriggered)
         self.AboutAction.triggered.connect(self.onAboutActionTriggered)
         self.SettingsAction.triggered.connect(self.onSettingsActionTriggered)
@@ -96,7 +112,7 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
             )
             self.__alTimerTaskManageWidget = None
             self.TimerTaskManageWidgetButton.setEnabled(False)
-            self.TimerTaskManageWidgetButton.setToolTip("定时任务功能初始化失败, 请检查配置文件。")
+            self.TimerTaskManageWidgetButton.setToolTip(f"定时任务功能初始化失败: {e}")
             return
         self.timerTaskIsRunning.connect(self.__alTimerTaskManageWidget.onTimerTaskIsRunning)
         self.timerTaskIsExecuted.connect(self.__alTimerTaskManageWidget.onTimerTaskIsExecuted)
@@ -179,13 +195,13 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
             self.showNormal()
             event.ignore()
             return
-        if self.__msg_queue_timer and self.__msg_queue_timer.isActive():
-            self.__msg_queue_timer.stop()
+        self._output_queue.setNotifier(None)
         if self.__timer_task_timer and self.__timer_task_timer.isActive():
             self.__timer_task_timer.stop()
-        if self.__is_running_timer_task:
-            self.__current_timer_task_thread.wait(2000)
-            self.__current_timer_task_thread.deleteLater()
+        for timer_task_thread in set(self.__timer_task_threads.values()):
+            timer_task_thread.wait(2000)
+            timer_task_thread.deleteLater()
+        self.__timer_task_threads.clear()
         if self.__alTimerTaskManageWidget:
             self.__alTimerTaskManageWidget.close()
             self.__alTimerTaskManageWidget.deleteLater()
@@ -203,62 +219,97 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
         text: str
     ):
 
-        cursor = self.MessageIOTextEdit.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertText(text + "\n")
-        self.MessageIOTextEdit.setTextCursor(cursor)
-        self.MessageIOTextEdit.ensureCursorVisible()
+        # one append per batch, the document drops the oldest blocks
+        # beyond MSG_MAX_BLOCKS by itself
+        self.MessageIOTextEdit.appendPlainText(text)
         scrollbar = self.MessageIOTextEdit.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
 
-    def startMsgPolling(
+    def startMsgDelivery(
         self
     ):
 
-        self.__msg_queue_timer = QTimer()
-        self.__msg_queue_timer.timeout.connect(self.pollMsgQueue)
-        self.__msg_queue_timer.start(100)
+        # workers push through a queued signal instead of being polled
+        self.msgQueueIsReady.connect(self.pollMsgQueue, Qt.ConnectionType.QueuedConnection)
+        self._output_queue.setNotifier(self.msgQueueIsReady.emit)
+        self.msgQueueIsReady.emit()
 
     def startTimerTaskPolling(
         self
     ):
 
+        self.loadExecutionLimits()
+        # ready tasks start right away, the timer only retries tasks held
+        # back by the CPU limit
         self.__timer_task_timer = QTimer()
         self.__timer_task_timer.timeout.connect(self.pollTimerTaskQueue)
         self.__timer_task_timer.start(500)
 
-    def pollTimerTaskQueue(
+    def loadExecutionLimits(
         self
     ):
 
-        if self.__is_running_timer_task:
-            return
+        cfg = configInstance()
+        max_browsers = int(cfg.get(CfgKey.GLOBAL.EXECUTION.MAX_BROWSERS, 2))
+        # every worker reads the captcha typed in from the one input queue,
+        # so with manual captcha only one session may wait for it
+        if max_browsers > 1 and self.manualCaptcha():
+            max_browsers = 1
+            self._showLog("运行配置使用手动验证码, 定时任务将逐个执行")
+        self.__timer_task_queue.setLimits(
+            max_browsers,
+            float(cfg.get(CfgKey.GLOBAL.EXECUTION.MAX_CPU_LOAD, 0.8))
+        )
+
+    def manualCaptcha(
+        self
+    ) -> bool:
+
         try:
-            while not self.__is_running_timer_task:
-                timer_task = self.__timer_task_queue.get_nowait()
-                self.timerTaskIsRunning.emit(timer_task)
-                self.__timer_task_timer.stop()
-                self.__is_running_timer_task = True
-                self.setControlButtons(None, True, False)
-                if not timer_task["silent"]:
-                    self.TrayIcon.showMessage(
-                        "定时任务 - AutoLibrary",
-                        f"\n已开始执行定时任务: \n{timer_task['name']}",
-                        QSystemTrayIcon.MessageIcon.Information,
-                        1000
-                    )
-                    self.showNormal()
-                self.__current_timer_task_thread = TimerTaskWorker(
-                    timer_task,
-                    self._input_queue,
-                    self._output_queue,
-                    self.__config_paths
+            run_config = JSONReader(self.__config_paths["run"]).data()
+        except Exception:
+            return False
+        return not run_config.get("login", {}).get("auto_captcha", True)
+
+    def pollTimerTaskQueue(
+        self
+    ):
+
+        running = len(set(self.__timer_task_threads.values()))
+        for timer_tasks in self.__timer_task_queue.admit(running, self.TIMER_TASK_COALESCE_WINDOW):
+            self.startTimerTasks(timer_tasks)
+
+    def startTimerTasks(
+        self,
+        timer_tasks: list[dict]
+    ):
+
+        self.setControlButtons(None, True, False)
+        for timer_task in timer_tasks:
+            self.timerTaskIsRunning.emit(timer_task)
+            if not timer_task["silent"]:
+                self.TrayIcon.showMessage(
+                    "定时任务 - AutoLibrary",
+                    f"\n已开始执行定时任务: \n{timer_task['name']}",
+                    QSystemTrayIcon.MessageIcon.Information,
+                    1000
                 )
-                self.__current_timer_task_thread.timerTaskWorkerIsFinished.connect(self.onTimerTaskFinished)
-                self.__current_timer_task_thread.start()
-        except queue.Empty:
-            self.__is_running_timer_task = False
-            pass
+                self.showNormal()
+        timer_task_thread = TimerTaskWorker(
+            timer_tasks,
+            self._input_queue,
+            self._output_queue,
+            self.__config_paths
+        )
+        timer_task_thread.timerTaskWorkerIsFinished.connect(self.onTimerTaskFinished)
+        for timer_task in timer_tasks:
+            self.__timer_task_threads[timer_task["uuid"]] = timer_task_thread
+        timer_task_thread.start()
+        self._showLog(
+            f"定时任务 {', '.join(x['name'] for x in timer_tasks)} 开始执行, "
+            f"正在执行 {len(set(self.__timer_task_threads.values()))} 个会话, "
+            f"等待 {len(self.__timer_task_queue)} 个任务"
+        )
 
     def setControlButtons(
         self,
@@ -280,12 +331,16 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
         self
     ):
 
-        try:
-            while True:
-                msg = self._output_queue.get_nowait()
-                self.appendToTextEdit(msg)
-        except queue.Empty:
-            pass
+        events = self._output_queue.getBatch(self.MSG_BATCH_SIZE)
+        lines = [event.format() for event in events]
+        dropped = self._output_queue.takeDroppedCount()
+        if dropped:
+            lines.insert(0, f"...... 消息过多, 已省略 {dropped} 条消息 ......")
+        if lines:
+            self.appendToTextEdit("\n".join(lines))
+        if len(events) == self.MSG_BATCH_SIZE:
+            # more messages left, let the event loop breathe between batches
+            QTimer.singleShot(0, self.pollMsgQueue)
 
     @Slot()
     def onTimerTaskManageWidgetClosed(
@@ -304,6 +359,7 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
             self.__alConfigWidget.deleteLater()
             self.__alConfigWidget = None
         self.__config_paths = ConfigUtils.getAutomationConfigPaths()
+        self.loadExecutionLimits()
         self.setControlButtons(True, None, None)
         self._showLog("配置窗口已关闭,配置文件路径已更新")
 
@@ -317,6 +373,7 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
             self.__alSettingsWidget.deleteLater()
             self.__alSettingsWidget = None
         self.SettingsAction.setEnabled(True)
+        self.loadExecutionLimits()
 
     @Slot()
     def onSettingsActionTriggered(
@@ -338,7 +395,10 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
         timer_task: dict
     ):
 
-        self.__timer_task_queue.put(timer_task)
+        self.__timer_task_queue.push(timer_task)
+        # tasks fired by the same check are all queued before admission,
+        # so they can be coalesced
+        QTimer.singleShot(0, self.pollTimerTaskQueue)
 
     @Slot(dict)
     def onTimerTaskFinished(
@@ -347,13 +407,14 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
         timer_task: dict
     ):
 
-        self.__current_timer_task_thread.wait(1000)
-        self.__current_timer_task_thread.timerTaskWorkerIsFinished.disconnect(self.onTimerTaskFinished)
-        self.__current_timer_task_thread.deleteLater()
-        self.__current_timer_task_thread = None
-        self.setControlButtons(None, False, True)
-        self.__is_running_timer_task = False
-        self.__timer_task_timer.start(500)
+        timer_task_thread = self.__timer_task_threads.pop(timer_task["uuid"], None)
+        # a coalesced worker reports once per task, release it after the last
+        if timer_task_thread and timer_task_thread not in self.__timer_task_threads.values():
+            timer_task_thread.wait(1000)
+            timer_task_thread.timerTaskWorkerIsFinished.disconnect(self.onTimerTaskFinished)
+            timer_task_thread.deleteLater()
+        if not self.__timer_task_threads:
+            self.setControlButtons(None, False, True)
         timer_task["executed"] = True
         self.TrayIcon.showMessage(
             "定时任务 - AutoLibrary",
@@ -368,6 +429,7 @@ class ALMainWindow(MsgBase, QMainWindow, Ui_ALMainWindow):
             self.timerTaskIsExecuted.emit(timer_task)
         else:
             self.timerTaskIsError.emit(timer_task)
+        self.pollTimerTaskQueue()
 
     @Slot()
     def onTimerTaskManageWidgetButtonClicked(
@@ -9,7 +9,6 @@ See the LICENSE file for details.
 """
 import uuid
 
-from enum import Enum
 from datetime import datetime, timedelta
 
 from PySide6.QtCore import (
@@ -31,20 +30,10 @@ from PySide6.QtWidgets import (
 )
 
 from gui.resources.ui.Ui_ALTimerTaskAddDialog import Ui_ALTimerTaskAddDialog
+from utils.TimerTaskUtils import ALTimerTaskStatus
 from utils.TimerUtils import TimerUtils
 
 
-class ALTimerTaskStatus(Enum):
-
-    PENDING = "等待中"
-    READY = "已就绪"
-    RUNNING = "执行中"
-    EXECUTED = "已执行"
-    ERROR = "执行失败"
-    OUTDATED = "已过期"
-    UNKNOWN = "未知"
-
-
 class ALTimerTaskAddDialog(QDialog, Ui_ALTimerTaskAddDialog):
 
     def __init__(
@@ -245,8 +234,6 @@ class ALTimerTaskAddDialog(QDialog, Ui_ALTimerTaskAddDialog):
         repeat = self.RepeatCheckBox.isChecked()
         task_data["repeat"] = repeat
         if repeat:
-            if "repeat_history" not in task_data:
-                task_data["repeat_history"] = []
             repeat_days = []
             if self.MonCheckBox.isChecked():
                 repeat_days.append(0)
@@ -7,16 +7,149 @@ This software is provided "as is", without any warranty of any kind.
 You may use, modify, and distribute this file under the terms of the MIT License.
 See the LICENSE file for details.
 """
-from datetime import datetime
+from typing import Any
 
-from PySide6.QtCore import Slot, Qt
+from PySide6.QtCore import (
+    QAbstractTableModel, QModelIndex,
+    Slot, Qt
+)
 from PySide6.QtWidgets import (
-    QDialog, QTableWidget, QTableWidgetItem,
+    QDialog, QTableView, QAbstractItemView,
     QVBoxLayout, QHBoxLayout, QGridLayout,
     QPushButton, QLabel, QHeaderView
 )
 
-from gui.ALTimerTaskAddDialog import ALTimerTaskStatus
+import managers.history.TimerTaskHistoryManager as TimerTaskHistoryManager
+
+from utils.TimerTaskUtils import ALTimerTaskStatus
+
+
+class ALTimerTaskHistoryModel(QAbstractTableModel):
+    """
+        Lazily paged table model of a task execution history.
+
+        Rows are read from the history store one page at a time when the
+        view scrolls near the end, so opening the dialog costs one page no
+        matter how long the history is.
+    """
+
+    PAGE_SIZE = 200
+    HEADERS = ["执行时间", "结果", "耗时（秒/s）"]
+
+    def __init__(
+        self,
+        parent = None,
+        task_uuid: str = ""
+    ):
+
+        super().__init__(parent)
+        self.__history_mgr = TimerTaskHistoryManager.instance()
+        self.__task_uuid = task_uuid
+        self.__records = []
+        self.__total = self.__history_mgr.count(task_uuid)
+
+    def rowCount(
+        self,
+        parent: QModelIndex = QModelIndex()
+    ) -> int:
+
+        return 0 if parent.isValid() else len(self.__records)
+
+    def columnCount(
+        self,
+        parent: QModelIndex = QModelIndex()
+    ) -> int:
+
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def totalCount(
+        self
+    ) -> int:
+
+        return self.__total
+
+    def canFetchMore(
+        self,
+        parent: QModelIndex
+    ) -> bool:
+
+        return not parent.isValid() and len(self.__records) < self.__total
+
+    def fetchMore(
+        self,
+        parent: QModelIndex
+    ):
+
+        if parent.isValid():
+            return
+        after = self.__records[-1] if self.__records else None
+        records = self.__history_mgr.page(self.__task_uuid, self.PAGE_SIZE, after)
+        if not records:
+            self.__total = len(self.__records)
+            return
+        for record in records:
+            try:
+                record["result"] = ALTimerTaskStatus(record["result"])
+            except ValueError:
+                record["result"] = ALTimerTaskStatus.UNKNOWN
+        begin = len(self.__records)
+        self.beginInsertRows(QModelIndex(), begin, begin + len(records) - 1)
+        self.__records.extend(records)
+        self.endInsertRows()
+
+    def clear(
+        self
+    ):
+
+        self.beginResetModel()
+        self.__history_mgr.clear(self.__task_uuid)
+        self.__records = []
+        self.__total = 0
+        self.endResetModel()
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+
+        if role == Qt.ItemDataRole.DisplayRole\
+        and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(
+        self,
+        index: QModelIndex,
+        role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+
+        if not index.isValid():
+            return None
+        record = self.__records[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            match column:
+                case 0:
+                    return record.get("execute_time", "")
+                case 1:
+                    return record["result"].value
+                case 2:
+                    return f"{record.get("duration", 0):.2f}"
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        elif role == Qt.ItemDataRole.ForegroundRole and column == 1:
+            match record["result"]:
+                case ALTimerTaskStatus.EXECUTED:
+                    return Qt.GlobalColor.green
+                case ALTimerTaskStatus.ERROR:
+                    return Qt.GlobalColor.red
+                case ALTimerTaskStatus.OUTDATED:
+                    return Qt.GlobalColor.red
+                case _:
+                    return Qt.GlobalColor.black
+        return None
 
 
 class ALTimerTaskHistoryDialog(QDialog):
@@ -29,7 +162,7 @@ class ALTimerTaskHistoryDialog(QDialog):
 
         super().__init__(parent)
         self.__task_data = task_data
-        self.__history = task_data.get("repeat_history", [])
+        self.__history_model = ALTimerTaskHistoryModel(self, task_data.get("uuid", ""))
 
         self.setupUi()
         self.connectSignals()
@@ -55,17 +188,16 @@ class ALTimerTaskHistoryDialog(QDialog):
             RepeatLabel.setStyleSheet("color: #2294FF; font-size: 12px;")
             InfoLayout.addWidget(RepeatLabel, 0, 1)
         MainLayout.addLayout(InfoLayout)
-        self.HistoryTableWidget = QTableWidget()
-        self.HistoryTableWidget.setColumnCount(3)
-        self.HistoryTableWidget.setHorizontalHeaderLabels(["执行时间", "结果", "耗时（秒/s）"])
-        self.HistoryTableWidget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.HistoryTableWidget.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        self.HistoryTableWidget.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        self.HistoryTableWidget.verticalHeader().setVisible(False)
-        self.HistoryTableWidget.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.HistoryTableWidget.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.loadHistory()
-        MainLayout.addWidget(self.HistoryTableWidget)
+        self.HistoryTableView = QTableView()
+        self.HistoryTableView.setModel(self.__history_model)
+        self.HistoryTableView.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.HistoryTableView.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.HistoryTableView.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.HistoryTableView.verticalHeader().setVisible(False)
+        self.HistoryTableView.verticalHeader().setDefaultSectionSize(25)
+        self.HistoryTableView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.HistoryTableView.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        MainLayout.addWidget(self.HistoryTableView)
         ButtonLayout = QHBoxLayout()
         ButtonLayout.addStretch()
         self.CloseButton = QPushButton("关闭")
@@ -85,54 +217,15 @@ class ALTimerTaskHistoryDialog(QDialog):
         self.CloseButton.clicked.connect(self.accept)
         self.ClearHistoryButton.clicked.connect(self.onClearHistoryButtonClicked)
 
-    def loadHistory(
+    def getHistoryCount(
         self
-    ):
-
-        self.HistoryTableWidget.setRowCount(len(self.__history))
-        for row, record in enumerate(self.__history):
-            self.addHistoryRow(row, record)
-
-    def getHistory(
-        self
-    ) -> list:
-
-        return self.__history
-
-    def addHistoryRow(
-        self,
-        row: int,
-        record: dict
-    ):
+    ) -> int:
 
-        execute_time = record.get("execute_time", "")
-        result = record.get("result", ALTimerTaskStatus.UNKNOWN)
-        duration = record.get("duration", 0)
-        ExecuteTimeItem = QTableWidgetItem(execute_time)
-        ExecuteTimeItem.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.HistoryTableWidget.setItem(row, 0, ExecuteTimeItem)
-        ResultItem = QTableWidgetItem(result.value)
-        ResultItem.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        match result:
-            case ALTimerTaskStatus.EXECUTED:
-                ResultItem.setForeground(Qt.GlobalColor.green)
-            case ALTimerTaskStatus.ERROR:
-                ResultItem.setForeground(Qt.GlobalColor.red)
-            case ALTimerTaskStatus.OUTDATED:
-                ResultItem.setForeground(Qt.GlobalColor.red)
-            case _:
-                ResultItem.setForeground(Qt.GlobalColor.black)
-        self.HistoryTableWidget.setItem(row, 1, ResultItem)
-        DurationItem = QTableWidgetItem(f"{duration:.2f}")
-        DurationItem.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.HistoryTableWidget.setItem(row, 2, DurationItem)
-        self.HistoryTableWidget.setRowHeight(row, 25)
+        return self.__history_model.totalCount()
 
     @Slot()
     def onClearHistoryButtonClicked(
         self
     ):
 
-        self.__history.clear()
-        self.HistoryTableWidget.setRowCount(0)
-        self.__task_data["repeat_history"] = self.__history
+        self.__history_model.clear()
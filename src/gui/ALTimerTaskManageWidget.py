@@ -10,9 +10,10 @@ See the LICENSE file for details.
 import os
 import sys
 import copy
+import math
 
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from PySide6.QtCore import (
     QTimer,
@@ -37,11 +38,9 @@ from PySide6.QtWidgets import (
 )
 
 import managers.config.ConfigManager as ConfigManager
+import managers.history.TimerTaskHistoryManager as TimerTaskHistoryManager
 
-from gui.ALTimerTaskAddDialog import (
-    ALTimerTaskAddDialog,
-    ALTimerTaskStatus
-)
+from gui.ALTimerTaskAddDialog import ALTimerTaskAddDialog
 from gui.ALTimerTaskHistoryDialog import ALTimerTaskHistoryDialog
 from gui.ALWidgetMixin import CenterOnParentMixin
 from gui.resources.ui.Ui_ALTimerTaskManageWidget import Ui_ALTimerTaskManageWidget
@@ -49,7 +48,11 @@ from interfaces.ConfigProvider import (
     CfgKey,
     ConfigProvider
 )
-from utils.TimerUtils import TimerUtils
+from utils.TimerScheduler import TimerScheduler
+from utils.TimerTaskUtils import (
+    ALTimerTaskStatus,
+    TimerTaskUtils
+)
 
 
 class ALTimerTaskItemWidget(QWidget):
@@ -198,6 +201,9 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
         BY_ADD_TIME = "按添加时间"
         BY_EXECUTE_TIME = "按执行时间"
 
+    # longest single wait, bounds how late a sleep/resume is noticed
+    MAX_WAIT_MS = 10000
+
     timerTaskIsReady = Signal(dict)
     timerTasksChanged = Signal()
     timerTaskManageWidgetIsClosed = Signal()
@@ -209,11 +215,18 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
 
         super().__init__(parent)
         self.__cfg_mgr: ConfigProvider = ConfigManager.instance()
+        self.__history_mgr = TimerTaskHistoryManager.instance()
         self.__timer_tasks = []
+        self.__scheduler = TimerScheduler()
         self.__CheckTimer = None
+        self.__task_lock = TimerTaskUtils.taskLock(ConfigManager.instance().configDir())
         self.__sort_policy = self.SortPolicy.BY_EXECUTE_TIME
         self.__sort_order = Qt.SortOrder.AscendingOrder
 
+        # held as long as the app runs, another instance of the same data
+        # dir (e.g. the headless daemon) would fire the tasks twice
+        if not self.__task_lock.acquire():
+            raise Exception("定时任务已由另一个 AutoLibrary 实例执行 (图形界面或守护进程) !")
         self.setupUi(self)
         self.connectSignals()
         self.setupTimer()
@@ -235,8 +248,41 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
     ):
 
         self.__CheckTimer = QTimer(self)
+        self.__CheckTimer.setSingleShot(True)
+        self.__CheckTimer.setTimerType(Qt.TimerType.PreciseTimer)
         self.__CheckTimer.timeout.connect(self.checkTasks)
-        self.__CheckTimer.start(500)
+
+    def armTimer(
+        self
+    ):
+        """
+            Arm the check timer for the earliest pending task.
+        """
+
+        delay = self.__scheduler.secondsUntilNext()
+        if delay is None:
+            self.__CheckTimer.stop()
+            return
+        self.__CheckTimer.start(min(math.ceil(delay*1000), self.MAX_WAIT_MS))
+
+    def scheduleTask(
+        self,
+        timer_task: dict
+    ):
+
+        if timer_task["status"] is ALTimerTaskStatus.PENDING:
+            self.__scheduler.schedule(timer_task["uuid"], timer_task["execute_time"])
+        else:
+            self.__scheduler.cancel(timer_task["uuid"])
+
+    def rescheduleAllTasks(
+        self
+    ):
+
+        self.__scheduler.clear()
+        for timer_task in self.__timer_tasks:
+            self.scheduleTask(timer_task)
+        self.armTimer()
 
     def initializeTimerTasks(
         self
@@ -245,11 +291,14 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
         timer_tasks = self.getTimerTasks()
         if timer_tasks is not None:
             self.__timer_tasks = timer_tasks
+            self.__history_mgr.retain(x["uuid"] for x in timer_tasks)
+            self.rescheduleAllTasks()
             self.timerTasksChanged.emit()
             return True
         timer_tasks = []
         if self.setTimerTasks(copy.deepcopy(timer_tasks)):
             self.__timer_tasks = timer_tasks
+            self.rescheduleAllTasks()
             return True
         return False
 
@@ -260,14 +309,7 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
         try:
             timer_tasks = self.__cfg_mgr.get(CfgKey.TIMERTASK.ROOT)
             if timer_tasks and "timer_tasks" in timer_tasks:
-                for task in timer_tasks["timer_tasks"]:
-                    task["added_time"] = datetime.strptime(task["added_time"], "%Y-%m-%d %H:%M:%S")
-                    task["execute_time"] = datetime.strptime(task["execute_time"], "%Y-%m-%d %H:%M:%S")
-                    task["status"] = ALTimerTaskStatus(task["status"])
-                    if "repeat_history" in task:
-                        for item in task["repeat_history"]:
-                            item["result"] = ALTimerTaskStatus(item["result"])
-                return timer_tasks["timer_tasks"]
+                return TimerTaskUtils.decodeTimerTasks(timer_tasks["timer_tasks"], self.__history_mgr)
             raise Exception("定时任务配置文件格式错误")
         except Exception as e:
             QMessageBox.warning(
@@ -283,13 +325,7 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
     ) -> bool:
 
         try:
-            for task in timer_tasks:
-                task["added_time"] = task["added_time"].strftime("%Y-%m-%d %H:%M:%S")
-                task["execute_time"] = task["execute_time"].strftime("%Y-%m-%d %H:%M:%S")
-                task["status"] = task["status"].value
-                if "repeat_history" in task:
-                    for item in task["repeat_history"]:
-                        item["result"] = item["result"].value
+            timer_tasks = TimerTaskUtils.encodeTimerTasks(timer_tasks)
             self.__cfg_mgr.set(CfgKey.TIMERTASK.ROOT, { "timer_tasks": timer_tasks })
             return True
         except Exception as e:
@@ -387,6 +423,7 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
         if Dialog.exec() == QDialog.DialogCode.Accepted:
             timer_task = Dialog.getTimerTask()
             self.__timer_tasks.append(timer_task)
+            self.scheduleTask(timer_task)
             self.timerTasksChanged.emit()
 
     def editTask(
@@ -400,19 +437,16 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
             for i, task in enumerate(self.__timer_tasks):
                 if task["uuid"] == updated["uuid"]:
                     self.__timer_tasks[i] = updated
+                    self.scheduleTask(updated)
                     break
             self.timerTasksChanged.emit()
 
-    @staticmethod
     def getTimerTaskDetailMessage(
+        self,
         timer_task: dict
     ):
 
-        if "repeat_history" not in timer_task:
-            history = []
-        else:
-            history = timer_task["repeat_history"]
-        history_count = len(history)
+        history_count = self.__history_mgr.count(timer_task["uuid"])
         return (
             f"任务名称：{timer_task["name"]}\n"
             f"添加时间：{timer_task["added_time"]}\n"
@@ -447,6 +481,8 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
             x for x in self.__timer_tasks
             if x["uuid"] != task_uuid
         ]
+        self.__scheduler.cancel(task_uuid)
+        self.__history_mgr.clear(task_uuid)
         self.timerTasksChanged.emit()
 
     def clearAllTasks(
@@ -508,6 +544,8 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
                 return
         # clear all tasks
         self.__timer_tasks.clear()
+        self.__scheduler.clear()
+        self.__history_mgr.retain([])
         self.timerTasksChanged.emit()
 
     def showTaskHistory(
@@ -516,8 +554,7 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
     ):
 
         Dialog = ALTimerTaskHistoryDialog(self, task)
-        if Dialog.exec() == QDialog.DialogCode.Accepted:
-            self.timerTasksChanged.emit()
+        Dialog.exec()
 
     def checkTasks(
         self
@@ -525,17 +562,21 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
 
         need_update = False
 
+        if self.__scheduler.detectClockJump() < 0:
+            # the clock was set back, repeat tasks may now be a cycle late
+            need_update = self.rewindRepeatTasks()
         now = datetime.now()
-        for timer_task in self.__timer_tasks:
-            if timer_task["execute_time"] > now:
-                continue
+        due_uuids = set(self.__scheduler.popDue(now))
+        due_tasks = [
+            x for x in self.__timer_tasks
+            if x["uuid"] in due_uuids
+        ] if due_uuids else []
+        for timer_task in due_tasks:
             if timer_task["status"] is not ALTimerTaskStatus.PENDING:
                 continue
-            if timer_task["execute_time"] <= now + timedelta(seconds = -5):
-                if timer_task.get("repeat", False):
-                    self.onRepeatTimerTaskIs(ALTimerTaskStatus.OUTDATED, timer_task)
-                else:
-                    timer_task["status"] = ALTimerTaskStatus.OUTDATED
+            if TimerTaskUtils.isOutdated(timer_task, now):
+                TimerTaskUtils.applyResult(ALTimerTaskStatus.OUTDATED, timer_task, self.__history_mgr)
+                self.scheduleTask(timer_task)
                 need_update = True
             else:
                 timer_task["status"] = ALTimerTaskStatus.READY
@@ -543,6 +584,19 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
                 need_update = True
         if need_update:
             self.timerTasksChanged.emit()
+        else:
+            self.armTimer()
+
+    def rewindRepeatTasks(
+        self
+    ) -> bool:
+
+        rewound = False
+        for timer_task in self.__timer_tasks:
+            if TimerTaskUtils.rewindRepeatTask(timer_task):
+                self.scheduleTask(timer_task)
+                rewound = True
+        return rewound
 
     @Slot(int)
     def onSortPolicyComboBoxChanged(
@@ -579,6 +633,7 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
         self.setTimerTasks(copy.deepcopy(self.__timer_tasks))
         self.updateTimerTaskList()
         self.updateStat()
+        self.armTimer()
 
     @Slot(dict)
     def onTimerTaskIsRunning(
@@ -592,57 +647,6 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
                 break
         self.timerTasksChanged.emit()
 
-    def onRepeatTimerTaskIs(
-        self,
-        status: ALTimerTaskStatus,
-        timer_task: dict
-    ) -> dict:
-
-        # only these status are valid
-        valid_statuses = {ALTimerTaskStatus.EXECUTED, ALTimerTaskStatus.ERROR,
-                         ALTimerTaskStatus.OUTDATED}
-        if status not in valid_statuses:
-            return timer_task
-        if "repeat_history" not in timer_task:
-            timer_task["repeat_history"] = []
-        if status != ALTimerTaskStatus.OUTDATED:
-            executed_time = datetime.now()
-            duration = (executed_time - timer_task["execute_time"]).total_seconds()
-            timer_task["repeat_history"].append({
-                "execute_time": timer_task["execute_time"].strftime("%Y-%m-%d %H:%M:%S"),
-                "executed_time": executed_time.strftime("%Y-%m-%d %H:%M:%S"),
-                "result": status,
-                "duration": duration,
-                "uuid": timer_task["uuid"]
-            })
-        else:
-            current_time = datetime.now()
-            execute_time = timer_task["execute_time"]
-            execute_weekday = execute_time.weekday()
-            delta_days = (current_time - execute_time).days
-            for i in range(delta_days + 1):
-                if (execute_weekday + i)%7 in timer_task["repeat_days"]:
-                    timer_task["repeat_history"].append({
-                        "execute_time": (execute_time + timedelta(days=i)).strftime("%Y-%m-%d %H:%M:%S"),
-                        "executed_time": (execute_time + timedelta(days=i)).strftime("%Y-%m-%d %H:%M:%S"),
-                        "result": status,
-                        "duration": 0,
-                        "uuid": timer_task["uuid"]
-                    })
-        next_time = TimerUtils.getNextTimerRepeatTime(
-            timer_task["repeat_days"],
-            timer_task["repeat_hour"],
-            timer_task["repeat_minute"],
-            timer_task["repeat_second"]
-        )
-        if next_time:
-            timer_task["execute_time"] = next_time
-            timer_task["status"] = ALTimerTaskStatus.PENDING
-            timer_task["executed"] = False
-        else:
-            timer_task["status"] = status
-        return timer_task
-
     @Slot(dict)
     def onTimerTaskIsExecuted(
         self,
@@ -651,10 +655,8 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
 
         for task in self.__timer_tasks:
             if task["uuid"] == timer_task["uuid"]:
-                if task.get("repeat", False):
-                    self.onRepeatTimerTaskIs(ALTimerTaskStatus.EXECUTED, task)
-                else:
-                    task["status"] = ALTimerTaskStatus.EXECUTED
+                TimerTaskUtils.applyResult(ALTimerTaskStatus.EXECUTED, task, self.__history_mgr)
+                self.scheduleTask(task)
                 break
         self.timerTasksChanged.emit()
 
@@ -666,9 +668,7 @@ class ALTimerTaskManageWidget(CenterOnParentMixin, QWidget, Ui_ALTimerTaskManage
 
         for task in self.__timer_tasks:
             if task["uuid"] == timer_task["uuid"]:
-                if task.get("repeat", False):
-                    self.onRepeatTimerTaskIs(ALTimerTaskStatus.ERROR, task)
-                else:
-                    task["status"] = ALTimerTaskStatus.ERROR
+                TimerTaskUtils.applyResult(ALTimerTaskStatus.ERROR, task, self.__history_mgr)
+                self.scheduleTask(task)
                 break
         self.timerTasksChanged.emit()
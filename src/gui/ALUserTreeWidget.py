@@ -8,19 +8,22 @@ You may use, modify, and distribute this file under the terms of the MIT License
 See the LICENSE file for details.
 """
 from enum import Enum
+from typing import Any
 
 from PySide6.QtCore import (
     Qt,
     QSize,
-    QCoreApplication,
     QRect,
-    QPoint
+    QPoint,
+    QMimeData,
+    QModelIndex,
+    QPersistentModelIndex,
+    QAbstractItemModel
 )
 from PySide6.QtWidgets import (
     QAbstractScrollArea,
     QAbstractItemView,
-    QTreeWidget,
-    QTreeWidgetItem
+    QTreeView
 )
 from PySide6.QtGui import (
      QDragEnterEvent,
@@ -28,6 +31,8 @@ from PySide6.QtGui import (
      QDropEvent
 )
 
+from managers.config.UserConfig import Group, User, UserConfig
+
 
 class ALUserTreeItemType(Enum):
 
@@ -35,7 +40,50 @@ class ALUserTreeItemType(Enum):
     USER = 1
 
 
-class ALUserTreeWidget(QTreeWidget):
+def _itemFlags(
+    item_type: ALUserTreeItemType,
+    enabled: bool,
+    column: int
+) -> Qt.ItemFlag:
+
+    flags = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+    if column == 1:
+        flags |= Qt.ItemFlag.ItemIsUserCheckable
+    if enabled:
+        flags |= Qt.ItemFlag.ItemIsEnabled
+    if item_type == ALUserTreeItemType.GROUP:
+        flags |= Qt.ItemFlag.ItemIsDropEnabled
+        if column == 0:
+            flags |= Qt.ItemFlag.ItemIsEditable
+    return flags
+
+# combined once, flags() is called for every row laid out
+_ITEM_FLAGS = {
+    (item_type, enabled, column): _itemFlags(item_type, enabled, column)
+    for item_type in ALUserTreeItemType
+    for enabled in (True, False)
+    for column in (0, 1)
+}
+
+
+class ALUserTreeModel(QAbstractItemModel):
+    """
+        Group/user tree model over the ``Group`` and ``User`` objects of a
+        user config, no per row item is created.
+
+        Group rows have an internal id of 0, user rows the id of their group,
+        ids are stable while groups are added, removed and moved. The users
+        of a group are only reported to the view once the group is expanded
+        (``fetchMore``).
+
+        The lists are kept in the order shown: ``sort`` sorts them in place
+        and an edit re-sorts the level of the row it changed, so the config
+        read back by ``userConfig`` is in display order.
+    """
+
+    HEADERS = ["分组/用户", "状态"]
+    ItemTypeRole = Qt.ItemDataRole.UserRole + 1
+    MIME_TYPE = "application/x-autolibrary-user-tree"
 
     def __init__(
         self,
@@ -43,17 +91,504 @@ class ALUserTreeWidget(QTreeWidget):
     ):
 
         super().__init__(parent)
+        self.__groups: list[Group] = []
+        self.__group_ids: list[int] = []
+        self.__group_rows: dict[int, int] = {}
+        self.__fetched: set[int] = set()
+        self.__next_id = 1
+        self.__sort_column = -1
+        self.__sort_order = Qt.SortOrder.AscendingOrder
+
+    @staticmethod
+    def sortText(
+        item: Group | User,
+        column: int
+    ) -> str:
+
+        if isinstance(item, Group):
+            return item.name if column == 0 else ""
+        if column == 0:
+            return item.username
+        return "" if item.enabled else "跳过"
+
+    def __newGroupId(
+        self
+    ) -> int:
+
+        group_id = self.__next_id
+        self.__next_id += 1
+        return group_id
+
+    def __updateGroupRows(
+        self
+    ):
+
+        self.__group_rows = {group_id: row for row, group_id in enumerate(self.__group_ids)}
+
+    def __group(
+        self,
+        index: QModelIndex
+    ) -> Group | None:
+
+        if not index.isValid() or index.internalId() != 0:
+            return None
+        return self.__groups[index.row()]
+
+    def __groupOf(
+        self,
+        index: QModelIndex
+    ) -> Group | None:
+
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        return self.__groups[self.__group_rows[index.internalId()]]
+
+    def __item(
+        self,
+        index: QModelIndex
+    ) -> Group | User | None:
+
+        group = self.__group(index)
+        if group is not None:
+            return group
+        group = self.__groupOf(index)
+        return None if group is None else group.users[index.row()]
+
+    def __sortKey(
+        self,
+        item: Group | User
+    ) -> str:
+
+        return self.sortText(item, self.__sort_column)
+
+    def __sortGroups(
+        self
+    ):
+
+        order = sorted(
+            range(len(self.__groups)),
+            key=lambda x: self.__sortKey(self.__groups[x]),
+            reverse=self.__sort_order == Qt.SortOrder.DescendingOrder
+        )
+        self.__groups = [self.__groups[row] for row in order]
+        self.__group_ids = [self.__group_ids[row] for row in order]
+        self.__updateGroupRows()
+
+    def __sortUsers(
+        self,
+        group: Group
+    ):
+
+        group.users.sort(key=self.__sortKey, reverse=self.__sort_order == Qt.SortOrder.DescendingOrder)
+
+    def __resort(
+        self,
+        parent: QModelIndex = None
+    ):
+        """
+            Re-sort the groups (invalid parent), the users of one group
+            (group parent) or everything (None), persistent indexes follow
+            their rows.
+        """
+
+        if self.__sort_column < 0:
+            return
+        group = None if parent is None else self.__group(parent)
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        items = [self.__item(index) for index in persistent]
+        if group is None:
+            self.__sortGroups()
+        for x in self.__groups if parent is None else [group] if group is not None else []:
+            self.__sortUsers(x)
+        group_rows = {id(x): row for row, x in enumerate(self.__groups)}
+        user_rows: dict[int, dict[int, int]] = {}
+        moved = []
+        for index, item in zip(persistent, items):
+            if isinstance(item, Group):
+                row = group_rows[id(item)]
+            else:
+                if index.internalId() not in user_rows:
+                    users = self.__groups[self.__group_rows[index.internalId()]].users
+                    user_rows[index.internalId()] = {id(x): row for row, x in enumerate(users)}
+                row = user_rows[index.internalId()][id(item)]
+            moved.append(self.createIndex(row, index.column(), index.internalId()))
+        self.changePersistentIndexList(persistent, moved)
+        self.layoutChanged.emit()
+
+    def sort(
+        self,
+        column: int,
+        order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+    ):
+
+        self.__sort_column = column
+        self.__sort_order = order
+        self.__resort()
+
+    def setUserConfig(
+        self,
+        user_config: UserConfig
+    ):
+
+        # own group lists, the users themselves are shared with the config
+        self.beginResetModel()
+        self.__groups = [Group(group.name, group.enabled, list(group.users)) for group in user_config.groups]
+        self.__group_ids = [self.__newGroupId() for _ in self.__groups]
+        self.__updateGroupRows()
+        if self.__sort_column >= 0:
+            self.__sortGroups()
+            for group in self.__groups:
+                self.__sortUsers(group)
+        # nothing to fetch for empty groups
+        self.__fetched = {
+            group_id
+            for group_id, group in zip(self.__group_ids, self.__groups)
+            if not group.users
+        }
+        self.endResetModel()
+
+    def userConfig(
+        self
+    ) -> UserConfig:
+
+        return UserConfig([
+            Group(group.name, group.enabled, list(group.users))
+            for group in self.__groups
+        ])
+
+    def userCount(
+        self,
+        index: QModelIndex
+    ) -> int:
+        """
+            Get the number of users of a group, fetched or not.
+        """
+
+        group = self.__group(index)
+        return 0 if group is None else len(group.users)
+
+    def index(
+        self,
+        row: int,
+        column: int,
+        parent: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+
+        # called for every row laid out, kept free of other model calls
+        if row < 0 or column < 0 or column >= len(self.HEADERS):
+            return QModelIndex()
+        if not parent.isValid():
+            if row >= len(self.__groups):
+                return QModelIndex()
+            return self.createIndex(row, column, 0)
+        if parent.internalId() != 0 or parent.column() != 0:
+            return QModelIndex()
+        group_id = self.__group_ids[parent.row()]
+        if group_id not in self.__fetched or row >= len(self.__groups[parent.row()].users):
+            return QModelIndex()
+        return self.createIndex(row, column, group_id)
+
+    def parent(
+        self,
+        index: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(self.__group_rows[index.internalId()], 0, 0)
+
+    def rowCount(
+        self,
+        parent: QModelIndex = QModelIndex()
+    ) -> int:
+
+        if not parent.isValid():
+            return len(self.__groups)
+        if parent.internalId() != 0 or parent.column() != 0:
+            return 0
+        if self.__group_ids[parent.row()] not in self.__fetched:
+            return 0
+        return len(self.__groups[parent.row()].users)
+
+    def columnCount(
+        self,
+        parent: QModelIndex = QModelIndex()
+    ) -> int:
+
+        return len(self.HEADERS)
+
+    def hasChildren(
+        self,
+        parent: QModelIndex = QModelIndex()
+    ) -> bool:
+
+        if not parent.isValid():
+            return bool(self.__groups)
+        group = self.__group(parent)
+        return parent.column() == 0 and group is not None and bool(group.users)
+
+    def canFetchMore(
+        self,
+        parent: QModelIndex
+    ) -> bool:
+
+        group = self.__group(parent)
+        return group is not None and bool(group.users)\
+            and self.__group_ids[parent.row()] not in self.__fetched
+
+    def fetchMore(
+        self,
+        parent: QModelIndex
+    ):
+
+        if not self.canFetchMore(parent):
+            return
+        parent = parent.siblingAtColumn(0)
+        self.beginInsertRows(parent, 0, len(self.__groups[parent.row()].users) - 1)
+        self.__fetched.add(self.__group_ids[parent.row()])
+        self.endInsertRows()
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+
+        if role == Qt.ItemDataRole.DisplayRole\
+        and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(
+        self,
+        index: QModelIndex,
+        role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+
+        if not index.isValid():
+            return None
+        item = self.__item(index)
+        column = index.column()
+        match role:
+            case Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole:
+                return self.sortText(item, column)
+            case Qt.ItemDataRole.CheckStateRole if column == 1:
+                return Qt.CheckState.Checked if item.enabled else Qt.CheckState.Unchecked
+            case Qt.ItemDataRole.UserRole if isinstance(item, User):
+                return item
+            case self.ItemTypeRole:
+                if isinstance(item, Group):
+                    return ALUserTreeItemType.GROUP.value
+                return ALUserTreeItemType.USER.value
+        return None
+
+    def setData(
+        self,
+        index: QModelIndex,
+        value: Any,
+        role: int = Qt.ItemDataRole.EditRole
+    ) -> bool:
 
+        if not index.isValid():
+            return False
+        item = self.__item(index)
+        sort_key = self.__sortKey(item)
+        if role == Qt.ItemDataRole.CheckStateRole and index.column() == 1:
+            item.enabled = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif role == Qt.ItemDataRole.EditRole and index.column() == 0:
+            if isinstance(item, Group):
+                item.name = str(value)
+            else:
+                item.username = str(value)
+        elif role == Qt.ItemDataRole.UserRole and isinstance(item, User) and isinstance(value, User):
+            self.__groupOf(index).users[index.row()] = item = value
+        else:
+            return False
+        row = index.siblingAtColumn(0)
+        self.dataChanged.emit(row, index.siblingAtColumn(1))
+        if isinstance(item, Group) and role == Qt.ItemDataRole.CheckStateRole and self.rowCount(row):
+            # users of a disabled group are disabled too
+            self.dataChanged.emit(self.index(0, 0, row), self.index(self.rowCount(row) - 1, 1, row))
+        if self.__sortKey(item) != sort_key:
+            self.__resort(index.parent())
+        return True
+
+    def flags(
+        self,
+        index: QModelIndex
+    ) -> Qt.ItemFlag:
+
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        if index.internalId() == 0:
+            return _ITEM_FLAGS[ALUserTreeItemType.GROUP, True, index.column()]
+        # users of a disabled group are disabled too
+        return _ITEM_FLAGS[ALUserTreeItemType.USER, self.__groupOf(index).enabled, index.column()]
+
+    def supportedDropActions(
+        self
+    ) -> Qt.DropAction:
+
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(
+        self
+    ) -> list[str]:
+
+        return [self.MIME_TYPE]
+
+    def mimeData(
+        self,
+        indexes: list[QModelIndex]
+    ) -> QMimeData:
+
+        # drops are internal moves done by the view, nothing to serialize
+        mime_data = QMimeData()
+        mime_data.setData(self.MIME_TYPE, b"")
+        return mime_data
+
+    def __userIndex(
+        self,
+        parent: QModelIndex,
+        user: User
+    ) -> QModelIndex:
+
+        users = self.__groups[parent.row()].users
+        row = next(row for row, x in enumerate(users) if x is user)
+        return self.index(row, 0, parent)
+
+    def appendGroup(
+        self,
+        name: str,
+        enabled: bool = True
+    ) -> QModelIndex:
+
+        row = len(self.__groups)
+        group_id = self.__newGroupId()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.__groups.append(Group(name, enabled))
+        self.__group_ids.append(group_id)
+        self.__group_rows[group_id] = row
+        # nothing to fetch for a new group
+        self.__fetched.add(group_id)
+        self.endInsertRows()
+        self.__resort(QModelIndex())
+        return self.index(self.__group_rows[group_id], 0)
+
+    def appendUser(
+        self,
+        parent: QModelIndex,
+        user: User
+    ) -> QModelIndex:
+
+        group = self.__group(parent)
+        if group is None:
+            return QModelIndex()
+        parent = parent.siblingAtColumn(0)
+        self.fetchMore(parent)
+        row = len(group.users)
+        self.beginInsertRows(parent, row, row)
+        group.users.append(user)
+        self.endInsertRows()
+        self.__resort(parent)
+        return self.__userIndex(parent, user)
+
+    def removeRows(
+        self,
+        row: int,
+        count: int,
+        parent: QModelIndex = QModelIndex()
+    ) -> bool:
+
+        if count <= 0 or row < 0 or row + count > self.rowCount(parent):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        if parent.isValid():
+            del self.__groups[parent.row()].users[row:row + count]
+        else:
+            for group_id in self.__group_ids[row:row + count]:
+                self.__fetched.discard(group_id)
+            del self.__groups[row:row + count]
+            del self.__group_ids[row:row + count]
+            self.__updateGroupRows()
+        self.endRemoveRows()
+        return True
+
+    def moveUser(
+        self,
+        index: QModelIndex,
+        parent: QModelIndex
+    ) -> QModelIndex:
+        """
+            Move a user to another group, the row is moved, not rebuilt.
+
+            Returns:
+                QModelIndex: The index of the moved user.
+        """
+
+        source = self.__groupOf(index)
+        target = self.__group(parent)
+        source_parent = index.parent()
+        parent = parent.siblingAtColumn(0)
+        if source is None or target is None:
+            return QModelIndex()
+        if parent == source_parent:
+            return index.siblingAtColumn(0)
+        self.fetchMore(parent)
+        user = source.users[index.row()]
+        self.beginMoveRows(source_parent, index.row(), index.row(), parent, len(target.users))
+        target.users.append(source.users.pop(index.row()))
+        self.endMoveRows()
+        self.__resort(parent)
+        return self.__userIndex(parent, user)
+
+    def moveGroupToEnd(
+        self,
+        index: QModelIndex
+    ) -> QModelIndex:
+
+        if self.__group(index) is None:
+            return QModelIndex()
+        row = index.row()
+        group_id = self.__group_ids[row]
+        if row < len(self.__groups) - 1:
+            self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), len(self.__groups))
+            self.__groups.append(self.__groups.pop(row))
+            self.__group_ids.append(self.__group_ids.pop(row))
+            self.__updateGroupRows()
+            self.endMoveRows()
+            self.__resort(QModelIndex())
+        return self.index(self.__group_rows[group_id], 0)
+
+
+class ALUserTreeWidget(QTreeView):
+    """
+        Group/user tree of the config widget, a view of ``ALUserTreeModel``.
+
+        Dragging a user onto a group moves its row in the model, the tree is
+        never rebuilt for an edit.
+    """
+
+    # groups of larger configs start collapsed, users are fetched on expand
+    EXPAND_USER_LIMIT = 2000
+
+    def __init__(
+        self,
+        parent = None
+    ):
+
+        super().__init__(parent)
+
+        self.__user_model = ALUserTreeModel(self)
+        self.setModel(self.__user_model)
         self.setupUi()
-        self.translateUi()
 
     def setupUi(
         self
     ):
 
-        __QTreeWidgetItem = QTreeWidgetItem()
-        __QTreeWidgetItem.setText(0, u"\u5206\u7ec4/\u7528\u6237");
-        self.setHeaderItem(__QTreeWidgetItem)
         self.setObjectName(u"UserTreeWidget")
         self.setMinimumSize(QSize(230, 0))
         self.setMaximumSize(QSize(250, 16777215))
@@ -65,24 +600,115 @@ class ALUserTreeWidget(QTreeWidget):
         self.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
         self.setDefaultDropAction(Qt.DropAction.IgnoreAction)
         self.setAlternatingRowColors(True)
+        self.setUniformRowHeights(True)
         self.setSortingEnabled(True)
         self.sortByColumn(0, Qt.SortOrder.AscendingOrder)
         self.setAnimated(True)
         self.setAllColumnsShowFocus(False)
         self.setHeaderHidden(False)
-        self.setColumnCount(2)
         self.setColumnWidth(0, 150)
         self.setColumnWidth(1, 20)
         self.header().setCascadingSectionResizes(False)
         self.header().setHighlightSections(False)
         self.header().setProperty(u"showSortIndicator", True)
 
-    def translateUi(
+    def setUserConfig(
+        self,
+        user_config: UserConfig
+    ):
+
+        # leave the current user first, its editor is saved on the way out
+        self.setCurrentIndex(QModelIndex())
+        self.__user_model.setUserConfig(user_config)
+        if sum(len(group.users) for group in user_config.groups) <= self.EXPAND_USER_LIMIT:
+            self.expandAll()
+
+    def userConfig(
         self
+    ) -> UserConfig:
+        """
+            Get the user config in the order shown.
+        """
+
+        return self.__user_model.userConfig()
+
+    @staticmethod
+    def itemType(
+        index: QModelIndex
+    ) -> ALUserTreeItemType | None:
+
+        if not index.isValid():
+            return None
+        return ALUserTreeItemType(index.data(ALUserTreeModel.ItemTypeRole))
+
+    @staticmethod
+    def isChecked(
+        index: QModelIndex
+    ) -> bool:
+
+        return index.siblingAtColumn(1).data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+
+    @staticmethod
+    def user(
+        index: QModelIndex
+    ) -> User | None:
+
+        return index.siblingAtColumn(0).data(Qt.ItemDataRole.UserRole)
+
+    def setUser(
+        self,
+        index: QModelIndex,
+        user: User
     ):
 
-        ___QTreeWidgetItem = self.headerItem()
-        ___QTreeWidgetItem.setText(1, QCoreApplication.translate("ALConfigWidget", u"\u72b6\u6001", None));
+        self.__user_model.setData(index.siblingAtColumn(0), user, Qt.ItemDataRole.UserRole)
+
+    def groupCount(
+        self
+    ) -> int:
+
+        return self.__user_model.rowCount()
+
+    def userCount(
+        self,
+        index: QModelIndex
+    ) -> int:
+
+        return self.__user_model.userCount(index)
+
+    def addGroup(
+        self,
+        name: str
+    ) -> QModelIndex:
+
+        return self.__user_model.appendGroup(name)
+
+    def addUser(
+        self,
+        index: QModelIndex,
+        user: User
+    ) -> QModelIndex:
+
+        UserIndex = self.__user_model.appendUser(index, user)
+        self.expand(UserIndex.parent())
+        return UserIndex
+
+    def removeItem(
+        self,
+        index: QModelIndex
+    ):
+
+        self.__user_model.removeRow(index.row(), index.parent())
+
+    def moveUser(
+        self,
+        index: QModelIndex,
+        group_index: QModelIndex
+    ) -> QModelIndex:
+
+        UserIndex = self.__user_model.moveUser(index, group_index)
+        self.expand(UserIndex.parent())
+        return UserIndex
 
     @staticmethod
     def isDragPositionValid(
@@ -95,6 +721,22 @@ class ALUserTreeWidget(QTreeWidget):
             y_offset < target_rect.height()*0.8)
         return valid
 
+    def isDropValid(
+        self,
+        SourceIndex: QModelIndex,
+        TargetIndex: QModelIndex,
+        drag_pos: QPoint
+    ) -> bool:
+
+        match self.itemType(SourceIndex):
+            case ALUserTreeItemType.GROUP:
+                return not TargetIndex.isValid()
+            case ALUserTreeItemType.USER:
+                return self.itemType(TargetIndex) == ALUserTreeItemType.GROUP\
+                    and self.isChecked(TargetIndex)\
+                    and self.isDragPositionValid(self.visualRect(TargetIndex), drag_pos)
+        return False
+
     def dragEnterEvent(
         self,
         event: QDragEnterEvent
@@ -109,32 +751,8 @@ class ALUserTreeWidget(QTreeWidget):
 
         super().dragMoveEvent(event)
 
-        SourceItem = self.currentItem()
-        TargetItem = self.itemAt(event.position().toPoint())
-        if SourceItem is None:
-            event.ignore()
-            return
-        if SourceItem.type() == ALUserTreeItemType.GROUP.value:
-            if TargetItem is not None:
-                event.ignore()
-                return
-        elif SourceItem.type() == ALUserTreeItemType.USER.value:
-            if TargetItem is None:
-                event.ignore()
-                return
-            if TargetItem.type() != ALUserTreeItemType.GROUP.value:
-                event.ignore()
-                return
-            if TargetItem.checkState(1) == Qt.CheckState.Unchecked:
-                event.ignore()
-                return
-            if not self.isDragPositionValid(
-                self.visualItemRect(TargetItem),
-                event.position().toPoint()
-            ):
-                event.ignore()
-                return
-        else:
+        drag_pos = event.position().toPoint()
+        if not self.isDropValid(self.currentIndex(), self.indexAt(drag_pos), drag_pos):
             event.ignore()
             return
         event.acceptProposedAction()
@@ -144,8 +762,19 @@ class ALUserTreeWidget(QTreeWidget):
         event: QDropEvent
     ):
 
-        super().dropEvent(event)
-
-        for item_index in range(self.topLevelItemCount()):
-            self.topLevelItem(item_index).setExpanded(True)
-        self.setCurrentItem(None)
+        drag_pos = event.position().toPoint()
+        SourceIndex = QPersistentModelIndex(self.currentIndex())
+        TargetIndex = QPersistentModelIndex(self.indexAt(drag_pos))
+        valid = self.isDropValid(QModelIndex(SourceIndex), QModelIndex(TargetIndex), drag_pos)
+        # the model moves the row, the view must not remove the source
+        event.setDropAction(Qt.DropAction.IgnoreAction)
+        event.accept()
+        self.stopAutoScroll()
+        self.setState(QAbstractItemView.State.NoState)
+        # leave the current user first, its editor is saved on the way out
+        self.setCurrentIndex(QModelIndex())
+        if valid and self.itemType(QModelIndex(SourceIndex)) == ALUserTreeItemType.USER:
+            self.moveUser(QModelIndex(SourceIndex), QModelIndex(TargetIndex))
+        elif valid:
+            self.__user_model.moveGroupToEnd(QModelIndex(SourceIndex))
+        self.viewport().update()
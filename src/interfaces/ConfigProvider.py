@@ -72,6 +72,16 @@ class CfgKey:
             STYLE = ConfigPath(ConfigType.GLOBAL, "appearance.style")
             CUSTOM_THEME = ConfigPath(ConfigType.GLOBAL, "appearance.custom_theme")
 
+        class EXECUTION:
+            ROOT = ConfigPath(ConfigType.GLOBAL, "execution")
+            MAX_BROWSERS = ConfigPath(ConfigType.GLOBAL, "execution.max_browsers")
+            MAX_CPU_LOAD = ConfigPath(ConfigType.GLOBAL, "execution.max_cpu_load")
+
+        class AUTOSCRIPT:
+            ROOT = ConfigPath(ConfigType.GLOBAL, "autoscript")
+            MAX_INSTRUCTIONS = ConfigPath(ConfigType.GLOBAL, "autoscript.max_instructions")
+            MAX_MEMORY_MB = ConfigPath(ConfigType.GLOBAL, "autoscript.max_memory_mb")
+
     class TIMERTASK:
         ROOT = ConfigPath(ConfigType.TIMERTASK, "")
         TIMER_TASKS = ConfigPath(ConfigType.TIMERTASK, "timer_tasks")
@@ -115,7 +125,8 @@ class ConfigProvider(Protocol):
         value: Any = None
     ) -> None:
         """
-            Set a configuration value and persist to disk.
+            Set a configuration value, it is persisted to disk shortly
+            after (see ``flush``).
 
             Args:
                 key: A ConfigPath object specifying which config file
@@ -123,3 +134,11 @@ class ConfigProvider(Protocol):
                 value: The value to store.
         """
         ...
+
+    def flush(
+        self
+    ) -> None:
+        """
+            Persist all pending configuration changes to disk.
+        """
+        ...
@@ -8,6 +8,8 @@ You may use, modify, and distribute this file under the terms of the MIT License
 See the LICENSE file for details.
 """
 import os
+import copy
+import atexit
 import threading
 
 from typing import Any, Optional
@@ -59,6 +61,14 @@ class ConfigTemplate:
                         "theme": "system",
                         "style": "Fusion",
                         "custom_theme": ""
+                    },
+                    "execution": {
+                        "max_browsers": 2,
+                        "max_cpu_load": 0.8
+                    },
+                    "autoscript": {
+                        "max_instructions": 10000000,
+                        "max_memory_mb": 64
                     }
                 }
             case ConfigType.BULLETIN:
@@ -75,6 +85,20 @@ class ConfigTemplate:
 
 
 class ConfigManager:
+    """
+        Config manager class.
+
+        Changes made by ``set`` are written behind: the config type is only
+        marked dirty and a flush is scheduled ``FLUSH_DELAY`` seconds later,
+        so a burst of changes is coalesced into one atomic file write. Call
+        ``flush`` to persist pending changes immediately, it is also called
+        at interpreter exit.
+
+        Args:
+            config_dir (str): Config directory.
+    """
+
+    FLUSH_DELAY = 0.5 # seconds
 
     def __init__(
         self,
@@ -83,9 +107,14 @@ class ConfigManager:
 
         self.__config_dir = os.path.abspath(config_dir)
         self.__config_lock = threading.Lock()
+        # serialises file writes, so an older snapshot never overwrites a newer one
+        self.__save_lock = threading.Lock()
         self.__config_data = {}
+        self.__dirty_types: set[ConfigType] = set()
+        self.__flush_timer: Optional[threading.Timer] = None
 
         self.initialize()
+        atexit.register(self.flush)
 
     def initialize(
         self
@@ -145,15 +174,89 @@ class ConfigManager:
                         config_data[k] = {}
                     config_data = config_data[k]
                 config_data[keys[-1]] = value
-        self.save(key.config_type)
+            self.__dirty_types.add(key.config_type)
+            self.__scheduleFlush()
+
+    def __scheduleFlush(
+        self
+    ):
+
+        # called with the config lock held
+        if self.__flush_timer is not None:
+            return
+        self.__flush_timer = threading.Timer(self.FLUSH_DELAY, self.__onFlushTimer)
+        self.__flush_timer.daemon = True
+        self.__flush_timer.start()
+
+    def __onFlushTimer(
+        self
+    ):
+
+        with self.__config_lock:
+            self.__flush_timer = None
+        try:
+            self.flush()
+        except Exception:
+            # the types stay dirty, the next set or flush retries them
+            pass
+
+    def __write(
+        self,
+        config_types: list[ConfigType]
+    ):
+
+        # called with the save lock held
+        with self.__config_lock:
+            snapshots = {
+                config_type: copy.deepcopy(self.__config_data[config_type.value])
+                for config_type in config_types
+            }
+            self.__dirty_types.difference_update(config_types)
+        error = None
+        for config_type, config_data in snapshots.items():
+            config_path = os.path.join(self.__config_dir, config_type.value)
+            try:
+                JSONWriter(config_path, config_data)
+            except Exception as e:
+                with self.__config_lock:
+                    self.__dirty_types.add(config_type)
+                error = e
+        if error is not None:
+            raise error
 
     def save(
         self,
         config_type: ConfigType
     ):
+        """
+            Write the given config type to disk immediately.
+        """
 
-        config_path = os.path.join(self.__config_dir, config_type.value)
-        JSONWriter(config_path, self.__config_data[config_type.value])
+        with self.__save_lock:
+            self.__write([config_type])
+
+    def flush(
+        self
+    ):
+        """
+            Write all pending changes to disk immediately.
+        """
+
+        with self.__save_lock:
+            with self.__config_lock:
+                if self.__flush_timer is not None:
+                    self.__flush_timer.cancel()
+                    self.__flush_timer = None
+                config_types = list(self.__dirty_types)
+            if config_types:
+                self.__write(config_types)
+
+    def hasPendingChanges(
+        self
+    ) -> bool:
+
+        with self.__config_lock:
+            return bool(self.__dirty_types)
 
     def configDir(
         self
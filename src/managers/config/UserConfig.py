@@ -0,0 +1,508 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Typed in-memory model of the user config.
+
+    A user config file is parsed once into Group / User / ReserveInfo /
+    TimeSpec / RenewSpec objects, every value is validated while parsing.
+    The classes use ``__slots__`` and repeated strings (dates, times,
+    floors, rooms) are interned, so large configs stay small in memory.
+
+    Keys missing from the file are kept as None ("not specified") and
+    filled in by ReserveChecker at run time, ``toDict`` leaves them out
+    again. A user with a malformed value is still loaded, so the GUI can
+    show and fix it, but carries the first problem found in ``error`` and
+    is never run. Unknown keys are dropped.
+"""
+import sys
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Optional
+
+
+__all__ = [
+    "TimeSpec", "RenewSpec", "ReserveInfo", "User", "Group", "UserConfig",
+]
+
+
+class _Errors:
+    """
+        Collects the first problem found while parsing one user.
+    """
+
+    __slots__ = ("first",)
+
+    def __init__(
+        self
+    ):
+
+        self.first: Optional[str] = None
+
+    def add(
+        self,
+        key: str,
+        message: str
+    ):
+
+        if self.first is None:
+            self.first = f"'{key}' {message}"
+
+
+def _str(
+    data: dict,
+    key: str,
+    errors: _Errors,
+    path: str,
+    intern: bool = False
+) -> Optional[str]:
+
+    value = data.get(key)
+    if value is None:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        errors.add(f"{path}{key}", f"应为字符串, 实际为 {value!r}")
+        return value
+    return sys.intern(value) if intern else value
+
+def _bool(
+    data: dict,
+    key: str,
+    errors: _Errors,
+    path: str
+) -> Optional[bool]:
+
+    value = data.get(key)
+    if value is not None and not isinstance(value, bool):
+        errors.add(f"{path}{key}", f"应为 true 或 false, 实际为 {value!r}")
+    return value
+
+def _number(
+    data: dict,
+    key: str,
+    errors: _Errors,
+    path: str,
+    integer: bool = False
+) -> Optional[float]:
+
+    value = data.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        errors.add(f"{path}{key}", f"应为数字, 实际为 {value!r}")
+        return value
+    if integer and value != int(value):
+        errors.add(f"{path}{key}", f"应为整数, 实际为 {value!r}")
+        return value
+    return int(value) if integer else value
+
+def _date(
+    data: dict,
+    key: str,
+    errors: _Errors,
+    path: str
+) -> Optional[str]:
+
+    value = _str(data, key, errors, path, intern=True)
+    if isinstance(value, str):
+        try:
+            date.fromisoformat(value)
+        except ValueError:
+            errors.add(f"{path}{key}", f"不是合法的日期 (YYYY-MM-DD): {value!r}")
+    return value
+
+def _time(
+    data: dict,
+    key: str,
+    errors: _Errors,
+    path: str
+) -> Optional[str]:
+
+    value = _str(data, key, errors, path, intern=True)
+    if isinstance(value, str):
+        hours, sep, minutes = value.partition(":")
+        if (
+            not sep or not hours.isdigit() or not minutes.isdigit()
+            or len(minutes) != 2 or int(hours) > 23 or int(minutes) > 59
+        ):
+            errors.add(f"{path}{key}", f"不是合法的时间 (HH:MM): {value!r}")
+    return value
+
+def _section(
+    data: dict,
+    key: str,
+    errors: _Errors,
+    path: str
+) -> dict:
+
+    value = data.get(key)
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        errors.add(f"{path}{key}", f"应为对象, 实际为 {value!r}")
+        return {}
+    return value
+
+def _put(
+    data: dict,
+    key: str,
+    value: Any
+):
+
+    if value is not None:
+        data[key] = value
+
+
+@dataclass(slots=True)
+class TimeSpec:
+    """
+        Begin or end time of a reservation.
+    """
+
+    time: Optional[str] = None
+    max_diff: Optional[int] = None
+    prefer_early: Optional[bool] = None
+
+    @classmethod
+    def fromDict(
+        cls,
+        data: dict,
+        errors: _Errors,
+        path: str = ""
+    ) -> "TimeSpec":
+
+        return cls(
+            _time(data, "time", errors, path),
+            _number(data, "max_diff", errors, path, integer=True),
+            _bool(data, "prefer_early", errors, path),
+        )
+
+    def toDict(
+        self
+    ) -> dict:
+
+        data = {}
+        _put(data, "time", self.time)
+        _put(data, "max_diff", self.max_diff)
+        _put(data, "prefer_early", self.prefer_early)
+        return data
+
+    def copy(
+        self
+    ) -> "TimeSpec":
+
+        return TimeSpec(self.time, self.max_diff, self.prefer_early)
+
+    def key(
+        self
+    ) -> tuple:
+
+        return (self.time, self.max_diff, self.prefer_early)
+
+
+@dataclass(slots=True)
+class RenewSpec:
+    """
+        Renewal settings of a reservation.
+    """
+
+    expect_duration: Optional[float] = None
+    max_diff: Optional[int] = None
+    prefer_early: Optional[bool] = None
+
+    @classmethod
+    def fromDict(
+        cls,
+        data: dict,
+        errors: _Errors,
+        path: str = ""
+    ) -> "RenewSpec":
+
+        return cls(
+            _number(data, "expect_duration", errors, path),
+            _number(data, "max_diff", errors, path, integer=True),
+            _bool(data, "prefer_early", errors, path),
+        )
+
+    def toDict(
+        self
+    ) -> dict:
+
+        data = {}
+        _put(data, "expect_duration", self.expect_duration)
+        _put(data, "max_diff", self.max_diff)
+        _put(data, "prefer_early", self.prefer_early)
+        return data
+
+    def copy(
+        self
+    ) -> "RenewSpec":
+
+        return RenewSpec(self.expect_duration, self.max_diff, self.prefer_early)
+
+    def key(
+        self
+    ) -> tuple:
+
+        return (self.expect_duration, self.max_diff, self.prefer_early)
+
+
+@dataclass(slots=True)
+class ReserveInfo:
+    """
+        Reservation settings of a user, the time specs are always present
+        (empty when not specified).
+    """
+
+    date: Optional[str] = None
+    place: Optional[str] = None
+    floor: Optional[str] = None
+    room: Optional[str] = None
+    seat_id: Optional[str] = None
+    begin_time: TimeSpec = field(default_factory=TimeSpec)
+    end_time: TimeSpec = field(default_factory=TimeSpec)
+    expect_duration: Optional[float] = None
+    satisfy_duration: Optional[bool] = None
+    renew_time: RenewSpec = field(default_factory=RenewSpec)
+
+    @classmethod
+    def fromDict(
+        cls,
+        data: dict,
+        errors: _Errors,
+        path: str = ""
+    ) -> "ReserveInfo":
+
+        return cls(
+            _date(data, "date", errors, path),
+            _str(data, "place", errors, path, intern=True),
+            _str(data, "floor", errors, path, intern=True),
+            _str(data, "room", errors, path, intern=True),
+            _str(data, "seat_id", errors, path),
+            TimeSpec.fromDict(
+                _section(data, "begin_time", errors, path), errors, f"{path}begin_time."
+            ),
+            TimeSpec.fromDict(
+                _section(data, "end_time", errors, path), errors, f"{path}end_time."
+            ),
+            _number(data, "expect_duration", errors, path),
+            _bool(data, "satisfy_duration", errors, path),
+            RenewSpec.fromDict(
+                _section(data, "renew_time", errors, path), errors, f"{path}renew_time."
+            ),
+        )
+
+    def toDict(
+        self
+    ) -> dict:
+
+        data = {}
+        _put(data, "date", self.date)
+        _put(data, "place", self.place)
+        _put(data, "floor", self.floor)
+        _put(data, "room", self.room)
+        _put(data, "seat_id", self.seat_id)
+        for key, spec in (("begin_time", self.begin_time), ("end_time", self.end_time)):
+            spec_data = spec.toDict()
+            if spec_data:
+                data[key] = spec_data
+        _put(data, "expect_duration", self.expect_duration)
+        _put(data, "satisfy_duration", self.satisfy_duration)
+        renew_data = self.renew_time.toDict()
+        if renew_data:
+            data["renew_time"] = renew_data
+        return data
+
+    def copy(
+        self
+    ) -> "ReserveInfo":
+
+        return ReserveInfo(
+            self.date, self.place, self.floor, self.room, self.seat_id,
+            self.begin_time.copy(), self.end_time.copy(),
+            self.expect_duration, self.satisfy_duration,
+            self.renew_time.copy(),
+        )
+
+    def key(
+        self
+    ) -> tuple:
+
+        return (
+            self.date, self.place, self.floor, self.room, self.seat_id,
+            self.begin_time.key(), self.end_time.key(),
+            self.expect_duration, self.satisfy_duration,
+            self.renew_time.key(),
+        )
+
+
+@dataclass(slots=True)
+class User:
+    """
+        A user of a task group.
+
+        Attributes:
+            error (Optional[str]): First malformed value found while loading,
+                None for a valid user. Not part of the user data.
+    """
+
+    username: str = ""
+    password: str = ""
+    enabled: bool = False
+    reserve_info: ReserveInfo = field(default_factory=ReserveInfo)
+    error: Optional[str] = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def fromDict(
+        cls,
+        data: dict,
+    ) -> "User":
+
+        errors = _Errors()
+        if not isinstance(data, dict):
+            errors.add("user", f"应为对象, 实际为 {data!r}")
+            data = {}
+        user = cls(
+            _str(data, "username", errors, "") or "",
+            _str(data, "password", errors, "") or "",
+            data.get("enabled", False),
+            ReserveInfo.fromDict(
+                _section(data, "reserve_info", errors, ""), errors, "reserve_info."
+            ),
+        )
+        if not isinstance(user.enabled, bool):
+            errors.add("enabled", f"应为 true 或 false, 实际为 {user.enabled!r}")
+        user.error = errors.first
+        return user
+
+    def toDict(
+        self
+    ) -> dict:
+
+        return {
+            "username": self.username,
+            "password": self.password,
+            "enabled": self.enabled,
+            "reserve_info": self.reserve_info.toDict(),
+        }
+
+    def copy(
+        self
+    ) -> "User":
+
+        return User(
+            self.username, self.password, self.enabled,
+            self.reserve_info.copy(), self.error,
+        )
+
+    def key(
+        self
+    ) -> tuple:
+        """
+            Hashable value of the user data, equal for users that would run
+            the same operations.
+        """
+
+        return (self.username, self.password, self.enabled, self.reserve_info.key())
+
+
+@dataclass(slots=True)
+class Group:
+    """
+        A task group of users.
+    """
+
+    name: str = ""
+    enabled: bool = False
+    users: list[User] = field(default_factory=list)
+
+    @classmethod
+    def fromDict(
+        cls,
+        data: dict,
+    ) -> "Group":
+
+        if not isinstance(data, dict):
+            raise ValueError(f"任务组应为对象, 实际为 {data!r}")
+        users = data.get("users") or []
+        if not isinstance(users, list):
+            raise ValueError(f"任务组 '{data.get("name", "")}' 的 'users' 应为列表")
+        return cls(
+            str(data.get("name", "")),
+            bool(data.get("enabled", False)),
+            [User.fromDict(user) for user in users],
+        )
+
+    def toDict(
+        self
+    ) -> dict:
+
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "users": [user.toDict() for user in self.users],
+        }
+
+
+@dataclass(slots=True)
+class UserConfig:
+    """
+        A whole user config file.
+
+        Examples:
+            >>> config = UserConfig.fromDict(JSONReader("user.json").data())
+            >>> for user in config.enabledUsers():
+            ...     print(user.username, user.reserve_info.begin_time.time)
+    """
+
+    groups: list[Group] = field(default_factory=list)
+
+    @classmethod
+    def fromDict(
+        cls,
+        data: dict,
+    ) -> "UserConfig":
+        """
+            Parse a user config dict.
+
+            Raises:
+                ValueError: The config or one of its groups is not shaped like
+                    a user config. Malformed user values do not raise, see
+                    ``User.error``.
+        """
+
+        if not isinstance(data, dict):
+            raise ValueError("用户配置应为对象")
+        groups = data.get("groups") or []
+        if not isinstance(groups, list):
+            raise ValueError("用户配置的 'groups' 应为列表")
+        return cls([Group.fromDict(group) for group in groups])
+
+    def toDict(
+        self
+    ) -> dict:
+
+        return {"groups": [group.toDict() for group in self.groups]}
+
+    def enabledUsers(
+        self
+    ) -> list[User]:
+        """
+            Get the users of the enabled groups, in group order.
+        """
+
+        return [
+            user
+            for group in self.groups
+            if group.enabled
+            for user in group.users
+        ]
@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    SQLite backed user store, an optional alternative to ``user.json``.
+
+    A user config path ending in ``.db``, ``.sqlite`` or ``.sqlite3`` is a
+    store, any other path a JSON file; ``loadUserConfig`` and
+    ``saveUserConfig`` pick the format from the path so callers do not care.
+
+    Groups and users are rows, indexed by group, enabled and username, the
+    reserve info of a user is kept as a JSON document. Saving a whole config
+    only writes the rows that changed, single users can be updated in place
+    and runs can stream the users of the enabled groups.
+"""
+import os
+import json
+import sqlite3
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+from managers.config.UserConfig import Group, User, UserConfig
+from utils.JSONReader import JSONReader
+from utils.JSONWriter import JSONWriter
+
+
+__all__ = ["UserStore", "loadUserConfig", "saveUserConfig"]
+
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    enabled INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    group_id INTEGER NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    enabled INTEGER NOT NULL,
+    reserve_info TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS groups_enabled ON groups(enabled, position);
+CREATE INDEX IF NOT EXISTS users_group ON users(group_id, position);
+CREATE INDEX IF NOT EXISTS users_enabled ON users(enabled);
+CREATE INDEX IF NOT EXISTS users_username ON users(username);
+"""
+_USER_COLUMNS = "username, password, enabled, reserve_info"
+
+
+def _userRow(
+    user: User
+) -> tuple:
+
+    if isinstance(user.enabled, bool):
+        enabled = 1 if user.enabled else 0
+    else:
+        # a malformed value is kept as it is, like in user.json, so the user
+        # is still flagged when loaded; wrapped in a list, the integer
+        # affinity of the column would turn "1" into 1
+        enabled = json.dumps([user.enabled], ensure_ascii=False)
+    return (
+        str(user.username),
+        str(user.password),
+        enabled,
+        json.dumps(user.reserve_info.toDict(), ensure_ascii=False, separators=(",", ":")),
+    )
+
+def _rowUser(
+    username: str,
+    password: str,
+    enabled: int | str,
+    reserve_info: str
+) -> User:
+
+    # through fromDict, so stored users are validated like JSON ones
+    return User.fromDict({
+        "username": username,
+        "password": password,
+        "enabled": json.loads(enabled)[0] if isinstance(enabled, str) else bool(enabled),
+        "reserve_info": json.loads(reserve_info),
+    })
+
+
+class UserStore:
+    """
+        SQLite user store.
+
+        Args:
+            store_path (str): The store file, created when missing.
+
+        Examples:
+            >>> with UserStore("users.db") as store:
+            ...     store.importJson("user.json")
+            ...     for group_name, user in store.iterUsers():
+            ...         print(group_name, user.username)
+    """
+
+    SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+    def __init__(
+        self,
+        store_path: str
+    ):
+
+        self.__store_path = os.path.abspath(store_path)
+        try:
+            self.__conn = sqlite3.connect(self.__store_path, timeout=10)
+            self.__conn.execute("PRAGMA foreign_keys = ON")
+            # readers (runs) do not block the writer (the GUI) and the other way round
+            self.__conn.execute("PRAGMA journal_mode = WAL")
+            if self.__conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                with self.__conn:
+                    self.__conn.executescript(_SCHEMA)
+                    self.__conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        except sqlite3.Error as e:
+            raise Exception(f"用户库打开失败: {self.__store_path}: {e}") from e
+
+    @staticmethod
+    def isStorePath(
+        path: str
+    ) -> bool:
+
+        return os.path.splitext(path)[1].lower() in UserStore.SUFFIXES
+
+    def __enter__(
+        self
+    ) -> "UserStore":
+
+        return self
+
+    def __exit__(
+        self,
+        *exc_info
+    ):
+
+        self.close()
+
+    def close(
+        self
+    ):
+
+        self.__conn.close()
+
+    def path(
+        self
+    ) -> str:
+
+        return self.__store_path
+
+    @contextmanager
+    def __transaction(
+        self
+    ):
+
+        try:
+            with self.__conn:
+                yield self.__conn
+        except sqlite3.Error as e:
+            raise Exception(f"用户库写入发生错误: {self.__store_path}: {e}") from e
+
+    def __query(
+        self,
+        sql: str,
+        params: tuple = ()
+    ) -> sqlite3.Cursor:
+
+        try:
+            return self.__conn.execute(sql, params)
+        except sqlite3.Error as e:
+            raise Exception(f"用户库读取发生错误: {self.__store_path}: {e}") from e
+
+    def __groupId(
+        self,
+        conn: sqlite3.Connection,
+        group_name: str,
+        create: bool = False
+    ) -> Optional[int]:
+
+        row = conn.execute(
+            "SELECT id FROM groups WHERE name = ? ORDER BY position, id LIMIT 1", (group_name,)
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        if not create:
+            return None
+        position = conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM groups").fetchone()[0]
+        return conn.execute(
+            "INSERT INTO groups (position, name, enabled) VALUES (?, ?, 1)", (position, group_name)
+        ).lastrowid
+
+    def load(
+        self,
+        enabled_only: bool = False
+    ) -> UserConfig:
+        """
+            Load the whole store.
+
+            Args:
+                enabled_only (bool): Only read the users of enabled groups,
+                    disabled groups are returned without users.
+        """
+
+        groups = []
+        by_id = {}
+        for group_id, name, enabled in self.__query(
+            "SELECT id, name, enabled FROM groups ORDER BY position, id"
+        ):
+            group = Group(name, bool(enabled))
+            groups.append(group)
+            by_id[group_id] = group
+        where = "WHERE group_id IN (SELECT id FROM groups WHERE enabled = 1)" if enabled_only else ""
+        for group_id, *row in self.__query(
+            f"SELECT group_id, {_USER_COLUMNS} FROM users {where} ORDER BY group_id, position, id"
+        ):
+            by_id[group_id].users.append(_rowUser(*row))
+        return UserConfig(groups)
+
+    def iterUsers(
+        self,
+        enabled_only: bool = True
+    ) -> Iterator[tuple[str, User]]:
+        """
+            Stream users in group order without loading the whole store.
+
+            Args:
+                enabled_only (bool): Only users of enabled groups.
+
+            Yields:
+                tuple[str, User]: The group name and the user.
+        """
+
+        where = "WHERE g.enabled = 1" if enabled_only else ""
+        cursor = self.__query(
+            f"SELECT g.name, u.username, u.password, u.enabled, u.reserve_info "
+            f"FROM users u JOIN groups g ON g.id = u.group_id {where} "
+            f"ORDER BY g.position, g.id, u.position, u.id"
+        )
+        while rows := cursor.fetchmany(256):
+            for group_name, *row in rows:
+                yield group_name, _rowUser(*row)
+
+    def findUsers(
+        self,
+        username: str
+    ) -> list[tuple[str, User]]:
+        """
+            Get every user with the given username, with its group name.
+        """
+
+        return [
+            (group_name, _rowUser(*row))
+            for group_name, *row in self.__query(
+                f"SELECT g.name, {", ".join(f"u.{c}" for c in _USER_COLUMNS.split(", "))} "
+                f"FROM users u JOIN groups g ON g.id = u.group_id "
+                f"WHERE u.username = ? ORDER BY g.position, u.position",
+                (username,)
+            )
+        ]
+
+    def putUser(
+        self,
+        group_name: str,
+        user: User
+    ) -> bool:
+        """
+            Insert or update one user, matched by group name and username.
+            The group is created (enabled) when missing, a new user is
+            appended to it.
+
+            Returns:
+                bool: True if the user was inserted, False if updated.
+        """
+
+        with self.__transaction() as conn:
+            group_id = self.__groupId(conn, group_name, create=True)
+            row = _userRow(user)
+            updated = conn.execute(
+                "UPDATE users SET password = ?, enabled = ?, reserve_info = ? "
+                "WHERE id = (SELECT id FROM users WHERE group_id = ? AND username = ? "
+                "ORDER BY position, id LIMIT 1)",
+                (*row[1:], group_id, row[0])
+            ).rowcount
+            if updated:
+                return False
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM users WHERE group_id = ?", (group_id,)
+            ).fetchone()[0]
+            conn.execute(
+                f"INSERT INTO users (group_id, position, {_USER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                (group_id, position, *row)
+            )
+            return True
+
+    def upsertUsers(
+        self,
+        rows: Iterable[tuple[str, User]]
+    ) -> tuple[int, int]:
+        """
+            Insert or update many users in one transaction, matched by
+            username only: an existing user is replaced where it is (the
+            first one in group order), a new one is appended to the named
+            group, created (enabled) when missing.
+
+            The rows are consumed as they come, so they can be streamed from
+            a file without building a list.
+
+            Returns:
+                tuple[int, int]: Number of users inserted and updated.
+        """
+
+        inserted = updated = 0
+        group_ids: dict[str, int] = {}
+        positions: dict[int, int] = {}
+        with self.__transaction() as conn:
+            for group_name, user in rows:
+                row = _userRow(user)
+                if conn.execute(
+                    "UPDATE users SET password = ?, enabled = ?, reserve_info = ? "
+                    "WHERE id = (SELECT u.id FROM users u JOIN groups g ON g.id = u.group_id "
+                    "WHERE u.username = ? ORDER BY g.position, g.id, u.position, u.id LIMIT 1)",
+                    (*row[1:], row[0])
+                ).rowcount:
+                    updated += 1
+                    continue
+                group_id = group_ids.get(group_name)
+                if group_id is None:
+                    group_id = group_ids[group_name] = self.__groupId(conn, group_name, create=True)
+                position = positions.get(group_id)
+                if position is None:
+                    position = conn.execute(
+                        "SELECT COALESCE(MAX(position) + 1, 0) FROM users WHERE group_id = ?", (group_id,)
+                    ).fetchone()[0]
+                positions[group_id] = position + 1
+                conn.execute(
+                    f"INSERT INTO users (group_id, position, {_USER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                    (group_id, position, *row)
+                )
+                inserted += 1
+        return inserted, updated
+
+    def setUserEnabled(
+        self,
+        group_name: str,
+        username: str,
+        enabled: bool
+    ) -> bool:
+
+        with self.__transaction() as conn:
+            return conn.execute(
+                "UPDATE users SET enabled = ? WHERE username = ? "
+                "AND group_id IN (SELECT id FROM groups WHERE name = ?)",
+                (1 if enabled else 0, username, group_name)
+            ).rowcount > 0
+
+    def deleteUser(
+        self,
+        group_name: str,
+        username: str
+    ) -> bool:
+
+        with self.__transaction() as conn:
+            return conn.execute(
+                "DELETE FROM users WHERE username = ? "
+                "AND group_id IN (SELECT id FROM groups WHERE name = ?)",
+                (username, group_name)
+            ).rowcount > 0
+
+    def setGroupEnabled(
+        self,
+        group_name: str,
+        enabled: bool
+    ) -> bool:
+
+        with self.__transaction() as conn:
+            return conn.execute(
+                "UPDATE groups SET enabled = ? WHERE name = ?", (1 if enabled else 0, group_name)
+            ).rowcount > 0
+
+    def deleteGroup(
+        self,
+        group_name: str
+    ) -> bool:
+
+        with self.__transaction() as conn:
+            return conn.execute("DELETE FROM groups WHERE name = ?", (group_name,)).rowcount > 0
+
+    def save(
+        self,
+        user_config: UserConfig
+    ) -> int:
+        """
+            Make the store hold exactly the given config.
+
+            Groups and users are matched by position, only rows that differ
+            are written, so saving after editing a few users of a large
+            config is cheap.
+
+            Returns:
+                int: Number of rows inserted, updated or deleted.
+        """
+
+        written = 0
+        with self.__transaction() as conn:
+            old_groups = conn.execute(
+                "SELECT id, position, name, enabled FROM groups ORDER BY position, id"
+            ).fetchall()
+            for position, group in enumerate(user_config.groups):
+                row = (position, group.name, 1 if group.enabled else 0)
+                if position < len(old_groups):
+                    group_id, *old_row = old_groups[position]
+                    if tuple(old_row) != row:
+                        conn.execute(
+                            "UPDATE groups SET position = ?, name = ?, enabled = ? WHERE id = ?",
+                            (*row, group_id)
+                        )
+                        written += 1
+                else:
+                    group_id = conn.execute(
+                        "INSERT INTO groups (position, name, enabled) VALUES (?, ?, ?)", row
+                    ).lastrowid
+                    written += 1
+                written += self.__saveUsers(conn, group_id, group.users)
+            stale = [(group_id,) for group_id, *_ in old_groups[len(user_config.groups):]]
+            conn.executemany("DELETE FROM groups WHERE id = ?", stale)
+            written += len(stale)
+        return written
+
+    @staticmethod
+    def __saveUsers(
+        conn: sqlite3.Connection,
+        group_id: int,
+        users: list[User]
+    ) -> int:
+
+        old_users = conn.execute(
+            f"SELECT id, position, {_USER_COLUMNS} FROM users WHERE group_id = ? ORDER BY position, id",
+            (group_id,)
+        ).fetchall()
+        updates, inserts = [], []
+        for position, user in enumerate(users):
+            row = (position, *_userRow(user))
+            if position < len(old_users):
+                user_id, *old_row = old_users[position]
+                if tuple(old_row) != row:
+                    updates.append((*row, user_id))
+            else:
+                inserts.append((group_id, *row))
+        stale = [(user_id,) for user_id, *_ in old_users[len(users):]]
+        conn.executemany(
+            "UPDATE users SET position = ?, username = ?, password = ?, enabled = ?, "
+            "reserve_info = ? WHERE id = ?",
+            updates
+        )
+        conn.executemany(
+            f"INSERT INTO users (group_id, position, {_USER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            inserts
+        )
+        conn.executemany("DELETE FROM users WHERE id = ?", stale)
+        return len(updates) + len(inserts) + len(stale)
+
+    def importJson(
+        self,
+        json_path: str
+    ) -> int:
+        """
+            Replace the store content with a JSON user config.
+
+            Returns:
+                int: Number of rows written.
+        """
+
+        return self.save(UserConfig.fromDict(JSONReader(json_path).data()))
+
+    def exportJson(
+        self,
+        json_path: str
+    ):
+
+        JSONWriter(json_path, self.load().toDict())
+
+
+def loadUserConfig(
+    user_config_path: str,
+    enabled_only: bool = False
+) -> UserConfig:
+    """
+        Load a user config from a JSON file or a user store.
+
+        Args:
+            user_config_path (str): The JSON file or store path.
+            enabled_only (bool): For a store, only read the users of enabled
+                groups (a JSON file is always read whole).
+    """
+
+    if UserStore.isStorePath(user_config_path):
+        # opening would create an empty store
+        if not os.path.exists(user_config_path):
+            raise Exception(f"文件不存在: {os.path.abspath(user_config_path)}")
+        with UserStore(user_config_path) as store:
+            return store.load(enabled_only)
+    return UserConfig.fromDict(JSONReader(user_config_path).data())
+
+def saveUserConfig(
+    user_config_path: str,
+    user_config: UserConfig
+):
+    """
+        Save a user config to a JSON file or a user store, the format is
+        chosen by the path.
+    """
+
+    if UserStore.isStorePath(user_config_path):
+        with UserStore(user_config_path) as store:
+            store.save(user_config)
+        return
+    JSONWriter(user_config_path, user_config.toDict())
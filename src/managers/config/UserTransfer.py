@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+"""
+    Bulk import and export of users as CSV or JSON lines.
+
+    A ``.csv`` file has one user per row with the columns of ``COLUMNS``
+    (only ``username`` is required, empty cells are "not specified"). A
+    ``.jsonl`` / ``.ndjson`` file has one user object per line, shaped like
+    a user of ``user.json``. Both can carry the ``group`` of the user.
+
+    Rows are read and validated one by one (the format checks of
+    ``User.fromDict`` and the rules of ``ReserveChecker``), a bad row is
+    reported with its line number and skipped. Valid rows are merged by
+    username: an existing user is replaced where it is, a new user is
+    appended to its group. A user store takes the rows as they are read,
+    a JSON user config is loaded, merged and written once.
+"""
+import os
+import csv
+import json
+import itertools
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from managers.config.UserConfig import Group, User, UserConfig
+from managers.config.UserStore import UserStore, loadUserConfig, saveUserConfig
+from pages.services.ReserveChecker import ReserveChecker
+
+
+__all__ = [
+    "COLUMNS", "DEFAULT_GROUP", "UserRow", "ImportReport",
+    "readUserRows", "mergeUsers", "importUsers", "writeUsers", "exportUsers",
+]
+
+DEFAULT_GROUP = "导入用户"
+CSV_SUFFIXES = (".csv",)
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+# CSV column -> (path in the user dict, value type)
+_COLUMN_SPECS = {
+    "username": (("username",), str),
+    "password": (("password",), str),
+    "enabled": (("enabled",), bool),
+    "date": (("reserve_info", "date"), str),
+    "place": (("reserve_info", "place"), str),
+    "floor": (("reserve_info", "floor"), str),
+    "room": (("reserve_info", "room"), str),
+    "seat_id": (("reserve_info", "seat_id"), str),
+    "begin_time": (("reserve_info", "begin_time", "time"), str),
+    "begin_max_diff": (("reserve_info", "begin_time", "max_diff"), int),
+    "begin_prefer_early": (("reserve_info", "begin_time", "prefer_early"), bool),
+    "end_time": (("reserve_info", "end_time", "time"), str),
+    "end_max_diff": (("reserve_info", "end_time", "max_diff"), int),
+    "end_prefer_early": (("reserve_info", "end_time", "prefer_early"), bool),
+    "expect_duration": (("reserve_info", "expect_duration"), float),
+    "satisfy_duration": (("reserve_info", "satisfy_duration"), bool),
+    "renew_expect_duration": (("reserve_info", "renew_time", "expect_duration"), float),
+    "renew_max_diff": (("reserve_info", "renew_time", "max_diff"), int),
+    "renew_prefer_early": (("reserve_info", "renew_time", "prefer_early"), bool),
+}
+COLUMNS = ("group", *_COLUMN_SPECS)
+
+_TRUE_CELLS = frozenset(("true", "1", "yes", "y", "是"))
+_FALSE_CELLS = frozenset(("false", "0", "no", "n", "否"))
+
+
+@dataclass(slots=True)
+class UserRow:
+    """
+        One row of an import file.
+
+        Attributes:
+            line (int): Line number in the file (the last line of a quoted
+                multi-line CSV row).
+            group (str): Group of the row, empty when not given.
+            user (Optional[User]): The parsed user, None when the row could
+                not be parsed at all.
+            error (Optional[str]): Why the row is not imported, None for a
+                valid row.
+    """
+
+    line: int
+    group: str = ""
+    user: Optional[User] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """
+        Outcome of a bulk import.
+
+        Attributes:
+            errors (list[tuple[int, str]]): Line number and problem of every
+                skipped row.
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def summary(
+        self,
+        max_errors: int = 20
+    ) -> str:
+
+        lines = [
+            f"新增 {self.inserted} 个用户, 更新 {self.updated} 个用户, "
+            f"跳过 {len(self.errors)} 行"
+        ]
+        for line, error in self.errors[:max_errors]:
+            lines.append(f"第 {line} 行: {error}")
+        if len(self.errors) > max_errors:
+            lines.append(f"... 另有 {len(self.errors) - max_errors} 行错误未列出")
+        return "\n".join(lines)
+
+
+def _fileFormat(
+    path: str
+) -> str:
+
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in CSV_SUFFIXES:
+        return "csv"
+    if suffix in JSONL_SUFFIXES:
+        return "jsonl"
+    raise Exception(f"不支持的文件格式: {path}, 仅支持 .csv, .jsonl, .ndjson 文件")
+
+def _cellValue(
+    cell: str,
+    value_type: type
+):
+
+    if value_type is str:
+        return cell
+    cell = cell.strip()
+    if value_type is bool:
+        lowered = cell.lower()
+        if lowered in _TRUE_CELLS:
+            return True
+        if lowered in _FALSE_CELLS:
+            return False
+        # left as text, User.fromDict reports it
+        return cell
+    try:
+        return int(cell)
+    except ValueError:
+        pass
+    try:
+        return float(cell)
+    except ValueError:
+        return cell
+
+def _cellText(
+    value
+) -> str:
+
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+def _rowError(
+    user: User
+) -> Optional[str]:
+
+    if user.error is not None:
+        return user.error
+    if not user.username:
+        return "未指定用户名"
+    error = ReserveChecker.validate(user.reserve_info)
+    if error is not None:
+        return f"预约信息错误: {error}"
+    return None
+
+def _readCsv(
+    file
+) -> Iterator[UserRow]:
+
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip() for name in header]
+    unknown = [name for name in header if name and name not in COLUMNS]
+    if unknown:
+        raise Exception(f"CSV 文件包含未知的列: {', '.join(unknown)}, 可用的列: {', '.join(COLUMNS)}")
+    if "username" not in header:
+        raise Exception("CSV 文件缺少 'username' 列")
+    columns = [
+        (index, name, *_COLUMN_SPECS.get(name, ((), str)))
+        for index, name in enumerate(header)
+        if name
+    ]
+    width = len(header)
+    for cells in reader:
+        if not any(cells):
+            continue
+        line = reader.line_num
+        if len(cells) > width:
+            yield UserRow(line, error=f"列数 {len(cells)} 多于表头的 {width} 列")
+            continue
+        group = ""
+        data: dict = {}
+        for index, name, path, value_type in columns:
+            if index >= len(cells) or cells[index] == "":
+                continue
+            if name == "group":
+                group = cells[index].strip()
+                continue
+            section = data
+            for key in path[:-1]:
+                section = section.setdefault(key, {})
+            section[path[-1]] = _cellValue(cells[index], value_type)
+        user = User.fromDict(data)
+        yield UserRow(line, group, user, _rowError(user))
+
+def _readJsonl(
+    file
+) -> Iterator[UserRow]:
+
+    for line, text in enumerate(file, 1):
+        if not text.strip():
+            continue
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            yield UserRow(line, error=f"JSON 解析错误: {e.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield UserRow(line, error=f"应为对象, 实际为 {data!r}")
+            continue
+        group = data.pop("group", None) or ""
+        if not isinstance(group, str):
+            yield UserRow(line, error=f"'group' 应为字符串, 实际为 {group!r}")
+            continue
+        user = User.fromDict(data)
+        yield UserRow(line, group.strip(), user, _rowError(user))
+
+def _readRows(
+    path: str,
+    file_format: str
+) -> Iterator[UserRow]:
+
+    try:
+        # utf-8-sig, files saved by spreadsheet programs start with a BOM
+        with open(path, "r", encoding="utf-8-sig", newline="") as file:
+            if file_format == "csv":
+                yield from _readCsv(file)
+            else:
+                yield from _readJsonl(file)
+    except PermissionError as e:
+        raise Exception(f"没有足够的权限读取文件: {path}") from e
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise Exception(f"文件解析错误: {path}: {e}") from e
+
+def readUserRows(
+    path: str
+) -> Iterator[UserRow]:
+    """
+        Stream the rows of a CSV or JSON lines file, every row is parsed and
+        validated, rows with an error are yielded too.
+
+        Raises:
+            Exception: The file does not exist or has an unsupported suffix
+                (raised at once), or it can not be read or is a CSV file with
+                an unusable header (raised while iterating).
+    """
+
+    file_format = _fileFormat(path)
+    path = os.path.abspath(path)
+    if not os.path.isfile(path):
+        raise Exception(f"文件不存在: {path}")
+    return _readRows(path, file_format)
+
+def _validRows(
+    rows: Iterable[UserRow],
+    report: ImportReport,
+    default_group: str
+) -> Iterator[tuple[str, User]]:
+
+    for row in rows:
+        if row.error is not None:
+            username = f"用户 {row.user.username}: " if row.user and row.user.username else ""
+            report.errors.append((row.line, f"{username}{row.error}"))
+            continue
+        yield row.group or default_group, row.user
+
+def mergeUsers(
+    user_config: UserConfig,
+    rows: Iterable[UserRow],
+    default_group: str = DEFAULT_GROUP
+) -> ImportReport:
+    """
+        Merge rows into a user config in place, matched by username.
+
+        An existing user (the first one in group order) is replaced where it
+        is, its group is kept. A new user is appended to the group of the
+        row, or to ``default_group``, the group is created (enabled) when
+        missing. Later rows win over earlier rows with the same username.
+    """
+
+    report = ImportReport()
+    groups = {}
+    found = {}
+    for group in user_config.groups:
+        groups.setdefault(group.name, group)
+        for index, user in enumerate(group.users):
+            found.setdefault(user.username, (group, index))
+    for group_name, user in _validRows(rows, report, default_group):
+        place = found.get(user.username)
+        if place is not None:
+            group, index = place
+            group.users[index] = user
+            report.updated += 1
+            continue
+        group = groups.get(group_name)
+        if group is None:
+            group = groups[group_name] = Group(group_name, True)
+            user_config.groups.append(group)
+        found[user.username] = (group, len(group.users))
+        group.users.append(user)
+        report.inserted += 1
+    return report
+
+def importUsers(
+    source_path: str,
+    user_config_path: str,
+    default_group: str = DEFAULT_GROUP
+) -> ImportReport:
+    """
+        Import a CSV or JSON lines file into a user config file or store,
+        see ``mergeUsers`` for how users are matched.
+
+        A store is written in one transaction while the file is read, a JSON
+        user config (created when missing) is written once at the end, and
+        only when a user was imported.
+    """
+
+    rows = readUserRows(source_path)
+    # the header is checked by the first row, a bad file fails before the target is touched
+    first = next(rows, None)
+    rows = itertools.chain(() if first is None else (first,), rows)
+    if UserStore.isStorePath(user_config_path):
+        report = ImportReport()
+        with UserStore(user_config_path) as store:
+            report.inserted, report.updated = store.upsertUsers(
+                _validRows(rows, report, default_group)
+            )
+        return report
+    user_config = UserConfig()
+    if os.path.exists(user_config_path):
+        user_config = loadUserConfig(user_config_path)
+    report = mergeUsers(user_config, rows, default_group)
+    if report.inserted or report.updated:
+        saveUserConfig(user_config_path, user_config)
+    return report
+
+def writeUsers(
+    path: str,
+    rows: Iterable[tuple[str, User]]
+) -> int:
+    """
+        Write users with their group names to a CSV or JSON lines file, the
+        rows are written as they come.
+
+        Returns:
+            int: Number of users written.
+    """
+
+    file_format = _fileFormat(path)
+    count = 0
+    try:
+        if file_format == "csv":
+            with open(path, "w", encoding="utf-8-sig", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(COLUMNS)
+                for group_name, user in rows:
+                    data = user.toDict()
+                    cells = [group_name]
+                    for path_keys, _ in _COLUMN_SPECS.values():
+                        value = data
+                        for key in path_keys:
+                            value = value.get(key) if isinstance(value, dict) else None
+                        cells.append(_cellText(value))
+                    writer.writerow(cells)
+                    count += 1
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                for group_name, user in rows:
+                    file.write(json.dumps(
+                        {"group": group_name, **user.toDict()},
+                        ensure_ascii=False,
+                        separators=(",", ":")
+                    ))
+                    file.write("\n")
+                    count += 1
+    except PermissionError as e:
+        raise Exception(f"没有足够的权限写入文件: {os.path.abspath(path)}") from e
+    except OSError as e:
+        raise Exception(f"写入文件时发生错误: {os.path.abspath(path)}: {e}") from e
+    return count
+
+def exportUsers(
+    user_config_path: str,
+    target_path: str
+) -> int:
+    """
+        Export every user of a user config file or store (disabled ones
+        included) to a CSV or JSON lines file, a store is streamed.
+
+        Returns:
+            int: Number of users written.
+    """
+
+    if UserStore.isStorePath(user_config_path):
+        if not os.path.exists(user_config_path):
+            raise Exception(f"文件不存在: {os.path.abspath(user_config_path)}")
+        with UserStore(user_config_path) as store:
+            return writeUsers(target_path, store.iterUsers(enabled_only=False))
+    user_config = loadUserConfig(user_config_path)
+    return writeUsers(
+        target_path,
+        ((group.name, user) for group in user_config.groups for user in group.users)
+    )
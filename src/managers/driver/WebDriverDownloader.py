@@ -332,34 +332,54 @@ class WebDriverDownloader:
         progress_callback(98, 100, 0.0, "验证完成")
         return True
 
+    def _findDriverMember(
+        self,
+        names: list[str]
+    ) -> Optional[str]:
+
+        expected_name = str(WebDriverExecName(self.driver_type, self.arch))
+        for name in names:
+            if name.endswith('/'):
+                continue
+            if name.rsplit('/', 1)[-1] == expected_name:
+                return name
+        return None
+
     def _extract(
         self,
         progress_callback: Optional[Callable[[float, int, float, str], None]] = None
     ) -> Optional[Path]:
 
+        CHUNK_SIZE = 8192*8 # 64KB chunk
+
         try:
             progress_callback(98, 100, 0.0, "解压中...")
-            file_path_str = str(self.download_path)
-            if file_path_str.endswith('.tar.gz'):
+            expected_name = str(WebDriverExecName(self.driver_type, self.arch))
+            driver_file = self.download_dir/expected_name
+            part_file = self.download_dir/f"{expected_name}.part"
+            # locate the driver from the archive index and stream only
+            # that member, the rest of the bundle never touches the disk
+            if str(self.download_path).endswith('.tar.gz'):
                 with tarfile.open(self.download_path, 'r:gz') as tar_ref:
-                    tar_ref.extractall(self.download_dir)
+                    members = {
+                        member.name: member
+                        for member in tar_ref.getmembers()
+                        if member.isfile()
+                    }
+                    member_name = self._findDriverMember(list(members))
+                    if not member_name:
+                        raise FileNotFoundError(f"未找到 web driver 文件 : {expected_name}")
+                    src = tar_ref.extractfile(members[member_name])
+                    with src, open(part_file, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
             else:
                 with zipfile.ZipFile(self.download_path, 'r') as zip_ref:
-                    zip_ref.extractall(self.download_dir)
-            driver_file = None
-            for root, _, files in os.walk(self.download_dir):
-                for file in files:
-                    expected_name = str(WebDriverExecName(self.driver_type, self.arch))
-                    if file == str(expected_name):
-                        src_path = Path(root, file)
-                        dst_path = self.download_dir/file
-                        src_path.rename(dst_path)
-                        driver_file = dst_path
-                        break
-                if driver_file:
-                    break
-            if not driver_file:
-                raise FileNotFoundError(f"未找到 web driver 文件 : {expected_name}")
+                    member_name = self._findDriverMember(zip_ref.namelist())
+                    if not member_name:
+                        raise FileNotFoundError(f"未找到 web driver 文件 : {expected_name}")
+                    with zip_ref.open(member_name) as src, open(part_file, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(part_file, driver_file)
             # Ensure executable permissions on Unix systems (zipfile
             # extraction does not preserve the execute bit).
             if os.name != 'nt':
@@ -22,6 +22,7 @@ from managers.driver.WebDriverDownloader import (
     WebDriverArch, WebDriverType,
     ChromeDriverDownloader, FirefoxDriverDownloader, EdgeDriverDownloader
 )
+from managers.driver.WebDriverStore import WebDriverStore
 
 
 class WebDriverStatus(Enum):
@@ -68,6 +69,9 @@ class WebDriverManager:
             driver_dir (str): The directory to store web drivers.
     """
 
+    BROWSERS_KEY = "detected-browsers"
+    BROWSERS_TTL = 24*3600 # 1 day, a newly installed browser shows up after it
+
     def __init__(
         self,
         driver_dir: str
@@ -75,6 +79,7 @@ class WebDriverManager:
 
         self.__driver_dir = os.path.abspath(driver_dir)
         self.__browser_detector = WebBrowserDetector()
+        self.__driver_store: WebDriverStore = None
         self.__driver_infos: list[WebDriverInfo] = []
         self.__initialized = False
         self.__lock = threading.Lock()
@@ -88,21 +93,80 @@ class WebDriverManager:
         if self.__initialized:
             return
         os.makedirs(self.__driver_dir, exist_ok=True)
+        self.__driver_store = WebDriverStore(self.__driver_dir)
         self._detectBrowsers()
         self._checkDriverStatus()
         self.__initialized = True
 
     def _detectBrowsers(
-        self
+        self,
+        cached: bool = True
     ):
+        """
+            Detect the installed browsers, or take them from the store
+            metadata while none of their executables changed.
+
+            Args:
+                cached (bool): False always runs the detection.
+        """
 
         with self.__lock:
-            browser_infos = self.__browser_detector.detect()
+            browser_infos = self._cachedBrowsers() if cached else None
+            if browser_infos is None:
+                browser_infos = self.__browser_detector.detect()
+                self.__driver_store.setMetadata(
+                    self.BROWSERS_KEY,
+                    [self._encodeBrowser(info) for info in browser_infos],
+                    self.BROWSERS_TTL
+                )
             self.__driver_infos = [
                 self._getDriverInfo(info)
                 for info in browser_infos
             ]
 
+    def _encodeBrowser(
+        self,
+        browser_info: WebBrowserInfo
+    ) -> dict:
+
+        stat = browser_info.browser_path.stat()
+        return {
+            "type": browser_info.browser_type.name,
+            "arch": browser_info.browser_arch.name,
+            "version": browser_info.browser_version,
+            "path": str(browser_info.browser_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+    def _cachedBrowsers(
+        self
+    ) -> Optional[list[WebBrowserInfo]]:
+        """
+            Get the browsers of the last detection, None when the metadata
+            expired or a browser executable was updated or removed since.
+        """
+
+        entries = self.__driver_store.getMetadata(self.BROWSERS_KEY)
+        if entries is None:
+            return None
+        browser_infos = []
+        try:
+            for entry in entries:
+                path = Path(entry["path"])
+                stat = path.stat()
+                if stat.st_mtime_ns != entry["mtime_ns"] or stat.st_size != entry["size"]:
+                    return None
+                browser_infos.append(WebBrowserInfo(
+                    browser_arch=WebBrowserArch[entry["arch"]],
+                    browser_type=WebBrowserType[entry["type"]],
+                    browser_version=entry["version"],
+                    browser_path=path,
+                ))
+        except (OSError, KeyError, TypeError):
+            return None
+        return browser_infos
+
     def _checkDriverStatus(
         self
     ):
@@ -286,7 +350,7 @@ class WebDriverManager:
         self
     ):
 
-        self._detectBrowsers()
+        self._detectBrowsers(cached=False)
         self._checkDriverStatus()
 
     def getDriverInfos(
@@ -367,7 +431,18 @@ class WebDriverManager:
                     raise ValueError(f"不支持的 Web Driver 类型")
             with self.__lock:
                 driver_info.driver_status = WebDriverStatus.DOWNLOADING
-            driver_path = downloader.download(progress_callback=progress_callback, cancel_event=cancel_event)
+            # other app instances may be installing the same driver, the
+            # one holding the lock downloads and the rest reuse its result
+            lock_key = f"{driver_type.value}-{driver_version}-{driver_arch.value}"
+            with self.__driver_store.lock(lock_key):
+                driver_path = self._getDriverPath(driver_info)
+                if driver_path and driver_path.is_file():
+                    if progress_callback:
+                        progress_callback(100, 100, 0.0, "驱动已由其他实例安装")
+                else:
+                    driver_path = downloader.download(progress_callback=progress_callback, cancel_event=cancel_event)
+                    if driver_path:
+                        driver_path = self.__driver_store.intern(driver_path)
             with self.__lock:
                 if driver_path:
                     driver_info.driver_path = driver_path
@@ -421,6 +496,7 @@ class WebDriverManager:
         try:
             driver_path = driver_info.driver_path
             driver_path.unlink()
+            self.__driver_store.prune()
             with self.__lock:
                 driver_info.driver_path = None
                 driver_info.driver_status = WebDriverStatus.NOT_INSTALLED
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import time
+import shutil
+import hashlib
+
+from pathlib import Path
+from typing import Any, Optional
+
+from utils.FileLock import FileLock
+from utils.JSONReader import JSONReader
+from utils.JSONWriter import JSONWriter
+
+
+class WebDriverStore:
+    """
+        Content-addressed web driver store shared by all app instances.
+
+        Driver binaries are kept once under ``.store/blobs/<sha256>`` and
+        hard linked into the ``<type>/<version>/<arch>`` layout used by
+        WebDriverManager, so identical drivers never take disk space twice.
+        On file systems without hard links blobs are plain copies, marked
+        by a ``<sha256>.copy`` file next to them.
+        Metadata such as the detected browser versions is cached in
+        ``.store/metadata.json`` with a TTL. Every mutation happens under an
+        inter-process file lock, so several processes on one machine can
+        share the same driver dir.
+
+        Args:
+            driver_dir (str): The root directory of web drivers.
+    """
+
+    DEFAULT_TTL = 7*24*3600 # 7 days
+    CHUNK_SIZE = 8192*8 # 64KB chunk
+    COPY_SUFFIX = ".copy"
+
+    def __init__(
+        self,
+        driver_dir: str
+    ):
+
+        self.__store_dir = Path(os.path.abspath(driver_dir))/".store"
+        self.__blob_dir = self.__store_dir/"blobs"
+        self.__lock_dir = self.__store_dir/"locks"
+        self.__metadata_path = self.__store_dir/"metadata.json"
+        self.__blob_dir.mkdir(mode=0o0755, parents=True, exist_ok=True)
+        self.__lock_dir.mkdir(mode=0o0755, parents=True, exist_ok=True)
+
+    def lock(
+        self,
+        key: str,
+        timeout: Optional[float] = None
+    ) -> FileLock:
+        """
+            Get the inter-process lock of the given key.
+
+            Args:
+                key (str): Lock key, e.g. ``chrome-120.0.1-linux64``.
+                timeout (Optional[float]): Seconds to wait, None waits forever.
+
+            Returns:
+                FileLock: The (not yet acquired) lock.
+        """
+
+        return FileLock(str(self.__lock_dir/f"{key}.lock"), timeout)
+
+    def _readMetadata(
+        self
+    ) -> dict:
+
+        if not self.__metadata_path.exists():
+            return {}
+        try:
+            return JSONReader(str(self.__metadata_path)).data()
+        except Exception:
+            return {}
+
+    def getMetadata(
+        self,
+        key: str
+    ) -> Optional[Any]:
+        """
+            Get a cached metadata value, None if missing or expired.
+        """
+
+        with self.lock("metadata"):
+            entry = self._readMetadata().get(key)
+        if not entry or entry.get("expires", 0) < time.time():
+            return None
+        return entry.get("value")
+
+    def setMetadata(
+        self,
+        key: str,
+        value: Any,
+        ttl: float = DEFAULT_TTL
+    ):
+        """
+            Cache a metadata value for ttl seconds.
+        """
+
+        with self.lock("metadata"):
+            metadata = self._readMetadata()
+            now = time.time()
+            metadata = {
+                k: v for k, v in metadata.items()
+                if v.get("expires", 0) >= now
+            }
+            metadata[key] = {"value": value, "expires": now + ttl}
+            JSONWriter(str(self.__metadata_path), metadata)
+
+    def _hashFile(
+        self,
+        file_path: Path
+    ) -> str:
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def intern(
+        self,
+        driver_file: Path
+    ) -> Path:
+        """
+            Move a driver binary into the store and link it back in place.
+
+            If an identical binary is already stored, the given file is
+            replaced by a link to it. Falls back to a plain copy when the
+            file system does not support hard links.
+
+            Args:
+                driver_file (Path): Installed driver executable.
+
+            Returns:
+                Path: The same driver path, now backed by the store.
+        """
+
+        driver_file = Path(driver_file)
+        blob_path = self.__blob_dir/self._hashFile(driver_file)
+        with self.lock("blobs"):
+            if not blob_path.exists():
+                try:
+                    os.link(driver_file, blob_path)
+                except OSError:
+                    shutil.copy2(driver_file, blob_path)
+                    blob_path.with_name(f"{blob_path.name}{self.COPY_SUFFIX}").touch()
+                return driver_file
+            if os.path.samefile(driver_file, blob_path):
+                return driver_file
+            link_path = driver_file.with_name(f"{driver_file.name}.link")
+            try:
+                os.link(blob_path, link_path)
+            except OSError:
+                return driver_file
+            os.replace(link_path, driver_file)
+        return driver_file
+
+    def prune(
+        self
+    ) -> int:
+        """
+            Remove blobs that are no longer linked by any installed driver.
+
+            Copied blobs are kept, their link count says nothing about the
+            drivers using them.
+
+            Returns:
+                int: Number of removed blobs.
+        """
+
+        removed = 0
+        with self.lock("blobs"):
+            blob_paths = list(self.__blob_dir.iterdir())
+            copied = {
+                path.name[:-len(self.COPY_SUFFIX)] for path in blob_paths
+                if path.name.endswith(self.COPY_SUFFIX)
+            }
+            for blob_path in blob_paths:
+                if blob_path.name.endswith(self.COPY_SUFFIX) or blob_path.name in copied:
+                    continue
+                try:
+                    if blob_path.stat().st_nlink <= 1:
+                        blob_path.unlink()
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    def storeDir(
+        self
+    ) -> str:
+
+        return str(self.__store_dir)
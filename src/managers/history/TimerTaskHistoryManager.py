@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import sqlite3
+import threading
+
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+
+class TimerTaskHistoryManager:
+    """
+        Append-only execution history of repeat timer tasks.
+
+        Records are kept in a SQLite database indexed by task uuid and
+        execute time, so appending a record or reading one page of a task
+        history does not depend on the total amount of history. Old records
+        are dropped by ``compact`` according to the retention limits.
+
+        Record format (same as the former ``repeat_history`` items):
+            {
+                "execute_time": "%Y-%m-%d %H:%M:%S",
+                "executed_time": "%Y-%m-%d %H:%M:%S",
+                "result": str, # ALTimerTaskStatus value
+                "duration": float,
+                "uuid": str
+            }
+
+        Args:
+            history_path (str): Path of the history database file.
+    """
+
+    MAX_RECORDS_PER_TASK = 5000
+    MAX_RECORD_AGE_DAYS = 365
+
+    def __init__(
+        self,
+        history_path: str
+    ):
+
+        self.__history_path = os.path.abspath(history_path)
+        self.__lock = threading.Lock()
+        self.__connection: Optional[sqlite3.Connection] = None
+
+        self.initialize()
+
+    def initialize(
+        self
+    ):
+
+        os.makedirs(os.path.dirname(self.__history_path), exist_ok=True)
+        self.__connection = sqlite3.connect(
+            self.__history_path,
+            check_same_thread=False
+        )
+        with self.__lock, self.__connection:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("""
+                CREATE TABLE IF NOT EXISTS history (
+                    task_uuid TEXT NOT NULL,
+                    execute_time TEXT NOT NULL,
+                    executed_time TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    duration REAL NOT NULL DEFAULT 0
+                )
+            """)
+            # also makes appending an already imported record a no-op
+            self.__connection.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS history_task_time
+                ON history (task_uuid, execute_time, executed_time)
+            """)
+        self.compact()
+
+    def append(
+        self,
+        task_uuid: str,
+        records: Iterable[dict]
+    ) -> int:
+        """
+            Append records to the history of a task.
+
+            Args:
+                task_uuid (str): Task uuid.
+                records (Iterable[dict]): Records, already identical records
+                    are skipped.
+
+            Returns:
+                int: Number of appended records.
+        """
+
+        rows = [
+            (
+                task_uuid,
+                record["execute_time"],
+                record.get("executed_time", record["execute_time"]),
+                record["result"],
+                record.get("duration", 0)
+            )
+            for record in records
+        ]
+        if not rows:
+            return 0
+        with self.__lock, self.__connection:
+            cursor = self.__connection.executemany(
+                "INSERT OR IGNORE INTO history VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            return cursor.rowcount
+
+    def count(
+        self,
+        task_uuid: str
+    ) -> int:
+
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT COUNT(*) FROM history WHERE task_uuid = ?",
+                (task_uuid,)
+            ).fetchone()
+        return row[0]
+
+    def page(
+        self,
+        task_uuid: str,
+        limit: int,
+        after: Optional[dict] = None
+    ) -> list[dict]:
+        """
+            Read records of a task in execute time order.
+
+            Args:
+                task_uuid (str): Task uuid.
+                limit (int): Maximum number of records.
+                after (Optional[dict]): Last record of the previous page,
+                    None to start from the oldest record.
+
+            Returns:
+                list[dict]: The records.
+        """
+
+        with self.__lock:
+            if after is None:
+                rows = self.__connection.execute("""
+                    SELECT execute_time, executed_time, result, duration
+                    FROM history WHERE task_uuid = ?
+                    ORDER BY execute_time, executed_time LIMIT ?
+                """, (task_uuid, limit)).fetchall()
+            else:
+                rows = self.__connection.execute("""
+                    SELECT execute_time, executed_time, result, duration
+                    FROM history WHERE task_uuid = ?
+                    AND (execute_time, executed_time) > (?, ?)
+                    ORDER BY execute_time, executed_time LIMIT ?
+                """, (
+                    task_uuid, after["execute_time"], after["executed_time"], limit
+                )).fetchall()
+        return [
+            {
+                "execute_time": execute_time,
+                "executed_time": executed_time,
+                "result": result,
+                "duration": duration,
+                "uuid": task_uuid
+            }
+            for execute_time, executed_time, result, duration in rows
+        ]
+
+    def clear(
+        self,
+        task_uuid: str
+    ):
+
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "DELETE FROM history WHERE task_uuid = ?",
+                (task_uuid,)
+            )
+
+    def retain(
+        self,
+        task_uuids: Iterable[str]
+    ) -> int:
+        """
+            Remove the history of tasks that no longer exist.
+
+            Returns:
+                int: Number of removed records.
+        """
+
+        with self.__lock, self.__connection:
+            self.__connection.execute("CREATE TEMP TABLE IF NOT EXISTS live_tasks (uuid TEXT PRIMARY KEY)")
+            self.__connection.execute("DELETE FROM live_tasks")
+            self.__connection.executemany(
+                "INSERT OR IGNORE INTO live_tasks VALUES (?)",
+                [(task_uuid,) for task_uuid in task_uuids]
+            )
+            cursor = self.__connection.execute(
+                "DELETE FROM history WHERE task_uuid NOT IN (SELECT uuid FROM live_tasks)"
+            )
+            return cursor.rowcount
+
+    def compact(
+        self
+    ) -> int:
+        """
+            Apply the retention limits and reclaim the freed space.
+
+            Returns:
+                int: Number of removed records.
+        """
+
+        cutoff = datetime.now() - timedelta(days=self.MAX_RECORD_AGE_DAYS)
+        with self.__lock:
+            with self.__connection:
+                removed = self.__connection.execute(
+                    "DELETE FROM history WHERE executed_time < ?",
+                    (cutoff.strftime("%Y-%m-%d %H:%M:%S"),)
+                ).rowcount
+                removed += self.__connection.execute("""
+                    DELETE FROM history WHERE rowid IN (
+                        SELECT rowid FROM (
+                            SELECT rowid, ROW_NUMBER() OVER (
+                                PARTITION BY task_uuid
+                                ORDER BY execute_time DESC, executed_time DESC
+                            ) AS position FROM history
+                        ) WHERE position > ?
+                    )
+                """, (self.MAX_RECORDS_PER_TASK,)).rowcount
+            if removed:
+                self.__connection.execute("VACUUM")
+        return removed
+
+    def close(
+        self
+    ):
+
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    def historyPath(
+        self
+    ) -> str:
+
+        return self.__history_path
+
+
+# TimerTaskHistoryManager singleton instance.
+_history_manager_instance: TimerTaskHistoryManager | None = None
+
+# Singleton instance lock.
+_instance_lock = threading.Lock()
+
+def instance(
+    history_path: str = ""
+) -> TimerTaskHistoryManager:
+    """
+        Initialize TimerTaskHistoryManager singleton instance.
+
+        Args:
+            history_path (str): Path of the history database file.
+    """
+
+    global _history_manager_instance
+    with _instance_lock:
+        if _history_manager_instance is None:
+            if not history_path:
+                raise ValueError("TimerTaskHistoryManager 需要历史记录文件参数")
+            _history_manager_instance = TimerTaskHistoryManager(history_path)
+        else:
+            if history_path and _history_manager_instance.historyPath() != os.path.abspath(history_path):
+                raise ValueError("TimerTaskHistoryManager 的实例已初始化, 不能使用不同的历史记录文件")
+    return _history_manager_instance
@@ -7,18 +7,27 @@ This software is provided "as is", without any warranty of any kind.
 You may use, modify, and distribute this file under the terms of the MIT License.
 See the LICENSE file for details.
 """
+import atexit
 import logging
 import os
+import queue
 import threading
 
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    TimedRotatingFileHandler
+)
 from typing import Optional
 
 
 class CallerInfoFormatter(logging.Formatter):
     """
-        Custom formatter to extract real caller information.
-        Skips MsgBase._showTrace to show the actual calling location.
+        Custom formatter with fixed-width caller information.
+
+        The caller location comes from the record itself, callers such as
+        MsgBase._showTrace pass ``stacklevel`` so that the record already
+        points at the actual calling location.
 
         Format:
         - Logger name: left-aligned, max 15 chars
@@ -42,21 +51,6 @@ class CallerInfoFormatter(logging.Formatter):
         record
     ):
 
-        depth = 0
-        while depth < 10:
-            record.filename = os.path.basename(record.pathname)
-            if 'MsgBase.py' not in record.filename and record.funcName != '_showTrace':
-                break
-            if not hasattr(record, 'stack'):
-                record.stack = True
-                import traceback
-                record.stack_list = traceback.extract_stack()
-            depth += 1
-            if depth < len(record.stack_list):
-                frame = record.stack_list[-depth-1]
-                record.filename = os.path.basename(frame.filename)
-                record.lineno = int(frame.lineno)
-                record.funcName = frame.name
         record.name = record.name[-15:].ljust(15)
         record.levelname = record.levelname.ljust(8)
         record.filename = record.filename[-20:].ljust(20)
@@ -70,35 +64,86 @@ class CallerInfoFormatter(logging.Formatter):
         return super().format(record)
 
 
+class DropPolicyQueueHandler(QueueHandler):
+    """
+        Queue handler that never blocks the logging thread.
+
+        When the bounded queue is full, records below WARNING are dropped,
+        WARNING and above evict the oldest queued record instead, so errors
+        are kept in preference to routine traces.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue
+    ):
+
+        super().__init__(log_queue)
+        self.__dropped = 0
+        self.__dropped_lock = threading.Lock()
+
+    def enqueue(
+        self,
+        record: logging.LogRecord
+    ):
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if record.levelno >= logging.WARNING:
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        with self.__dropped_lock:
+            self.__dropped += 1
+
+    def droppedCount(
+        self
+    ) -> int:
+
+        with self.__dropped_lock:
+            return self.__dropped
+
+
 class LogManager:
     """
         Log Manager Singleton Class
 
         Args:
             log_dir (str): The directory to store log files.
+            console (bool): Whether to also write records to the console.
     """
 
+    QUEUE_SIZE = 10000
+
     def __init__(
         self,
-        log_dir: str
+        log_dir: str,
+        console: bool = True
     ):
 
         self.__log_dir = os.path.abspath(log_dir)
+        self.__console = console
         self.__logger = None
+        self.__queue_handler = None
+        self.__queue_listener = None
         self.__initialized = False
 
         self.initialize()
 
-    def initialize(
+    def createHandlers(
         self
-    ):
+    ) -> list[logging.Handler]:
+        """
+            Create the console and rotating file handlers.
 
-        if self.__initialized:
-            return
-        os.makedirs(self.__log_dir, exist_ok=True)
-        self.__logger = logging.getLogger("AutoLibrary")
-        self.__logger.setLevel(logging.DEBUG)
-        self.__logger.handlers.clear()
+            Returns:
+                list[logging.Handler]: Handlers served by the queue listener.
+        """
 
         formatter = CallerInfoFormatter(
             '[%(asctime)s] - [%(name)s] - [%(levelname)s] - [%(filename)s:%(lineno)s] - %(message)s',
@@ -108,7 +153,6 @@ class LogManager:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
-        self.__logger.addHandler(console_handler)
 
         all_log_file = os.path.join(self.__log_dir, "all.log")
         file_handler_all = TimedRotatingFileHandler(
@@ -121,7 +165,6 @@ class LogManager:
         file_handler_all.suffix = "%Y-%m-%d.log"
         file_handler_all.setLevel(logging.DEBUG)
         file_handler_all.setFormatter(formatter)
-        self.__logger.addHandler(file_handler_all)
 
         error_log_file = os.path.join(self.__log_dir, "error.log")
         file_handler_error = TimedRotatingFileHandler(
@@ -134,10 +177,63 @@ class LogManager:
         file_handler_error.suffix = "%Y-%m-%d.log"
         file_handler_error.setLevel(logging.ERROR)
         file_handler_error.setFormatter(formatter)
-        self.__logger.addHandler(file_handler_error)
+
+        if not self.__console:
+            return [file_handler_all, file_handler_error]
+        return [console_handler, file_handler_all, file_handler_error]
+
+    def initialize(
+        self
+    ):
+
+        if self.__initialized:
+            return
+        os.makedirs(self.__log_dir, exist_ok=True)
+        self.__logger = logging.getLogger("AutoLibrary")
+        self.__logger.setLevel(logging.DEBUG)
+        self.__logger.handlers.clear()
+
+        # the logging thread only enqueues records, formatting and disk
+        # writes happen on the listener thread
+        log_queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self.__queue_handler = DropPolicyQueueHandler(log_queue)
+        self.__logger.addHandler(self.__queue_handler)
+        self.__queue_listener = QueueListener(
+            log_queue,
+            *self.createHandlers(),
+            respect_handler_level=True
+        )
+        self.__queue_listener.start()
+        atexit.register(self.shutdown)
 
         self.__initialized = True
 
+    def shutdown(
+        self
+    ):
+        """
+            Flush the queued records and stop the listener thread, records
+            dropped on a full queue are reported with a warning first.
+        """
+
+        if self.__queue_listener is None:
+            return
+        dropped = self.droppedCount()
+        if dropped:
+            self.__logger.warning(f"日志队列已满, 共丢弃 {dropped} 条日志记录")
+        self.__queue_listener.stop()
+        for handler in self.__queue_listener.handlers:
+            handler.close()
+        self.__queue_listener = None
+
+    def droppedCount(
+        self
+    ) -> int:
+
+        if self.__queue_handler is None:
+            return 0
+        return self.__queue_handler.droppedCount()
+
     def getLogger(
         self,
         name: Optional[str] = None
@@ -169,7 +265,8 @@ _log_manager_instance = None
 _instance_lock = threading.Lock()
 
 def instance(
-    log_dir: str = ""
+    log_dir: str = "",
+    console: bool = True
 ) -> LogManager:
 
     global _log_manager_instance
@@ -177,7 +274,7 @@ def instance(
         if _log_manager_instance is None:
             if not log_dir:
                 raise ValueError("LogManager 需要日志目录参数")
-            _log_manager_instance = LogManager(log_dir)
+            _log_manager_instance = LogManager(log_dir, console)
         else:
             if log_dir and _log_manager_instance.logDir() != os.path.abspath(log_dir):
                 raise ValueError("LogManager 的实例已初始化, 不能使用不同的日志目录")
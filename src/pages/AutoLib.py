@@ -9,6 +9,11 @@ See the LICENSE file for details.
 """
 import os
 import queue
+import itertools
+import threading
+
+from dataclasses import dataclass
+
 from selenium import webdriver
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.common.exceptions import (
@@ -20,6 +25,7 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 
 from base.MsgBase import MsgBase
+from managers.config.UserConfig import ReserveInfo, User
 from pages.LoginPage import LoginPage
 from pages.MainShell import MainShell
 from pages.flows.ReserveFlow import ReserveFlow, ReserveContext
@@ -28,9 +34,39 @@ from pages.flows.RenewFlow import RenewFlow
 from pages.services.CaptchaSolver import CaptchaSolver
 from pages.services.ReserveChecker import ReserveChecker
 from pages.services.RecordChecker import RecordChecker
+from utils.HostCircuitBreaker import HostCircuitBreaker, breakerFor
+from utils.HostRateLimiter import HostRateLimiter, limiterFor
+from utils.TimeoutPolicy import TimeoutPolicy, instance as timeoutInstance
+from utils.BrowserContexts import ISOLATED_DRIVER_TYPES, WindowRouter, openIsolatedWindow
+
+
+@dataclass
+class _Session:
+    """
+        The page objects of one browser window, which runs one user at a
+        time.
+    """
+
+    handle: str
+    login_page: LoginPage
+    shell: MainShell
+    reserve_flow: ReserveFlow
+    checkin_flow: CheckinFlow
+    renew_flow: RenewFlow
+    host_blocked: bool = False
 
 
 class AutoLib(MsgBase):
+    """
+        Runs users in one browser.
+
+        With ``web_driver.contexts`` above 1 (Chrome and Edge, automatic
+        captcha), up to that many users run at once, each in a window of
+        its own browser context (separate cookies) inside the same
+        browser process, see ``utils.BrowserContexts``. This has not been
+        run against a real browser yet, so it also takes
+        ``web_driver.experimental_contexts`` set to true.
+    """
 
     def __init__(
         self,
@@ -41,27 +77,29 @@ class AutoLib(MsgBase):
 
         super().__init__(input_queue, output_queue)
         self.__run_config: dict = run_config
-        self.__user_config: dict | None = None
         self.__driver: WebDriver | None = None
         self.__driver_type: str = ""
         self.__driver_path: str = ""
-        self.__login_page: LoginPage = None
-        self.__shell: MainShell = None
         self.__captcha_solver: CaptchaSolver = None
+        self.__captcha_lock = threading.Lock()
         self.__record_checker: RecordChecker = None
         self.__reserve_checker: ReserveChecker = None
-        self.__reserve_flow: ReserveFlow = None
-        self.__checkin_flow: CheckinFlow = None
-        self.__renew_flow: RenewFlow = None
+        self.__sessions: list[_Session] = []
+        self.__router: WindowRouter | None = None
+        self.__limiter: HostRateLimiter = self.__initRateLimiter()
+        self.__breaker: HostCircuitBreaker = breakerFor(
+            (self.__run_config.get("library") or {}).get("host_url") or ""
+        )
 
         if not self.__initBrowserDriver():
             raise Exception("浏览器驱动初始化失败 !")
         else:
-            if not self.__initDriverUrl():
+            session = self.__newSession(self.__driver.current_window_handle)
+            if not self.__initDriverUrl(session.login_page):
                 self.close()
                 raise Exception("浏览器驱动 URL 初始化失败 !")
+            self.__sessions.append(session)
             self.__initPagesServices()
-            self.__initPagesFlows()
 
     def __initBrowserDriver(
         self,
@@ -123,6 +161,16 @@ class AutoLib(MsgBase):
                          "Gecko/20100101 Firefox/120.0"
         driver_options.add_argument(f"user-agent={user_agent}")
 
+        # several windows share the session one command at a time, a click
+        # that loads a page then only holds it until the page is parsed
+        contexts = driver_config.get("contexts", 1)
+        if (
+            driver_config.get("experimental_contexts") is True
+            and isinstance(contexts, int) and contexts > 1
+            and self.__driver_type in ISOLATED_DRIVER_TYPES
+        ):
+            driver_options.page_load_strategy = "eager"
+
         # init browser driver
         self.__driver_path = driver_config.get("driver_path", "")
         if not self.__driver_path:
@@ -144,7 +192,8 @@ class AutoLib(MsgBase):
                     self.__driver = webdriver.Firefox(service=service, options=driver_options)
                 case _:
                     raise Exception(f"不支持的浏览器驱动类型: {self.__driver_type} !")
-            self.__driver.implicitly_wait(1)
+            # pages loaded by clicks, navigations time themselves
+            self.__driver.set_page_load_timeout(timeoutInstance().timeout(TimeoutPolicy.PAGE_LOAD))
             self.__driver.execute_script(
                 "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
             )
@@ -154,8 +203,25 @@ class AutoLib(MsgBase):
         self._showTrace(f"浏览器驱动已初始化, 类型: {self.__driver_type}, 路径: {self.__driver_path}")
         return True
 
+    def __initRateLimiter(
+        self,
+    ) -> HostRateLimiter:
+
+        # shared by every browser of this process that uses the same host
+        lib_config: dict = self.__run_config.get("library") or {}
+        host_url = lib_config.get("host_url") or ""
+        try:
+            return limiterFor(host_url, lib_config.get("rate_limit"))
+        except ValueError as e:
+            self._showTrace(
+                f"图书馆访问限速配置错误 ! : {e}, 使用默认限速",
+                self.TraceLevel.WARNING,
+            )
+            return limiterFor(host_url)
+
     def __initDriverUrl(
         self,
+        login_page: LoginPage,
     ) -> bool:
 
         lib_config: dict = self.__run_config.get("library", None)
@@ -163,12 +229,14 @@ class AutoLib(MsgBase):
             self._showTrace("未配置图书馆参数 !", self.TraceLevel.ERROR)
             return False
         url: str = lib_config.get("host_url") + lib_config.get("login_url")
-        self.__login_page = LoginPage(self._input_queue, self._output_queue, self.__driver)
-        self.__driver.set_page_load_timeout(5)
         try:
-            self.__driver.get(url)
+            with self.__limiter.limit(HostRateLimiter.NAVIGATE) as permit:
+                timeoutInstance().navigate(self.__driver, url)
+                loaded = login_page.waitUntilLoaded()
+                if not loaded:
+                    permit.fail()
         except TimeoutException:
-            self.__login_page.stopPageLoad()
+            login_page.stopPageLoad()
             self._showTrace(
                 "图书馆登录页面加载超时 ! 请检查网络环境是否正常", self.TraceLevel.ERROR
             )
@@ -176,9 +244,7 @@ class AutoLib(MsgBase):
         except WebDriverException as e:
             self._showTrace(f"图书馆页面加载失败: {e}", self.TraceLevel.ERROR)
             return False
-        if not self.__login_page.waitUntilLoaded():
-            return False
-        return True
+        return loaded
 
     def __initPagesServices(
         self,
@@ -187,7 +253,6 @@ class AutoLib(MsgBase):
         if not self.__driver:
             self._showTrace("浏览器驱动未初始化, 请先初始化浏览器驱动 !", self.TraceLevel.WARNING)
             return
-        self.__shell = MainShell(self.__driver)
         self.__captcha_solver = CaptchaSolver(
             input_queue=self._input_queue,
             output_queue=self._output_queue,
@@ -201,51 +266,155 @@ class AutoLib(MsgBase):
             output_queue=self._output_queue,
         )
 
-    def __initPagesFlows(
+    def __newSession(
         self,
-    ) -> None:
+        handle: str,
+    ) -> _Session:
 
-        self.__reserve_flow = ReserveFlow(
-            input_queue=self._input_queue,
-            output_queue=self._output_queue,
-            driver=self.__driver,
-            shell=self.__shell,
-        )
-        self.__checkin_flow = CheckinFlow(
-            input_queue=self._input_queue,
-            output_queue=self._output_queue,
-            driver=self.__driver,
-            shell=self.__shell,
-        )
-        self.__renew_flow = RenewFlow(
-            input_queue=self._input_queue,
-            output_queue=self._output_queue,
-            driver=self.__driver,
-            shell=self.__shell,
+        shell = MainShell(self.__driver, self.__limiter)
+        return _Session(
+            handle=handle,
+            login_page=LoginPage(
+                self._input_queue, self._output_queue, self.__driver, self.__limiter
+            ),
+            shell=shell,
+            reserve_flow=ReserveFlow(
+                input_queue=self._input_queue,
+                output_queue=self._output_queue,
+                driver=self.__driver,
+                shell=shell,
+            ),
+            checkin_flow=CheckinFlow(
+                input_queue=self._input_queue,
+                output_queue=self._output_queue,
+                driver=self.__driver,
+                shell=shell,
+            ),
+            renew_flow=RenewFlow(
+                input_queue=self._input_queue,
+                output_queue=self._output_queue,
+                driver=self.__driver,
+                shell=shell,
+            ),
         )
 
+    def __contextCount(
+        self,
+        users: list[User],
+    ) -> int:
+        """
+            Get how many users to run at once: ``web_driver.contexts``, at
+            most the enabled users, 1 when the browser or the captcha mode
+            does not allow more.
+        """
+
+        driver_config: dict = self.__run_config.get("web_driver") or {}
+        contexts = driver_config.get("contexts", 1)
+        if isinstance(contexts, bool) or not isinstance(contexts, int) or contexts < 1:
+            self._showTrace(
+                f"浏览器上下文数量配置错误 ! : {contexts!r}, 将逐个运行用户",
+                self.TraceLevel.WARNING,
+            )
+            return 1
+        contexts = min(contexts, sum(1 for user in users if user.enabled))
+        if contexts <= 1:
+            return 1
+        if driver_config.get("experimental_contexts") is not True:
+            self._showTrace(
+                "同时运行多个用户为实验功能, 尚未在真实浏览器上验证, "
+                "需将 web_driver.experimental_contexts 设为 true, 将逐个运行用户",
+                self.TraceLevel.WARNING,
+            )
+            return 1
+        if self.__driver_type not in ISOLATED_DRIVER_TYPES:
+            self._showTrace(
+                f"{self.__driver_type} 浏览器不支持隔离的浏览器上下文, 将逐个运行用户",
+                self.TraceLevel.WARNING,
+            )
+            return 1
+        if not self.__run_config.get("login", {}).get("auto_captcha", True):
+            # the captcha answers come one by one from the same input queue
+            self._showTrace("手动输入验证码时将逐个运行用户", self.TraceLevel.WARNING)
+            return 1
+        return contexts
+
+    def __openSessions(
+        self,
+        count: int,
+    ) -> list[_Session]:
+        """
+            Open browser contexts until there are count sessions, a context
+            that fails to open leaves fewer sessions.
+        """
+
+        if count > len(self.__sessions) and self.__router is None:
+            # a missing element must not hold the session for the other windows
+            self.__driver.implicitly_wait(0)
+            self.__router = WindowRouter(self.__driver)
+        while len(self.__sessions) < count:
+            try:
+                handle = openIsolatedWindow(self.__driver)
+            except (WebDriverException, KeyError) as e:
+                self._showTrace(f"浏览器上下文创建失败: {e}", self.TraceLevel.WARNING)
+                break
+            session = self.__newSession(handle)
+            self.__router.bind(handle)
+            try:
+                # the page of a new window is not laid out like the first one otherwise
+                self.__driver.set_window_size(1920, 1080)
+                loaded = self.__initDriverUrl(session.login_page)
+            finally:
+                self.__router.bind(None)
+            if not loaded:
+                break
+            self.__sessions.append(session)
+        sessions = self.__sessions[:count]
+        if len(sessions) > 1:
+            self._showTrace(f"同时运行 {len(sessions)} 个用户, 每个用户使用独立的浏览器上下文")
+        return sessions
+
+    def __solveCaptcha(
+        self,
+        login_page: LoginPage,
+        auto_captcha: bool,
+    ) -> str:
+
+        # one OCR model for all the windows
+        with self.__captcha_lock:
+            return self.__captcha_solver.solveCaptcha(login_page, auto_captcha)
+
     def __run(
         self,
+        session: _Session,
         username: str,
         password: str,
         login_config: dict,
         run_mode_config: dict,
-        reserve_info: dict,
+        reserve_info: ReserveInfo,
+        reserve_ctx: ReserveContext | None = None,
     ) -> int:
 
         # result : -1 - terminate, 0 - success, 1 - failed, 2 - passed
         result: int = 2
 
         # login
-        auto_captcha: bool = login_config.get("auto_captcha", True)
-        if not self.__login_page.login(
-            username,
-            password,
-            captcha_solver=self.__captcha_solver.solveCaptcha,
-            auto_captcha=auto_captcha,
-            max_attempts=login_config.get("max_attempt", 3),
-        ):
-            return 1
+        with self._traceContext(stage="login"):
+            auto_captcha: bool = login_config.get("auto_captcha", True)
+            if not session.login_page.login(
+                username,
+                password,
+                captcha_solver=self.__solveCaptcha,
+                auto_captcha=auto_captcha,
+                max_attempts=login_config.get("max_attempt", 3),
+            ):
+                # a wrong password and an unreachable host look the same here
+                if not self.__breaker.probe():
+                    self._showTrace(
+                        f"图书馆服务器不可达 ({self.__breaker.lastError()}), "
+                        f"用户 {username} 登录失败",
+                        self.TraceLevel.ERROR,
+                    )
+                return 1
         run_mode_raw: int = run_mode_config.get("run_mode", 0)
         run_mode: dict[str, bool] = {
             "auto_reserve": run_mode_raw & 0x1,
@@ -254,125 +423,220 @@ class AutoLib(MsgBase):
         }
 
         # reserve
-        if run_mode["auto_reserve"]:
-            if self.__reserve_checker.check(reserve_info):
-                if self.__record_checker.canReserve(self.__shell, reserve_info["date"]):
-                    ctx = ReserveContext(
-                        username=username,
-                        date=reserve_info["date"],
-                        floor=reserve_info["floor"],
-                        room=reserve_info["room"],
-                        seat_id=reserve_info["seat_id"],
-                        begin_time=reserve_info["begin_time"]["time"],
-                        end_time=reserve_info["end_time"]["time"],
-                        begin_max_diff=reserve_info["begin_time"]["max_diff"],
-                        end_max_diff=reserve_info["end_time"]["max_diff"],
-                        begin_prefer_early=reserve_info["begin_time"]["prefer_early"],
-                        end_prefer_early=reserve_info["end_time"]["prefer_early"],
-                        expect_duration=reserve_info["expect_duration"],
-                        satisfy_duration=reserve_info["satisfy_duration"],
-                    )
-                    if self.__reserve_flow.execute(ctx):
-                        result = 0
+        with self._traceContext(stage="reserve"):
+            if run_mode["auto_reserve"]:
+                # checked by the pre-flight pass when given
+                ctx = reserve_ctx or self.__reserve_checker.buildContext(username, reserve_info)
+                if ctx:
+                    if self.__record_checker.canReserve(session.shell, ctx.date):
+                        if session.reserve_flow.execute(ctx):
+                            result = 0
+                        else:
+                            result = 1
                     else:
-                        result = 1
+                        self._showTrace(f"用户 {username} 无法预约, 已跳过")
+                        result = 2
                 else:
-                    self._showTrace(f"用户 {username} 无法预约, 已跳过")
-                    result = 2
-            else:
-                result = 1
+                    result = 1
 
         # checkin
-        last_result: int = result
-        if run_mode["auto_checkin"] and last_result != 1:
-            if self.__record_checker.canCheckin(self.__shell):
-                if self.__checkin_flow.execute(username):
-                    result = 0
+        with self._traceContext(stage="checkin"):
+            last_result: int = result
+            if run_mode["auto_checkin"] and last_result != 1:
+                if self.__record_checker.canCheckin(session.shell):
+                    if session.checkin_flow.execute(username):
+                        result = 0
+                    else:
+                        result = 1
                 else:
-                    result = 1
-            else:
-                self._showTrace(f"用户 {username} 无法签到, 已跳过")
-                result = 2
+                    self._showTrace(f"用户 {username} 无法签到, 已跳过")
+                    result = 2
         if last_result == 0:  # partly success
             result = 0
 
         # renewal
-        last_result = result
-        if run_mode["auto_renewal"] and last_result != 1:
-            can_renew, record = self.__record_checker.canRenew(self.__shell)
-            if can_renew:
-                renew_info: dict = reserve_info.get("renew_time", {})
-                if self.__renew_flow.execute(username, record, renew_info):
-                    if self.__record_checker.postRenewCheck(self.__shell, record):
-                        self._showTrace(f"用户 {username} 续约成功 !")
-                        result = 0
-                    else:
-                        if result != 1:  # partly success
+        with self._traceContext(stage="renewal"):
+            last_result = result
+            if run_mode["auto_renewal"] and last_result != 1:
+                can_renew, record = self.__record_checker.canRenew(session.shell)
+                if can_renew:
+                    if session.renew_flow.execute(username, record, reserve_info.renew_time):
+                        if self.__record_checker.postRenewCheck(session.shell, record):
+                            self._showTrace(f"用户 {username} 续约成功 !")
                             result = 0
                         else:
-                            result = 1
+                            if result != 1:  # partly success
+                                result = 0
+                            else:
+                                result = 1
+                    else:
+                        result = 1
                 else:
-                    result = 1
-            else:
-                self._showTrace(f"用户 {username} 无法续约, 已跳过")
-                result = 2
+                    self._showTrace(f"用户 {username} 无法续约, 已跳过")
+                    result = 2
         if last_result == 0:  # partly success
             result = 0
 
         # logout
-        if not self.__shell.logout():
-            self._showTrace(f"用户 {username} 退出登录失败, 尝试直接重载页面")
-            if not self.__initDriverUrl():
-                self._showTrace(f"用户 {username} 重载页面失败, 无法继续操作, 该任务已终止 !")
-                return -1
+        with self._traceContext(stage="logout"):
+            if not session.shell.logout():
+                self._showTrace(f"用户 {username} 退出登录失败, 尝试直接重载页面")
+                if not self.__initDriverUrl(session.login_page):
+                    self._showTrace(f"用户 {username} 重载页面失败, 无法继续操作, 该任务已终止 !")
+                    return -1
         self._showTrace(f"用户 {username} 已退出登录")
         return result
 
-    def run(
+    def __runUser(
         self,
-        user_config: dict,
-    ) -> None:
+        session: _Session,
+        position: int,
+        users: list[User],
+        index: int,
+        preflight: dict[int, ReserveContext | None] | None,
+    ) -> int:
 
-        self.__user_config = user_config
-        user_counter: dict[str, int] = {"current": 0, "success": 0, "failed": 0, "passed": 0}
-        users: list = self.__user_config.get("users", [])
-        self._showTrace(f"共发现 {len(users)} 个用户")
-        for user in users:
-            user_counter["current"] += 1
+        user = users[index]
+        self._showTrace(
+            f"正在处理第 {position}/{len(users)} 个用户: {user.username or "未知"}......",
+            no_log=True,
+        )
+        if not user.enabled:
+            self._showTrace(f"用户 {user.username or "未知"} 已跳过")
+            return 2
+        if user.error is not None:
+            self._showTrace(f"用户 {user.username or "未知"} 配置格式不正确 ({user.error}), 已跳过")
+            return 1
+        reserve_ctx = None
+        if preflight is not None and index in preflight:
+            reserve_ctx = preflight[index]
+            if reserve_ctx is None:
+                self._showTrace(f"用户 {user.username or "未知"} 预约信息预检未通过, 已跳过")
+                return 1
+        if not self.__breaker.allow():
+            # fail at once instead of waiting for every timeout of the user
             self._showTrace(
-                f"正在处理第 {user_counter["current"]}/{len(users)} 个用户: {user.get("username", "未知")}......",
-                no_log=True,
+                f"图书馆服务器不可达 ({self.__breaker.lastError()}), "
+                f"用户 {user.username or "未知"} 已跳过, "
+                f"{self.__breaker.retryIn():.0f} 秒后再次探测",
+                self.TraceLevel.WARNING,
             )
-            if not user.get("enabled", False):
-                self._showTrace(f"用户 {user.get("username", "未知")} 已跳过")
-                user_counter["passed"] += 1
-                continue
-            r: int = self.__run(
-                username=user.get("username", ""),
-                password=user.get("password", ""),
+            session.host_blocked = True
+            return 1
+        if session.host_blocked:
+            session.host_blocked = False
+            self._showTrace("图书馆服务器已恢复, 正在重新加载登录页面......")
+            if not self.__initDriverUrl(session.login_page):
+                return 1
+        with self._traceContext(user=user.username):
+            return self.__run(
+                session,
+                username=user.username,
+                password=user.password,
                 login_config=self.__run_config.get("login", {}),
                 run_mode_config=self.__run_config.get("mode", {}),
-                reserve_info=user.get("reserve_info", {}),
+                reserve_info=user.reserve_info,
+                reserve_ctx=reserve_ctx,
             )
-            if r == -1:
-                self._showTrace(
-                    f"用户 {user.get("username", "未知")} 处理过程中页面发生异常, 无法继续操作, 任务已终止 !",
-                    self.TraceLevel.WARNING,
-                )
-                break
-            elif r == 0:
-                user_counter["success"] += 1
-            elif r == 1:
-                user_counter["failed"] += 1
-            elif r == 2:
-                user_counter["passed"] += 1
+
+    def run(
+        self,
+        users: list[User],
+        preflight: dict[int, ReserveContext | None] | None = None,
+    ) -> list[int]:
+        """
+            Run the users in order, several at once in their own browser
+            contexts when configured (see ``AutoLib``).
+
+            Users that failed to load (see ``User.error``) fail without
+            logging in. ``preflight`` is the result of
+            ``ReserveChecker.preflight`` for these users: users with an
+            invalid reserve info fail without logging in as well, the others
+            reserve with their prepared context.
+
+            Returns:
+                list[int]: Result of each processed user, aligned with the
+                    users list: -1 - terminate, 0 - success, 1 - failed,
+                    2 - passed. Users after a terminate are not processed
+                    and have no result (users already running in other
+                    contexts are finished first).
+        """
+
+        results: list[int | None] = [None]*len(users)
+        user_counter: dict[str, int] = {"current": 0, "success": 0, "failed": 0, "passed": 0}
+        waited: float = self.__limiter.waited()
+        self._showTrace(f"共发现 {len(users)} 个用户")
+        sessions = self.__openSessions(self.__contextCount(users))
+        pending = iter(range(len(users)))
+        lock = threading.Lock()
+        terminated = threading.Event()
+        errors: list[Exception] = []
+
+        def work(
+            session: _Session,
+        ):
+
+            if self.__router is not None:
+                self.__router.bind(session.handle)
+            try:
+                while not terminated.is_set():
+                    with lock:
+                        index = next(pending, None)
+                        if index is None:
+                            return
+                        user_counter["current"] += 1
+                        position = user_counter["current"]
+                    r: int = self.__runUser(session, position, users, index, preflight)
+                    with lock:
+                        results[index] = r
+                        match r:
+                            case 0:
+                                user_counter["success"] += 1
+                            case 1:
+                                user_counter["failed"] += 1
+                            case 2:
+                                user_counter["passed"] += 1
+                    if r == -1:
+                        self._showTrace(
+                            f"用户 {users[index].username or "未知"} 处理过程中页面发生异常, 无法继续操作, 任务已终止 !",
+                            self.TraceLevel.WARNING,
+                        )
+                        terminated.set()
+            except Exception as e:
+                # raised again by run, once the other contexts are done
+                errors.append(e)
+                terminated.set()
+            finally:
+                if self.__router is not None:
+                    self.__router.bind(None)
+
+        if len(sessions) == 1:
+            work(sessions[0])
+        else:
+            workers = [
+                threading.Thread(target=work, args=(session,), name=f"AutoLibContext-{number}")
+                for number, session in enumerate(sessions)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        if errors:
+            raise errors[0]
         self._showTrace(
             f"处理完成, 共计 {user_counter["current"]} 个用户, "
             f"成功 {user_counter["success"]} 个用户, "
             f"失败 {user_counter["failed"]} 个用户, "
             f"跳过 {user_counter["passed"]} 个用户"
         )
-        return
+        waited = self.__limiter.waited() - waited
+        if waited >= 1 or self.__limiter.scale() < 1:
+            self._showTrace(
+                f"为避免图书馆服务器过载, 访问已限速: 共等待 {waited:.1f} 秒, "
+                f"当前速率为设定上限的 {self.__limiter.scale():.0%}"
+            )
+        # users are taken in order, the processed ones are a prefix
+        return list(itertools.takewhile(lambda r: r is not None, results))
 
     def close(
         self,
@@ -17,10 +17,11 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from base.MsgBase import MsgBase
+from utils.HostRateLimiter import HostRateLimiter
+from utils.TimeoutPolicy import waitFor, instance as timeoutInstance
 
 
 class LoginPage(MsgBase):
@@ -35,27 +36,28 @@ class LoginPage(MsgBase):
     SUCCESS_INDICATOR_CONTENT = (By.CLASS_NAME, "selectContent")
     SUCCESS_TITLE_KEYWORD     = "自选座位 :: 座位预约系统"
 
-    PAGE_LOAD_TIMEOUT = 5
-
     def __init__(
         self,
         input_queue: queue.Queue,
         output_queue: queue.Queue,
         driver: WebDriver,
+        limiter: HostRateLimiter | None = None,
     ) -> None:
 
         super().__init__(input_queue, output_queue)
         self._driver: WebDriver = driver
+        self._limiter: HostRateLimiter = limiter or HostRateLimiter({})
 
     def navigate(
         self,
         url: str,
     ) -> bool:
 
-        self._driver.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT)
-        self._driver.get(url)
-        if not self.waitUntilLoaded():
-            return False
+        with self._limiter.limit(HostRateLimiter.NAVIGATE) as permit:
+            timeoutInstance().navigate(self._driver, url)
+            if not self.waitUntilLoaded():
+                permit.fail()
+                return False
         return True
 
     def waitUntilLoaded(
@@ -63,19 +65,19 @@ class LoginPage(MsgBase):
     ) -> bool:
 
         try:
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "LoginPage:title",
                 EC.title_contains("首页")
             )
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "LoginPage:username",
                 EC.presence_of_element_located(self.USERNAME_INPUT)
             )
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "LoginPage:password",
                 EC.presence_of_element_located(self.PASSWORD_INPUT)
             )
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "LoginPage:captcha",
                 EC.presence_of_element_located(self.CAPTCHA_INPUT)
             )
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "LoginPage:captcha_img",
                 EC.presence_of_element_located(self.CAPTCHA_IMG)
             )
             return True
@@ -149,14 +151,16 @@ class LoginPage(MsgBase):
         self,
     ) -> bool:
 
+        # a wrong captcha or password never shows the main page, only the
+        # successes are learnt from
         try:
-            WebDriverWait(self._driver, 2).until(
-                EC.title_contains(self.SUCCESS_TITLE_KEYWORD)
+            waitFor(self._driver, "LoginPage:success_title",
+                EC.title_contains(self.SUCCESS_TITLE_KEYWORD), optional=True
             )
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "LoginPage:success_search",
                 EC.presence_of_element_located(self.SUCCESS_INDICATOR_SEARCH)
             )
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "LoginPage:success_content",
                 EC.presence_of_element_located(self.SUCCESS_INDICATOR_CONTENT)
             )
             return True
@@ -191,9 +195,15 @@ class LoginPage(MsgBase):
             if not self.fillCaptcha(captcha_text):
                 continue
             self._showTrace("尝试登录...", no_log=True)
-            if not self.clickLogin():
-                continue
-            if self.waitLoginSuccess():
+            with self._limiter.limit(HostRateLimiter.SUBMIT) as permit:
+                if not self.clickLogin():
+                    permit.discard()
+                    continue
+                logged_in = self.waitLoginSuccess()
+                if not logged_in:
+                    # mostly a wrong captcha or password, not the host
+                    permit.discard()
+            if logged_in:
                 self._showTrace(f"用户 {username} 第 {attempt + 1} 次登录成功 !")
                 return True
             else:
@@ -10,7 +10,6 @@ See the LICENSE file for details.
 import time
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.common.exceptions import (
@@ -22,6 +21,8 @@ from selenium.common.exceptions import (
 
 from pages.ReserveView import ReserveView
 from pages.RecordsView import RecordsView
+from utils.HostRateLimiter import HostRateLimiter
+from utils.TimeoutPolicy import waitFor
 
 
 class MainShell:
@@ -36,16 +37,19 @@ class MainShell:
     def __init__(
         self,
         driver: WebDriver,
+        limiter: HostRateLimiter | None = None,
     ) -> None:
 
         self._driver = driver
+        # navigations and submits wait for the budget of the library host
+        self._limiter = limiter or HostRateLimiter({})
 
     def _clickTab(
         self,
         locator: tuple,
     ) -> None:
 
-        WebDriverWait(self._driver, 2).until(
+        waitFor(self._driver, f"MainShell:tab:{locator[1]}",
             EC.element_to_be_clickable(locator)
         ).click()
 
@@ -53,39 +57,44 @@ class MainShell:
         self,
     ) -> ReserveView:
 
-        self._clickTab(self.TAB_RESERVE)
-        WebDriverWait(self._driver, 2).until(
-            EC.presence_of_element_located((By.ID, "seatLayout"))
-        )
-        return ReserveView(self._driver)
+        with self._limiter.limit(HostRateLimiter.NAVIGATE):
+            self._clickTab(self.TAB_RESERVE)
+            waitFor(self._driver, "MainShell:reserve_view",
+                EC.presence_of_element_located((By.ID, "seatLayout"))
+            )
+        return ReserveView(self._driver, self._limiter)
 
     def gotoRecordsView(
         self,
     ) -> RecordsView:
 
-        self._clickTab(self.TAB_HISTORY)
-        WebDriverWait(self._driver, 2).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "myReserveList"))
-        )
-        return RecordsView(self._driver)
+        with self._limiter.limit(HostRateLimiter.RECORDS):
+            self._clickTab(self.TAB_HISTORY)
+            waitFor(self._driver, "MainShell:records_view",
+                EC.presence_of_element_located((By.CLASS_NAME, "myReserveList"))
+            )
+        return RecordsView(self._driver, self._limiter)
 
     def logout(
         self,
     ) -> bool:
 
-        try:
-            self._driver.find_element(*self.TAB_LOGOUT).click()
-            return True
-        except (NoSuchElementException, ElementNotInteractableException):
-            return False
+        with self._limiter.limit(HostRateLimiter.NAVIGATE) as permit:
+            try:
+                self._driver.find_element(*self.TAB_LOGOUT).click()
+                return True
+            except (NoSuchElementException, ElementNotInteractableException):
+                permit.discard()
+                return False
 
     def waitCheckinButton(
         self,
     ) -> bool:
 
+        # no check in button without a reservation to check in
         try:
-            WebDriverWait(self._driver, 2).until(
-                EC.element_to_be_clickable(self.BTN_CHECKIN)
+            waitFor(self._driver, "MainShell:checkin_button:probe",
+                EC.element_to_be_clickable(self.BTN_CHECKIN), optional=True
             )
             return True
         except TimeoutException:
@@ -96,8 +105,8 @@ class MainShell:
     ) -> bool:
 
         try:
-            WebDriverWait(self._driver, 2).until(
-                EC.element_to_be_clickable(self.BTN_EXTEND)
+            waitFor(self._driver, "MainShell:extend_button:probe",
+                EC.element_to_be_clickable(self.BTN_EXTEND), optional=True
             )
             return True
         except TimeoutException:
@@ -127,25 +136,29 @@ class MainShell:
         self,
     ) -> None:
 
-        try:
-            btn = WebDriverWait(self._driver, 2).until(
-                EC.element_to_be_clickable(self.BTN_CHECKIN)
-            )
-            btn.click()
-        except (TimeoutException, ElementNotInteractableException):
-            return
+        with self._limiter.limit(HostRateLimiter.SUBMIT) as permit:
+            try:
+                btn = waitFor(self._driver, "MainShell:checkin_button:click",
+                    EC.element_to_be_clickable(self.BTN_CHECKIN)
+                )
+                btn.click()
+            except (TimeoutException, ElementNotInteractableException):
+                permit.discard()
+                return
 
     def clickExtendButton(
         self,
     ) -> None:
 
-        try:
-            btn = WebDriverWait(self._driver, 2).until(
-                EC.element_to_be_clickable(self.BTN_EXTEND)
-            )
-            btn.click()
-        except (TimeoutException, ElementNotInteractableException):
-            return
+        with self._limiter.limit(HostRateLimiter.SUBMIT) as permit:
+            try:
+                btn = waitFor(self._driver, "MainShell:extend_button:click",
+                    EC.element_to_be_clickable(self.BTN_EXTEND)
+                )
+                btn.click()
+            except (TimeoutException, ElementNotInteractableException):
+                permit.discard()
+                return
 
     def enableCheckinButtonByJS(
         self,
@@ -171,7 +184,9 @@ class MainShell:
         self,
     ) -> None:
 
-        try:
-            self._driver.refresh()
-        except (TimeoutException, WebDriverException):
-            return
+        with self._limiter.limit(HostRateLimiter.NAVIGATE) as permit:
+            try:
+                self._driver.refresh()
+            except (TimeoutException, WebDriverException):
+                permit.fail()
+                return
@@ -8,7 +8,6 @@ You may use, modify, and distribute this file under the terms of the MIT License
 See the LICENSE file for details.
 """
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
@@ -18,6 +17,9 @@ from selenium.common.exceptions import (
     TimeoutException,
 )
 
+from utils.HostRateLimiter import HostRateLimiter
+from utils.TimeoutPolicy import waitFor
+
 
 class RecordsView:
 
@@ -29,16 +31,18 @@ class RecordsView:
     def __init__(
         self,
         driver: WebDriver,
+        limiter: HostRateLimiter | None = None,
     ) -> None:
 
         self._driver = driver
+        self._limiter = limiter or HostRateLimiter({})
 
     def loadRecords(
         self,
     ) -> list | None:
 
         try:
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "RecordsView:records",
                 EC.presence_of_element_located(self.RECORDS_LIST)
             )
             return self._driver.find_elements(*self.RECORDS_LIST)
@@ -63,9 +67,10 @@ class RecordsView:
         self,
     ) -> bool:
 
+        # the more button is gone once every record is shown
         try:
-            WebDriverWait(self._driver, 2).until(
-                EC.element_to_be_clickable(self.MORE_BTN)
+            waitFor(self._driver, "RecordsView:more_button",
+                EC.element_to_be_clickable(self.MORE_BTN), optional=True
             )
         except TimeoutException:
             return False
@@ -73,7 +78,9 @@ class RecordsView:
             more_btn = self._driver.find_element(*self.MORE_BTN)
             if more_btn.is_displayed() and more_btn.is_enabled():
                 self._driver.execute_script("arguments[0].scrollIntoView(true);", more_btn)
-                self._driver.execute_script("arguments[0].click();", more_btn)
+                # loads the next page of records from the host
+                with self._limiter.limit(HostRateLimiter.RECORDS):
+                    self._driver.execute_script("arguments[0].click();", more_btn)
                 return True
             return False
         except (NoSuchElementException, StaleElementReferenceException):
@@ -10,7 +10,6 @@ See the LICENSE file for details.
 import time
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.common.exceptions import (
@@ -19,6 +18,8 @@ from selenium.common.exceptions import (
 )
 
 from pages.components.SeatMapDialog import SeatMapDialog
+from utils.HostRateLimiter import HostRateLimiter
+from utils.TimeoutPolicy import waitFor
 
 
 class ReserveView:
@@ -49,9 +50,11 @@ class ReserveView:
     def __init__(
         self,
         driver: WebDriver,
+        limiter: HostRateLimiter | None = None,
     ) -> None:
 
         self._driver = driver
+        self._limiter = limiter or HostRateLimiter({})
 
     def _clickOptionByJS(
         self,
@@ -87,10 +90,10 @@ class ReserveView:
     ) -> bool:
 
         try:
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "ReserveView:select",
                 EC.element_to_be_clickable(trigger)
             ).click()
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "ReserveView:option",
                 EC.element_to_be_clickable(option)
             ).click()
             return True
@@ -148,13 +151,13 @@ class ReserveView:
     ) -> SeatMapDialog | None:
 
         try:
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "ReserveView:find_room",
                 EC.element_to_be_clickable(self.FIND_ROOM_BTN)
             ).click()
         except (TimeoutException, ElementNotInteractableException):
             return None
         try:
-            WebDriverWait(self._driver, 2).until(
+            waitFor(self._driver, "ReserveView:room",
                 EC.element_to_be_clickable((By.ID, self.ROOM_BTN_FMT.format(room=room)))
             ).click()
         except (TimeoutException, ElementNotInteractableException):
@@ -168,19 +171,23 @@ class ReserveView:
         self,
     ) -> bool:
 
-        try:
-            WebDriverWait(self._driver, 2).until(
-                EC.element_to_be_clickable(self.RESERVE_BTN)
-            ).click()
-            return True
-        except (TimeoutException, ElementNotInteractableException):
-            return False
+        with self._limiter.limit(HostRateLimiter.SUBMIT) as permit:
+            try:
+                waitFor(self._driver, "ReserveView:reserve_button",
+                    EC.element_to_be_clickable(self.RESERVE_BTN)
+                ).click()
+                return True
+            except (TimeoutException, ElementNotInteractableException):
+                permit.discard()
+                return False
 
     def refresh(
         self,
     ) -> None:
 
-        try:
-            self._driver.refresh()
-        except TimeoutException:
-            return
+        with self._limiter.limit(HostRateLimiter.NAVIGATE) as permit:
+            try:
+                self._driver.refresh()
+            except TimeoutException:
+                permit.fail()
+                return
@@ -9,9 +9,10 @@ See the LICENSE file for details.
 """
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from utils.TimeoutPolicy import waitFor
+
 
 class Dialog:
     """
@@ -22,6 +23,11 @@ class Dialog:
 
         Automates the lifecycle: wait for appearance on enter,
         optionally wait for disappearance on exit.
+
+        The waits are named after the dialog class and the locator, their
+        timeouts are learnt (see ``utils.TimeoutPolicy``), the timeouts given
+        here only apply until then. Waits for elements that may be missing
+        as a normal answer pass ``optional``.
     """
 
     def __init__(
@@ -37,8 +43,8 @@ class Dialog:
         self._auto_close: bool = auto_close_on_exit
         self._timeout: float = wait_timeout
 
-        WebDriverWait(self._driver, self._timeout).until(
-            EC.visibility_of_element_located(self._root_locator)
+        waitFor(self._driver, self._waitName("open"),
+            EC.visibility_of_element_located(self._root_locator), self._timeout
         )
 
     def __enter__(
@@ -53,10 +59,17 @@ class Dialog:
     ) -> None:
 
         if self._auto_close:
-            WebDriverWait(self._driver, self._timeout).until(
-                EC.invisibility_of_element_located(self._root_locator)
+            waitFor(self._driver, self._waitName("close"),
+                EC.invisibility_of_element_located(self._root_locator), self._timeout
             )
 
+    def _waitName(
+        self,
+        target: str,
+    ) -> str:
+
+        return f"{type(self).__name__}:{target}"
+
     def _find(
         self,
         by: str,
@@ -76,39 +89,43 @@ class Dialog:
     def _waitClickable(
         self,
         locator: tuple,
-        timeout: float = 2.0,
+        timeout: float | None = None,
+        optional: bool = False,
     ) -> WebElement:
 
-        return WebDriverWait(self._driver, timeout).until(
-            EC.element_to_be_clickable(locator)
+        return waitFor(self._driver, self._waitName(locator[1]),
+            EC.element_to_be_clickable(locator), timeout, optional
         )
 
     def _waitPresence(
         self,
         locator: tuple,
-        timeout: float = 2.0,
+        timeout: float | None = None,
+        optional: bool = False,
     ) -> WebElement:
 
-        return WebDriverWait(self._driver, timeout).until(
-            EC.presence_of_element_located(locator)
+        return waitFor(self._driver, self._waitName(locator[1]),
+            EC.presence_of_element_located(locator), timeout, optional
         )
 
     def _waitVisible(
         self,
         locator: tuple,
-        timeout: float = 2.0,
+        timeout: float | None = None,
+        optional: bool = False,
     ) -> WebElement:
 
-        return WebDriverWait(self._driver, timeout).until(
-            EC.visibility_of_element_located(locator)
+        return waitFor(self._driver, self._waitName(locator[1]),
+            EC.visibility_of_element_located(locator), timeout, optional
         )
 
     def _waitAllPresence(
         self,
         locator: tuple,
-        timeout: float = 2.0,
+        timeout: float | None = None,
+        optional: bool = False,
     ) -> list[WebElement]:
 
-        return WebDriverWait(self._driver, timeout).until(
-            EC.presence_of_all_elements_located(locator)
+        return waitFor(self._driver, self._waitName(locator[1]),
+            EC.presence_of_all_elements_located(locator), timeout, optional
         )
@@ -57,7 +57,7 @@ class RenewDialog(Dialog):
         if "警告" in head_msg:
             return False
         try:
-            self._waitAllPresence(self.TIME_OPTS)
+            self._waitAllPresence(self.TIME_OPTS, optional=True)
             self._waitPresence(self.OK_BTN)
         except TimeoutException:
             return False
@@ -10,6 +10,7 @@ See the LICENSE file for details.
 from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
+    TimeoutException,
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -42,8 +43,8 @@ class ReserveResultDialog(Dialog):
     ) -> str:
 
         try:
-            return self._find(*self._titleLocator()).text
-        except (NoSuchElementException, StaleElementReferenceException):
+            return self._waitPresence(self._titleLocator(), optional=True).text
+        except (TimeoutException, NoSuchElementException, StaleElementReferenceException):
             return ""
 
     def isSuccess(
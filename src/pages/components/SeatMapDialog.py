@@ -15,10 +15,10 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from pages.components.Dialog import Dialog
+from utils.TimeoutPolicy import waitFor
 
 
 class SeatMapDialog(Dialog):
@@ -48,8 +48,9 @@ class SeatMapDialog(Dialog):
         try:
             seat_el = self._find(By.ID, f"seat_{int(seat_id):03d}")
             seat_link = seat_el.find_element(By.TAG_NAME, "a")
-            WebDriverWait(self._driver, 2).until(
-                EC.element_to_be_clickable(seat_link)
+            # a taken seat is never clickable, not a slow page
+            waitFor(self._driver, self._waitName("seat"),
+                EC.element_to_be_clickable(seat_link), optional=True
             )
             seat_link.click()
             return seat_link.get_attribute("title")
@@ -63,8 +64,8 @@ class SeatMapDialog(Dialog):
                 if not seat_id_upper == seat.text.lstrip('0'):
                     continue
                 seat_link = seat.find_element(By.TAG_NAME, "a")
-                WebDriverWait(self._driver, 2).until(
-                    EC.element_to_be_clickable(seat_link)
+                waitFor(self._driver, self._waitName("seat"),
+                    EC.element_to_be_clickable(seat_link), optional=True
                 )
                 seat_link.click()
                 return seat_link.get_attribute("title")
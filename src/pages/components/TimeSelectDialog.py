@@ -104,8 +104,9 @@ class TimeSelectDialog(Dialog):
     ) -> list[WebElement]:
 
         try:
+            # no free time is an answer, not a slow page
             self._waitAllPresence(
-                (By.CSS_SELECTOR, f"#{time_id} ul li a")
+                (By.CSS_SELECTOR, f"#{time_id} ul li a"), optional=True
             )
         except TimeoutException:
             return []
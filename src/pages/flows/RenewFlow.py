@@ -17,6 +17,7 @@ from selenium.common.exceptions import (
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from base.MsgBase import MsgBase
+from managers.config.UserConfig import RenewSpec
 from pages.MainShell import MainShell
 from pages.components.RenewDialog import RenewDialog
 from pages.flows._helpers import timeStrToMins, minsToTimeStr
@@ -64,11 +65,12 @@ class RenewFlow(MsgBase):
     def _computeRenewTarget(
         self,
         record: dict,
-        renew_info: dict,
+        renew_info: RenewSpec,
     ):
 
         end_time = record["time"]["end"]
-        target_renew_mins = timeStrToMins(end_time) + renew_info.get("expect_duration", 2) * 60
+        expect_duration = 2 if renew_info.expect_duration is None else renew_info.expect_duration
+        target_renew_mins = timeStrToMins(end_time) + expect_duration * 60
         if not self._validateRenewTime(end_time, target_renew_mins):
             return None
         return target_renew_mins
@@ -151,11 +153,11 @@ class RenewFlow(MsgBase):
         self,
         username: str,
         record: dict,
-        renew_info: dict,
+        renew_info: RenewSpec,
     ) -> bool:
 
-        max_diff = renew_info.get("max_diff", 30)
-        prefer_earlier = renew_info.get("prefer_early", True)
+        max_diff = 30 if renew_info.max_diff is None else renew_info.max_diff
+        prefer_earlier = True if renew_info.prefer_early is None else renew_info.prefer_early
         target_renew_mins = self._computeRenewTarget(record, renew_info)
         if target_renew_mins is None:
             return False
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import time
+import queue
+import threading
+
+from base.MsgBase import MsgBase
+from managers.config.UserConfig import User
+from managers.config.UserStore import loadUserConfig
+from pages.AutoLib import AutoLib
+from pages.services.ReserveChecker import ReserveChecker
+from utils.HostCircuitBreaker import breakerFor
+from utils.JSONReader import JSONReader
+from utils.TimeoutPolicy import instance as timeoutInstance
+
+
+class AutoLibRunner(MsgBase):
+    """
+        Runs the enabled groups of the user config with one AutoLib.
+
+        The runner does not depend on Qt, the GUI wraps it in a QThread and
+        the headless CLI calls ``run`` directly. Subclasses hook into the
+        run through the ``_on*`` methods.
+
+        The reserve info of every enabled user is checked by a pre-flight
+        pass before the browser is started (see ``_preflight``), users with
+        an invalid one are never run and no browser is started when no user
+        is left to run. The library host is then probed over plain HTTP
+        (see ``_checkHost``), no browser is started while it is down.
+
+        The page wait timeouts learnt by the run are kept in
+        ``timeouts.json`` next to the run config (see ``_loadTimeouts``).
+
+        Args:
+            input_queue (queue.Queue): The input queue for receiving messages.
+            output_queue (queue.Queue): The output queue for sending messages.
+            config_paths (dict): The ``run`` and ``user`` config paths.
+    """
+
+    def __init__(
+        self,
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+        config_paths: dict,
+    ):
+
+        MsgBase.__init__(self, input_queue, output_queue)
+        self.__config_paths = config_paths
+        self.__has_error = False
+        self.__stop_requested = threading.Event()
+        self._preflight_contexts: dict[int, dict] = {}
+
+    def checkTimeAvailable(
+        self,
+    ) -> bool:
+
+        current_time = time.strftime("%H:%M", time.localtime())
+        if current_time >= "23:30" or current_time <= "07:30":
+            self._showTrace(
+                "当前时间不在图书馆开放时间内, 请在 07:30 - 23:30 之间尝试",
+                self.TraceLevel.WARNING,
+            )
+            return False
+        self._showLog(f"时间检查通过, 当前时间: {current_time}", self.TraceLevel.INFO)
+        return True
+
+    def checkConfigPaths(
+        self,
+    ) -> bool:
+
+        if not all(
+            os.path.exists(path) for path in self.__config_paths.values()
+        ):
+            self._showTrace(
+                "配置文件路径不存在, 请检查配置文件路径是否正确",
+                self.TraceLevel.ERROR,
+            )
+            return False
+        self._showLog(
+            f"配置文件路径检查通过, 路径: {self.__config_paths}",
+            self.TraceLevel.INFO,
+        )
+        return True
+
+    def loadConfigs(
+        self,
+    ) -> bool:
+
+        self._showTrace(
+            f"正在加载配置文件, 运行配置文件路径: {self.__config_paths["run"]}",
+            no_log=True,
+        )
+        self._run_config = JSONReader(self.__config_paths["run"]).data()
+        self._showTrace(
+            f"正在加载配置文件, 用户配置文件路径: {self.__config_paths["user"]}",
+            no_log=True,
+        )
+        if self._run_config is None:
+            self._showTrace(
+                "配置文件加载失败, 请检查配置文件是否正确",
+                self.TraceLevel.ERROR,
+            )
+            return False
+        # parsed and validated once, the runs below only read the model,
+        # a user store only yields the users of the enabled groups
+        self._user_config = loadUserConfig(self.__config_paths["user"], enabled_only=True)
+        if not self._user_config.groups:
+            self._showTrace(
+                "用户配置文件中无有效任务组, 请检查用户配置文件是否正确",
+                self.TraceLevel.WARNING,
+            )
+            return False
+        invalid_users = [
+            user
+            for group in self._user_config.groups
+            for user in group.users
+            if user.error is not None
+        ]
+        if invalid_users:
+            self._showTrace(
+                f"用户配置文件中有 {len(invalid_users)} 个用户的配置格式不正确, 将不会运行: "
+                f"{", ".join(user.username or "未知" for user in invalid_users)}",
+                self.TraceLevel.WARNING,
+            )
+        self._showLog(
+            f"配置文件加载成功, 任务组数量: {len(self._user_config.groups)}",
+            self.TraceLevel.INFO,
+        )
+        return True
+
+    def _runName(
+        self,
+    ) -> str:
+
+        return "常规任务"
+
+    def _beforeCreateAutoLib(
+        self,
+    ):
+
+        return
+
+    def _onChecksFailed(
+        self,
+    ) -> bool:
+
+        return True
+
+    def _preflightUsers(
+        self,
+        users: list[User],
+    ) -> dict:
+
+        checker = ReserveChecker(self._input_queue, self._output_queue)
+        return checker.preflight(users, self._run_config.get("mode", {}).get("run_mode", 0))
+
+    @staticmethod
+    def _hasRunnableUser(
+        users: list[User],
+        contexts: dict,
+    ) -> bool:
+
+        return any(
+            user.enabled and user.error is None and contexts.get(index, True) is not None
+            for index, user in enumerate(users)
+        )
+
+    def _preflight(
+        self,
+    ) -> bool:
+        """
+            Check the users of every enabled group before the browser is
+            started, contexts are kept by group index for ``_runGroups``.
+
+            Returns:
+                bool: Whether any user is left to run.
+        """
+
+        self._preflight_contexts = {}
+        runnable = False
+        for index, group in enumerate(self._user_config.groups):
+            if not group.enabled:
+                continue
+            with self._traceContext(stage="preflight"):
+                self._preflight_contexts[index] = self._preflightUsers(group.users)
+            runnable = runnable or self._hasRunnableUser(group.users, self._preflight_contexts[index])
+        return runnable
+
+    def _onNothingToRun(
+        self,
+    ):
+
+        return
+
+    def _checkHost(
+        self,
+    ) -> bool:
+        """
+            Probe the library host through the breaker shared by all runs of
+            the process, an open breaker is not probed again before its
+            backoff is over.
+
+            Returns:
+                bool: Whether the host is reachable.
+        """
+
+        host_url = self._run_config.get("library", {}).get("host_url")
+        if not host_url:
+            return True
+        breaker = breakerFor(host_url)
+        if breaker.check():
+            return True
+        retry_in = breaker.retryIn()
+        self._showTrace(
+            f"图书馆服务器不可达 ({breaker.lastError()}), 不启动浏览器"
+            + (f", {retry_in:.0f} 秒后可再次探测" if retry_in > 0 else ""),
+            self.TraceLevel.ERROR,
+        )
+        return False
+
+    def _loadTimeouts(
+        self,
+    ):
+        """
+            Load the learnt page wait timeouts of the run config directory,
+            the process keeps them once loaded.
+        """
+
+        path = os.path.join(os.path.dirname(os.path.abspath(self.__config_paths["run"])), "timeouts.json")
+        policy = timeoutInstance()
+        if policy.path() == path:
+            return
+        if not policy.load(path):
+            self._showTrace(f"超时记录文件 {path} 无法读取, 将重新统计", self.TraceLevel.WARNING)
+
+    def _saveTimeouts(
+        self,
+    ):
+
+        try:
+            timeoutInstance().save()
+        except Exception as e:
+            self._showTrace(f"超时记录保存失败: {e}", self.TraceLevel.WARNING)
+
+    def _onHostUnreachable(
+        self,
+    ):
+
+        self.__has_error = True
+
+    def _runGroups(
+        self,
+        auto_lib: AutoLib,
+    ):
+
+        for index, group in enumerate(self._user_config.groups):
+            if self.stopRequested():
+                self._showTrace("已请求停止, 跳过剩余任务组", no_log=True)
+                break
+            if not group.enabled:
+                self._showTrace(f"任务组 {group.name or "未知"} 已跳过", no_log=True)
+                continue
+            self._showTrace(f"正在运行任务组 {group.name or "未知"}", no_log=True)
+            auto_lib.run(group.users, self._preflight_contexts.get(index))
+
+    def _onFinished(
+        self,
+    ):
+
+        return
+
+    def _onError(
+        self,
+        error_msg: str,
+    ):
+
+        self._showTrace(error_msg, self.TraceLevel.ERROR)
+
+    def hasError(
+        self,
+    ) -> bool:
+
+        return self.__has_error
+
+    def requestStop(
+        self,
+    ):
+        """
+            Ask the run to stop before the next task group, the group being
+            run is finished first.
+        """
+
+        self.__stop_requested.set()
+
+    def stopRequested(
+        self,
+    ) -> bool:
+
+        return self.__stop_requested.is_set()
+
+    def run(
+        self,
+    ):
+
+        auto_lib = None
+        self._showTrace(f"{self._runName()} 开始运行")
+
+        if not self.checkTimeAvailable() or not self.checkConfigPaths():
+            if not self._onChecksFailed():
+                return
+        else:
+            try:
+                if not self.loadConfigs():
+                    raise Exception("配置文件加载失败")
+                self._beforeCreateAutoLib()
+                self._loadTimeouts()
+                if not self._preflight():
+                    self._showTrace("预检后没有需要运行的用户, 不启动浏览器")
+                    self._onNothingToRun()
+                elif not self._checkHost():
+                    self._onHostUnreachable()
+                else:
+                    auto_lib = AutoLib(
+                        self._input_queue,
+                        self._output_queue,
+                        self._run_config,
+                    )
+                    self._runGroups(auto_lib)
+                    self._saveTimeouts()
+            except Exception as e:
+                self.__has_error = True
+                self._onError(f"{self._runName()} 运行时发生异常 : {e}")
+                return
+        if auto_lib:
+            auto_lib.close()
+        self._showTrace(f"{self._runName()} 运行结束")
+        self._onFinished()
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import queue
+
+import managers.config.ConfigManager as ConfigManager
+
+from autoscript import ASEngine, createEngine
+from interfaces.ConfigProvider import CfgKey
+from managers.config.UserConfig import User
+from pages.AutoLib import AutoLib
+from runners.AutoLibRunner import AutoLibRunner
+
+
+class TimerTaskRunner(AutoLibRunner):
+    """
+        Runs one or several timer tasks in a single browser session.
+
+        Tasks fired together are merged into one execution plan: every task
+        applies its repeat AutoScript to its own copy of the users, users
+        that end up identical are run only once, and all of them share one
+        AutoLib (one browser driver). When the run is over the result is
+        reported back to each originating task through
+        ``_onTimerTaskFinished``.
+    """
+
+    def __init__(
+        self,
+        timer_tasks: list[dict],
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+        config_paths: dict,
+    ):
+
+        super().__init__(input_queue, output_queue, config_paths)
+        self.__timer_tasks = timer_tasks
+        self.__plan_users: list[User] = []
+        self.__plan_contexts: dict = {}
+        self.__task_users: dict[str, list[int]] = {}
+        self.__results: list[int] = []
+
+    def timerTasks(
+        self,
+    ) -> list[dict]:
+
+        return self.__timer_tasks
+
+    def _runName(
+        self,
+    ) -> str:
+
+        names = "', '".join(x.get("name", "未知") for x in self.__timer_tasks)
+        if len(self.__timer_tasks) == 1:
+            return f"定时任务 '{names}'"
+        return f"合并定时任务 '{names}'"
+
+    def _beforeCreateAutoLib(
+        self,
+    ):
+
+        self.buildPlan()
+
+    def _runGroups(
+        self,
+        auto_lib: AutoLib,
+    ):
+
+        self.__results = auto_lib.run(self.__plan_users, self.__plan_contexts)
+
+    def _preflight(
+        self,
+    ) -> bool:
+
+        with self._traceContext(stage="preflight"):
+            self.__plan_contexts = self._preflightUsers(self.__plan_users)
+        return self._hasRunnableUser(self.__plan_users, self.__plan_contexts)
+
+    def _onNothingToRun(
+        self,
+    ):
+
+        # disabled users are passed, the others failed the pre-flight
+        self.__results = [
+            2 if not user.enabled else 1
+            for user in self.__plan_users
+        ]
+
+    def _onHostUnreachable(
+        self,
+    ):
+
+        # disabled users are passed, the others could not be run
+        self.__results = [
+            2 if not user.enabled else 1
+            for user in self.__plan_users
+        ]
+
+    def _onChecksFailed(
+        self,
+    ) -> bool:
+
+        self._showTrace("定时任务跳过执行: 时间或配置文件检查未通过")
+        self.finishTasks(False)
+        return False
+
+    def _onFinished(
+        self,
+    ):
+
+        self.finishTasks(False)
+
+    def _onError(
+        self,
+        error_msg: str,
+    ):
+
+        self._showTrace(error_msg, self.TraceLevel.ERROR)
+        self.finishTasks(True)
+
+    def buildPlan(
+        self,
+    ):
+
+        self.__plan_users = []
+        self.__task_users = {}
+        plan_index: dict[tuple, int] = {}
+        total_count = 0
+        for timer_task in self.__timer_tasks:
+            task_users = self.__task_users.setdefault(timer_task["uuid"], [])
+            for user in self.applyRepeatAutoScript(timer_task):
+                total_count += 1
+                # identical users mean identical operations
+                user_key = user.key()
+                if user_key not in plan_index:
+                    plan_index[user_key] = len(self.__plan_users)
+                    self.__plan_users.append(user)
+                task_users.append(plan_index[user_key])
+        if len(self.__timer_tasks) > 1:
+            self._showTrace(
+                f"合并执行 {len(self.__timer_tasks)} 个定时任务, "
+                f"共 {total_count} 个用户, 去重后 {len(self.__plan_users)} 个用户"
+            )
+
+    def finishTasks(
+        self,
+        is_error: bool,
+    ):
+
+        for timer_task in self.__timer_tasks:
+            if not is_error and self.__plan_users:
+                counter = {"success": 0, "failed": 0, "passed": 0}
+                for index in self.__task_users.get(timer_task["uuid"], []):
+                    result = self.__results[index] if index < len(self.__results) else -1
+                    if result == 0:
+                        counter["success"] += 1
+                    elif result == 2:
+                        counter["passed"] += 1
+                    else:
+                        counter["failed"] += 1
+                self._showTrace(
+                    f"定时任务 '{timer_task.get("name", "未知")}' 结果: "
+                    f"成功 {counter["success"]} 个用户, "
+                    f"失败 {counter["failed"]} 个用户, "
+                    f"跳过 {counter["passed"]} 个用户"
+                )
+            self._onTimerTaskFinished(is_error, timer_task)
+
+    def _onTimerTaskFinished(
+        self,
+        is_error: bool,
+        timer_task: dict,
+    ):
+
+        return
+
+    def autoScriptLimits(
+        self,
+    ) -> tuple[int, int]:
+        """
+            Get the AutoScript instruction and memory (bytes) limits from the
+            global config, the engine defaults when it is not available.
+        """
+
+        instruction_limit = ASEngine.DEFAULT_INSTRUCTION_LIMIT
+        memory_limit = ASEngine.DEFAULT_MEMORY_LIMIT
+        try:
+            cfg_mgr = ConfigManager.instance()
+            instruction_limit = int(cfg_mgr.get(CfgKey.GLOBAL.AUTOSCRIPT.MAX_INSTRUCTIONS, instruction_limit))
+            memory_limit = int(float(cfg_mgr.get(
+                CfgKey.GLOBAL.AUTOSCRIPT.MAX_MEMORY_MB,
+                memory_limit/(1024*1024)
+            ))*1024*1024)
+        except (ValueError, TypeError):
+            pass
+        return instruction_limit, memory_limit
+
+    def applyRepeatAutoScript(
+        self,
+        timer_task: dict,
+    ) -> list[User]:
+        """
+            Get the users of the enabled groups as seen by the given task.
+
+            Without a repeat AutoScript these are the loaded users themselves,
+            otherwise copies the script is applied to, so the loaded user
+            config is never touched by a task.
+
+            Returns:
+                list[User]: Users of the task, in group order.
+        """
+
+        users = self._user_config.enabledUsers()
+        auto_script = timer_task.get("repeat_auto_script", "")
+        if not auto_script or not auto_script.strip():
+            return users
+        users = [user.copy() for user in users]
+        self._showTrace("检测到重复定时任务 AutoScript, 开始执行...", no_log=True)
+        # one runtime and one compiled script for all users of the task
+        try:
+            errors = createEngine(*self.autoScriptLimits()).executeBatch(auto_script, users)
+        except ValueError as e:
+            self._showTrace(f"AutoScript 执行错误: {e}", self.TraceLevel.ERROR)
+            return users
+        affected_count = 0
+        for user, error in zip(users, errors):
+            if error is None:
+                affected_count += 1
+                continue
+            self._showTrace(
+                f"AutoScript 执行错误 (用户 {user.username or "未知"}): {error}",
+                self.TraceLevel.ERROR,
+            )
+        self._showLog(
+            f"AutoScript 执行完毕, 影响 {affected_count} 个用户",
+            self.TraceLevel.INFO,
+        )
+        return users
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import time
+import threading
+
+from typing import Any, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+
+# Driver types whose browser contexts can be created over CDP.
+ISOLATED_DRIVER_TYPES = ("chrome", "edge")
+
+
+class WindowRouter:
+    """
+        Lets several threads drive one WebDriver session, each in its own
+        window.
+
+        Every command of the session (elements found in a window included,
+        they call back into the driver) goes through ``execute``, which is
+        replaced on the driver: commands are serialized, and the window of
+        the calling thread (see ``bind``) is switched to first when it is
+        not the current one. Threads that did not bind a window use the
+        window that was current when the router was installed.
+
+        A thread waiting between commands (e.g. polling for an element,
+        solving a captcha) holds no lock, so the other windows go on
+        meanwhile. A command that waits in the driver holds every window
+        until it returns, so the session should have no implicit wait,
+        load pages by clicks with the "eager" strategy and navigate with
+        ``TimeoutPolicy.navigate``.
+
+        Args:
+            driver (Any): The web driver, its ``execute`` is replaced.
+    """
+
+    # Commands that do not act on a window.
+    UNROUTED = frozenset((
+        Command.SWITCH_TO_WINDOW,
+        Command.W3C_GET_WINDOW_HANDLES,
+        Command.QUIT,
+    ))
+
+    def __init__(
+        self,
+        driver: Any
+    ):
+
+        self.__lock = threading.RLock()
+        self.__local = threading.local()
+        self.__execute = driver.execute
+        self.__default = driver.current_window_handle
+        self.__current = self.__default
+        self.__switches = 0
+        driver.execute = self.execute
+
+    def bind(
+        self,
+        handle: Optional[str]
+    ):
+        """
+            Route the commands of the calling thread to a window, None routes
+            them to the default window again.
+        """
+
+        self.__local.handle = handle
+
+    def execute(
+        self,
+        driver_command: str,
+        params: Optional[dict] = None
+    ) -> dict:
+
+        handle = getattr(self.__local, "handle", None) or self.__default
+        with self.__lock:
+            if driver_command not in self.UNROUTED and handle != self.__current:
+                self.__execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+                self.__current = handle
+                self.__switches += 1
+            response = self.__execute(driver_command, params)
+            if driver_command == Command.SWITCH_TO_WINDOW and params:
+                self.__current = params.get("handle", self.__current)
+            return response
+
+    def switches(
+        self
+    ) -> int:
+        """
+            Get the number of window switches made for the threads.
+        """
+
+        with self.__lock:
+            return self.__switches
+
+
+def isRouted(
+    driver: Any
+) -> bool:
+    """
+        Whether a ``WindowRouter`` shares the session of the driver between
+        windows.
+    """
+
+    return isinstance(getattr(driver.execute, "__self__", None), WindowRouter)
+
+def openIsolatedWindow(
+    driver: Any,
+    timeout: float = 2.0
+) -> str:
+    """
+        Open a window in a new browser context of a Chrome or Edge browser,
+        with its own cookies, storage and cache, so another user can log in
+        there while the other windows stay logged in.
+
+        Args:
+            driver (Any): The Chrome or Edge web driver.
+            timeout (float): Seconds to wait for the window to be listed.
+
+        Returns:
+            str: The window handle.
+
+        Raises:
+            WebDriverException: The context or the window could not be
+                created.
+    """
+
+    before = set(driver.window_handles)
+    context = driver.execute_cdp_cmd("Target.createBrowserContext", {"disposeOnDetach": True})
+    target = driver.execute_cdp_cmd("Target.createTarget", {
+        "url": "about:blank",
+        "browserContextId": context["browserContextId"],
+        "newWindow": True,
+    })
+    target_id = target["targetId"]
+    deadline = time.monotonic() + timeout
+    while True:
+        handles = driver.window_handles
+        # ChromeDriver names windows after their target
+        for handle in handles:
+            if handle == target_id or handle.endswith(target_id):
+                return handle
+        new_handles = set(handles) - before
+        if len(new_handles) == 1:
+            return new_handles.pop()
+        if time.monotonic() >= deadline:
+            raise WebDriverException(f"浏览器上下文窗口 {target_id} 未出现")
+        time.sleep(0.05)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import time
+
+from typing import Optional
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+        Inter-process exclusive file lock.
+
+        This class is used to serialise work between several application
+        instances (or worker processes) on one machine. The lock is held on
+        a small lock file, which is created if it does not exist.
+
+        Args:
+            lock_path (str): The path of the lock file.
+            timeout (Optional[float]): Seconds to wait for the lock, None waits forever.
+
+        Examples:
+            >>> with FileLock("drivers/.locks/chrome.lock"):
+            ...     pass # only one process at a time runs here
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        lock_path: str,
+        timeout: Optional[float] = None
+    ):
+
+        self.__lock_path = os.path.abspath(lock_path)
+        self.__timeout = timeout
+        self.__fd = None
+
+    def __tryLock(
+        self
+    ) -> bool:
+
+        try:
+            if os.name == 'nt':
+                msvcrt.locking(self.__fd, msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(self.__fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def acquire(
+        self
+    ) -> bool:
+
+        if self.__fd is not None:
+            return True
+        os.makedirs(os.path.dirname(self.__lock_path), exist_ok=True)
+        self.__fd = os.open(self.__lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.__timeout is None else time.monotonic() + self.__timeout
+        while not self.__tryLock():
+            if deadline is not None and time.monotonic() >= deadline:
+                os.close(self.__fd)
+                self.__fd = None
+                return False
+            time.sleep(self.POLL_INTERVAL)
+        return True
+
+    def release(
+        self
+    ):
+
+        if self.__fd is None:
+            return
+        try:
+            if os.name == 'nt':
+                os.lseek(self.__fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.__fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.__fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self.__fd)
+            self.__fd = None
+
+    def __enter__(
+        self
+    ) -> "FileLock":
+
+        if not self.acquire():
+            raise TimeoutError(f"获取文件锁超时: {self.__lock_path}")
+        return self
+
+    def __exit__(
+        self,
+        *args: object
+    ) -> None:
+
+        self.release()
+
+    def path(
+        self
+    ) -> str:
+
+        return self.__lock_path
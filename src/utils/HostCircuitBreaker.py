@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import ssl
+import time
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+from typing import Optional
+from urllib.parse import urlsplit
+
+from utils.TimeoutPolicy import TimeoutPolicy, instance as timeoutInstance
+
+
+def hostKey(
+    host_url: str
+) -> str:
+    """
+        Get the scheme and host of a url, the key of the per host limiter and
+        breaker.
+    """
+
+    parts = urlsplit(host_url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.netloc else host_url
+
+def probeHost(
+    host_url: str,
+    timeout: float = 2.0
+) -> Optional[str]:
+    """
+        Check that the host answers HTTP, without starting a browser.
+
+        Any answer below 500 counts, the host is up even when the page itself
+        is a redirect or an error. Certificate errors are ignored like the
+        browsers do.
+
+        Returns:
+            Optional[str]: None when the host is reachable, otherwise why not.
+    """
+
+    request = urllib.request.Request(host_url, headers={"User-Agent": "AutoLibrary"})
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    try:
+        with urllib.request.urlopen(
+            request,
+            timeout=timeout,
+            context=context
+        ):
+            return None
+    except urllib.error.HTTPError as e:
+        return None if e.code < 500 else f"HTTP {e.code}"
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, (socket.timeout, TimeoutError)):
+            return f"{timeout:g} 秒内无响应"
+        return str(e.reason)
+    except (socket.timeout, TimeoutError):
+        return f"{timeout:g} 秒内无响应"
+    except (OSError, ValueError) as e:
+        return str(e)
+
+
+class HostCircuitBreaker:
+    """
+        Circuit breaker for one library host, shared by all browsers of the
+        process through ``breakerFor``.
+
+        Closed, every user runs. ``failure_threshold`` host failures in a
+        row (page loads timing out, see ``HostRateLimiter``, or failed
+        probes, each tried twice) open it: users fail at once instead of
+        waiting for their timeouts. When the backoff is over the next ``allow`` probes the
+        host; reachable, the breaker is half open and users run again until
+        the first success closes it or the first failure opens it again
+        with twice the backoff (up to ``max_backoff``).
+
+        Args:
+            host_url (str): The host to probe.
+            failure_threshold (int): Host failures in a row that open it.
+            base_backoff (float): Seconds before the first probe.
+            max_backoff (float): Upper bound of the backoff.
+            probe_timeout (Optional[float]): Seconds a probe waits for an
+                answer, None takes the learnt page load timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        host_url: str,
+        failure_threshold: int = 3,
+        base_backoff: float = 5.0,
+        max_backoff: float = 120.0,
+        probe_timeout: Optional[float] = None
+    ):
+
+        self.__lock = threading.Lock()
+        self.__host_url = host_url
+        self.__failure_threshold = max(1, failure_threshold)
+        self.__base_backoff = base_backoff
+        self.__max_backoff = max(base_backoff, max_backoff)
+        self.__probe_timeout = probe_timeout
+        self.__state = self.CLOSED
+        self.__failures = 0
+        self.__backoff = base_backoff
+        self.__retry_at = 0.0
+        self.__probing = False
+        self.__last_error = ""
+
+    def __open(
+        self,
+        error: str
+    ):
+
+        # from half open or open the host failed again, back off longer
+        if self.__state == self.CLOSED:
+            self.__backoff = self.__base_backoff
+        else:
+            self.__backoff = min(self.__max_backoff, self.__backoff*2)
+        self.__state = self.OPEN
+        self.__retry_at = time.monotonic() + self.__backoff
+        if error:
+            self.__last_error = error
+
+    def state(
+        self
+    ) -> str:
+
+        with self.__lock:
+            return self.__state
+
+    def lastError(
+        self
+    ) -> str:
+
+        with self.__lock:
+            return self.__last_error
+
+    def retryIn(
+        self
+    ) -> float:
+        """
+            Get the seconds until the host is probed again, 0 when it is not
+            open.
+        """
+
+        with self.__lock:
+            if self.__state != self.OPEN:
+                return 0.0
+            return max(0.0, self.__retry_at - time.monotonic())
+
+    def recordSuccess(
+        self
+    ):
+
+        with self.__lock:
+            self.__failures = 0
+            self.__state = self.CLOSED
+            self.__backoff = self.__base_backoff
+
+    def recordFailure(
+        self,
+        error: str = ""
+    ):
+
+        with self.__lock:
+            self.__failures += 1
+            if error:
+                self.__last_error = error
+            if self.__state == self.HALF_OPEN or (
+                self.__state == self.CLOSED and self.__failures >= self.__failure_threshold
+            ):
+                self.__open(error)
+
+    def probeTimeout(
+        self
+    ) -> float:
+
+        if self.__probe_timeout is not None:
+            return self.__probe_timeout
+        return timeoutInstance().timeout(TimeoutPolicy.PAGE_LOAD)
+
+    def probe(
+        self
+    ) -> bool:
+        """
+            Probe the host now and learn from it. A closed breaker tries the
+            probe twice and counts a failure like ``recordFailure``, an open
+            or half open one opens again at once. A reachable host resets
+            the failure count and lets an open breaker try again (half open).
+
+            Returns:
+                bool: Whether the host is reachable.
+        """
+
+        error = probeHost(self.__host_url, self.probeTimeout())
+        if error is not None and self.state() == self.CLOSED:
+            # one lost answer is no outage
+            error = probeHost(self.__host_url, self.probeTimeout())
+        with self.__lock:
+            if error is not None:
+                self.__failures += 1
+                self.__last_error = f"探测失败: {error}"
+                if self.__state != self.CLOSED or self.__failures >= self.__failure_threshold:
+                    self.__open(self.__last_error)
+                return False
+            self.__failures = 0
+            if self.__state == self.OPEN:
+                self.__state = self.HALF_OPEN
+            return True
+
+    def allow(
+        self
+    ) -> bool:
+        """
+            Whether a user may run now. An open breaker whose backoff is over
+            probes the host first, only one caller probes at a time.
+        """
+
+        with self.__lock:
+            if self.__state != self.OPEN:
+                return True
+            if self.__probing or time.monotonic() < self.__retry_at:
+                return False
+            self.__probing = True
+        try:
+            return self.probe()
+        finally:
+            with self.__lock:
+                self.__probing = False
+
+    def check(
+        self
+    ) -> bool:
+        """
+            Check the host before a browser is started: probed when the
+            breaker is closed, the backoff is respected when it is open.
+        """
+
+        if self.state() == self.CLOSED:
+            return self.probe()
+        return self.allow()
+
+
+# HostCircuitBreaker instances by host.
+_breakers: dict[str, HostCircuitBreaker] = {}
+
+# Breaker registry lock.
+_breakers_lock = threading.Lock()
+
+def breakerFor(
+    host_url: str
+) -> HostCircuitBreaker:
+    """
+        Get the breaker shared by every browser of this process that talks
+        to the host of host_url, created on first use.
+    """
+
+    key = hostKey(host_url)
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = HostCircuitBreaker(host_url)
+        return breaker
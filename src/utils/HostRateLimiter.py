@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import time
+import threading
+
+from typing import Optional
+
+from utils.HostCircuitBreaker import HostCircuitBreaker, breakerFor, hostKey
+
+
+class TokenBucket:
+    """
+        Token bucket, ``rate`` tokens per second up to ``burst`` tokens.
+
+        A caller takes its tokens at once and then waits for the debt to be
+        refilled outside the lock, so concurrent callers are served in the
+        order they came and never spin.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float
+    ):
+
+        self.__lock = threading.Lock()
+        self.__rate = max(rate, 1e-3)
+        self.__burst = max(burst, 1.0)
+        self.__tokens = self.__burst
+        self.__stamp = time.monotonic()
+
+    def __refill(
+        self,
+        now: float
+    ):
+
+        self.__tokens = min(self.__burst, self.__tokens + (now - self.__stamp)*self.__rate)
+        self.__stamp = now
+
+    def rate(
+        self
+    ) -> float:
+
+        return self.__rate
+
+    def setRate(
+        self,
+        rate: float,
+        burst: Optional[float] = None
+    ):
+
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.__rate = max(rate, 1e-3)
+            if burst is not None:
+                self.__burst = max(burst, 1.0)
+                self.__tokens = min(self.__tokens, self.__burst)
+
+    def reserve(
+        self,
+        cost: float = 1.0
+    ) -> float:
+        """
+            Take tokens, going into debt when there are not enough.
+
+            Returns:
+                float: Seconds to wait before the tokens are really there.
+        """
+
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.__tokens -= cost
+            return 0.0 if self.__tokens >= 0 else -self.__tokens/self.__rate
+
+    def acquire(
+        self,
+        cost: float = 1.0
+    ) -> float:
+        """
+            Take tokens, sleeping until they are there.
+
+            Returns:
+                float: Seconds waited.
+        """
+
+        delay = self.reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class HostPermit:
+    """
+        One limited operation, see ``HostRateLimiter.limit``.
+
+        The time spent inside the ``with`` block is the latency of the
+        operation, an exception leaving the block marks it failed.
+    """
+
+    __slots__ = ("__limiter", "__operation", "__begin", "__failed", "__discarded")
+
+    def __init__(
+        self,
+        limiter: "HostRateLimiter",
+        operation: str
+    ):
+
+        self.__limiter = limiter
+        self.__operation = operation
+        self.__begin = 0.0
+        self.__failed = False
+        self.__discarded = False
+
+    def __enter__(
+        self
+    ) -> "HostPermit":
+
+        self.__limiter.acquire(self.__operation)
+        self.__begin = time.monotonic()
+        return self
+
+    def __exit__(
+        self,
+        exc_type,
+        exc_value,
+        traceback
+    ) -> bool:
+
+        if not self.__discarded:
+            self.__limiter.record(
+                self.__operation,
+                time.monotonic() - self.__begin,
+                self.__failed or exc_type is not None
+            )
+        return False
+
+    def fail(
+        self
+    ):
+        """
+            Mark the operation failed (e.g. a page load timeout that was
+            caught inside the block).
+        """
+
+        self.__failed = True
+
+    def discard(
+        self
+    ):
+        """
+            Do not learn from this operation, its outcome says nothing about
+            the server (e.g. a wrong captcha).
+        """
+
+        self.__discarded = True
+
+
+class HostRateLimiter:
+    """
+        Adaptive rate limiter for the requests sent to one library host.
+
+        Every operation (page navigation, form submit, record load) has its
+        own token bucket, ``BUDGETS`` by default, operations without a budget
+        are not limited. All buckets run at ``scale`` times their budget,
+        adapted from what the host answers (AIMD):
+
+            - a failed operation (e.g. a timeout) halves the scale,
+            - an operation much slower than the fastest latency seen for it
+              reduces the scale by a fifth,
+            - otherwise the scale is raised a little, up to the full budget.
+
+        Decreases are at most one per average latency of the operation (a
+        round trip, at most ``DECREASE_INTERVAL`` seconds), so a burst of
+        timeouts of concurrent browsers counts once, increases at
+        most one per ``INCREASE_INTERVAL`` seconds, so the rate climbs back
+        at the same pace however many browsers share the limiter.
+
+        The limiter is thread safe, browsers of one process share the
+        limiter of their host through ``limiterFor``. The outcomes are also
+        passed on to the circuit breaker of the host, if any.
+
+        Args:
+            budgets (Optional[dict]): Rate per second of each operation,
+                ``{operation: rate}`` or ``{operation: (rate, burst)}``.
+                None uses ``BUDGETS``, an empty dict limits nothing.
+            breaker (Optional[HostCircuitBreaker]): Breaker told about every
+                success and failure.
+    """
+
+    NAVIGATE = "navigate"
+    SUBMIT = "submit"
+    RECORDS = "records"
+
+    BUDGETS = {
+        NAVIGATE: (2.0, 4),
+        SUBMIT: (1.0, 2),
+        RECORDS: (1.0, 2),
+    }
+
+    MIN_SCALE = 0.1
+    INCREASE_STEP = 0.05
+    FAILURE_FACTOR = 0.5
+    SLOW_FACTOR = 0.8
+    SLOW_LATENCY_RATIO = 2.0
+    DECREASE_INTERVAL = 1.0
+    INCREASE_INTERVAL = 1.0
+    LATENCY_ALPHA = 0.2
+
+    def __init__(
+        self,
+        budgets: Optional[dict] = None,
+        breaker: Optional[HostCircuitBreaker] = None
+    ):
+
+        self.__lock = threading.Lock()
+        self.__breaker = breaker
+        self.__budgets: dict[str, tuple[float, float]] = {}
+        self.__buckets: dict[str, TokenBucket] = {}
+        self.__latency: dict[str, float] = {}
+        self.__baseline: dict[str, float] = {}
+        self.__scale = 1.0
+        self.__last_decrease = float("-inf")
+        self.__last_increase = float("-inf")
+        self.__waited = 0.0
+        self.__failures = 0
+        self.setBudgets(self.BUDGETS if budgets is None else budgets)
+
+    @staticmethod
+    def parseBudgets(
+        budgets: dict
+    ) -> dict[str, tuple[float, float]]:
+        """
+            Normalise budgets to ``{operation: (rate, burst)}``, the burst of
+            a bare rate is the rate itself (at least 1).
+
+            Raises:
+                ValueError: The budgets are not a dict, or a rate or burst is
+                    not a positive number.
+        """
+
+        if not isinstance(budgets, dict):
+            raise ValueError(f"限速配置应为对象, 实际为 {budgets!r}")
+        parsed = {}
+        for operation, budget in budgets.items():
+            if isinstance(budget, (tuple, list)) and len(budget) == 2:
+                rate, burst = budget
+            else:
+                rate, burst = budget, None
+            for value in (rate, burst):
+                if value is not None and (
+                    isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0
+                ):
+                    raise ValueError(f"操作 '{operation}' 的限速配置无效: {budget!r}")
+            if rate is None:
+                raise ValueError(f"操作 '{operation}' 的限速配置无效: {budget!r}")
+            parsed[operation] = (float(rate), float(burst if burst is not None else max(1.0, rate)))
+        return parsed
+
+    def setBudgets(
+        self,
+        budgets: dict
+    ):
+        """
+            Replace the operation budgets, the learnt scale is kept.
+
+            Raises:
+                ValueError: See ``parseBudgets``.
+        """
+
+        parsed = self.parseBudgets(budgets)
+        with self.__lock:
+            self.__budgets = parsed
+            for operation in list(self.__buckets):
+                if operation not in parsed:
+                    del self.__buckets[operation]
+            for operation, (rate, burst) in parsed.items():
+                bucket = self.__buckets.get(operation)
+                if bucket is None:
+                    self.__buckets[operation] = TokenBucket(rate*self.__scale, burst)
+                else:
+                    bucket.setRate(rate*self.__scale, burst)
+
+    def budgets(
+        self
+    ) -> dict[str, tuple[float, float]]:
+
+        with self.__lock:
+            return dict(self.__budgets)
+
+    def limit(
+        self,
+        operation: str
+    ) -> HostPermit:
+        """
+            Wait for the budget of an operation and measure it.
+
+            Examples:
+                >>> with limiter.limit(HostRateLimiter.NAVIGATE):
+                ...     driver.get(url)
+        """
+
+        return HostPermit(self, operation)
+
+    def acquire(
+        self,
+        operation: str
+    ) -> float:
+        """
+            Wait for the budget of an operation without measuring it.
+
+            Returns:
+                float: Seconds waited.
+        """
+
+        bucket = self.__buckets.get(operation)
+        if bucket is None:
+            return 0.0
+        waited = bucket.acquire()
+        if waited:
+            with self.__lock:
+                self.__waited += waited
+        return waited
+
+    def record(
+        self,
+        operation: str,
+        latency: float,
+        failed: bool = False
+    ):
+        """
+            Learn from the outcome of an operation.
+        """
+
+        if self.__breaker is not None:
+            if failed:
+                self.__breaker.recordFailure(f"操作 '{operation}' 失败或超时")
+            else:
+                self.__breaker.recordSuccess()
+        now = time.monotonic()
+        with self.__lock:
+            average = self.__latency.get(operation)
+            average = latency if average is None else average + (latency - average)*self.LATENCY_ALPHA
+            self.__latency[operation] = average
+            baseline = self.__baseline.get(operation, average)
+            if not failed:
+                # the fastest average seen, slowly forgotten so a permanently slower host is accepted
+                baseline = self.__baseline[operation] = min(baseline*1.01, average)
+            if failed:
+                self.__failures += 1
+                factor = self.FAILURE_FACTOR
+            elif average > baseline*self.SLOW_LATENCY_RATIO:
+                factor = self.SLOW_FACTOR
+            else:
+                factor = None
+            scale = self.__scale
+            if factor is not None:
+                if now - self.__last_decrease >= min(self.DECREASE_INTERVAL, average):
+                    self.__last_decrease = self.__last_increase = now
+                    scale = max(self.MIN_SCALE, scale*factor)
+            elif scale < 1.0 and now - self.__last_increase >= self.INCREASE_INTERVAL:
+                self.__last_increase = now
+                scale = min(1.0, scale + self.INCREASE_STEP)
+            if scale == self.__scale:
+                return
+            self.__scale = scale
+            for name, bucket in self.__buckets.items():
+                bucket.setRate(self.__budgets[name][0]*scale)
+
+    def scale(
+        self
+    ) -> float:
+
+        with self.__lock:
+            return self.__scale
+
+    def rate(
+        self,
+        operation: str
+    ) -> Optional[float]:
+        """
+            Get the current rate per second of an operation, None when it is
+            not limited.
+        """
+
+        bucket = self.__buckets.get(operation)
+        return None if bucket is None else bucket.rate()
+
+    def waited(
+        self
+    ) -> float:
+        """
+            Get the total seconds callers have waited for a budget.
+        """
+
+        with self.__lock:
+            return self.__waited
+
+    def failures(
+        self
+    ) -> int:
+
+        with self.__lock:
+            return self.__failures
+
+
+# HostRateLimiter instances by host.
+_limiters: dict[str, HostRateLimiter] = {}
+
+# Limiter registry lock.
+_limiters_lock = threading.Lock()
+
+def limiterFor(
+    host_url: str,
+    budgets: Optional[dict] = None
+) -> HostRateLimiter:
+    """
+        Get the limiter shared by every browser of this process that talks
+        to the host of host_url, created on first use and wired to the
+        breaker of the host (see ``breakerFor``).
+
+        Args:
+            host_url (str): The library host url, only scheme and host count.
+            budgets (Optional[dict]): Budgets to apply, see
+                ``HostRateLimiter``. None keeps the current ones.
+    """
+
+    key = hostKey(host_url)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = HostRateLimiter(budgets, breakerFor(host_url))
+            return limiter
+    if budgets is not None and limiter.budgets() != HostRateLimiter.parseBudgets(budgets):
+        limiter.setBudgets(budgets)
+    return limiter
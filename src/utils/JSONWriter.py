@@ -9,13 +9,18 @@ See the LICENSE file for details.
 """
 import os
 import json
+import stat
+import tempfile
 
 
 class JSONWriter:
     """
         JSON writer class.
 
-        This class is used to write JSON file.
+        This class is used to write JSON file. The file is replaced
+        atomically: the data is written to a temporary file in the same
+        directory, synced to disk and then renamed over the target, so a
+        crash never leaves a truncated file behind.
 
         Args:
             json_path (str): The path of JSON file.
@@ -50,9 +55,24 @@ class JSONWriter:
         self
     ):
 
+        temp_path = None
         try:
-            with open(self.__json_path, "w", encoding="utf-8") as f:
+            fd, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.__json_path),
+                prefix=f".{os.path.basename(self.__json_path)}.",
+                suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
                 json.dump(self.__json_data, f, indent=4, sort_keys=False)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file as 0600, keep the usual file mode
+            if os.path.exists(self.__json_path):
+                os.chmod(temp_path, stat.S_IMODE(os.stat(self.__json_path).st_mode))
+            else:
+                os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.__json_path)
+            temp_path = None
         except PermissionError as e:
             raise Exception(f"没有足够的权限写入文件: {self.__json_path}") from e
         except IOError as e:
@@ -61,6 +81,9 @@ class JSONWriter:
             raise Exception(f"JSON 数据包含无法 JSON 序列化的类型: {e}") from e
         except Exception as e:
             raise Exception(f"写入文件时发生未知错误: {e}") from e
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
 
     def write(
         self
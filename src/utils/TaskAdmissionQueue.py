@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import heapq
+import itertools
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class TaskAdmissionQueue:
+    """
+        Queue of ready timer tasks waiting for an execution slot.
+
+        Tasks are ordered by ``priority`` (higher first, default 0) and then
+        by their deadline (``execute_time``, earlier first). ``admit`` hands
+        out tasks while the number of running tasks, each owning one live
+        browser, stays below ``max_running`` and the system CPU load stays
+        below ``max_cpu_load``. The CPU limit never blocks the only task,
+        so a busy machine still makes progress one task at a time.
+
+        Args:
+            max_running (int): Maximum number of concurrently running tasks.
+            max_cpu_load (float): Maximum 1-minute load average per CPU core
+                for admitting another task, 0 disables the check.
+    """
+
+    def __init__(
+        self,
+        max_running: int = 2,
+        max_cpu_load: float = 0.8
+    ):
+
+        self.__heap: list[tuple[int, datetime, int, dict]] = []
+        self.__counter = itertools.count()
+        self.__max_running = max(1, max_running)
+        self.__max_cpu_load = max_cpu_load
+
+    def __len__(
+        self
+    ) -> int:
+
+        return len(self.__heap)
+
+    def setLimits(
+        self,
+        max_running: int,
+        max_cpu_load: float
+    ):
+
+        self.__max_running = max(1, max_running)
+        self.__max_cpu_load = max_cpu_load
+
+    def push(
+        self,
+        timer_task: dict
+    ):
+
+        heapq.heappush(self.__heap, (
+            -timer_task.get("priority", 0),
+            timer_task["execute_time"],
+            next(self.__counter),
+            timer_task
+        ))
+
+    def peek(
+        self
+    ) -> Optional[dict]:
+
+        return self.__heap[0][-1] if self.__heap else None
+
+    def pop(
+        self
+    ) -> dict:
+
+        return heapq.heappop(self.__heap)[-1]
+
+    def remove(
+        self,
+        task_uuid: str
+    ) -> Optional[dict]:
+        """
+            Remove a queued task.
+
+            Returns:
+                Optional[dict]: The removed task, None if it is not queued.
+        """
+
+        for index, item in enumerate(self.__heap):
+            if item[-1]["uuid"] == task_uuid:
+                self.__heap.pop(index)
+                heapq.heapify(self.__heap)
+                return item[-1]
+        return None
+
+    def takeWithin(
+        self,
+        timer_task: dict,
+        window: timedelta
+    ) -> list[dict]:
+        """
+            Take the queued tasks whose deadline is within window of the
+            given task, so they can run together with it.
+
+            Returns:
+                list[dict]: The taken tasks, in queue order.
+        """
+
+        deadline = timer_task["execute_time"]
+        taken, kept = [], []
+        for item in self.__heap:
+            if abs(item[1] - deadline) <= window:
+                taken.append(item)
+            else:
+                kept.append(item)
+        if taken:
+            heapq.heapify(kept)
+            self.__heap = kept
+        return [item[-1] for item in sorted(taken)]
+
+    @staticmethod
+    def cpuLoad(
+    ) -> Optional[float]:
+        """
+            Get the 1-minute load average per CPU core.
+
+            Returns:
+                Optional[float]: The load, None if the platform has no load
+                    average (Windows).
+        """
+
+        if not hasattr(os, "getloadavg"):
+            return None
+        try:
+            return os.getloadavg()[0]/(os.cpu_count() or 1)
+        except OSError:
+            return None
+
+    def canAdmit(
+        self,
+        running: int
+    ) -> bool:
+
+        if not self.__heap or running >= self.__max_running:
+            return False
+        if running == 0 or self.__max_cpu_load <= 0:
+            return True
+        load = self.cpuLoad()
+        return load is None or load < self.__max_cpu_load
+
+    def admit(
+        self,
+        running: int,
+        coalesce_window: Optional[timedelta] = None
+    ) -> list[list[dict]]:
+        """
+            Take the tasks that may start now, grouped into sessions.
+
+            Each admitted task takes along the queued tasks due within
+            coalesce_window of it (see ``takeWithin``), a group counts as one
+            running task. The load average reacts slowly, so while other
+            tasks are running at most one group is admitted per call when the
+            CPU limit is on.
+
+            Args:
+                running (int): Number of sessions currently running.
+                coalesce_window (Optional[timedelta]): None disables grouping.
+
+            Returns:
+                list[list[dict]]: Admitted task groups, highest priority first.
+        """
+
+        admitted = []
+        while self.canAdmit(running + len(admitted)):
+            timer_task = self.pop()
+            group = [timer_task]
+            if coalesce_window is not None:
+                group += self.takeWithin(timer_task, coalesce_window)
+            admitted.append(group)
+            if running and self.__max_cpu_load > 0:
+                break
+        return admitted
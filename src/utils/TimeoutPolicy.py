@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import json
+import time
+import bisect
+import threading
+
+from typing import Any, Callable, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.BrowserContexts import isRouted
+from utils.JSONWriter import JSONWriter
+
+
+class LatencyHistogram:
+    """
+        Latency histogram with log spaced buckets, ``BOUNDS`` are the upper
+        bounds in seconds (the last bucket takes everything slower).
+
+        Counts are floats, ``decay`` scales them down so old samples weigh
+        less than new ones.
+    """
+
+    BOUNDS: tuple[float, ...] = tuple(round(0.05*1.25**i, 4) for i in range(32))
+
+    __slots__ = ("__counts", "__total")
+
+    def __init__(
+        self,
+        counts: Optional[list[float]] = None
+    ):
+
+        self.__counts = list(counts) if counts else [0.0]*(len(self.BOUNDS) + 1)
+        self.__total = sum(self.__counts)
+
+    def add(
+        self,
+        seconds: float,
+        weight: float = 1.0
+    ):
+
+        self.__counts[bisect.bisect_left(self.BOUNDS, seconds)] += weight
+        self.__total += weight
+
+    def decay(
+        self,
+        factor: float
+    ):
+
+        self.__counts = [count*factor for count in self.__counts]
+        self.__total *= factor
+
+    def total(
+        self
+    ) -> float:
+
+        return self.__total
+
+    def percentile(
+        self,
+        q: float
+    ) -> Optional[float]:
+        """
+            Get the upper bound of the bucket holding the q quantile, None
+            when empty. Samples slower than the last bound count as twice
+            the last bound.
+        """
+
+        if self.__total <= 0:
+            return None
+        rank = q*self.__total
+        seen = 0.0
+        for index, count in enumerate(self.__counts):
+            seen += count
+            if seen >= rank and count > 0:
+                break
+        return self.BOUNDS[index] if index < len(self.BOUNDS) else self.BOUNDS[-1]*2
+
+    def counts(
+        self
+    ) -> list[float]:
+
+        return list(self.__counts)
+
+
+class TimeoutPolicy:
+    """
+        Timeouts of the page waits, learnt from their observed latency.
+
+        Every wait has a name (e.g. ``"LoginPage:title"``). Until a name has
+        ``min_samples`` samples its timeout is the default given by the
+        caller (``DEFAULTS``, else ``DEFAULT_TIMEOUT``), then it is the
+        ``percentile`` latency times ``margin``, bounded by ``floor`` and
+        ``ceiling`` (or the default, when higher). Fast hosts get short
+        timeouts so a missing element fails early, slow hosts long ones.
+
+        A required wait that times out is recorded at its timeout with the
+        weight of the whole tail above the percentile, so the next wait of
+        the name gets ``margin`` times longer at once and a host at peak
+        load fails a few waits, not most of them. Optional waits, whose
+        element is missing as a normal answer (e.g. no check in button
+        without a reservation), only learn from their successes. So that a
+        slower host does not fail them all, they are stretched by the
+        slowdown (latency of the required waits over their median), up to
+        their default timeout.
+
+        Histograms are decayed past ``window`` samples and persisted to a
+        JSON file with ``load`` and ``save``, the process shares one policy
+        through ``instance``.
+
+        Args:
+            path (str): JSON file of the histograms, empty keeps them in
+                memory only.
+            percentile (float): Latency quantile the timeouts derive from.
+            margin (float): Factor on top of the quantile.
+            floor (float): Lowest learnt timeout in seconds.
+            ceiling (float): Highest learnt timeout in seconds.
+            min_samples (int): Samples needed before a name is learnt.
+            window (int): Samples kept at full weight per name.
+    """
+
+    DEFAULT_TIMEOUT = 2.0
+
+    PAGE_LOAD = "page_load"
+
+    DEFAULTS = {
+        PAGE_LOAD: 5.0,
+    }
+
+    POLL_INTERVAL = 0.1
+
+    SLOWDOWN_ALPHA = 0.1
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: str = "",
+        percentile: float = 0.99,
+        margin: float = 1.5,
+        floor: float = 0.5,
+        ceiling: float = 15.0,
+        min_samples: int = 20,
+        window: int = 500
+    ):
+
+        self.__lock = threading.Lock()
+        self.__path = path
+        self.__percentile = percentile
+        self.__margin = margin
+        self.__floor = floor
+        self.__ceiling = max(floor, ceiling)
+        self.__min_samples = max(1, min_samples)
+        self.__window = max(self.__min_samples, window)
+        self.__histograms: dict[str, LatencyHistogram] = {}
+        self.__timeouts: dict[str, int] = {}
+        self.__optional: set[str] = set()
+        self.__slowdown = 1.0
+        self.__dirty = False
+
+    def path(
+        self
+    ) -> str:
+
+        return self.__path
+
+    def timeout(
+        self,
+        name: str,
+        default: Optional[float] = None
+    ) -> float:
+        """
+            Get the timeout in seconds of a named wait.
+
+            Args:
+                name (str): The wait name.
+                default (Optional[float]): Timeout until the name is learnt,
+                    None takes it from ``DEFAULTS``.
+        """
+
+        if default is None:
+            default = self.DEFAULTS.get(name, self.DEFAULT_TIMEOUT)
+        with self.__lock:
+            histogram = self.__histograms.get(name)
+            if histogram is None or histogram.total() < self.__min_samples:
+                return default
+            latency = histogram.percentile(self.__percentile)
+            slowdown = self.__slowdown if name in self.__optional else 1.0
+        timeout = min(max(self.__floor, latency*self.__margin), max(self.__ceiling, default))
+        if slowdown > 1.0:
+            timeout = max(timeout, min(timeout*slowdown, default))
+        return timeout
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        timed_out: bool = False,
+        optional: bool = False
+    ):
+        """
+            Learn the latency of a named wait, a timed out wait took at least
+            ``seconds`` and moves the percentile up to it. Only required
+            waits update the slowdown.
+        """
+
+        with self.__lock:
+            histogram = self.__histograms.get(name)
+            if histogram is None:
+                histogram = self.__histograms[name] = LatencyHistogram()
+            if optional:
+                self.__optional.add(name)
+            elif histogram.total() >= self.__min_samples:
+                ratio = seconds/histogram.percentile(0.5)
+                self.__slowdown += (ratio - self.__slowdown)*self.SLOWDOWN_ALPHA
+            weight = 1.0
+            if timed_out:
+                tail = 1 - self.__percentile
+                weight = max(weight, histogram.total()*tail/self.__percentile*1.01)
+            histogram.add(seconds, weight)
+            if histogram.total() > self.__window:
+                histogram.decay(0.5)
+            if timed_out:
+                self.__timeouts[name] = self.__timeouts.get(name, 0) + 1
+            self.__dirty = True
+
+    def wait(
+        self,
+        driver: Any,
+        name: str,
+        condition: Callable[[Any], Any],
+        default: Optional[float] = None,
+        optional: bool = False
+    ) -> Any:
+        """
+            ``WebDriverWait(driver, timeout).until(condition)`` with the
+            timeout of the name, the latency is recorded.
+
+            Args:
+                driver (Any): The web driver.
+                name (str): The wait name.
+                condition (Callable[[Any], Any]): The expected condition.
+                default (Optional[float]): See ``timeout``.
+                optional (bool): Whether a timeout is a normal answer, it is
+                    then not learnt from.
+
+            Raises:
+                TimeoutException: The condition was not met in time.
+        """
+
+        if optional:
+            with self.__lock:
+                self.__optional.add(name)
+        timeout = self.timeout(name, default)
+        begin = time.monotonic()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=self.POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            if not optional:
+                self.record(name, max(timeout, time.monotonic() - begin), timed_out=True)
+            raise
+        self.record(name, time.monotonic() - begin, optional=optional)
+        return result
+
+    def navigate(
+        self,
+        driver: Any,
+        url: str
+    ):
+        """
+            ``driver.get(url)`` with the learnt page load timeout, the load
+            time is recorded as ``PAGE_LOAD``.
+
+            When several windows share the session (see
+            ``utils.BrowserContexts``) the page is left through
+            ``window.location`` and its replacement is polled for instead,
+            so no driver command waits for the host and the session wide
+            page load timeout is left alone. A browser error page then fails
+            like ``driver.get`` does.
+
+            Raises:
+                TimeoutException: The page did not load in time.
+                WebDriverException: The page could not be loaded.
+        """
+
+        timeout = self.timeout(self.PAGE_LOAD)
+        begin = time.monotonic()
+        try:
+            if isRouted(driver):
+                self.__assign(driver, url, timeout)
+            else:
+                driver.set_page_load_timeout(timeout)
+                driver.get(url)
+        except TimeoutException:
+            self.record(self.PAGE_LOAD, max(timeout, time.monotonic() - begin), timed_out=True)
+            raise
+        self.record(self.PAGE_LOAD, time.monotonic() - begin)
+
+    def __assign(
+        self,
+        driver: Any,
+        url: str,
+        timeout: float
+    ):
+
+        def loaded(
+            driver: Any
+        ) -> Any:
+
+            try:
+                return driver.execute_script(
+                    "return !window.__autoLibLeaving && document.readyState === 'complete'"
+                    " && [document.URL, (document.querySelector('.error-code') || {}).textContent];"
+                )
+            except WebDriverException:
+                # the document is being replaced
+                return False
+
+        # the mark goes with the old document
+        driver.execute_script(
+            "window.__autoLibLeaving = true; window.location.assign(arguments[0]);", url
+        )
+        page_url, error_code = WebDriverWait(
+            driver, timeout, poll_frequency=self.POLL_INTERVAL
+        ).until(loaded)
+        if page_url.startswith("chrome-error://"):
+            raise WebDriverException(f"{error_code or 'net::ERR_FAILED'} ({url})")
+
+    def slowdown(
+        self
+    ) -> float:
+
+        with self.__lock:
+            return self.__slowdown
+
+    def stats(
+        self
+    ) -> dict[str, dict]:
+        """
+            Get the samples, timeouts seen and current timeout of every name.
+        """
+
+        with self.__lock:
+            names = {
+                name: (histogram.total(), self.__timeouts.get(name, 0))
+                for name, histogram in self.__histograms.items()
+            }
+        return {
+            name: {"samples": samples, "timeouts": timeouts, "timeout": self.timeout(name)}
+            for name, (samples, timeouts) in sorted(names.items())
+        }
+
+    def load(
+        self,
+        path: str = ""
+    ) -> bool:
+        """
+            Replace the histograms with the ones of a JSON file, a missing
+            file starts empty. The path is kept for ``save``.
+
+            Returns:
+                bool: False when the file could not be read, the histograms
+                    are then empty.
+        """
+
+        path = path or self.__path
+        histograms: dict[str, LatencyHistogram] = {}
+        ok = True
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if data.get("version") != self.VERSION or data.get("bounds") != list(LatencyHistogram.BOUNDS):
+                    raise ValueError("版本或分桶不一致")
+                for name, counts in data.get("latency", {}).items():
+                    if len(counts) != len(LatencyHistogram.BOUNDS) + 1:
+                        raise ValueError(f"'{name}' 的分桶数量不正确")
+                    histograms[name] = LatencyHistogram([float(count) for count in counts])
+            except (OSError, ValueError, TypeError, AttributeError):
+                histograms = {}
+                ok = False
+        with self.__lock:
+            self.__path = path
+            self.__histograms = histograms
+            self.__timeouts = {}
+            self.__dirty = False
+        return ok
+
+    def save(
+        self
+    ) -> bool:
+        """
+            Write the histograms to the JSON file, if anything was learnt.
+
+            Returns:
+                bool: Whether the file was written.
+        """
+
+        with self.__lock:
+            if not self.__path or not self.__dirty:
+                return False
+            data = {
+                "version": self.VERSION,
+                "bounds": list(LatencyHistogram.BOUNDS),
+                "latency": {
+                    name: [round(count, 3) for count in histogram.counts()]
+                    for name, histogram in sorted(self.__histograms.items())
+                },
+            }
+            self.__dirty = False
+        JSONWriter(self.__path, data)
+        return True
+
+
+# TimeoutPolicy singleton instance.
+_timeout_policy_instance: TimeoutPolicy | None = None
+
+# Singleton instance lock.
+_instance_lock = threading.Lock()
+
+def instance(
+) -> TimeoutPolicy:
+    """
+        Get the timeout policy of the process, created in memory on first
+        use, see ``TimeoutPolicy.load`` to persist it.
+    """
+    global _timeout_policy_instance
+    with _instance_lock:
+        if _timeout_policy_instance is None:
+            _timeout_policy_instance = TimeoutPolicy()
+        return _timeout_policy_instance
+
+def waitFor(
+    driver: Any,
+    name: str,
+    condition: Callable[[Any], Any],
+    default: Optional[float] = None,
+    optional: bool = False
+) -> Any:
+    """
+        Wait for a condition with the learnt timeout of the name, see
+        ``TimeoutPolicy.wait``.
+    """
+
+    return instance().wait(driver, name, condition, default, optional)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import time
+import heapq
+import itertools
+
+from datetime import datetime
+from typing import Hashable, Optional
+
+
+class TimerScheduler:
+    """
+        Min-heap of wall clock deadlines keyed by task.
+
+        The scheduler only keeps the order of deadlines, the owner arms a
+        single timer for ``secondsUntilNext`` and calls ``popDue`` when it
+        fires. Rescheduling or cancelling a key is O(log n), replaced heap
+        entries are dropped lazily when they reach the top.
+
+        Timers of the event loop run on the monotonic clock, which does not
+        advance while the system sleeps and ignores wall clock changes.
+        ``detectClockJump`` compares both clocks so the owner can re-arm
+        its timer after a resume or a clock adjustment.
+
+        Args:
+            jump_threshold (float): Wall/monotonic drift in seconds that is
+                reported as a clock jump.
+    """
+
+    def __init__(
+        self,
+        jump_threshold: float = 2.0
+    ):
+
+        self.__heap: list[tuple[datetime, int, Hashable]] = []
+        self.__entries: dict[Hashable, tuple[datetime, int]] = {}
+        self.__counter = itertools.count()
+        self.__jump_threshold = jump_threshold
+        self.__last_wall = time.time()
+        self.__last_monotonic = time.monotonic()
+
+    def __len__(
+        self
+    ) -> int:
+
+        return len(self.__entries)
+
+    def __contains__(
+        self,
+        key: Hashable
+    ) -> bool:
+
+        return key in self.__entries
+
+    def schedule(
+        self,
+        key: Hashable,
+        deadline: datetime
+    ):
+        """
+            Add the key or move it to a new deadline.
+
+            Args:
+                key (Hashable): Task key, e.g. the task uuid.
+                deadline (datetime): Naive local wall clock deadline.
+        """
+
+        entry = (deadline, next(self.__counter))
+        self.__entries[key] = entry
+        heapq.heappush(self.__heap, (*entry, key))
+        self.__compact()
+
+    def cancel(
+        self,
+        key: Hashable
+    ):
+
+        if self.__entries.pop(key, None) is not None:
+            self.__compact()
+
+    def clear(
+        self
+    ):
+
+        self.__heap.clear()
+        self.__entries.clear()
+
+    def deadline(
+        self,
+        key: Hashable
+    ) -> Optional[datetime]:
+
+        entry = self.__entries.get(key)
+        return entry[0] if entry else None
+
+    def __compact(
+        self
+    ):
+
+        # rebuild once stale entries dominate, keeps the heap O(live keys)
+        if len(self.__heap) > 2*len(self.__entries) + 64:
+            self.__heap = [
+                (deadline, seq, key)
+                for key, (deadline, seq) in self.__entries.items()
+            ]
+            heapq.heapify(self.__heap)
+
+    def __dropStale(
+        self
+    ):
+
+        while self.__heap:
+            deadline, seq, key = self.__heap[0]
+            if self.__entries.get(key) == (deadline, seq):
+                return
+            heapq.heappop(self.__heap)
+
+    def nextDeadline(
+        self
+    ) -> Optional[datetime]:
+
+        self.__dropStale()
+        return self.__heap[0][0] if self.__heap else None
+
+    def secondsUntilNext(
+        self,
+        now: Optional[datetime] = None
+    ) -> Optional[float]:
+        """
+            Get the seconds until the earliest deadline.
+
+            Returns:
+                Optional[float]: Seconds to wait (0 when already due), None
+                    when nothing is scheduled.
+        """
+
+        deadline = self.nextDeadline()
+        if deadline is None:
+            return None
+        now = now or datetime.now()
+        return max(0.0, (deadline - now).total_seconds())
+
+    def popDue(
+        self,
+        now: Optional[datetime] = None
+    ) -> list[Hashable]:
+        """
+            Remove and return the keys whose deadline is not after now.
+
+            Returns:
+                list[Hashable]: Due keys, earliest deadline first.
+        """
+
+        now = now or datetime.now()
+        due = []
+        while True:
+            self.__dropStale()
+            if not self.__heap or self.__heap[0][0] > now:
+                return due
+            _, _, key = heapq.heappop(self.__heap)
+            del self.__entries[key]
+            due.append(key)
+
+    def detectClockJump(
+        self
+    ) -> float:
+        """
+            Check whether the wall clock moved apart from the monotonic clock
+            since the last call (system sleep/resume or clock adjustment).
+
+            Returns:
+                float: The jump in seconds, positive when the wall clock moved
+                    forward, 0.0 when below the threshold.
+        """
+
+        wall, monotonic = time.time(), time.monotonic()
+        drift = (wall - self.__last_wall) - (monotonic - self.__last_monotonic)
+        self.__last_wall, self.__last_monotonic = wall, monotonic
+        if abs(drift) < self.__jump_threshold:
+            return 0.0
+        return drift
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 KenanZhu.
+All rights reserved.
+
+This software is provided "as is", without any warranty of any kind.
+You may use, modify, and distribute this file under the terms of the MIT License.
+See the LICENSE file for details.
+"""
+import os
+import uuid
+
+from enum import Enum
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from utils.FileLock import FileLock
+from utils.TimerUtils import TimerUtils
+
+
+class ALTimerTaskStatus(Enum):
+
+    PENDING = "等待中"
+    READY = "已就绪"
+    RUNNING = "执行中"
+    EXECUTED = "已执行"
+    ERROR = "执行失败"
+    OUTDATED = "已过期"
+    UNKNOWN = "未知"
+
+
+class TimerTaskUtils:
+    """
+        Timer task utilities class.
+
+        Status transitions of timer tasks shared by the timer task widget
+        and the headless daemon, neither of them depends on Qt.
+    """
+
+    # a task firing later than this after its execute time is outdated
+    OUTDATED_TOLERANCE = timedelta(seconds=5)
+
+    TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    LOCK_FILE = "timer_task.lock"
+
+    @staticmethod
+    def taskLock(
+        config_dir: str
+    ) -> FileLock:
+        """
+            Get the lock of the timer tasks kept in config_dir.
+
+            Only the holder, the timer task widget or the headless daemon,
+            fires the tasks and saves ``timer_task.json``, so two instances
+            sharing one data dir never reserve twice.
+
+            Returns:
+                FileLock: The (not yet acquired) lock, it does not wait.
+        """
+
+        return FileLock(os.path.join(config_dir, TimerTaskUtils.LOCK_FILE), 0)
+
+    @staticmethod
+    def decodeTimerTasks(
+        timer_tasks: list[dict],
+        history_mgr: Any
+    ) -> list[dict]:
+        """
+            Convert timer tasks loaded from the config file in place.
+
+            History kept in the config file by older versions is moved to
+            the history manager.
+
+            Args:
+                timer_tasks (list[dict]): Timer tasks as stored in the config.
+                history_mgr (TimerTaskHistoryManager): History store.
+
+            Returns:
+                list[dict]: The same list, with datetime and status values.
+        """
+
+        for task in timer_tasks:
+            task["added_time"] = datetime.strptime(task["added_time"], TimerTaskUtils.TIME_FORMAT)
+            task["execute_time"] = datetime.strptime(task["execute_time"], TimerTaskUtils.TIME_FORMAT)
+            task["status"] = ALTimerTaskStatus(task["status"])
+            # history of older versions is kept in the config file
+            if "repeat_history" in task:
+                history_mgr.append(task["uuid"], task.pop("repeat_history"))
+        return timer_tasks
+
+    @staticmethod
+    def encodeTimerTasks(
+        timer_tasks: list[dict]
+    ) -> list[dict]:
+        """
+            Convert timer tasks in place to the config file format.
+
+            Args:
+                timer_tasks (list[dict]): A copy of the timer tasks.
+
+            Returns:
+                list[dict]: The same list, with string values.
+        """
+
+        for task in timer_tasks:
+            task["added_time"] = task["added_time"].strftime(TimerTaskUtils.TIME_FORMAT)
+            task["execute_time"] = task["execute_time"].strftime(TimerTaskUtils.TIME_FORMAT)
+            task["status"] = task["status"].value
+        return timer_tasks
+
+    @staticmethod
+    def createTimerTask(
+        name: str,
+        execute_time: datetime,
+        silent: bool = True,
+        repeat: bool = False,
+        repeat_days: Optional[list[int]] = None,
+        repeat_auto_script: str = "",
+        priority: int = 0
+    ) -> dict:
+        """
+            Create a pending timer task, the same way the add dialog does.
+
+            Args:
+                name (str): Task name.
+                execute_time (datetime): Execute time, for a repeat task the
+                    time of day of the repeats.
+                silent (bool): Run without asking first.
+                repeat (bool): Whether the task repeats.
+                repeat_days (Optional[list[int]]): Weekdays (0 is Monday),
+                    empty or None for every day.
+                repeat_auto_script (str): AutoScript applied before each repeat.
+                priority (int): Admission priority, higher runs first.
+
+            Returns:
+                dict: The timer task.
+        """
+
+        added_time = datetime.now()
+        timer_task = {
+            "name": name,
+            "uuid": uuid.uuid4().hex.upper() + f"-{added_time.strftime('%Y%m%d%H%M%S')}",
+            "time_type": "特定时间",
+            "execute_time": execute_time,
+            "silent": silent,
+            "added_time": added_time,
+            "status": ALTimerTaskStatus.PENDING,
+            "executed": False,
+            "repeat": repeat,
+            "repeat_auto_script": repeat_auto_script,
+            "mock_target_data": None,
+        }
+        if priority:
+            timer_task["priority"] = priority
+        if repeat:
+            TimerTaskUtils.setRepeat(timer_task, repeat_days, execute_time)
+        return timer_task
+
+    @staticmethod
+    def setRepeat(
+        timer_task: dict,
+        repeat_days: Optional[list[int]],
+        repeat_time: datetime
+    ) -> dict:
+        """
+            Make a timer task repeat on the given weekdays at the time of
+            day of repeat_time, and move it to its next repeat time.
+        """
+
+        repeat_days = sorted({int(x) for x in repeat_days or [] if 0 <= int(x) <= 6})
+        timer_task["repeat"] = True
+        timer_task["repeat_days"] = repeat_days or [0, 1, 2, 3, 4, 5, 6]
+        timer_task["repeat_hour"] = repeat_time.hour
+        timer_task["repeat_minute"] = repeat_time.minute
+        timer_task["repeat_second"] = repeat_time.second
+        timer_task["execute_time"] = TimerTaskUtils.nextRepeatTime(timer_task)
+        return timer_task
+
+    @staticmethod
+    def isOutdated(
+        timer_task: dict,
+        now: Optional[datetime] = None
+    ) -> bool:
+
+        now = now or datetime.now()
+        return timer_task["execute_time"] <= now - TimerTaskUtils.OUTDATED_TOLERANCE
+
+    @staticmethod
+    def applyRepeatResult(
+        status: ALTimerTaskStatus,
+        timer_task: dict,
+        history_mgr: Any
+    ) -> dict:
+        """
+            Record the result of a repeat task and move it to its next time.
+
+            Args:
+                status (ALTimerTaskStatus): EXECUTED, ERROR or OUTDATED.
+                timer_task (dict): The repeat task, updated in place.
+                history_mgr (TimerTaskHistoryManager): History store.
+
+            Returns:
+                dict: The updated timer task.
+        """
+
+        # only these status are valid
+        valid_statuses = {ALTimerTaskStatus.EXECUTED, ALTimerTaskStatus.ERROR,
+                         ALTimerTaskStatus.OUTDATED}
+        if status not in valid_statuses:
+            return timer_task
+        history = []
+        if status != ALTimerTaskStatus.OUTDATED:
+            executed_time = datetime.now()
+            duration = (executed_time - timer_task["execute_time"]).total_seconds()
+            history.append({
+                "execute_time": timer_task["execute_time"].strftime(TimerTaskUtils.TIME_FORMAT),
+                "executed_time": executed_time.strftime(TimerTaskUtils.TIME_FORMAT),
+                "result": status.value,
+                "duration": duration,
+                "uuid": timer_task["uuid"]
+            })
+        else:
+            current_time = datetime.now()
+            execute_time = timer_task["execute_time"]
+            execute_weekday = execute_time.weekday()
+            delta_days = (current_time - execute_time).days
+            for i in range(delta_days + 1):
+                if (execute_weekday + i)%7 in timer_task["repeat_days"]:
+                    history.append({
+                        "execute_time": (execute_time + timedelta(days=i)).strftime(TimerTaskUtils.TIME_FORMAT),
+                        "executed_time": (execute_time + timedelta(days=i)).strftime(TimerTaskUtils.TIME_FORMAT),
+                        "result": status.value,
+                        "duration": 0,
+                        "uuid": timer_task["uuid"]
+                    })
+        history_mgr.append(timer_task["uuid"], history)
+        next_time = TimerTaskUtils.nextRepeatTime(timer_task)
+        if next_time:
+            timer_task["execute_time"] = next_time
+            timer_task["status"] = ALTimerTaskStatus.PENDING
+            timer_task["executed"] = False
+        else:
+            timer_task["status"] = status
+        return timer_task
+
+    @staticmethod
+    def applyResult(
+        status: ALTimerTaskStatus,
+        timer_task: dict,
+        history_mgr: Any
+    ) -> dict:
+        """
+            Apply a final status (EXECUTED, ERROR or OUTDATED) to a task.
+        """
+
+        if timer_task.get("repeat", False):
+            return TimerTaskUtils.applyRepeatResult(status, timer_task, history_mgr)
+        timer_task["status"] = status
+        return timer_task
+
+    @staticmethod
+    def nextRepeatTime(
+        timer_task: dict
+    ) -> datetime:
+
+        return TimerUtils.getNextTimerRepeatTime(
+            timer_task["repeat_days"],
+            timer_task["repeat_hour"],
+            timer_task["repeat_minute"],
+            timer_task["repeat_second"]
+        )
+
+    @staticmethod
+    def rewindRepeatTask(
+        timer_task: dict
+    ) -> bool:
+        """
+            Move a pending repeat task back to its next repeat time, needed
+            after the system clock was set back.
+
+            Returns:
+                bool: Whether the execute time changed.
+        """
+
+        if not timer_task.get("repeat", False)\
+        or timer_task["status"] is not ALTimerTaskStatus.PENDING:
+            return False
+        next_time = TimerTaskUtils.nextRepeatTime(timer_task)
+        if next_time and next_time < timer_task["execute_time"]:
+            timer_task["execute_time"] = next_time
+            return True
+        return False